@@ -0,0 +1,2 @@
+from .hud import HUD_STATS, HudAggregator, HudStat
+from .tournament_stats import TournamentStats
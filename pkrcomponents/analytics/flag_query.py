@@ -0,0 +1,112 @@
+"""This module computes stats over many hands from the packed flags columns of the players hand stats"""
+import numpy as np
+
+from pkrcomponents.analytics.hud import HUD_STATS, split_column
+from pkrcomponents.components.players.player_hand_stats import FLAGS_SCHEMAS
+
+
+class FlagQuery:
+    """
+    Vectorized queries over the packed flags of the hand stats of many players. Each street is a uint64 column named
+    '<street>_flags', as exported by PlayerHandStats.to_dataframe(packed_flags=True) or stored in a hand archive.
+    Conditions on flags of the same street are tested with a single mask, so a query costs one or two bitwise NumPy
+    operations per street involved, whatever the number of flags.
+
+    Attributes:
+        columns (dict): The packed flags arrays, keyed by '<street>_flags'
+
+    Methods:
+        select(*flags): Returns the rows where all the given flags are set
+        count(*flags): Returns the number of rows where all the given flags are set
+        ratio(success, opportunity): Returns how often the success flag is set when the opportunity flag is
+        ratios(stats): Returns the ratio of each HUD stat
+    """
+
+    def __init__(self, columns, where: np.ndarray = None):
+        """
+        Args:
+            columns: A DataFrame, a structured array or a mapping holding the '<street>_flags' columns
+            where (np.ndarray): A boolean array restricting the rows queried, for instance to the hands of a player
+        """
+        self.columns = {}
+        for street_name in FLAGS_SCHEMAS:
+            values = np.asarray(columns[f"{street_name}_flags"], dtype=np.uint64)
+            self.columns[f"{street_name}_flags"] = values if where is None else values[where]
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values())))
+
+    def masks(self, flags: tuple) -> dict:
+        """
+        Groups flags by street
+
+        Args:
+            flags (tuple): The flags, like "flop_flag_face_cbet"
+
+        Returns:
+            masks (dict): The mask of the flags of each street, keyed by '<street>_flags'
+        """
+        names_by_street = {}
+        for flag in flags:
+            street_name, name = split_column(flag)
+            names_by_street.setdefault(street_name, []).append(name)
+        return {f"{street_name}_flags": np.uint64(FLAGS_SCHEMAS[street_name].mask(*names))
+                for street_name, names in names_by_street.items()}
+
+    def select(self, *flags: str) -> np.ndarray:
+        """
+        Returns the rows where all the given flags are set
+
+        Args:
+            *flags (str): The flags, like "flop_flag_face_cbet", "flop_flag_fold"
+
+        Returns:
+            selected (np.ndarray): A boolean array, True for every row when no flag is given
+        """
+        selected = np.ones(len(self), dtype=bool)
+        for flags_column, mask in self.masks(flags).items():
+            selected &= (self.columns[flags_column] & mask) == mask
+        return selected
+
+    def count(self, *flags: str) -> int:
+        """
+        Returns the number of rows where all the given flags are set
+
+        Args:
+            *flags (str): The flags
+
+        Returns:
+            count (int): The number of rows
+        """
+        if not flags:
+            return len(self)
+        return int(np.count_nonzero(self.select(*flags)))
+
+    def ratio(self, success: str, opportunity: str = None) -> float:
+        """
+        Returns how often the success flag is set among the rows where the opportunity flag is set
+
+        Args:
+            success (str): The success flag, like "flop_flag_fold"
+            opportunity (str): The opportunity flag, like "flop_flag_face_cbet", None for every row
+
+        Returns:
+            ratio (float): The ratio, NaN without any opportunity
+        """
+        opportunities = (opportunity,) if opportunity else ()
+        nb_opportunities = self.count(*opportunities)
+        if not nb_opportunities:
+            return float("nan")
+        return self.count(success, *opportunities) / nb_opportunities
+
+    def ratios(self, stats: list = None) -> dict:
+        """
+        Returns the ratio of each HUD stat
+
+        Args:
+            stats (list): The HudStat to compute, HUD_STATS by default
+
+        Returns:
+            ratios (dict): The ratio of each stat, keyed by its name
+        """
+        return {stat.name: self.ratio(stat.success, stat.opportunity) for stat in (stats or HUD_STATS)}
@@ -0,0 +1,300 @@
+"""This module aggregates the hand stats of the players across hands, as a HUD does"""
+import json
+import os
+import threading
+from bisect import bisect_right
+
+import numpy as np
+import pandas as pd
+from attrs import define, field
+
+
+@define(frozen=True)
+class HudStat:
+    """
+    A ratio stat of a HUD: how often the player succeeded when they had the opportunity
+
+    Attributes:
+        name (str): The name of the stat
+        success (str): The flag of the success, like "preflop_flag_3bet"
+        opportunity (str): The flag of the opportunity, like "preflop_flag_3bet_opportunity", or None if every hand
+        played is an opportunity
+    """
+    name = field()
+    success = field()
+    opportunity = field(default=None)
+
+
+HUD_STATS = [
+    HudStat("vpip", "preflop_flag_vpip"),
+    HudStat("pfr", "preflop_flag_raise"),
+    HudStat("limp", "preflop_flag_limp"),
+    HudStat("open", "preflop_flag_open", "preflop_flag_open_opportunity"),
+    HudStat("cold_call", "preflop_flag_cold_called", "preflop_flag_face_raise"),
+    HudStat("three_bet", "preflop_flag_3bet", "preflop_flag_3bet_opportunity"),
+    HudStat("fold_to_three_bet", "preflop_flag_fold", "preflop_flag_face_3bet"),
+    HudStat("four_bet", "preflop_flag_4bet", "preflop_flag_4bet_opportunity"),
+    HudStat("squeeze", "preflop_flag_squeeze", "preflop_flag_squeeze_opportunity"),
+    HudStat("steal", "preflop_flag_steal_attempt", "preflop_flag_steal_opportunity"),
+    HudStat("fold_to_steal", "preflop_flag_fold_to_steal_attempt", "preflop_flag_face_steal_attempt"),
+    HudStat("blind_defense", "preflop_flag_blind_defense", "preflop_flag_blind_defense_opportunity"),
+    HudStat("saw_flop", "flop_flag_saw"),
+    HudStat("flop_cbet", "flop_flag_cbet", "flop_flag_cbet_opportunity"),
+    HudStat("flop_fold_to_cbet", "flop_flag_fold", "flop_flag_face_cbet"),
+    HudStat("flop_donk_bet", "flop_flag_donk_bet", "flop_flag_donk_bet_opportunity"),
+    HudStat("flop_check_raise", "flop_flag_check_raise", "flop_flag_check"),
+    HudStat("turn_cbet", "turn_flag_cbet", "turn_flag_cbet_opportunity"),
+    HudStat("turn_fold_to_cbet", "turn_flag_fold", "turn_flag_face_cbet"),
+    HudStat("river_cbet", "river_flag_cbet", "river_flag_cbet_opportunity"),
+    HudStat("river_fold_to_cbet", "river_flag_fold", "river_flag_face_cbet"),
+    HudStat("went_to_showdown", "general_flag_went_to_showdown", "flop_flag_saw"),
+    HudStat("won_at_showdown", "general_flag_won_hand", "general_flag_went_to_showdown"),
+]
+
+
+def split_column(column: str) -> tuple:
+    """
+    Splits a stats column name into the name of the street stats and the name of the attribute
+
+    Args:
+        column (str): The column, like "preflop_flag_vpip"
+
+    Returns:
+        street_name (str): The name of the street stats, like "preflop"
+        name (str): The name of the attribute, like "flag_vpip"
+    """
+    street_name, name = column.split("_", 1)
+    return street_name, name
+
+
+class HudAggregator:
+    """
+    Streaming aggregator of HUD stats. For each key (the name of the player, optionally with their position and their
+    stack depth bucket), it keeps the number of hands played, and the number of opportunities and successes of each
+    stat. Updating costs a constant time per player and hand; aggregators can be merged, for instance when hands are
+    converted by several processes, and saved to or restored from disk.
+
+    Attributes:
+        stats (list): The HUD stats aggregated
+        by_position (bool): Whether the keys include the position of the player
+        stack_buckets (list): The bounds, in big blinds, of the stack depth buckets included in the keys, or None
+        counters (dict): The counters of each key: hands played, then opportunities and successes of each stat
+
+    Methods:
+        update(table): Adds the stats of the players of a converted hand
+        merge(other): Adds the counters of another aggregator
+        to_dataframe(): Returns the counters and ratios of each key
+        snapshot(path): Saves the counters to a file
+        restore(path): Creates an aggregator from a saved file
+    """
+
+    def __init__(self, stats: list = None, by_position: bool = False, stack_buckets: list = None):
+        self.stats = list(HUD_STATS if stats is None else stats)
+        self.by_position = by_position
+        self.stack_buckets = None if stack_buckets is None else sorted(stack_buckets)
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._getters = [(split_column(stat.success),
+                          None if stat.opportunity is None else split_column(stat.opportunity))
+                         for stat in self.stats]
+
+    def __len__(self) -> int:
+        return len(self.counters)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def columns(self) -> list:
+        """
+        Returns the names of the counters
+        """
+        columns = ["hands"]
+        for stat in self.stats:
+            columns += [f"{stat.name}_opportunities", f"{stat.name}_successes"]
+        return columns
+
+    @property
+    def config(self) -> dict:
+        return {
+            "stats": [[stat.name, stat.success, stat.opportunity] for stat in self.stats],
+            "by_position": self.by_position,
+            "stack_buckets": self.stack_buckets,
+        }
+
+    def get_bucket(self, stack_bb: float) -> int:
+        """
+        Returns the stack depth bucket of a stack
+
+        Args:
+            stack_bb (float): The stack in big blinds
+
+        Returns:
+            bucket (int): The index of the bucket, None if the keys have no bucket
+        """
+        if self.stack_buckets is None:
+            return None
+        return bisect_right(self.stack_buckets, stack_bb)
+
+    def bucket_label(self, bucket: int) -> str:
+        """
+        Returns the label of a stack depth bucket, like "20-40"
+        """
+        if bucket is None:
+            return None
+        bounds = [0] + self.stack_buckets + [None]
+        lower, upper = bounds[bucket], bounds[bucket + 1]
+        return f"{lower:g}+" if upper is None else f"{lower:g}-{upper:g}"
+
+    def get_key(self, player, bb: float) -> tuple:
+        """
+        Returns the key of a player in a hand
+
+        Args:
+            player (TablePlayer): The player
+            bb (float): The big blind of the hand
+
+        Returns:
+            key (tuple): The name of the player, the player's position and stack depth bucket
+        """
+        position = player.position.name if self.by_position and player.position is not None else None
+        bucket = self.get_bucket(player.init_stack / bb) if self.stack_buckets is not None and bb else None
+        return player.name, position, bucket
+
+    def update(self, table):
+        """
+        Adds the stats of the players of a converted hand
+
+        Args:
+            table (Table): The converted hand
+        """
+        bb = table.level.bb
+        rows = [(self.get_key(player, bb), self.count_player(player)) for player in table.players]
+        with self._lock:
+            for key, row in rows:
+                counters = self.counters.get(key)
+                if counters is None:
+                    self.counters[key] = row
+                else:
+                    for index, value in enumerate(row):
+                        counters[index] += value
+
+    def count_player(self, player) -> list:
+        """
+        Returns the counters of a player for one hand
+
+        Args:
+            player (TablePlayer): The player
+
+        Returns:
+            row (list): 1 hand played, then the opportunity and success of each stat
+        """
+        hand_stats = player.hand_stats
+        row = [1]
+        for (success_street, success_name), opportunity in self._getters:
+            if opportunity is None:
+                has_opportunity = True
+            else:
+                has_opportunity = getattr(getattr(hand_stats, opportunity[0]), opportunity[1])
+            has_succeeded = has_opportunity and getattr(getattr(hand_stats, success_street), success_name)
+            row.append(1 if has_opportunity else 0)
+            row.append(1 if has_succeeded else 0)
+        return row
+
+    def merge(self, other: "HudAggregator"):
+        """
+        Adds the counters of another aggregator with the same configuration
+
+        Args:
+            other (HudAggregator): The other aggregator
+        """
+        if other.config != self.config:
+            raise ValueError("Cannot merge aggregators with different configurations")
+        with self._lock:
+            for key, row in other.counters.items():
+                counters = self.counters.get(key)
+                if counters is None:
+                    self.counters[key] = list(row)
+                else:
+                    for index, value in enumerate(row):
+                        counters[index] += value
+
+    def to_arrays(self) -> tuple:
+        """
+        Returns the keys and counters as arrays
+
+        Returns:
+            names (np.ndarray): The names of the players
+            positions (np.ndarray): The positions, empty strings if the keys have no position
+            buckets (np.ndarray): The stack depth buckets, -1 if the keys have no bucket
+            counts (np.ndarray): The counters, one row per key
+        """
+        with self._lock:
+            items = list(self.counters.items())
+        names = np.array([key[0] for key, _ in items], dtype=str)
+        positions = np.array([key[1] or "" for key, _ in items], dtype=str)
+        buckets = np.array([-1 if key[2] is None else key[2] for key, _ in items], dtype=np.int16)
+        counts = np.array([row for _, row in items], dtype=np.int64).reshape(len(items), len(self.columns))
+        return names, positions, buckets, counts
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Returns the counters and the ratio of each stat for each key
+
+        Returns:
+            df (pd.DataFrame): One row per key
+        """
+        names, positions, buckets, counts = self.to_arrays()
+        df = pd.DataFrame(counts, columns=self.columns)
+        df.insert(0, "name", names)
+        if self.by_position:
+            df.insert(1, "position", positions)
+        if self.stack_buckets is not None:
+            df.insert(len(df.columns) - len(self.columns), "stack_bucket",
+                      [self.bucket_label(bucket) for bucket in buckets])
+        for stat in self.stats:
+            opportunities = df[f"{stat.name}_opportunities"]
+            df[stat.name] = (df[f"{stat.name}_successes"] / opportunities.where(opportunities > 0)).astype(float)
+        return df
+
+    def snapshot(self, path: str):
+        """
+        Saves the counters to a file. The file is written next to the path and then moved, so that an existing
+        snapshot is never left half written.
+
+        Args:
+            path (str): The path of the snapshot
+        """
+        names, positions, buckets, counts = self.to_arrays()
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "wb") as file:
+            np.savez(file, names=names, positions=positions, buckets=buckets, counts=counts,
+                     config=np.array(json.dumps(self.config)))
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def restore(cls, path: str) -> "HudAggregator":
+        """
+        Creates an aggregator from a snapshot
+
+        Args:
+            path (str): The path of the snapshot
+
+        Returns:
+            aggregator (HudAggregator): The restored aggregator
+        """
+        with np.load(path, allow_pickle=False) as data:
+            config = json.loads(str(data["config"]))
+            aggregator = cls(stats=[HudStat(*stat) for stat in config["stats"]], by_position=config["by_position"],
+                             stack_buckets=config["stack_buckets"])
+            for name, position, bucket, row in zip(data["names"], data["positions"], data["buckets"],
+                                                   data["counts"]):
+                key = (str(name), str(position) or None, None if bucket < 0 else int(bucket))
+                aggregator.counters[key] = row.tolist()
+        return aggregator
@@ -0,0 +1,200 @@
+"""This module computes the results of a player over many tournaments, with bootstrap confidence intervals"""
+import numpy as np
+import pandas as pd
+
+GROUP_KEYS = ("speed", "tournament_type", "buy_in_bucket", "month")
+METRICS = ("roi", "itm", "average_finish", "bounty_share")
+BOOTSTRAP_CHUNK_SIZE = 4_000_000
+
+
+class TournamentStats:
+    """
+    Vectorized results over the converted summaries of many tournaments, loaded as typed NumPy columns. The sums of
+    each group are computed with one bincount per column, and the bootstrap resamples of a group are drawn as index
+    counts, so that the resampled sums are a single matrix product per chunk of resamples.
+
+    Attributes:
+        cost (np.ndarray): The buy-ins paid for each tournament, re-entries included
+        winnings (np.ndarray): The amount won plus the bounties won in each tournament
+        bounty_won (np.ndarray): The bounties won in each tournament
+        itm (np.ndarray): Whether the player finished in the money
+        final_position (np.ndarray): The final position, NaN if unknown
+        keys (dict): The group labels of each tournament, by group key
+
+    Methods:
+        summary(group_by, nb_bootstraps, confidence, seed): Returns the results and their confidence intervals by group
+    """
+
+    def __init__(self, columns, buy_in_buckets: list = None):
+        """
+        Args:
+            columns: A TournamentResults, its arrays, or a DataFrame with the same columns
+            buy_in_buckets (list): The bounds of the buy-in buckets, like [1, 5, 20, 100]
+        """
+        if hasattr(columns, "to_arrays"):
+            columns = columns.to_arrays()
+        buy_in = sum(np.asarray(columns[column], dtype=float)
+                     for column in ("buy_in_prize_pool", "buy_in_bounty", "buy_in_rake"))
+        amount_won = np.asarray(columns["amount_won"], dtype=float)
+        self.bounty_won = np.asarray(columns["bounty_won"], dtype=float)
+        self.cost = buy_in * np.asarray(columns["nb_entries"], dtype=float)
+        self.winnings = amount_won + self.bounty_won
+        self.itm = amount_won > 0
+        self.final_position = np.asarray(columns["final_position"], dtype=float)
+        self.buy_in_buckets = None if buy_in_buckets is None else sorted(buy_in_buckets)
+        self.keys = {
+            "speed": np.asarray(columns["speed"], dtype=str),
+            "tournament_type": np.asarray(columns["tournament_type"], dtype=str),
+            "buy_in_bucket": self.get_buy_in_buckets(buy_in),
+            "month": np.asarray(columns["start_date"], dtype="datetime64[s]").astype("datetime64[M]").astype(str),
+        }
+
+    def __len__(self) -> int:
+        return len(self.cost)
+
+    def get_buy_in_buckets(self, buy_in: np.ndarray) -> np.ndarray:
+        """
+        Returns the label of the buy-in bucket of each tournament, like "5-20"
+
+        Args:
+            buy_in (np.ndarray): The total buy-in of each tournament
+
+        Returns:
+            labels (np.ndarray): The labels, all "all" without buckets
+        """
+        if self.buy_in_buckets is None:
+            return np.full(len(buy_in), "all")
+        bounds = [0] + self.buy_in_buckets + [None]
+        labels = np.array([f"{lower:g}+" if upper is None else f"{lower:g}-{upper:g}"
+                           for lower, upper in zip(bounds[:-1], bounds[1:])])
+        return labels[np.searchsorted(self.buy_in_buckets, buy_in, side="right")]
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        Returns the columns summed by the metrics, one row per tournament: cost, profit, in the money, known finish,
+        final position, bounties won and winnings
+        """
+        known_finish = ~np.isnan(self.final_position)
+        return np.column_stack([self.cost, self.winnings - self.cost, self.itm, known_finish,
+                                np.where(known_finish, self.final_position, 0.0), self.bounty_won, self.winnings])
+
+    @staticmethod
+    def get_metrics(sums: np.ndarray, counts: np.ndarray) -> dict:
+        """
+        Returns the metrics from the sums of the values of groups or of resamples
+
+        Args:
+            sums (np.ndarray): The sums of the columns of values, on the last axis
+            counts (np.ndarray): The number of tournaments summed
+
+        Returns:
+            metrics (dict): The arrays of ROI, ITM, average finish and bounty share
+        """
+        cost, profit, itm, known_finish, final_position, bounty_won, winnings = np.moveaxis(sums, -1, 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return {
+                "roi": profit / cost,
+                "itm": itm / counts,
+                "average_finish": final_position / known_finish,
+                "bounty_share": bounty_won / winnings,
+            }
+
+    def group_codes(self, group_by: list) -> tuple:
+        """
+        Returns the group of each tournament
+
+        Args:
+            group_by (list): The group keys, among GROUP_KEYS
+
+        Returns:
+            codes (np.ndarray): The index of the group of each tournament
+            labels (dict): The labels of each group, by group key
+        """
+        codes = np.zeros(len(self), dtype=np.int64)
+        uniques = []
+        for key in group_by:
+            key_uniques, key_codes = np.unique(self.keys[key], return_inverse=True)
+            codes = codes * len(key_uniques) + key_codes
+            uniques.append(key_uniques)
+        group_ids, codes = np.unique(codes, return_inverse=True)
+        labels = {}
+        for key, key_uniques in reversed(list(zip(group_by, uniques))):
+            labels[key] = key_uniques[group_ids % len(key_uniques)]
+            group_ids = group_ids // len(key_uniques)
+        return codes.reshape(-1), {key: labels[key] for key in group_by}
+
+    @staticmethod
+    def bootstrap(values: np.ndarray, nb_bootstraps: int, generator: np.random.Generator) -> np.ndarray:
+        """
+        Returns the sums of the values of bootstrap resamples of tournaments
+
+        Args:
+            values (np.ndarray): The values of the tournaments of a group, one row per tournament
+            nb_bootstraps (int): The number of resamples
+            generator (np.random.Generator): The random generator
+
+        Returns:
+            sums (np.ndarray): The sums of each resample, shaped as (nb_bootstraps, nb_columns)
+        """
+        nb_tournaments = len(values)
+        chunk_size = max(1, BOOTSTRAP_CHUNK_SIZE // nb_tournaments)
+        sums = []
+        for start in range(0, nb_bootstraps, chunk_size):
+            nb_resamples = min(chunk_size, nb_bootstraps - start)
+            draws = generator.integers(0, nb_tournaments, (nb_resamples, nb_tournaments))
+            draws += np.arange(nb_resamples)[:, None] * nb_tournaments
+            counts = np.bincount(draws.ravel(), minlength=nb_resamples * nb_tournaments)
+            sums.append(counts.reshape(nb_resamples, nb_tournaments) @ values)
+        return np.concatenate(sums)
+
+    def summary(self, group_by: list = None, nb_bootstraps: int = 1000, confidence: float = 0.95,
+                seed: int = None) -> pd.DataFrame:
+        """
+        Returns the ROI, ITM, average finish and bounty share of each group, with percentile bootstrap confidence
+        intervals
+
+        Args:
+            group_by (list): The group keys, among "speed", "tournament_type", "buy_in_bucket" and "month"
+            nb_bootstraps (int): The number of bootstrap resamples per group, 0 for no confidence interval
+            confidence (float): The confidence level of the intervals
+            seed (int): The seed of the random generator
+
+        Returns:
+            df (pd.DataFrame): One row per group, with the number of tournaments, cost, profit, and each metric with
+            its "_low" and "_high" bounds
+        """
+        group_by = list(group_by or [])
+        for key in group_by:
+            if key not in GROUP_KEYS:
+                raise ValueError(f"Cannot group tournaments by {key}")
+        generator = np.random.default_rng(seed)
+        values = self.values
+        codes, labels = self.group_codes(group_by)
+        nb_groups = len(next(iter(labels.values()))) if labels else int(len(self) > 0)
+        counts = np.bincount(codes, minlength=nb_groups).astype(float)
+        sums = np.column_stack([np.bincount(codes, weights=column, minlength=nb_groups) for column in values.T]) \
+            if len(self) else np.zeros((nb_groups, values.shape[1]))
+        df = pd.DataFrame(labels)
+        df["tournaments"] = counts.astype(np.int64)
+        df["cost"] = sums[:, 0]
+        df["profit"] = sums[:, 1]
+        for metric, metric_values in self.get_metrics(sums, counts).items():
+            df[metric] = metric_values
+        if nb_bootstraps:
+            order = np.argsort(codes, kind="stable")
+            bounds = np.concatenate(([0], np.cumsum(counts).astype(np.int64)))
+            low_quantile, high_quantile = 100 * (1 - confidence) / 2, 100 * (1 + confidence) / 2
+            intervals = {metric: np.full((nb_groups, 2), np.nan) for metric in METRICS}
+            for group in range(nb_groups):
+                group_values = values[order[bounds[group]:bounds[group + 1]]]
+                resampled = self.get_metrics(self.bootstrap(group_values, nb_bootstraps, generator),
+                                             counts[group])
+                for metric, metric_values in resampled.items():
+                    finite = metric_values[np.isfinite(metric_values)]
+                    if len(finite):
+                        intervals[metric][group] = np.percentile(finite, [low_quantile, high_quantile])
+            for metric in METRICS:
+                df[f"{metric}_low"] = intervals[metric][:, 0]
+                df[f"{metric}_high"] = intervals[metric][:, 1]
+        return df
@@ -1,7 +1,9 @@
 from .action import Action, BetAction, CallAction, CheckAction, FoldAction, RaiseAction
+from .action_log import ActionLog, ActionLogView
 from .action_move import ActionMove
 from .actions_history import ActionsHistory
 from .actions_sequence import ActionsSequence
 from .blind_type import BlindType
+from .line_registry import LINES, LineRegistry
 from .posting import Posting
 from .street import Street
\ No newline at end of file
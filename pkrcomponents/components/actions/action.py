@@ -65,10 +65,18 @@ class Action:
         Executes the action
         """
 
+        went_all_in = self.value > 0 and self.is_all_in
+        all_in_is_highest_bet = (went_all_in and self.move in (ActionMove.BET, ActionMove.RAISE)
+                                 and self.player.current_bet + self.value > self.table.pot.highest_bet)
         self.player.pay(self.value)
         self.add_to_history()
         self.player.set_first_to_talk()
+        self.add_to_bet_totals()
         self.update_hand_stats()
+        if went_all_in:
+            self.player.flag_street_went_all_in = True
+        if all_in_is_highest_bet:
+            self.table.street_all_in_made = True
         self.player.current_bet += self.value
         self.table.update_min_bet(self.new_min_bet)
         self.table.pot.update_highest_bet(self.player.current_bet)
@@ -81,6 +89,25 @@ class Action:
         self.table.advance_seat_playing()
         self.player.played = True
 
+    def add_to_bet_totals(self):
+        """
+        Adds the value of the action to the running bet totals of the player, for the street and for the hand
+        """
+        hand_stats = self.player.hand_stats
+        match self.table.street:
+            case Street.PREFLOP:
+                street_stats = hand_stats.preflop
+            case Street.FLOP:
+                street_stats = hand_stats.flop
+            case Street.TURN:
+                street_stats = hand_stats.turn
+            case Street.RIVER:
+                street_stats = hand_stats.river
+            case _:
+                return
+        street_stats.total_bet_amount += self.value
+        hand_stats.general.total_bet_amount += self.value
+
     def update_street_hand_stats(self):
         """
         Updates the hand statistics of the player according to the action
@@ -109,15 +136,7 @@ class Action:
         """
         Adds the action to the history
         """
-        match self.table.street:
-            case Street.PREFLOP:
-                self.player.actions_history.preflop.add(self)
-            case Street.FLOP:
-                self.player.actions_history.flop.add(self)
-            case Street.TURN:
-                self.player.actions_history.turn.add(self)
-            case Street.RIVER:
-                self.player.actions_history.river.add(self)
+        self.player.actions_history.add(self, self.table.street)
 
 
 class FoldAction(Action):
@@ -130,7 +149,7 @@ class FoldAction(Action):
     def execute(self):
         super().execute()
         self.player.folded = True
-        self.player.has_initiative = False
+        self.player.lose_initiative()
 
 
 class CheckAction(Action):
@@ -142,7 +161,7 @@ class CheckAction(Action):
 
     def execute(self):
         super().execute()
-        self.player.has_initiative = False
+        self.player.lose_initiative()
 
 
 class CallAction(Action):
@@ -178,8 +197,10 @@ class BetAction(Action):
         self.player.take_initiative()
         if self.player.has_initiative:
             self.player.flag_street_cbet = True
+            self.table.street_cbet_made = True
         else:
             self.player.flag_street_donk_bet = True
+            self.table.street_donk_bet_made = True
 
 
 class RaiseAction(Action):
@@ -205,3 +226,8 @@ class RaiseAction(Action):
         self.table.cnt_bets += 1
         self.table.is_opened = True
         self.player.take_initiative()
+        preflop_stats = self.player.hand_stats.preflop
+        if preflop_stats.flag_squeeze:
+            self.table.squeeze_made = True
+        if preflop_stats.flag_steal_attempt:
+            self.table.steal_attempted = True
@@ -0,0 +1,171 @@
+from array import array
+
+from attrs import define, field, Factory
+
+from pkrcomponents.components.actions.action_move import ActionMove
+from pkrcomponents.components.actions.line_registry import LINES
+from pkrcomponents.components.actions.street import Street
+
+MOVES = tuple(ActionMove)
+MOVE_CODES = {move: code for code, move in enumerate(MOVES)}
+MOVE_SYMBOLS = tuple(move.symbol for move in MOVES)
+STREETS = tuple(Street)
+STREET_CODES = {street: code for code, street in enumerate(STREETS)}
+INITIAL_CAPACITY = 16
+
+
+def zeros(typecode: str, length: int) -> array:
+    return array(typecode, bytes(array(typecode).itemsize * length))
+
+
+@define(repr=False)
+class ActionLogView:
+    """
+    This class is a read-only view on the actions of one street of an action log. It holds memoryviews on the arrays of
+    the log, so creating it copies nothing.
+
+    Attributes:
+        seats (memoryview): The seats of the players making the actions
+        moves (memoryview): The codes of the moves made
+        amounts (memoryview): The amounts of the moves made
+
+    Methods:
+        __iter__(): Iterates over the (seat, move, amount) of the actions
+
+    Properties:
+        symbol(str): The symbols of the moves, like "RC"
+        line_id(int): The interned id of the line
+        total_amount(float): The total amount of the moves
+    """
+    seats = field()
+    moves = field()
+    amounts = field()
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def __iter__(self):
+        for seat, move_code, amount in zip(self.seats, self.moves, self.amounts):
+            yield seat, MOVES[move_code], amount
+
+    def __repr__(self) -> str:
+        return f"ActionLogView({self.symbol})"
+
+    @property
+    def symbol(self) -> str:
+        """
+        Returns the symbols of the moves in the view
+        """
+        return "".join([MOVE_SYMBOLS[move_code] for move_code in self.moves])
+
+    @property
+    def line_id(self) -> int:
+        """
+        Returns the interned id of the line of the view
+        """
+        return LINES.intern(self.symbol)
+
+    @property
+    def total_amount(self) -> float:
+        """
+        Returns the total amount of the moves in the view
+        """
+        return sum(self.amounts)
+
+
+@define(repr=False, eq=False)
+class ActionLog:
+    """
+    This class is a compact log of the actions of a hand, stored as typed arrays of (seat, street, move code, amount).
+    Actions must be appended street by street, so that the actions of a street are contiguous and can be viewed without
+    copying. The arrays are never resized in place: when the capacity is reached they are replaced by bigger ones, so
+    that views taken earlier stay valid until the log is reset.
+
+    Attributes:
+        seats (array): The seats of the players making the actions
+        streets (array): The codes of the streets of the actions
+        moves (array): The codes of the moves made
+        amounts (array): The amounts of the moves made
+        street_counts (list): The number of actions logged on each street
+
+    Methods:
+        append(seat, street, move, amount): Appends an action to the log
+        view(street): Returns a view on the actions of a street
+        reset(): Empties the log, keeping its arrays
+    """
+    seats = field(default=Factory(lambda: zeros("b", INITIAL_CAPACITY)))
+    streets = field(default=Factory(lambda: zeros("b", INITIAL_CAPACITY)))
+    moves = field(default=Factory(lambda: zeros("b", INITIAL_CAPACITY)))
+    amounts = field(default=Factory(lambda: zeros("d", INITIAL_CAPACITY)))
+    street_counts = field(default=Factory(lambda: [0] * len(STREETS)))
+    length = field(default=0)
+    last_street_code = field(default=0)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"ActionLog({len(self)} actions)"
+
+    def grow(self):
+        """
+        Replaces the arrays with arrays twice as big
+        """
+        capacity = 2 * len(self.moves)
+        for name in ("seats", "streets", "moves", "amounts"):
+            old_array = getattr(self, name)
+            new_array = zeros(old_array.typecode, capacity)
+            new_array[:self.length] = old_array[:self.length]
+            setattr(self, name, new_array)
+
+    def append(self, seat: int, street: Street, move: ActionMove, amount: float):
+        """
+        Appends an action to the log
+
+        Args:
+            seat (int): The seat of the player making the action
+            street (Street): The street of the action
+            move (ActionMove): The move made
+            amount (float): The amount of the move
+        """
+        street_code = STREET_CODES[street]
+        if street_code < self.last_street_code:
+            raise ValueError(f"Cannot log a {street.name} action after a {STREETS[self.last_street_code].name} one")
+        if self.length == len(self.moves):
+            self.grow()
+        index = self.length
+        self.seats[index] = seat
+        self.streets[index] = street_code
+        self.moves[index] = MOVE_CODES[move]
+        self.amounts[index] = amount
+        self.street_counts[street_code] += 1
+        self.length = index + 1
+        self.last_street_code = street_code
+
+    def view(self, street: Street = None) -> ActionLogView:
+        """
+        Returns a view on the actions of a street, or on all the actions if no street is given
+
+        Args:
+            street (Street): The street to view
+
+        Returns:
+            view (ActionLogView): The view on the actions
+        """
+        if street is None:
+            start, stop = 0, self.length
+        else:
+            street_code = STREET_CODES[street]
+            start = sum(self.street_counts[:street_code])
+            stop = start + self.street_counts[street_code]
+        return ActionLogView(seats=memoryview(self.seats)[start:stop], moves=memoryview(self.moves)[start:stop],
+                             amounts=memoryview(self.amounts)[start:stop])
+
+    def reset(self):
+        """
+        Empties the log. The arrays are kept to be reused by the next hand
+        """
+        self.length = 0
+        self.last_street_code = 0
+        for street_code in range(len(self.street_counts)):
+            self.street_counts[street_code] = 0
@@ -1,6 +1,8 @@
 from attrs import define, field, Factory
 from attrs.validators import instance_of
+from pkrcomponents.components.actions.action_log import ActionLog, ActionLogView
 from pkrcomponents.components.actions.actions_sequence import ActionsSequence
+from pkrcomponents.components.actions.street import Street
 
 
 @define
@@ -13,14 +15,51 @@ class ActionsHistory:
         flop (ActionsSequence): The sequence of actions on the flop
         turn (ActionsSequence): The sequence of actions on the turn
         river (ActionsSequence): The sequence of actions on the river
+        log (ActionLog): The compact log of the actions of the hand
 
     Methods:
+        add(action, street): Adds an action to the history
+        view(street): Returns a view on the logged actions of a street
         reset(): Resets the history of actions
     """
     preflop = field(validator=instance_of(ActionsSequence), default=Factory(lambda: ActionsSequence()))
     flop = field(validator=instance_of(ActionsSequence), default=Factory(lambda: ActionsSequence()))
     turn = field(validator=instance_of(ActionsSequence), default=Factory(lambda: ActionsSequence()))
     river = field(validator=instance_of(ActionsSequence), default=Factory(lambda: ActionsSequence()))
+    log = field(validator=instance_of(ActionLog), default=Factory(ActionLog), eq=False)
+
+    def add(self, action, street: Street):
+        """
+        Adds an action to the sequence of its street and to the log
+
+        Args:
+            action (Action): The action to add
+            street (Street): The street of the action
+        """
+        match street:
+            case Street.PREFLOP:
+                self.preflop.add(action)
+            case Street.FLOP:
+                self.flop.add(action)
+            case Street.TURN:
+                self.turn.add(action)
+            case Street.RIVER:
+                self.river.add(action)
+            case _:
+                return
+        self.log.append(action.player.seat, street, action.move, action.value)
+
+    def view(self, street: Street = None) -> ActionLogView:
+        """
+        Returns a view on the logged actions of a street, without copying them
+
+        Args:
+            street (Street): The street to view, or None for the whole hand
+
+        Returns:
+            view (ActionLogView): The view on the actions
+        """
+        return self.log.view(street)
 
     def reset(self):
         """
@@ -30,3 +69,4 @@ class ActionsHistory:
         self.flop.reset()
         self.turn.reset()
         self.river.reset()
+        self.log.reset()
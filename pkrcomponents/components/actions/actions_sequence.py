@@ -1,6 +1,8 @@
-from attrs import define, field
+from attrs import define, field, Factory
 from attrs.validators import instance_of
 
+from pkrcomponents.components.actions.line_registry import LINES
+
 
 @define(repr=False, eq=False)
 class ActionsSequence:
@@ -13,8 +15,17 @@ class ActionsSequence:
     Methods:
         add (Action): Adds an action to the sequence
         reset(): Resets the sequence of actions
+
+    Properties:
+        symbol(str): The symbols of the moves of the sequence, built as the actions are added
+        name(str): The names of the moves of the sequence
+        line_id(int): The interned id of the line of the sequence
     """
-    actions = field(validator=instance_of(list), default=[])
+    actions = field(validator=instance_of(list), default=Factory(list))
+    _symbol = field(default="", init=False)
+
+    def __attrs_post_init__(self):
+        self._symbol = "".join([action.move.symbol for action in self.actions])
 
     def __str__(self):
         return self.symbol
@@ -30,7 +41,7 @@ class ActionsSequence:
         """
         Returns the symbol representation of the sequence of actions
         """
-        return "".join([action.move.symbol for action in self.actions])
+        return self._symbol
 
     @property
     def name(self) -> str:
@@ -39,14 +50,23 @@ class ActionsSequence:
         """
         return "-".join([action.move.name for action in self.actions])
 
+    @property
+    def line_id(self) -> int:
+        """
+        Returns the interned id of the line of the sequence, to group sequences with an integer instead of a string
+        """
+        return LINES.intern(self._symbol)
+
     def add(self, action):
         """
         Adds an action to the sequence
         """
         self.actions.append(action)
+        self._symbol += action.move.symbol
 
     def reset(self):
         """
         Resets the sequence of actions
         """
-        self.actions = []
\ No newline at end of file
+        self.actions = []
+        self._symbol = ""
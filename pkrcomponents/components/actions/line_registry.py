@@ -0,0 +1,87 @@
+import threading
+
+import numpy as np
+
+
+class LineRegistry:
+    """
+    This class interns action lines (sequences of move symbols, like "RC" or "XRC") as small integers, so that hands can
+    be grouped by line with an integer hash instead of a string comparison. Ids are given in order of first appearance
+    and never change for the lifetime of the registry. The empty line always has the id 0.
+
+    Methods:
+        intern(symbol): Returns the id of a line, registering it if needed
+        symbol(line_id): Returns the line of an id
+        encode(symbols): Returns the ids of several lines as a numpy array
+        decode(line_ids): Returns the lines of several ids
+    """
+
+    def __init__(self):
+        self._ids = {"": 0}
+        self._symbols = [""]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._ids
+
+    def intern(self, symbol: str) -> int:
+        """
+        Returns the id of a line, registering it if it was never seen
+
+        Args:
+            symbol (str): The symbols of the moves of the line
+
+        Returns:
+            line_id (int): The id of the line
+        """
+        line_id = self._ids.get(symbol)
+        if line_id is None:
+            with self._lock:
+                line_id = self._ids.get(symbol)
+                if line_id is None:
+                    line_id = len(self._symbols)
+                    self._symbols.append(symbol)
+                    self._ids[symbol] = line_id
+        return line_id
+
+    def symbol(self, line_id: int) -> str:
+        """
+        Returns the line registered with an id
+
+        Args:
+            line_id (int): The id of the line
+
+        Returns:
+            symbol (str): The symbols of the moves of the line
+        """
+        return self._symbols[line_id]
+
+    def encode(self, symbols) -> np.ndarray:
+        """
+        Returns the ids of several lines
+
+        Args:
+            symbols (iterable): The lines to encode
+
+        Returns:
+            line_ids (np.ndarray): The ids of the lines
+        """
+        return np.fromiter((self.intern(symbol) for symbol in symbols), dtype=np.int32)
+
+    def decode(self, line_ids) -> list:
+        """
+        Returns the lines of several ids
+
+        Args:
+            line_ids (iterable): The ids to decode
+
+        Returns:
+            symbols (list): The lines of the ids
+        """
+        return [self._symbols[line_id] for line_id in line_ids]
+
+
+LINES = LineRegistry()
@@ -1,55 +1,85 @@
 import csv
 import pandas as pd
 
-from attrs import define, Factory, field
+from attrs import define, Factory, field, fields
 from attrs.validators import instance_of
 from pkrcomponents.components.players.street_hand_stats import preflop, postflop, general
 from pkrcomponents.components.players.street_hand_stats.base import StreetHandStatsBase
+from pkrcomponents.components.players.street_hand_stats.flags import get_flags_schema
+
+STREET_NAMES = ['general', 'preflop', 'flop', 'turn', 'river']
 
 
 @define
 class PlayerHandStats(StreetHandStatsBase):
     """
-    This class represents the statistics of a player's hand in a poker game
+    This class represents the statistics of a player's hand in a poker game. The street stats are built by their
+    generated reset functions, so a new object starts with every stat at its default and no actions sequence.
 
     Methods:
         reset: Resets all stats
     """
     # A. Preflop stats
     preflop = field(
-        default=Factory(preflop.PreflopPlayerHandStats),
+        default=Factory(preflop.PreflopPlayerHandStats.create),
         metadata={'description': 'Preflop player stats for a hand'},
         validator=instance_of(preflop.PreflopPlayerHandStats))
     flop = field(
-        default=Factory(postflop.PostflopPlayerHandStats),
+        default=Factory(postflop.PostflopPlayerHandStats.create),
         metadata={'description': 'Flop player stats for a hand'},
         validator=instance_of(postflop.PostflopPlayerHandStats))
     turn = field(
-        default=Factory(postflop.PostflopPlayerHandStats),
+        default=Factory(postflop.PostflopPlayerHandStats.create),
         metadata={'description': 'Turn player stats for a hand'},
         validator=instance_of(postflop.PostflopPlayerHandStats))
     river = field(
-        default=Factory(postflop.PostflopPlayerHandStats),
+        default=Factory(postflop.PostflopPlayerHandStats.create),
         metadata={'description': 'River player stats for a hand'},
         validator=instance_of(postflop.PostflopPlayerHandStats))
     general = field(
-        default=Factory(general.GeneralPlayerHandStats),
+        default=Factory(general.GeneralPlayerHandStats.create),
         metadata={'description': 'General player stats for a hand'},
         validator=instance_of(general.GeneralPlayerHandStats))
 
-    def __attrs_post_init__(self):
+    def reset(self):
+        """
+        Resets all stats in place, keeping the street stats objects
+        """
         self.preflop.reset()
         self.flop.reset()
         self.turn.reset()
         self.river.reset()
         self.general.reset()
 
-    def to_dataframe(self) -> pd.DataFrame:
+    def pack_flags(self) -> dict:
+        """
+        Returns the boolean stats of each street packed into an integer
+
+        Returns:
+            flags (dict): The packed flags, keyed by '<street>_flags'
+        """
+        return {f'{street_name}_flags': getattr(self, street_name).pack_flags() for street_name in STREET_NAMES}
+
+    def unpack_flags(self, flags: dict):
+        """
+        Sets the boolean stats of each street from packed flags
+
+        Args:
+            flags (dict): The packed flags, keyed by '<street>_flags'
+        """
+        for street_name in STREET_NAMES:
+            getattr(self, street_name).unpack_flags(flags[f'{street_name}_flags'])
+
+    def to_dataframe(self, packed_flags: bool = False) -> pd.DataFrame:
         """
         Converts the object to a pandas DataFrame
+
+        Args:
+            packed_flags (bool): Whether to export the boolean stats of each street as a single uint64
+                '<street>_flags' column instead of one column per stat
         """
-        street_names = ['general', 'preflop', 'flop', 'turn', 'river']
-        data_frames = [getattr(self, street_name).to_dataframe() for street_name in street_names]
+        street_names = STREET_NAMES
+        data_frames = [getattr(self, street_name).to_dataframe(packed_flags) for street_name in street_names]
         # Join all dataframes with the usage of street_names as keys
         df = pd.concat(data_frames, axis=1, keys=street_names)
         # Modify the column names by adding the street name as prefix to the current column names
@@ -57,6 +87,8 @@ class PlayerHandStats(StreetHandStatsBase):
         return df
 
 
+FLAGS_SCHEMAS = {attribute.name: get_flags_schema(attribute.validator.type) for attribute in fields(PlayerHandStats)}
+
 
 if __name__ == '__main__':
     PlayerHandStats.generate_description_file()
@@ -1,11 +1,57 @@
+from bisect import insort
+from functools import lru_cache
+
+from attrs import define
+
 from pkrcomponents.components.actions.posting import AntePosting, SBPosting, BBPosting
 from pkrcomponents.components.players.position import Position
 from pkrcomponents.components.utils.exceptions import PlayerNotOnTableError
 
+POSITIONS_BY_NB_PLAYERS = Position.get_mapper()
+
+
+@define(frozen=True)
+class SeatOrder:
+    """
+    The playing orders and positions of a set of occupied seats for a given Big Blind seat
+
+    Attributes:
+        preflop (tuple): The seats in preflop playing order
+        postflop (tuple): The seats in postflop playing order
+        positions (dict): The position of each seat
+        seats (dict): The seat of each position name
+    """
+    preflop: tuple
+    postflop: tuple
+    positions: dict
+    seats: dict
+
+
+@lru_cache(maxsize=None)
+def get_seat_order(occupied_mask: int, bb_seat: int) -> SeatOrder:
+    """
+    Returns the playing orders and positions of the occupied seats, computed once per seats and Big Blind
+
+    Args:
+        occupied_mask (int): The occupied seats, bit i set when seat i is occupied
+        bb_seat (int): The seat of the Big Blind, which must be occupied
+
+    Returns:
+        seat_order (SeatOrder): The orders and positions
+    """
+    occupied_seats = [seat for seat in range(occupied_mask.bit_length()) if occupied_mask >> seat & 1]
+    cut = occupied_seats.index(bb_seat) + 1
+    preflop = tuple(occupied_seats[cut:] + occupied_seats[:cut])
+    postflop = preflop[-2:] + preflop[:-2]
+    positions = dict(zip(preflop, POSITIONS_BY_NB_PLAYERS.get(len(preflop), ())))
+    seats = {position.name: seat for seat, position in positions.items()}
+    return SeatOrder(preflop=preflop, postflop=postflop, positions=positions, seats=seats)
+
 
 class Players:
     """
-    Class representing many players on a table
+    Class representing many players on a table. The playing orders and positions are looked up once each time a
+    player sits or leaves or the Big Blind moves, and reused until then.
     """
     _bb_seat: int
     _pl_list: list
@@ -18,6 +64,7 @@ class Players:
         self.name_dict = {}
         self.seat_dict = {}
         self._bb_seat = 1
+        self._seat_order = None
 
     def __getitem__(self, item):
         if isinstance(item, str):
@@ -31,7 +78,7 @@ class Players:
             raise ValueError("To get a player, call it by its name or seat")
 
     def __len__(self):
-        return len(self.occupied_seats)
+        return len(self.seat_dict)
 
     def __contains__(self, item):
         return self.pl_list.__contains__(item)
@@ -71,6 +118,9 @@ class Players:
     def seat_dict(self, dico):
         """Setter for seat dict property"""
         self._seat_dict = dico
+        self._occupied_seats = sorted(dico)
+        self._occupied_mask = sum(1 << seat for seat in dico)
+        self._seat_order = None
 
     @property
     def len(self):
@@ -80,9 +130,7 @@ class Players:
     @property
     def occupied_seats(self):
         """returns an ordered list of the number of every occupied seat on the table"""
-        tab = list(self.seat_dict.keys())
-        tab.sort()
-        return tab
+        return list(self._occupied_seats)
 
     @property
     def bb_seat(self):
@@ -92,24 +140,30 @@ class Players:
     @bb_seat.setter
     def bb_seat(self, seat):
         """ Setter for bb_seat property"""
-        if seat in self.occupied_seats:
+        if seat in self.seat_dict:
             self._bb_seat = seat
         else:
-            self._bb_seat = self.occupied_seats[0]
+            self._bb_seat = self._occupied_seats[0]
+        self._seat_order = None
+
+    @property
+    def seat_order(self) -> SeatOrder:
+        """Returns the playing orders and positions of the occupied seats for the current Big Blind"""
+        if self._seat_order is None:
+            self._seat_order = get_seat_order(self._occupied_mask, self._bb_seat)
+        return self._seat_order
 
     @property
     def preflop_ordered_seats(self):
         """Returns the list of the indexes of players on the table, with preflop playing order"""
-        cut = self.occupied_seats.index(self.bb_seat) + 1
-        return self.occupied_seats[cut:] + self.occupied_seats[:cut]
+        return list(self.seat_order.preflop)
 
     @property
     def positions_mapper(self):
         """Returns a dict {seat: position} """
-        nb_players = self.len
-        mapper = Position.get_mapper()
-        positions = mapper[nb_players]
-        return dict(zip(self.preflop_ordered_seats, positions))
+        if self.len not in POSITIONS_BY_NB_PLAYERS:
+            raise KeyError(self.len)
+        return dict(self.seat_order.positions)
 
     def set_button_seat(self, seat: int):
         self.button_seat = seat
@@ -117,10 +171,9 @@ class Players:
     @property
     def seats_mapper(self):
         """Returns a dict {position: seat} """
-        nb_players = self.len
-        mapper = Position.get_mapper()
-        positions = tuple(position.name for position in mapper[nb_players])
-        return dict(zip(positions, self.preflop_ordered_seats))
+        if self.len not in POSITIONS_BY_NB_PLAYERS:
+            raise KeyError(self.len)
+        return dict(self.seat_order.seats)
 
     def distribute_positions(self):
         """When  players are on the table and bb is set, distributes a position to each player on the table"""
@@ -139,18 +192,25 @@ class Players:
     @property
     def postflop_ordered_seats(self):
         """Returns the list of the indexes of players on the table, with postflop playing order"""
-        return self.preflop_ordered_seats[-2:] + self.preflop_ordered_seats[:-2]
+        return list(self.seat_order.postflop)
 
     def add_player(self, player):
         """Adds a player to the table"""
         self.pl_list.append(player)
         self.name_dict[player.name] = player
+        if player.seat not in self.seat_dict:
+            insort(self._occupied_seats, player.seat)
+            self._occupied_mask |= 1 << player.seat
         self.seat_dict[player.seat] = player
+        self._seat_order = None
 
     def remove_player(self, player):
         self.pl_list.remove(player)
         self.name_dict.pop(player.name)
         self.seat_dict.pop(player.seat)
+        self._occupied_seats.remove(player.seat)
+        self._occupied_mask &= ~(1 << player.seat)
+        self._seat_order = None
 
     def advance_bb_seat(self):
         """Advances the Big Blind seat"""
@@ -196,6 +256,16 @@ class Players:
                 bb_index = 0
         return self.occupied_seats[bb_index]
 
+    def clear(self):
+        """Removes every player from the table in place and resets the Big Blind seat"""
+        self.pl_list.clear()
+        self.name_dict.clear()
+        self.seat_dict.clear()
+        self._occupied_seats.clear()
+        self._occupied_mask = 0
+        self._bb_seat = 1
+        self._seat_order = None
+
     def hand_reset(self):
         """Reset all players for a new hand"""
         for player in self:
@@ -211,14 +281,14 @@ class Players:
 
     def post_sb(self):
         """Post Small Blind"""
-        seat = self.seats_mapper["SB"]
+        seat = self.seat_order.seats["SB"]
         player = self[seat]
         posting = SBPosting(player_name=player.name, value=player.table.level.sb)
         posting.execute(player)
 
     def post_bb(self):
         """Preflop big blind posting"""
-        seat = self.seats_mapper["BB"]
+        seat = self.seat_order.seats["BB"]
         player = self.seat_dict[seat]
         posting = BBPosting(player_name=player.name, value=player.table.level.bb)
         posting.execute(player)
@@ -1,6 +1,9 @@
 import csv
+import numpy as np
 import pandas as pd
 from attrs import define, Factory
+from pkrcomponents.components.players.street_hand_stats.compiled_reset import get_compiled_reset
+from pkrcomponents.components.players.street_hand_stats.flags import FlagsSchema, get_flags_schema
 #from pkrcomponents.components.utils.converters import pascal_to_snake_case
 
 @define
@@ -8,23 +11,57 @@ class StreetHandStatsBase:
 
     def reset(self):
         """
-        Resets the statistics
+        Resets the statistics, with the reset function generated from the defaults of the class
         """
-        for attribute in self.__attrs_attrs__:
-            # noinspection PyTypeChecker
-            if isinstance(attribute.default, Factory):
-                # noinspection PyUnresolvedReferences
-                setattr(self, attribute.name, attribute.default.factory())
-            else:
-                setattr(self, attribute.name, attribute.default)
+        get_compiled_reset(type(self))(self)
 
-    def to_dataframe(self):
+    @classmethod
+    def create(cls):
+        """
+        Returns new statistics set to their defaults, built by the generated reset function instead of the attrs
+        __init__ and its validators
+        """
+        stats = object.__new__(cls)
+        get_compiled_reset(cls)(stats)
+        return stats
+
+    @classmethod
+    def flags_schema(cls) -> FlagsSchema:
+        """
+        Returns the bit layout of the boolean stats of the class
+        """
+        return get_flags_schema(cls)
+
+    def pack_flags(self) -> int:
+        """
+        Returns the boolean stats packed into an integer, with the bits of the flags schema of the class
+        """
+        return get_flags_schema(type(self)).pack(self)
+
+    def unpack_flags(self, packed: int):
+        """
+        Sets the boolean stats from an integer packed with the flags schema of the class
+
+        Args:
+            packed (int): The packed flags
+        """
+        get_flags_schema(type(self)).unpack(packed, self)
+
+    def to_dataframe(self, packed_flags: bool = False):
         """
         Converts the object to a pandas DataFrame
+
+        Args:
+            packed_flags (bool): Whether to replace the boolean columns by a single uint64 'flags' column
         """
         columns = [attribute.name for attribute in self.__attrs_attrs__]
+        if packed_flags:
+            schema = get_flags_schema(type(self))
+            columns = [column_name for column_name in columns if column_name not in schema]
         values = [getattr(self, column_name) for column_name in columns]
         df = pd.DataFrame([values], columns=columns)
+        if packed_flags:
+            df["flags"] = np.array([schema.pack(self)], dtype=np.uint64)
         return df
 
     # @classmethod
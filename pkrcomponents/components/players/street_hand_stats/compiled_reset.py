@@ -0,0 +1,51 @@
+"""This module generates the reset function of a stats class from the defaults of its attrs fields"""
+from functools import lru_cache
+
+import attrs
+from attrs import Factory
+
+
+def compile_reset(stats_class: type):
+    """
+    Generates a function setting every field of a slotted stats class back to its default. The defaults are converted
+    once, when the function is generated, and assigned straight to the slots, without __setattr__ nor validators.
+    Factory defaults are still called on every reset.
+
+    Args:
+        stats_class (type): The slotted attrs stats class
+
+    Returns:
+        reset (function): The function resetting an instance of the class in place
+    """
+    namespace = {}
+    lines = ["def reset(self):"]
+    for index, attribute in enumerate(attrs.fields(stats_class)):
+        default = attribute.default
+        if default is attrs.NOTHING:
+            raise TypeError(f"Cannot compile the reset of {stats_class.__name__}: {attribute.name} has no default")
+        namespace[f"set_{index}"] = getattr(stats_class, attribute.name).__set__
+        if isinstance(default, Factory):
+            namespace[f"factory_{index}"] = default.factory
+            value = f"factory_{index}(self)" if default.takes_self else f"factory_{index}()"
+        else:
+            namespace[f"default_{index}"] = default if attribute.converter is None else attribute.converter(default)
+            value = f"default_{index}"
+        lines.append(f"    set_{index}(self, {value})")
+    if len(lines) == 1:
+        lines.append("    pass")
+    exec(compile("\n".join(lines), f"<reset of {stats_class.__name__}>", "exec"), namespace)
+    return namespace["reset"]
+
+
+@lru_cache(maxsize=None)
+def get_compiled_reset(stats_class: type):
+    """
+    Returns the generated reset function of a stats class, generated once per class
+
+    Args:
+        stats_class (type): The slotted attrs stats class
+
+    Returns:
+        reset (function): The function resetting an instance of the class in place
+    """
+    return compile_reset(stats_class)
@@ -0,0 +1,110 @@
+"""This module generates the bit layout of the boolean stats of a street stats class from its attrs metadata"""
+from functools import lru_cache
+
+import attrs
+import numpy as np
+
+MAX_FLAGS = 64
+
+
+class FlagsSchema:
+    """
+    The bit positions of the boolean stats of a street stats class, in the order of declaration of the attrs fields
+    whose metadata type is 'bool'. The flags of a street fit in a single uint64.
+
+    Attributes:
+        stats_class (type): The street stats class
+        names (tuple): The names of the boolean stats, ordered by bit
+        bits (dict): The bit of each boolean stat
+
+    Methods:
+        pack(street_stats): Returns the flags of street stats as an integer
+        unpack(packed, street_stats): Sets the boolean stats of street stats from an integer
+        mask(*names): Returns the integer with the bits of some boolean stats set
+        select(packed, *names): Returns whether all the given flags are set, for an array of packed flags
+    """
+
+    def __init__(self, stats_class: type):
+        self.stats_class = stats_class
+        self.names = tuple(attribute.name for attribute in attrs.fields(stats_class)
+                           if attribute.metadata.get("type") == "bool")
+        if len(self.names) > MAX_FLAGS:
+            raise TypeError(f"Too many flags to pack for {stats_class.__name__}")
+        self.bits = {name: bit for bit, name in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.bits
+
+    def pack(self, street_stats) -> int:
+        """
+        Returns the flags of street stats packed into an integer
+
+        Args:
+            street_stats (StreetHandStatsBase): The street stats
+
+        Returns:
+            packed (int): The packed flags, bit i set when the i-th boolean stat is True
+        """
+        packed = 0
+        for bit, name in enumerate(self.names):
+            if getattr(street_stats, name):
+                packed |= 1 << bit
+        return packed
+
+    def unpack(self, packed: int, street_stats):
+        """
+        Sets the boolean stats of street stats from packed flags
+
+        Args:
+            packed (int): The packed flags
+            street_stats (StreetHandStatsBase): The street stats to set
+        """
+        packed = int(packed)
+        for bit, name in enumerate(self.names):
+            setattr(street_stats, name, bool((packed >> bit) & 1))
+
+    def mask(self, *names: str) -> int:
+        """
+        Returns the integer with the bits of some boolean stats set
+
+        Args:
+            *names (str): The names of the boolean stats, like "flag_cbet"
+
+        Returns:
+            mask (int): The mask
+        """
+        mask = 0
+        for name in names:
+            mask |= 1 << self.bits[name]
+        return mask
+
+    def select(self, packed: np.ndarray, *names: str) -> np.ndarray:
+        """
+        Returns whether all the given flags are set, for an array of packed flags
+
+        Args:
+            packed (np.ndarray): The packed flags, as uint64
+            *names (str): The names of the boolean stats
+
+        Returns:
+            selected (np.ndarray): A boolean array
+        """
+        mask = np.uint64(self.mask(*names))
+        return (packed & mask) == mask
+
+
+@lru_cache(maxsize=None)
+def get_flags_schema(stats_class: type) -> FlagsSchema:
+    """
+    Returns the flags schema of a street stats class, generated once per class
+
+    Args:
+        stats_class (type): The street stats class
+
+    Returns:
+        schema (FlagsSchema): The flags schema of the class
+    """
+    return FlagsSchema(stats_class)
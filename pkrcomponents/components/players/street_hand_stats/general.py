@@ -33,7 +33,6 @@ class GeneralPlayerHandStats(StreetHandStatsBase):
         """
         Updates the hand statistics of the player according to the action
         """
-        stats = action.player.hand_stats
         if action.is_all_in:
             self.all_in_street = action.table.street
         if action.player.is_facing_covering_bet:
@@ -44,8 +43,6 @@ class GeneralPlayerHandStats(StreetHandStatsBase):
             self.facing_all_in_move = action.move
         if action.move == ActionMove.FOLD:
             self.fold_street = action.table.street
-        self.total_bet_amount = sum((stats.preflop.total_bet_amount, stats.flop.total_bet_amount,
-                                     stats.turn.total_bet_amount, stats.river.total_bet_amount))
 
 if __name__ == '__main__':
     GeneralPlayerHandStats.generate_description_file()
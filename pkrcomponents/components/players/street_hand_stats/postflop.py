@@ -66,7 +66,6 @@ class PostflopPlayerHandStats(StreetHandStatsBase):
     move_facing_donk_bet = postflop.MOVE_FACING_DONK_BET
 
     def __attrs_post_init__(self):
-        self.reset()
         self.actions_sequence = ActionsSequence()
 
     def fold_action_update(self):
@@ -154,8 +153,6 @@ class PostflopPlayerHandStats(StreetHandStatsBase):
             self.flag_3bet_opportunity = True
         if action.player.can_4bet:
             self.flag_4bet_opportunity = True
-        self.total_bet_amount = sum(
-            [action.value for action in self.actions_sequence.actions])
         match action.move:
             case ActionMove.FOLD:
                 self.fold_action_update()
@@ -64,7 +64,6 @@ class PreflopPlayerHandStats(StreetHandStatsBase):
     move_facing_steal_attempt = preflop.MOVE_FACING_STEAL_ATTEMPT
 
     def __attrs_post_init__(self):
-        self.reset()
         self.actions_sequence = ActionsSequence([])
 
     def fold_action_update(self, action):
@@ -115,7 +114,6 @@ class PreflopPlayerHandStats(StreetHandStatsBase):
     def update_hand_stats(self, action):
         self.flag_voluntary_all_in = action.value >= action.player.effective_stack
         self.actions_sequence = action.player.actions_history.preflop
-        self.total_bet_amount = sum([action.value for action in self.actions_sequence.actions])
         if not action.table.is_opened:
             self.flag_open_opportunity = True
             self.count_faced_limps = action.table.cnt_limps
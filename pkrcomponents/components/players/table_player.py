@@ -68,6 +68,7 @@ class TablePlayer:
         delete_combo(): Deletes the player's combo
         reset_street_status(): Resets street status
         reset_hand_status(): Resets hand status
+        recycle(): Resets the player in place so that it can be reused for another hand
         pay(value): Action of paying a value
         do_bet(value): Action of betting a certain value
         bet(value): Bet and step to next player
@@ -381,6 +382,28 @@ class TablePlayer:
         self.delete_combo()
         self.reset_actions()
 
+    def recycle(self):
+        """
+        Resets the player in place to the state of a newly created player, so that it can be reused for another
+        hand. Identity fields (name, seat, stacks, bounty) are kept and must be set again by the caller.
+        References to the table, the combo and the actions of the previous hand are dropped.
+        """
+        self.reset_street_status()
+        self.table = None
+        self.stack = self.init_stack
+        self.combo = None
+        self.folded = False
+        self.position = None
+        self.is_hero = False
+        self.hand_reward = 0
+        self.has_initiative = False
+        self.went_to_showdown = False
+        self.entered_hand = True
+        self.actions_history.reset()
+        self.hand_stats.reset()
+        self.hand_stats.general.seat = self.seat
+        self.hand_stats.general.bounty = self.bounty
+
     def pay(self, value: float):
         """
         Action of paying a value
@@ -434,11 +457,19 @@ class TablePlayer:
         for player in self.table.players:
             player.has_initiative = False
         self.has_initiative = True
+        self.table.initiative_seat = self.seat
+
+    def lose_initiative(self):
+        """Player loses initiative"""
+        self.has_initiative = False
+        if self.table.initiative_seat == self.seat:
+            self.table.initiative_seat = None
 
     def set_first_to_talk(self):
         """Sets the first to talk flag to True if player is the first to talk"""
-        if not any([player.flag_street_first_to_talk for player in self.table.players_in_game]):
+        if not self.table.first_to_talk_is_in_game:
             self.flag_street_first_to_talk = True
+            self.table.street_first_to_talk_seat = self.seat
 
     @property
     def is_in_position(self) -> bool:
@@ -475,8 +506,7 @@ class TablePlayer:
     @property
     def can_donk_bet(self) -> bool:
         """Boolean indicating if player can donk bet"""
-        return not self.has_initiative and self.can_open and any([player.has_initiative
-                                                                  for player in self.table.players_able_to_play])
+        return not self.has_initiative and self.can_open and self.table.initiative_player_can_play
 
     @property
     def can_raise(self) -> bool:
@@ -533,7 +563,7 @@ class TablePlayer:
     def is_facing_squeeze(self) -> bool:
         """Boolean indicating if player is facing a squeeze"""
         return (self.is_facing_3bet
-                and any([player.hand_stats.preflop.flag_squeeze for player in self.table.players_involved])
+                and self.table.squeeze_made
                 and self.table.street.is_preflop)
 
     @property
@@ -541,7 +571,7 @@ class TablePlayer:
         """Boolean indicating if player is facing a steal"""
         return (
                 self.is_facing_2bet
-                and any([player.hand_stats.preflop.flag_steal_attempt for player in self.table.players_involved])
+                and self.table.steal_attempted
                 and self.table.street.is_preflop)
 
     @property
@@ -552,12 +582,12 @@ class TablePlayer:
     @property
     def is_facing_cbet(self) -> bool:
         """Boolean indicating if player is facing a cbet"""
-        return self.is_facing_1bet and any([player.flag_street_cbet for player in self.table.players_involved])
+        return self.is_facing_1bet and self.table.street_cbet_made
 
     @property
     def is_facing_donk_bet(self) -> bool:
         """Boolean indicating if player is facing a donk bet"""
-        return self.is_facing_1bet and any([player.flag_street_donk_bet for player in self.table.players_involved])
+        return self.is_facing_1bet and self.table.street_donk_bet_made
 
     @property
     def is_facing_covering_bet(self) -> bool:
@@ -567,4 +597,4 @@ class TablePlayer:
     @property
     def is_facing_all_in(self) -> bool:
         """Boolean indicating if player is facing an all-in"""
-        return any([player.flag_street_went_all_in for player in self.table.players_involved])
+        return self.to_call > 0 and self.table.street_all_in_made
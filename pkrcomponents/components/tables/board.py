@@ -45,7 +45,7 @@ class Board:
             return cls(flop=Flop(*cards[:3]), turn=Card(cards[3]), river=Card(cards[4]))
 
     def __len__(self):
-        return 5 - self.cards.isna().sum()
+        return len(self.cards_list)
 
     def __eq__(self, other):
         return self.flop == other.flop and self.turn == other.turn and self.river == other.river
@@ -62,6 +62,14 @@ class Board:
             name="cards"
         ).fillna(value=np.nan)
 
+    @property
+    def cards_list(self) -> list:
+        """
+        Returns:
+            list: The cards on the board, without the missing ones
+        """
+        return [card for card in self.flop.cards + [self.turn, self.river] if card is not None]
+
     @property
     def len(self):
         """
@@ -78,17 +86,18 @@ class Board:
             card (str, Card): The card to add to the board
         """
         card = Card(card)
-        if len(self) == 5:
+        cards = self.cards_list
+        if len(cards) == 5:
             raise ValueError("Board is already full with 5 cards")
-        if self.cards.isin([card]).any():
+        if card in cards:
             raise ValueError("A same card cannot be put in the board twice or more")
-        if len(self) == 0:
+        if len(cards) == 0:
             self.flop.first_card = card
-        elif len(self) == 1:
+        elif len(cards) == 1:
             self.flop.second_card = card
-        elif len(self) == 2:
+        elif len(cards) == 2:
             self.flop.third_card = card
-        elif len(self) == 3:
+        elif len(cards) == 3:
             self.turn = card
         else:
             self.river = card
@@ -11,7 +11,7 @@ from pkrcomponents.components.tables.pot import Pot
 from pkrcomponents.components.tournaments.tournament import Level, Tournament
 from pkrcomponents.components.cards.evaluator import Evaluator
 from pkrcomponents.components.utils.converters import convert_to_street
-from pkrcomponents.components.utils.exceptions import CannotParseWinnersError
+from pkrcomponents.components.utils.exceptions import CannotParseWinnersError, NotFinalTableError
 
 
 @define(repr=False)
@@ -31,6 +31,7 @@ class Table:
         hand_id(str): The ID of the hand
         hand_date(datetime): The date of the hand
         hero_combo(Combo): The combo of the hero
+        initiative_seat(int): The seat of the player who has the initiative, if any
         is_mtt(bool): Whether the table is a tournament
         is_opened(bool): Whether the table is opened
         level(Level): The level of the table
@@ -40,7 +41,13 @@ class Table:
         pot(Pot): The pot of the table
         rewards_table (list): The rewards table
         seat_playing(int): The seat of the player currently playing
+        squeeze_made(bool): Whether a player squeezed preflop
+        steal_attempted(bool): Whether a player attempted to steal preflop
         street(Street): The current street of the table
+        street_all_in_made(bool): Whether a bet or a raise put a player all-in on the current street
+        street_cbet_made(bool): Whether a player made a cbet on the current street
+        street_donk_bet_made(bool): Whether a player made a donk bet on the current street
+        street_first_to_talk_seat(int): The seat of the last player flagged as first to talk on the current street
         tournament(Tournament): The tournament associated with the table
 
     Methods:
@@ -81,6 +88,13 @@ class Table:
     tournament = field(default=None, validator=optional(instance_of(Tournament)))
     total_buy_in = field(default=0, validator=[instance_of(float), ge(0)], converter=float)
     rewards_table = field(default=[], validator=instance_of(list))
+    squeeze_made = field(default=False, validator=instance_of(bool))
+    steal_attempted = field(default=False, validator=instance_of(bool))
+    street_all_in_made = field(default=False, validator=instance_of(bool))
+    street_cbet_made = field(default=False, validator=instance_of(bool))
+    street_donk_bet_made = field(default=False, validator=instance_of(bool))
+    street_first_to_talk_seat = field(default=None, validator=optional(instance_of(int)))
+    initiative_seat = field(default=None, validator=optional(instance_of(int)))
 
     def __attrs_post_init__(self):
         self.deck.shuffle()
@@ -462,6 +476,17 @@ class Table:
         """Returns the average stack in big blinds"""
         return round(self.average_stack/self.level.bb, 2)
 
+    def icm_equities(self, **kwargs) -> dict:
+        """
+        Returns the ICM equity of each player on the table, from their stacks at the beginning of the hand. The payouts
+        are shared between the seated players only, so the table must be the final table of the tournament.
+        """
+        players = list(self.players)
+        if self.tournament.players_remaining > len(players):
+            raise NotFinalTableError(self.tournament.players_remaining, len(players))
+        equities = self.tournament.icm_equities([pl.init_stack for pl in players], **kwargs)
+        return {pl.name: float(equity) for pl, equity in zip(players, equities)}
+
     @property
     def estimated_players_remaining(self) -> int:
         """Returns the estimated number of players remaining in the tournament"""
@@ -495,6 +520,7 @@ class Table:
         self.cnt_bets = 0
         self.cnt_calls = 0
         self.cnt_cold_calls = 0
+        self.reset_street_facts()
         self.update_min_bet(self.level.bb)
         try:
             self.seat_playing = self.players_in_game[0].seat
@@ -506,6 +532,34 @@ class Table:
             # raise IndexError
             pass
 
+    def reset_street_facts(self):
+        """Reset the facts about the actions made on the current street"""
+        self.street_all_in_made = False
+        self.street_cbet_made = False
+        self.street_donk_bet_made = False
+        self.street_first_to_talk_seat = None
+
+    def reset_hand_facts(self):
+        """Reset the facts about the actions made preflop"""
+        self.squeeze_made = False
+        self.steal_attempted = False
+
+    @property
+    def initiative_player_can_play(self) -> bool:
+        """Returns True if the player who has the initiative can still play in this street"""
+        if self.initiative_seat is None:
+            return False
+        player = self.players.seat_dict.get(self.initiative_seat)
+        return player is not None and player.can_play
+
+    @property
+    def first_to_talk_is_in_game(self) -> bool:
+        """Returns True if the player flagged as first to talk on the current street is still in the game"""
+        if self.street_first_to_talk_seat is None:
+            return False
+        player = self.players.seat_dict.get(self.street_first_to_talk_seat)
+        return player is not None and player.in_game
+
     @property
     def current_player(self):
         """Returns the player currently playing"""
@@ -613,9 +667,42 @@ class Table:
         self.board.reset()
         self.players.hand_reset()
         self.reset_postings()
+        self.reset_street_facts()
+        self.reset_hand_facts()
         self.hand_has_started = False
         self.rewards_table = []
 
+    def recycle(self):
+        """
+        Resets the table in place to the state of a newly created table, so that it can be reused for another hand.
+        Players are removed from the table but not reset; the level is kept as it is always set before a hand starts.
+        """
+        self.board.reset()
+        self.cnt_bets = 0
+        self.cnt_calls = 0
+        self.cnt_cold_calls = 0
+        self.cnt_limps = 0
+        self.deck.reset()
+        self.hand_has_started = False
+        self.hand_id = None
+        self.hero_combo = None
+        self.is_mtt = False
+        self.is_opened = False
+        self.max_players = 6
+        self.min_bet = 0
+        self.players.clear()
+        self.postings.clear()
+        self.pot.reset()
+        self.seat_playing = 0
+        self.hand_date = None
+        self.street = None
+        self.tournament = None
+        self.total_buy_in = 0
+        self.rewards_table.clear()
+        self.reset_street_facts()
+        self.reset_hand_facts()
+        self.initiative_seat = None
+
     def advance_to_next_hand(self):
         """Advance to the next hand"""
         self.hand_reset()
@@ -0,0 +1,114 @@
+"""This module contains the TablePool class, which recycles a table and its players across hands."""
+from pkrcomponents.components.players.table_player import TablePlayer
+from pkrcomponents.components.tables.table import Table
+from pkrcomponents.components.utils.exceptions import PoolLeakError
+
+
+class TablePool:
+    """
+    This class recycles a Table and its TablePlayers across hands, instead of building new objects for each hand.
+
+    Reset contract: the table returned by acquire_table() and the players returned by acquire_player() are only valid
+    until the next call to acquire_table() or release(). At that point, the table is reset in place and every player
+    acquired since the last release is reset and given back to the pool, so callers must not keep references to them.
+
+    Attributes:
+        table (Table): The table recycled by the pool
+        free_players (list): The players available to be acquired
+        players_in_use (list): The players acquired since the last release
+        cnt_created_players (int): The number of players created by the pool
+        check_leaks_on_release (bool): Whether to check the pool for leaks each time it is released
+
+    Methods:
+        acquire_table(): Releases the pool and returns the reset table
+        acquire_player(name, seat, init_stack, bounty, entered_hand): Returns a player with the given identity
+        release(): Resets the table and gives every player in use back to the pool
+        check_leaks(): Raises a PoolLeakError if the released objects still hold state from a previous hand
+    """
+
+    def __init__(self, check_leaks_on_release: bool = False):
+        self.table = Table()
+        self.free_players = []
+        self.players_in_use = []
+        self.cnt_created_players = 0
+        self.check_leaks_on_release = check_leaks_on_release
+
+    def __repr__(self):
+        return (f"TablePool(free_players={len(self.free_players)}, players_in_use={len(self.players_in_use)}, "
+                f"cnt_created_players={self.cnt_created_players})")
+
+    def acquire_table(self) -> Table:
+        """
+        Releases the pool and returns the reset table
+
+        Returns:
+            table (Table): The table, in the same state as a newly created table
+        """
+        self.release()
+        return self.table
+
+    def acquire_player(self, name: str, seat: int, init_stack: float = 0, bounty: float = 0,
+                       entered_hand: bool = True) -> TablePlayer:
+        """
+        Returns a recycled player with the given identity, or a new one if no player is available
+
+        Args:
+            name (str): The name of the player
+            seat (int): The seat number of the player
+            init_stack (float): The initial stack of the player
+            bounty (float): The bounty of the player
+            entered_hand (bool): Whether the player entered the hand
+
+        Returns:
+            player (TablePlayer): The player, in the same state as a newly created player
+        """
+        if self.free_players:
+            player = self.free_players.pop()
+            player.name = name
+            player.seat = seat
+            player.init_stack = init_stack
+            player.stack = player.init_stack
+            player.bounty = bounty
+            player.entered_hand = entered_hand
+            player.hand_stats.general.seat = player.seat
+            player.hand_stats.general.bounty = player.bounty
+        else:
+            player = TablePlayer(name=name, seat=seat, init_stack=init_stack, bounty=bounty,
+                                 entered_hand=entered_hand)
+            self.cnt_created_players += 1
+        self.players_in_use.append(player)
+        return player
+
+    def release(self):
+        """Resets the table and gives every player in use back to the pool"""
+        self.table.recycle()
+        for player in self.players_in_use:
+            player.recycle()
+        self.free_players.extend(self.players_in_use)
+        self.players_in_use.clear()
+        if self.check_leaks_on_release:
+            self.check_leaks()
+
+    def check_leaks(self):
+        """
+        Checks that the released table and players do not hold state or references from a previous hand
+
+        Raises:
+            PoolLeakError: If an object of the pool was not properly reset or was lost
+        """
+        table = self.table
+        if table.players.len or table.postings or table.rewards_table:
+            raise PoolLeakError("The table still holds players, postings or rewards from a previous hand")
+        if table.pot.value or table.board.len or table.deck.len != 52 or table.hand_id is not None:
+            raise PoolLeakError("The table still holds the pot, board or deck of a previous hand")
+        for player in self.free_players:
+            actions_history = player.actions_history
+            if player.table is not None or player.combo is not None:
+                raise PoolLeakError(f"Player {player.name} still references a table or a combo")
+            sequences = (actions_history.preflop, actions_history.flop, actions_history.turn, actions_history.river)
+            if any(sequence.actions for sequence in sequences) or len(actions_history.log):
+                raise PoolLeakError(f"Player {player.name} still holds actions from a previous hand")
+        if len({id(player) for player in self.free_players}) != len(self.free_players):
+            raise PoolLeakError("A player was released twice to the pool")
+        if self.cnt_created_players != len(self.free_players) + len(self.players_in_use):
+            raise PoolLeakError("A player created by the pool was lost")
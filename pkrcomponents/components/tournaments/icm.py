@@ -0,0 +1,166 @@
+"""This module computes the Independent Chip Model (ICM) equities of the players of a tournament"""
+from functools import lru_cache
+
+import numpy as np
+
+EXACT_MAX_PLAYERS = 12
+DEFAULT_NB_SAMPLES = 20000
+MONTE_CARLO_MAX_DRAWS = 1 << 20
+
+
+def get_rewards(payouts, nb_players: int) -> np.ndarray:
+    """
+    Returns the reward of each finish rank among the remaining players
+
+    Args:
+        payouts (Payouts): The payouts of the tournament, or a sequence of the rewards of ranks 1, 2, ...
+        nb_players (int): The number of players remaining
+
+    Returns:
+        rewards (np.ndarray): The reward of ranks 1 to nb_players
+    """
+    if hasattr(payouts, "get_rewards"):
+        return payouts.get_rewards(np.arange(1, nb_players + 1))
+    rewards = np.zeros(nb_players)
+    paid = np.asarray(payouts, dtype=float)[:nb_players]
+    rewards[:len(paid)] = paid
+    return rewards
+
+
+@lru_cache(maxsize=None)
+def get_layers(nb_players: int, nb_places: int) -> tuple:
+    """
+    Returns the subsets of players taking the first places, place by place, for the Malmuth-Harville recursion.
+    The subsets of k players are linked to their k parents, the subsets without one of their players, and to that
+    player.
+
+    Args:
+        nb_players (int): The number of players
+        nb_places (int): The number of places to evaluate
+
+    Returns:
+        layers (tuple): For each place k, the (parents_players, parents, players, players_matrix) arrays: the players of
+        each subset of k - 1 players as a 0/1 matrix, the parents of each subset of k players, the player added to each
+        parent and its one-hot matrix
+    """
+    subsets_by_size = [[] for _ in range(nb_players + 1)]
+    for mask in range(1 << nb_players):
+        subsets_by_size[mask.bit_count()].append(mask)
+    index = {mask: position for subsets in subsets_by_size for position, mask in enumerate(subsets)}
+    layers = []
+    for size in range(1, nb_places + 1):
+        subsets = subsets_by_size[size]
+        players = [[player for player in range(nb_players) if mask >> player & 1] for mask in subsets]
+        parents = np.array([[index[mask ^ (1 << player)] for player in row] for mask, row in zip(subsets, players)],
+                           dtype=np.intp)
+        players = np.array(players, dtype=np.intp)
+        parent_masks = np.array(subsets_by_size[size - 1], dtype=np.int64)
+        parents_players = ((parent_masks[:, None] >> np.arange(nb_players)) & 1).astype(float)
+        players_matrix = np.eye(nb_players)[players.ravel()]
+        layers.append((parents_players, parents, players, players_matrix))
+    return tuple(layers)
+
+
+def exact_equities(stacks: np.ndarray, rewards: np.ndarray) -> np.ndarray:
+    """
+    Returns the ICM equities with the exact Malmuth-Harville model, for many stack vectors at once. The probability
+    that a subset of players takes the first places does not depend on their order, so it is computed once per
+    subset, place by place, instead of once per finish order.
+
+    Args:
+        stacks (np.ndarray): The stacks, shaped as (nb_tables, nb_players)
+        rewards (np.ndarray): The reward of each finish rank
+
+    Returns:
+        equities (np.ndarray): The equity of each player, shaped as stacks
+    """
+    nb_tables, nb_players = stacks.shape
+    paid = np.flatnonzero(rewards)
+    nb_places = int(paid[-1]) + 1 if len(paid) else 0
+    equities = np.zeros_like(stacks)
+    total = stacks.sum(axis=1, keepdims=True)
+    probabilities = np.ones((nb_tables, 1))
+    for place, (parents_players, parents, players, players_matrix) in enumerate(get_layers(nb_players, nb_places)):
+        remaining = total - stacks @ parents_players.T
+        terms = probabilities[:, parents] * stacks[:, players] / remaining[:, parents]
+        equities += rewards[place] * (terms.reshape(nb_tables, -1) @ players_matrix)
+        probabilities = terms.sum(axis=2)
+    return equities
+
+
+def monte_carlo_equities(stacks: np.ndarray, rewards: np.ndarray, nb_samples: int = DEFAULT_NB_SAMPLES,
+                         seed: int = None) -> np.ndarray:
+    """
+    Returns the ICM equities estimated by sampling finish orders, for many stack vectors at once. Under the
+    Malmuth-Harville model, the finish order is the order of independent exponential draws divided by the stacks,
+    so each sample costs one sort. The draws of the stack vectors are made, sorted and accumulated together, by
+    batches of at most MONTE_CARLO_MAX_DRAWS draws to bound the memory. The standard error is below
+    max(rewards) / sqrt(nb_samples).
+
+    Args:
+        stacks (np.ndarray): The stacks, shaped as (nb_tables, nb_players)
+        rewards (np.ndarray): The reward of each finish rank
+        nb_samples (int): The number of finish orders sampled per stack vector
+        seed (int): The seed of the random generator
+
+    Returns:
+        equities (np.ndarray): The estimated equity of each player, shaped as stacks
+    """
+    generator = np.random.default_rng(seed)
+    nb_tables, nb_players = stacks.shape
+    paid = np.flatnonzero(rewards)
+    nb_places = int(paid[-1]) + 1 if len(paid) else 0
+    equities = np.zeros_like(stacks)
+    if not nb_places:
+        return equities
+    batch_size = max(1, MONTE_CARLO_MAX_DRAWS // (nb_samples * nb_players))
+    for start in range(0, nb_tables, batch_size):
+        batch_stacks = stacks[start:start + batch_size]
+        batch_tables = len(batch_stacks)
+        keys = generator.standard_exponential((batch_tables, nb_samples, nb_players)) / batch_stacks[:, None, :]
+        keys = keys.reshape(batch_tables * nb_samples, nb_players)
+        if nb_places < nb_players:
+            rows = np.arange(len(keys))[:, None]
+            top = np.argpartition(keys, nb_places - 1, axis=1)[:, :nb_places]
+            order = top[rows, np.argsort(keys[rows, top], axis=1)]
+        else:
+            order = np.argsort(keys, axis=1)
+        players = order + np.repeat(np.arange(batch_tables) * nb_players, nb_samples)[:, None]
+        weights = np.broadcast_to(rewards[:nb_places], players.shape)
+        totals = np.bincount(players.ravel(), weights=weights.ravel(), minlength=batch_tables * nb_players)
+        equities[start:start + batch_tables] = totals.reshape(batch_tables, nb_players) / nb_samples
+    return equities
+
+
+def icm_equities(stacks, payouts, method: str = "auto", nb_samples: int = DEFAULT_NB_SAMPLES,
+                 seed: int = None) -> np.ndarray:
+    """
+    Returns the ICM equity of each player, the expected reward given the stacks
+
+    Args:
+        stacks: The positive stacks of the remaining players, or many stack vectors shaped as (nb_tables, nb_players)
+        payouts (Payouts): The payouts of the tournament, or a sequence of the rewards of ranks 1, 2, ...
+        method (str): "exact", "monte_carlo", or "auto" to use the exact model up to EXACT_MAX_PLAYERS players
+        nb_samples (int): The number of samples of the Monte Carlo method
+        seed (int): The seed of the Monte Carlo method
+
+    Returns:
+        equities (np.ndarray): The equity of each player, shaped as stacks
+    """
+    stacks = np.asarray(stacks, dtype=float)
+    single = stacks.ndim == 1
+    stacks = np.atleast_2d(stacks)
+    if stacks.ndim != 2:
+        raise ValueError("Stacks must be a vector or a matrix of stack vectors")
+    if (stacks <= 0).any():
+        raise ValueError("Stacks must be positive, busted players must be removed")
+    rewards = get_rewards(payouts, stacks.shape[1])
+    if method == "auto":
+        method = "exact" if stacks.shape[1] <= EXACT_MAX_PLAYERS else "monte_carlo"
+    if method == "exact":
+        equities = exact_equities(stacks, rewards)
+    elif method == "monte_carlo":
+        equities = monte_carlo_equities(stacks, rewards, nb_samples=nb_samples, seed=seed)
+    else:
+        raise ValueError(f"Unknown ICM method: {method}")
+    return equities[0] if single else equities
@@ -1,6 +1,293 @@
 """ This module contains the class LevelsStructure that represents the structure of the levels of a tournament."""
+from bisect import bisect_right
+from datetime import datetime
+
+import numpy as np
+from attrs import define
+
+from pkrcomponents.components.tournaments.level import Level
+from pkrcomponents.components.utils.common import invalidates_index
+
+
+@define(frozen=True)
+class LevelsIndex:
+    """
+    The levels sorted by value, with the arrays used by the lookups
+
+    Attributes:
+        levels (list): The levels, sorted by value
+        by_value (dict): The level of each value
+        ends (list): The elapsed time, in minutes, at the end of each level, None if a duration is unknown
+        bb (np.ndarray): The big blind of each level
+        sb (np.ndarray): The small blind of each level
+        ante (np.ndarray): The ante of each level
+    """
+    levels: list
+    by_value: dict
+    ends: list
+    bb: np.ndarray
+    sb: np.ndarray
+    ante: np.ndarray
+
+    @classmethod
+    def from_structure(cls, structure: "LevelsStructure") -> "LevelsIndex":
+        levels = sorted(structure, key=lambda level: level.value)
+        durations = [structure.get_duration(level.value) for level in levels]
+        ends = None if None in durations else np.cumsum(durations, dtype=float).tolist()
+        return cls(levels=levels, by_value={level.value: level for level in levels}, ends=ends,
+                   bb=np.array([level.bb for level in levels], dtype=float),
+                   sb=np.array([level.sb for level in levels], dtype=float),
+                   ante=np.array([level.ante for level in levels], dtype=float))
 
 
 class LevelsStructure(list):
-    # TODO: Implement this class that represents the structure of the levels of a tournament
-    pass
+    """
+    This class represents the structure of the levels of a tournament, a list of levels with their durations.
+    Lookups use an index of the levels sorted by value, built on the first lookup and rebuilt after the list is
+    modified, so that the level played after some time is found by bisection and the blinds of every level are
+    available as arrays.
+
+    Attributes:
+        level_duration (float): The duration of the levels, in minutes, or None if unknown
+        durations (dict): The durations of the levels, in minutes, overriding level_duration, by level value
+
+    Methods:
+        add_level(level: Level, duration: float): Add a level to the structure
+        get_level(value: int) -> Level: Get the level of a given value
+        get_or_add_level(value: int, bb: float, ante: float, sb: float) -> Level: Get a level, added if unknown
+        level_at(elapsed: float) -> Level: Get the level played after some time
+        level_at_date(date: datetime, start_date: datetime) -> Level: Get the level played at some date
+        level_indexes_at(elapsed) -> np.ndarray: Get the index of the level played after many times
+        cost_per_round(nb_players: int) -> np.ndarray: Get the cost of a round for a player at each level
+        refresh_index(): Rebuild the lookup index
+    """
+    _index = None
+
+    append = invalidates_index(list.append)
+    extend = invalidates_index(list.extend)
+    insert = invalidates_index(list.insert)
+    remove = invalidates_index(list.remove)
+    pop = invalidates_index(list.pop)
+    clear = invalidates_index(list.clear)
+    sort = invalidates_index(list.sort)
+    reverse = invalidates_index(list.reverse)
+    __setitem__ = invalidates_index(list.__setitem__)
+    __delitem__ = invalidates_index(list.__delitem__)
+    __iadd__ = invalidates_index(list.__iadd__)
+    __imul__ = invalidates_index(list.__imul__)
+
+    def __init__(self, levels=(), level_duration: float = None, durations: dict = None):
+        super().__init__(levels)
+        self.level_duration = level_duration
+        self.durations = {} if durations is None else dict(durations)
+
+    @classmethod
+    def from_dicts(cls, levels_dicts: list, level_duration: float = None) -> "LevelsStructure":
+        """
+        A method to create a levels structure from the levels of a summary
+
+        Args:
+            levels_dicts (list): The levels, as dictionaries with value, bb, sb, ante and optionally duration keys
+            level_duration (float): The duration of the levels without a duration key, in minutes
+
+        Returns:
+            LevelsStructure: The levels structure
+        """
+        structure = cls(level_duration=level_duration)
+        for level_dict in levels_dicts or ():
+            level = Level(value=level_dict.get("value"), bb=level_dict.get("bb"),
+                          sb=level_dict.get("sb", level_dict.get("bb") / 2), ante=level_dict.get("ante"))
+            structure.add_level(level, duration=level_dict.get("duration"))
+        return structure
+
+    @property
+    def levels_index(self) -> LevelsIndex:
+        """
+        A property to get the lookup index of the levels, built when needed
+        """
+        if self._index is None:
+            self._index = LevelsIndex.from_structure(self)
+        return self._index
+
+    def refresh_index(self) -> None:
+        """
+        A method to rebuild the lookup index, after a level or a duration was modified in place
+        """
+        self._index = None
+
+    def add_level(self, level: Level, duration: float = None) -> None:
+        """
+        A method to add a level to the structure
+
+        Args:
+            level (Level): The level to add
+            duration (float): The duration of the level in minutes, level_duration if None
+        """
+        if duration is not None:
+            self.durations[level.value] = duration
+        self.append(level)
+
+    def get_duration(self, value: int) -> float:
+        """
+        A method to get the duration of a level
+
+        Args:
+            value (int): The value of the level
+
+        Returns:
+            float: The duration of the level in minutes, None if unknown
+        """
+        return self.durations.get(value, self.level_duration)
+
+    def get_level(self, value: int) -> Level:
+        """
+        A method to get the level of a given value
+
+        Args:
+            value (int): The value of the level
+
+        Returns:
+            Level: The level, None if the structure has no level of this value
+        """
+        return self.levels_index.by_value.get(value)
+
+    def get_known_level(self, value: int, bb: float, ante: float, sb: float = None) -> Level:
+        """
+        A method to get the level of a given value if the structure knows it with the same blinds
+
+        Args:
+            value (int): The value of the level
+            bb (float): The big blind of the level
+            ante (float): The ante of the level
+            sb (float): The small blind of the level, half the big blind if None
+
+        Returns:
+            Level: The level, None if the structure has no level of this value with these blinds
+        """
+        sb = bb / 2 if sb is None else sb
+        level = self.get_level(value)
+        if level is not None and level.bb == bb and level.ante == ante and level.sb == sb:
+            return level
+        return None
+
+    def get_or_add_level(self, value: int, bb: float, ante: float, sb: float = None) -> Level:
+        """
+        A method to get the level of a given value, so that hands of the same level share a single Level object.
+        The level is added to the structure if it has no level of this value, and a new level is returned without
+        being added if the known level has other blinds.
+
+        Args:
+            value (int): The value of the level
+            bb (float): The big blind of the level
+            ante (float): The ante of the level
+            sb (float): The small blind of the level, half the big blind if None
+
+        Returns:
+            Level: The level
+        """
+        known_level = self.get_known_level(value, bb, ante, sb)
+        if known_level is not None:
+            return known_level
+        sb = bb / 2 if sb is None else sb
+        new_level = Level(value=value, bb=bb, sb=sb, ante=ante)
+        if self.get_level(value) is None:
+            self.add_level(new_level)
+        return new_level
+
+    def level_index_at(self, elapsed: float) -> int:
+        """
+        A method to get the index of the level played after some time
+
+        Args:
+            elapsed (float): The time elapsed since the start of the tournament, in minutes
+
+        Returns:
+            int: The index of the level in the levels sorted by value, the last one after the end of the structure
+        """
+        index = self.levels_index
+        if index.ends is None:
+            raise ValueError("Cannot look a level up by time without the durations of the levels")
+        return min(bisect_right(index.ends, elapsed), len(index.levels) - 1)
+
+    def level_at(self, elapsed: float) -> Level:
+        """
+        A method to get the level played after some time
+
+        Args:
+            elapsed (float): The time elapsed since the start of the tournament, in minutes
+
+        Returns:
+            Level: The level played
+        """
+        return self.levels_index.levels[self.level_index_at(elapsed)]
+
+    def level_at_date(self, date: datetime, start_date: datetime) -> Level:
+        """
+        A method to get the level played at some date, like the date of a hand
+
+        Args:
+            date (datetime): The date
+            start_date (datetime): The start date of the tournament
+
+        Returns:
+            Level: The level played
+        """
+        return self.level_at((date - start_date).total_seconds() / 60)
+
+    def level_indexes_at(self, elapsed) -> np.ndarray:
+        """
+        A method to get the indexes of the levels played after many times at once
+
+        Args:
+            elapsed: The times elapsed since the start of the tournament in minutes, as an array or a sequence
+
+        Returns:
+            np.ndarray: The index of each level in the levels sorted by value
+        """
+        index = self.levels_index
+        if index.ends is None:
+            raise ValueError("Cannot look a level up by time without the durations of the levels")
+        positions = np.searchsorted(np.asarray(index.ends), np.asarray(elapsed, dtype=float), side="right")
+        return np.minimum(positions, len(index.levels) - 1)
+
+    @property
+    def starts(self) -> np.ndarray:
+        """
+        A property to get the elapsed time, in minutes, at the start of each level sorted by value
+        """
+        ends = self.levels_index.ends
+        if ends is None:
+            raise ValueError("The durations of the levels are unknown")
+        return np.concatenate(([0.0], ends[:-1]))
+
+    @property
+    def ends(self) -> np.ndarray:
+        """
+        A property to get the elapsed time, in minutes, at the end of each level sorted by value
+        """
+        ends = self.levels_index.ends
+        if ends is None:
+            raise ValueError("The durations of the levels are unknown")
+        return np.array(ends)
+
+    def cost_per_round(self, nb_players: int) -> np.ndarray:
+        """
+        A method to get the cost of a round for a player at each level sorted by value, as Table.cost_per_round
+
+        Args:
+            nb_players (int): The number of players on the table
+
+        Returns:
+            np.ndarray: The cost of a round at each level
+        """
+        index = self.levels_index
+        return index.bb * 1.5 + index.ante * nb_players
+
+    def to_json(self) -> list:
+        """
+        A method to get a json representation of the levels structure
+
+        Returns:
+            list: The json representation of each level, with its duration
+        """
+        return [{**level.to_json(), "duration": self.get_duration(level.value)} for level in self.levels_index.levels]
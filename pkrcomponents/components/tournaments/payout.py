@@ -1,6 +1,11 @@
+from bisect import bisect_left
+
+import numpy as np
 from attrs import define, field, asdict
 from attrs.validators import instance_of, ge
 
+from pkrcomponents.components.utils.common import invalidates_index
+
 
 @define
 class Payout:
@@ -37,9 +42,44 @@ class Payout:
         return asdict(self)
 
 
+@define(frozen=True)
+class PayoutsIndex:
+    """
+    The payouts sorted by tier, with the arrays used by the lookups
+
+    Attributes:
+        payouts (list): The payouts, sorted by tier
+        tiers (list): The sorted tiers
+        tiers_array (np.ndarray): The sorted tiers, as an array
+        rewards_array (np.ndarray): The rewards of the sorted payouts, followed by 0.0 for the ranks after the last tier
+        prize_pool (float): The total prize pool distributed via the payouts
+    """
+    payouts: list
+    tiers: list
+    tiers_array: np.ndarray
+    rewards_array: np.ndarray
+    prize_pool: float
+
+    @classmethod
+    def from_payouts(cls, payouts: list) -> "PayoutsIndex":
+        sorted_payouts = sorted(payouts, key=lambda payout: payout.tier)
+        tiers = [payout.tier for payout in sorted_payouts]
+        rewards = [payout.reward for payout in sorted_payouts]
+        prize_pool = 0.0
+        previous_tier = 0
+        for tier, reward in zip(tiers, rewards):
+            prize_pool += reward * (tier - previous_tier)
+            previous_tier = tier
+        return cls(payouts=sorted_payouts, tiers=tiers, tiers_array=np.array(tiers, dtype=np.int64),
+                   rewards_array=np.array(rewards + [0.0], dtype=float), prize_pool=prize_pool)
+
+
 class Payouts(list):
     """
-    This class represents a list of payouts in a poker tournament
+    This class represents a list of payouts in a poker tournament, a rank being paid the reward of the lowest tier
+    greater than or equal to it. Lookups use an index of the payouts sorted by tier, built on the first lookup and
+    rebuilt after the list is modified, so that a rank is looked up in O(log n) and the prize pool in O(1). A payout
+    modified in place is not seen by the index until the list is modified or refresh_index() is called.
 
     Methods:
         add_payout(payout: Payout): Add a payout to the list
@@ -47,8 +87,39 @@ class Payouts(list):
         get_payout(rank: int) -> Payout: Get the reward for a given finish rank
         closest_payout(rank: int) -> Payout: Get the closest payout to a given rank
         get_reward(rank: int) -> float: Get the reward for a given finish rank
+        get_rewards(ranks) -> np.ndarray: Get the rewards for an array of finish ranks
         get_prize_pool() -> float: Get the total prize pool distributed via the payouts
+        refresh_index(): Rebuild the lookup index
     """
+    _index = None
+
+    append = invalidates_index(list.append)
+    extend = invalidates_index(list.extend)
+    insert = invalidates_index(list.insert)
+    remove = invalidates_index(list.remove)
+    pop = invalidates_index(list.pop)
+    clear = invalidates_index(list.clear)
+    sort = invalidates_index(list.sort)
+    reverse = invalidates_index(list.reverse)
+    __setitem__ = invalidates_index(list.__setitem__)
+    __delitem__ = invalidates_index(list.__delitem__)
+    __iadd__ = invalidates_index(list.__iadd__)
+    __imul__ = invalidates_index(list.__imul__)
+
+    @property
+    def payouts_index(self) -> PayoutsIndex:
+        """
+        A property to get the lookup index of the payouts, built when needed
+        """
+        if self._index is None:
+            self._index = PayoutsIndex.from_payouts(self)
+        return self._index
+
+    def refresh_index(self) -> None:
+        """
+        A method to rebuild the lookup index, after a payout of the list was modified in place
+        """
+        self._index = None
 
     def add_payout(self, payout: Payout) -> None:
         """
@@ -80,9 +151,11 @@ class Payouts(list):
         Returns:
             Payout: The payout for the given rank
         """
-        for tier, reward in zip(self.tiers, self.rewards):
-            if tier >= rank:
-                return Payout(tier, reward)
+        index = self.payouts_index
+        position = bisect_left(index.tiers, rank)
+        if position < len(index.tiers):
+            payout = index.payouts[position]
+            return Payout(payout.tier, payout.reward)
         return Payout(0, 0.0)
 
     def closest_payout(self, rank: int) -> Payout:
@@ -95,10 +168,8 @@ class Payouts(list):
         Returns:
             Payout: The closest payout to the given rank
         """
-        i = 0
-        while i < len(self) and rank > self[i].tier:
-            i += 1
-        return self[i-1]
+        index = self.payouts_index
+        return index.payouts[bisect_left(index.tiers, rank) - 1]
 
     def get_reward(self, rank: int) -> float:
         """
@@ -110,7 +181,24 @@ class Payouts(list):
         Returns:
             float: The reward for the given rank
         """
-        return self.get_payout(rank).reward
+        index = self.payouts_index
+        position = bisect_left(index.tiers, rank)
+        if position < len(index.tiers):
+            return index.payouts[position].reward
+        return 0.0
+
+    def get_rewards(self, ranks) -> np.ndarray:
+        """
+        A method to get the rewards for many finish ranks at once
+
+        Args:
+            ranks: The ranks of the players, as an array or a sequence
+
+        Returns:
+            np.ndarray: The reward of each rank
+        """
+        index = self.payouts_index
+        return index.rewards_array[np.searchsorted(index.tiers_array, np.asarray(ranks), side="left")]
 
     def get_prize_pool(self) -> float:
         """
@@ -119,7 +207,9 @@ class Payouts(list):
         Returns:
             float: The total prize pool distributed via the payouts
         """
-        return sum(self.get_reward(rank) for rank in range(1, max(self.tiers)+1))
+        if not self:
+            raise ValueError("Cannot get the prize pool of empty payouts")
+        return self.payouts_index.prize_pool
 
     @property
     def tiers(self) -> list:
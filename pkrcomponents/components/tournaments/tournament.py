@@ -3,7 +3,9 @@ from attrs.validators import instance_of, gt, ge, optional
 from datetime import datetime
 from pkrcomponents.components.utils.constants import MoneyType
 from pkrcomponents.components.tournaments.buy_in import BuyIn
+from pkrcomponents.components.tournaments.icm import DEFAULT_NB_SAMPLES, icm_equities
 from pkrcomponents.components.tournaments.level import Level
+from pkrcomponents.components.tournaments.levels_structure import LevelsStructure
 from pkrcomponents.components.tournaments.payout import Payouts
 from pkrcomponents.components.tournaments.speed import TourSpeed
 from pkrcomponents.components.tournaments.tournament_type import TournamentType
@@ -23,6 +25,7 @@ class Tournament:
         is_ko(bool): Whether the tournament is a knockout tournament
         money_type(MoneyType): The type of money used in the tournament
         level(Level): The current level of the tournament
+        levels_structure(LevelsStructure): The levels of the tournament
         payouts(Payouts): The payouts of the tournament
         total_players(int): The total number of players in the tournament
         players_remaining(int): The number of players remaining in the tournament
@@ -40,6 +43,7 @@ class Tournament:
     is_ko = field(default=True, validator=[instance_of(bool)])
     money_type = field(default=MoneyType.REAL, validator=[instance_of(MoneyType)], converter=MoneyType)
     level = field(default=Factory(Level), validator=optional(instance_of(Level)))
+    levels_structure = field(default=Factory(LevelsStructure), validator=[instance_of(LevelsStructure)])
     payouts = field(default=Factory(Payouts), validator=[instance_of(Payouts)])
     total_players = field(default=2, validator=[gt(1), instance_of(int)])
     players_remaining = field(default=2, validator=validate_players_remaining)
@@ -95,6 +99,27 @@ class Tournament:
         """
         return min(round(self.total_chips / average_stack), self.total_players)
 
+    def icm_equities(self, stacks, method: str = "auto", nb_samples: int = DEFAULT_NB_SAMPLES, seed: int = None):
+        """
+        Returns the ICM equity of each remaining player given their stacks and the payouts of the tournament
+
+        Args:
+            stacks: The stacks of the remaining players, or many stack vectors shaped as (nb_tables, nb_players)
+            method (str): "exact", "monte_carlo" or "auto"
+            nb_samples (int): The number of samples of the Monte Carlo method
+            seed (int): The seed of the Monte Carlo method
+
+        Returns:
+            equities (np.ndarray): The equity of each player, shaped as stacks
+        """
+        return icm_equities(stacks, self.payouts, method=method, nb_samples=nb_samples, seed=seed)
+
+    def level_at_date(self, date: datetime) -> Level:
+        """
+        Returns the level played at some date, like the date of a hand, from the levels structure
+        """
+        return self.levels_structure.level_at_date(date, self.start_date)
+
     def set_level(self, level: Level):
         self.level = level
 
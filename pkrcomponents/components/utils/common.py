@@ -82,6 +82,20 @@ class PokerEnum(_OrderableMixin, enum.Enum, metaclass=_PokerEnumMeta):
         return self._value_[0]
 
 
+def invalidates_index(method):
+    """
+    Wraps a list method modifying a list subclass so that its lookup index is rebuilt on the next lookup. The index is
+    also dropped after the modification, in case it was rebuilt from the list before it was modified.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._index = None
+        result = method(self, *args, **kwargs)
+        self._index = None
+        return result
+    return wrapper
+
+
 class ReprMixin:
     def __repr__(self):
         return f"{self.__class__.__name__}('{self}')"
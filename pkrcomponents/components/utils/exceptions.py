@@ -86,3 +86,18 @@ class PlayerNotOnTableError(Exception):
     def __init__(self, name_item):
         self.message = f"Player {name_item} is not on the table"
         super().__init__(self.message)
+
+
+class NotFinalTableError(Exception):
+    """Raised when ICM equities are requested at a table which is not the final table of the tournament"""
+    def __init__(self, players_remaining, nb_players):
+        self.message = (f"ICM equities need the final table: {players_remaining} players remain in the tournament, "
+                        f"{nb_players} are seated")
+        super().__init__(self.message)
+
+
+class PoolLeakError(Exception):
+    """Raised when an object released to a pool still holds state or references from a previous hand"""
+    def __init__(self, message="An object released to the pool was not properly reset"):
+        self.message = message
+        super().__init__(self.message)
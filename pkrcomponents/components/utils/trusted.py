@@ -0,0 +1,210 @@
+"""This module implements the trusted mode, in which the hot attrs classes skip their validators"""
+import threading
+import types
+from contextlib import contextmanager
+
+import attrs
+
+
+class TrustedState(threading.local):
+    """
+    The number of nested entries in the trusted mode of the current thread
+    """
+    depth = 0
+
+
+_state = TrustedState()
+_lock = threading.Lock()
+_nb_entries = 0
+_original_methods = {}
+_dispatchers = {}
+_compiled_inits = {}
+NO_VALIDATORS_CONFIG = types.SimpleNamespace(_run_validators=False)
+
+
+def get_hot_classes() -> list:
+    """
+    Returns the attrs classes whose attributes are set while a hand is replayed.
+    The imports are local to avoid circular imports with the components modules.
+
+    Returns:
+        hot_classes (list): The attrs classes patched by the trusted mode
+    """
+    from pkrcomponents.components.actions.action import Action
+    from pkrcomponents.components.actions.actions_history import ActionsHistory
+    from pkrcomponents.components.actions.actions_sequence import ActionsSequence
+    from pkrcomponents.components.actions.posting import Posting
+    from pkrcomponents.components.players.player_hand_stats import PlayerHandStats
+    from pkrcomponents.components.players.street_hand_stats.general import GeneralPlayerHandStats
+    from pkrcomponents.components.players.street_hand_stats.postflop import PostflopPlayerHandStats
+    from pkrcomponents.components.players.street_hand_stats.preflop import PreflopPlayerHandStats
+    from pkrcomponents.components.players.table_player import TablePlayer
+    from pkrcomponents.components.tables.board import Board
+    from pkrcomponents.components.tables.pot import Pot
+    from pkrcomponents.components.tables.table import Table
+    from pkrcomponents.components.tournaments.level import Level
+    from pkrcomponents.components.tournaments.tournament import Tournament
+    return [Action, ActionsHistory, ActionsSequence, Board, GeneralPlayerHandStats, Level, PlayerHandStats, Posting,
+            PostflopPlayerHandStats, Pot, PreflopPlayerHandStats, Table, TablePlayer, Tournament]
+
+
+def get_subclasses(cls: type) -> list:
+    """
+    Returns a class and all its subclasses, like the action classes of Action
+
+    Args:
+        cls (type): The class
+
+    Returns:
+        classes (list): The class followed by its subclasses
+    """
+    classes = [cls]
+    for subclass in cls.__subclasses__():
+        classes.extend(get_subclasses(subclass))
+    return classes
+
+
+def compile_init(cls: type):
+    """
+    Builds an __init__ for an attrs class which does not run the validators of the fields. The generated __init__ of
+    attrs only runs them if the _config module in its globals allows it, so the same code is rebound to globals where
+    the validators are disabled, without disabling them for the rest of the process. This relies on the code generated
+    by attrs, so its version is pinned in the requirements and the tests check that the hot classes still get a
+    validation-free __init__.
+
+    Args:
+        cls (type): The attrs class
+
+    Returns:
+        init_function (function): The validation-free __init__, None if the __init__ of the class runs no validator
+    """
+    if cls in _compiled_inits:
+        return _compiled_inits[cls]
+    init = cls.__dict__.get("__init__")
+    if init is None or "_config" not in getattr(init, "__globals__", {}):
+        _compiled_inits[cls] = None
+        return None
+    init_globals = dict(init.__globals__, _config=NO_VALIDATORS_CONFIG)
+    trusted_init = types.FunctionType(init.__code__, init_globals, init.__name__, init.__defaults__, init.__closure__)
+    trusted_init.__kwdefaults__ = init.__kwdefaults__
+    _compiled_inits[cls] = trusted_init
+    return trusted_init
+
+
+def dispatch_setattr(cls: type, original_setattr):
+    """
+    Returns a __setattr__ which only applies the converters of the fields in the threads in trusted mode, and calls
+    the original one in the other threads
+    """
+    state = _state
+    get_converter = {attribute.name: attribute.converter for attribute in attrs.fields(cls)
+                     if attribute.converter is not None}.get
+    set_attribute = object.__setattr__
+
+    def __setattr__(self, name, value):
+        if state.depth:
+            converter = get_converter(name)
+            set_attribute(self, name, value if converter is None else converter(value))
+        else:
+            original_setattr(self, name, value)
+    return __setattr__
+
+
+def dispatch_init(original_init, trusted_init):
+    """
+    Returns an __init__ calling the validation-free one in the threads in trusted mode, and the original one in the
+    other threads
+    """
+    state = _state
+
+    def __init__(self, *args, **kwargs):
+        if state.depth:
+            trusted_init(self, *args, **kwargs)
+        else:
+            original_init(self, *args, **kwargs)
+    return __init__
+
+
+def get_dispatchers() -> dict:
+    """
+    Returns the dispatching methods of the hot classes and of their subclasses, built once
+
+    Returns:
+        dispatchers (dict): The dispatching method of each (class, method name)
+    """
+    if not _dispatchers:
+        for hot_class in get_hot_classes():
+            for cls in get_subclasses(hot_class):
+                if "__setattr__" in cls.__dict__:
+                    original_setattr = cls.__dict__["__setattr__"]
+                    _original_methods[(cls, "__setattr__")] = original_setattr
+                    _dispatchers[(cls, "__setattr__")] = dispatch_setattr(cls, original_setattr)
+                trusted_init = compile_init(cls)
+                if trusted_init is not None:
+                    original_init = cls.__dict__["__init__"]
+                    _original_methods[(cls, "__init__")] = original_init
+                    _dispatchers[(cls, "__init__")] = dispatch_init(original_init, trusted_init)
+    return _dispatchers
+
+
+def install_dispatchers():
+    for (cls, name), dispatcher in get_dispatchers().items():
+        setattr(cls, name, dispatcher)
+
+
+def remove_dispatchers():
+    for (cls, name), original_method in _original_methods.items():
+        setattr(cls, name, original_method)
+
+
+def is_trusted() -> bool:
+    """
+    Returns whether the trusted mode is active in the current thread
+
+    Returns:
+        trusted (bool): True if the trusted mode is active
+    """
+    return _state.depth > 0
+
+
+def enter_trusted_mode():
+    """
+    Enters the trusted mode in the current thread. The hot classes, and their subclasses, skip the validators of their
+    __setattr__ and __init__ in this thread only: the first entry of any thread installs methods dispatching on the
+    trusted mode of the calling thread, so that the other threads keep validating. Entries are counted, so the mode
+    can be nested.
+    """
+    global _nb_entries
+    with _lock:
+        if _nb_entries == 0:
+            install_dispatchers()
+        _nb_entries += 1
+    _state.depth += 1
+
+
+def exit_trusted_mode():
+    """
+    Exits the trusted mode in the current thread. The last exit of all threads restores the original methods of the
+    hot classes.
+    """
+    global _nb_entries
+    if _state.depth == 0:
+        return
+    _state.depth -= 1
+    with _lock:
+        _nb_entries -= 1
+        if _nb_entries == 0:
+            remove_dispatchers()
+
+
+@contextmanager
+def trusted_mode():
+    """
+    Context manager running its block in trusted mode. The mode only applies to the hot classes in the current thread,
+    so it must only be used when every hot object built in the block comes from validated input.
+    """
+    enter_trusted_mode()
+    try:
+        yield
+    finally:
+        exit_trusted_mode()
@@ -0,0 +1,3 @@
+from .record import ArchivedHand, ArchivedPlayer
+from .segment import HandArchive, SegmentReader, SegmentWriter
+from .stats_layout import STATS_LAYOUT, StatsLayout
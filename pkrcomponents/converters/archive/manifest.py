@@ -0,0 +1,260 @@
+"""This module records the parsed histories already converted, so that interrupted and incremental runs resume"""
+import hashlib
+import os
+import threading
+
+import numpy as np
+
+MANIFEST_BATCH_SIZE = 1000
+MERGE_SIZE = 100_000
+CHECKSUM_BLOCK_SIZE = 1 << 16
+
+
+def get_fingerprint(key: str, version: str) -> int:
+    """
+    Returns the 64 bits fingerprint of a version of a parsed history
+
+    Args:
+        key (str): The key of the parsed history
+        version (str): The version of the parsed history, like its modification time and size
+
+    Returns:
+        fingerprint (int): The fingerprint
+    """
+    return int.from_bytes(hashlib.blake2b(f"{key}\t{version}".encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def get_key_fingerprint(key: str) -> int:
+    """
+    Returns the 64 bits fingerprint of a parsed history, whatever its version
+
+    Args:
+        key (str): The key of the parsed history
+
+    Returns:
+        fingerprint (int): The fingerprint
+    """
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def get_content_hash(data_text: str) -> str:
+    """
+    Returns the hash of the content of a parsed history
+
+    Args:
+        data_text (str): The content of the parsed history
+
+    Returns:
+        content_hash (str): The hexadecimal hash
+    """
+    return hashlib.blake2b(data_text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get_prefix_checksum(path: str, size: int) -> str:
+    """
+    Returns the checksum of the first and last blocks of the first bytes of a file, to check that the file still starts
+    with the content an index was saved for, without reading all of it
+
+    Args:
+        path (str): The path of the file
+        size (int): The number of bytes of the prefix
+
+    Returns:
+        checksum (str): The hexadecimal checksum
+    """
+    digest = hashlib.blake2b(str(size).encode("utf-8"), digest_size=16)
+    with open(path, "rb") as file:
+        digest.update(file.read(min(size, CHECKSUM_BLOCK_SIZE)))
+        if size > CHECKSUM_BLOCK_SIZE:
+            file.seek(max(size - CHECKSUM_BLOCK_SIZE, CHECKSUM_BLOCK_SIZE))
+            digest.update(file.read(size - file.tell()))
+    return digest.hexdigest()
+
+
+class ConversionManifest:
+    """
+    An append-only manifest of the parsed histories converted, one "key, version, content hash" line each. The entries
+    are committed by batches: a batch is written and synced to disk at once, so that a crash loses at most the entries
+    of the current batch, whose histories are converted again by the next run. Reopening the manifest truncates a
+    partial last line. The membership of a (key, version) is tested against a sorted array of the 64 bits fingerprints
+    of the entries, and that of a key against a sorted array of the fingerprints of the keys, both saved next to the
+    manifest on close so that the next run only parses the entries appended since. The saved index is only used if the
+    manifest still starts with the lines it was saved for, as checked by the checksum of their first and last blocks.
+
+    Attributes:
+        path (str): The path of the manifest
+        batch_size (int): The number of entries of a batch
+        fingerprints (np.ndarray): The sorted fingerprints of the committed entries
+        key_fingerprints (np.ndarray): The sorted fingerprints of the keys of the committed entries
+        nb_entries (int): The number of committed lines of the manifest, a history converted again counted again
+
+    Methods:
+        is_converted(key, version): Returns whether a version of a parsed history was converted
+        is_known(key): Returns whether any version of a parsed history was converted
+        record(key, version, content_hash): Records a converted parsed history
+        commit(): Writes and syncs the entries of the current batch
+        close(): Commits the current batch and saves the index
+    """
+
+    def __init__(self, path: str, batch_size: int = MANIFEST_BATCH_SIZE):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.index_path = f"{path}.idx.npz"
+        self.fingerprints, self.key_fingerprints, manifest_size, self.nb_entries = self.load()
+        self.batch = []
+        self._unmerged = set()
+        self._unmerged_keys = set()
+        self._lock = threading.Lock()
+        self.file = open(path, "a", encoding="utf-8", newline="\n")
+        self.file.truncate(manifest_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.nb_entries
+
+    def load(self) -> tuple:
+        """
+        Loads the fingerprints of the saved index, then those of the entries appended after it, up to the last complete
+        line. An index saved without the fingerprints of the keys or the number of lines, or whose checksum does not
+        match the start of the manifest, is rebuilt from the whole manifest.
+
+        Returns:
+            fingerprints (np.ndarray): The sorted fingerprints
+            key_fingerprints (np.ndarray): The sorted fingerprints of the keys
+            manifest_size (int): The size of the complete lines of the manifest
+            nb_entries (int): The number of complete lines of the manifest
+        """
+        fingerprints, key_fingerprints = np.array([], dtype=np.uint64), np.array([], dtype=np.uint64)
+        start, nb_entries = 0, 0
+        if not os.path.exists(self.path):
+            return fingerprints, key_fingerprints, start, nb_entries
+        manifest_size = os.path.getsize(self.path)
+        if os.path.exists(self.index_path):
+            with np.load(self.index_path) as index:
+                if {"key_fingerprints", "nb_entries", "checksum"} <= set(index.files) \
+                        and int(index["manifest_size"]) <= manifest_size \
+                        and str(index["checksum"]) == get_prefix_checksum(self.path, int(index["manifest_size"])):
+                    fingerprints, key_fingerprints = index["fingerprints"], index["key_fingerprints"]
+                    start, nb_entries = int(index["manifest_size"]), int(index["nb_entries"])
+        appended, appended_keys = [], []
+        with open(self.path, "rb") as file:
+            file.seek(start)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                key, version, _ = line.decode("utf-8").rstrip("\n").split("\t")
+                appended.append(get_fingerprint(key, version))
+                appended_keys.append(get_key_fingerprint(key))
+                start += len(line)
+        if appended:
+            fingerprints = np.union1d(fingerprints, np.array(appended, dtype=np.uint64))
+            key_fingerprints = np.union1d(key_fingerprints, np.array(appended_keys, dtype=np.uint64))
+        return fingerprints, key_fingerprints, start, nb_entries + len(appended)
+
+    def is_converted(self, key: str, version: str) -> bool:
+        """
+        Returns whether a version of a parsed history was converted, with a 64 bits fingerprint collision probability
+
+        Args:
+            key (str): The key of the parsed history
+            version (str): The version of the parsed history
+
+        Returns:
+            is_converted (bool): Whether the version was recorded
+        """
+        fingerprint = get_fingerprint(key, version)
+        return fingerprint in self._unmerged or self.contains(self.fingerprints, fingerprint)
+
+    def is_known(self, key: str) -> bool:
+        """
+        Returns whether any version of a parsed history was converted, with a 64 bits fingerprint collision probability
+
+        Args:
+            key (str): The key of the parsed history
+
+        Returns:
+            is_known (bool): Whether a version of the parsed history was recorded
+        """
+        key_fingerprint = get_key_fingerprint(key)
+        return key_fingerprint in self._unmerged_keys or self.contains(self.key_fingerprints, key_fingerprint)
+
+    @staticmethod
+    def contains(fingerprints: np.ndarray, fingerprint: int) -> bool:
+        """
+        Returns whether a fingerprint is in a sorted array of fingerprints
+
+        Args:
+            fingerprints (np.ndarray): The sorted fingerprints
+            fingerprint (int): The fingerprint
+
+        Returns:
+            contains (bool): Whether the fingerprint is in the array
+        """
+        position = np.searchsorted(fingerprints, np.uint64(fingerprint))
+        return bool(position < len(fingerprints) and fingerprints[position] == fingerprint)
+
+    def record(self, key: str, version: str, content_hash: str):
+        """
+        Records a converted parsed history, committed with its batch
+
+        Args:
+            key (str): The key of the parsed history
+            version (str): The version of the parsed history converted
+            content_hash (str): The hash of its content, empty if it was skipped without being read
+        """
+        with self._lock:
+            self.batch.append((key, version, content_hash))
+            if len(self.batch) >= self.batch_size:
+                self._commit()
+
+    def commit(self):
+        """
+        Writes the entries of the current batch and syncs them to disk
+        """
+        with self._lock:
+            self._commit()
+
+    def _commit(self):
+        if not self.batch:
+            return
+        self.file.write("".join(f"{key}\t{version}\t{content_hash}\n" for key, version, content_hash in self.batch))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self._unmerged.update(get_fingerprint(key, version) for key, version, _ in self.batch)
+        self._unmerged_keys.update(get_key_fingerprint(key) for key, _, _ in self.batch)
+        self.nb_entries += len(self.batch)
+        self.batch = []
+        if len(self._unmerged) >= MERGE_SIZE:
+            self._merge()
+
+    def _merge(self):
+        self.fingerprints = np.union1d(self.fingerprints, np.fromiter(self._unmerged, dtype=np.uint64))
+        self.key_fingerprints = np.union1d(self.key_fingerprints, np.fromiter(self._unmerged_keys, dtype=np.uint64))
+        self._unmerged = set()
+        self._unmerged_keys = set()
+
+    def close(self):
+        """
+        Commits the current batch, closes the manifest and saves the index of its fingerprints
+        """
+        with self._lock:
+            if self.file.closed:
+                return
+            self._commit()
+            self.file.close()
+            manifest_size = os.path.getsize(self.path)
+            if self._unmerged:
+                self._merge()
+            temporary_path = f"{self.index_path}.tmp.npz"
+            np.savez(temporary_path, fingerprints=self.fingerprints, key_fingerprints=self.key_fingerprints,
+                     manifest_size=np.int64(manifest_size), nb_entries=np.int64(self.nb_entries),
+                     checksum=np.str_(get_prefix_checksum(self.path, manifest_size)))
+            os.replace(temporary_path, self.index_path)
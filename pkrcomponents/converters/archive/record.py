@@ -0,0 +1,295 @@
+"""This module defines the binary record of a converted hand and its lazy decoding"""
+import struct
+from datetime import datetime, timedelta
+
+from pkrcomponents.components.actions.action import Action
+from pkrcomponents.components.actions.action_log import MOVES, STREETS, STREET_CODES
+from pkrcomponents.components.cards.combo import Combo
+from pkrcomponents.components.players.position import Position
+from pkrcomponents.components.players.table_player import TablePlayer
+from pkrcomponents.components.tables.board import Board
+from pkrcomponents.components.tables.table import Table
+from pkrcomponents.components.tournaments.level import Level
+from pkrcomponents.components.tournaments.tournament import Tournament
+from pkrcomponents.components.utils.trusted import trusted_mode
+from pkrcomponents.converters.utils.exceptions import ArchiveFormatError
+
+RECORD_VERSION = 1
+EPOCH = datetime(1970, 1, 1)
+NO_DATE = -2 ** 63
+NO_CODE = 255
+LENGTH = struct.Struct("<I")
+STRING_LENGTH = struct.Struct("<H")
+HEADER = struct.Struct("<BqHdddBBBdd4s10sBB")
+PLAYER = struct.Struct("<BBBdddd4sIH")
+REWARD = struct.Struct("<Bd")
+POSITIONS = tuple(Position)
+POSITION_CODES = {position: code for code, position in enumerate(POSITIONS)}
+FOLDED, IS_HERO, ENTERED_HAND, WENT_TO_SHOWDOWN = 1, 2, 4, 8
+
+
+def pack_string(value: str) -> bytes:
+    encoded = (value or "").encode("utf-8")
+    return STRING_LENGTH.pack(len(encoded)) + encoded
+
+
+def unpack_string(buffer, offset: int) -> tuple:
+    (length,) = STRING_LENGTH.unpack_from(buffer, offset)
+    offset += STRING_LENGTH.size
+    return bytes(buffer[offset:offset + length]).decode("utf-8"), offset + length
+
+
+def pack_cards(cards: list, width: int) -> bytes:
+    return "".join(str(card) for card in cards if card is not None).encode().ljust(width, b"\0")
+
+
+def encode_hand(table: Table, hand_index: int, first_stats_row: int) -> bytes:
+    """
+    Encodes a converted hand into a binary record, prefixed with its length. The stats of the players are not part of
+    the record: each player points to its row in the stats file of the segment, written in the players order.
+
+    Args:
+        table (Table): The converted hand
+        hand_index (int): The index of the hand in its segment
+        first_stats_row (int): The row of the stats of the first player in the stats file
+
+    Returns:
+        record (bytes): The record
+    """
+    tournament = table.tournament
+    players = table.players.pl_list
+    hand_date = NO_DATE if table.hand_date is None else (table.hand_date - EPOCH) // timedelta(microseconds=1)
+    board = table.board
+    hero_combo = b"" if table.hero_combo is None else str(table.hero_combo).encode()
+    parts = [
+        pack_string(table.hand_id),
+        pack_string(tournament.id if tournament else None),
+        pack_string(tournament.name if tournament else None),
+        HEADER.pack(RECORD_VERSION, hand_date, table.level.value, table.level.bb, table.level.sb, table.level.ante,
+                    table.max_players, table.players.bb_seat,
+                    NO_CODE if table.street is None else STREET_CODES[table.street], table.total_buy_in,
+                    table.pot.value, hero_combo, pack_cards(board.flop.cards + [board.turn, board.river], 10),
+                    len(players), len(table.rewards_table)),
+    ]
+    for row, player in enumerate(players):
+        flags = ((FOLDED if player.folded else 0) | (IS_HERO if player.is_hero else 0)
+                 | (ENTERED_HAND if player.entered_hand else 0) | (WENT_TO_SHOWDOWN if player.went_to_showdown else 0))
+        log = player.actions_history.log
+        nb_actions = len(log)
+        parts.append(PLAYER.pack(player.seat, NO_CODE if player.position is None else POSITION_CODES[player.position],
+                                 flags, player.init_stack, player.stack, player.bounty, player.hand_reward,
+                                 b"" if player.combo is None else str(player.combo).encode(),
+                                 first_stats_row + row, nb_actions))
+        parts.append(pack_string(player.name))
+        parts.append(log.streets[:nb_actions].tobytes())
+        parts.append(log.moves[:nb_actions].tobytes())
+        parts.append(log.amounts[:nb_actions].tobytes())
+    for reward_dict in table.rewards_table:
+        parts.append(REWARD.pack(reward_dict["player"].seat, reward_dict["reward"]))
+    body = b"".join(parts)
+    return LENGTH.pack(len(body)) + body
+
+
+class ArchivedPlayer:
+    """
+    A player of an archived hand, decoded from its record
+
+    Attributes:
+        name (str): The name of the player
+        seat (int): The seat of the player
+        position (Position): The position of the player
+        folded (bool): Whether the player folded
+        is_hero (bool): Whether the player is the hero
+        entered_hand (bool): Whether the player entered the hand
+        went_to_showdown (bool): Whether the player went to showdown
+        init_stack (float): The stack of the player at the beginning of the hand
+        stack (float): The stack of the player at the end of the hand
+        bounty (float): The bounty of the player
+        hand_reward (float): The amount won by the player
+        combo (Combo): The combo of the player, if known
+        stats_row (int): The row of the stats of the player in the stats file
+        actions (list): The (street, move, amount) of the actions of the player
+    """
+    __slots__ = ("name", "seat", "position", "folded", "is_hero", "entered_hand", "went_to_showdown", "init_stack",
+                 "stack", "bounty", "hand_reward", "combo", "stats_row", "actions")
+
+
+class ArchivedHand:
+    """
+    A converted hand read from an archive. The record is only decoded when an attribute is accessed, and a Table can be
+    rehydrated from it without converting the parsed history again.
+
+    Methods:
+        to_table(): Rehydrates the hand into a Table
+    """
+
+    def __init__(self, buffer, segment=None):
+        self.buffer = buffer
+        self.segment = segment
+        self._header = None
+        self._players = None
+        self._rewards = None
+
+    def __repr__(self):
+        return f"ArchivedHand({self.hand_id})"
+
+    def _decode_header(self):
+        buffer = self.buffer
+        hand_id, offset = unpack_string(buffer, 0)
+        tournament_id, offset = unpack_string(buffer, offset)
+        tournament_name, offset = unpack_string(buffer, offset)
+        values = HEADER.unpack_from(buffer, offset)
+        if values[0] != RECORD_VERSION:
+            raise ArchiveFormatError(f"Unsupported record version {values[0]}")
+        self._header = (hand_id, tournament_id, tournament_name) + values[1:] + (offset + HEADER.size,)
+
+    @property
+    def header(self) -> tuple:
+        if self._header is None:
+            self._decode_header()
+        return self._header
+
+    @property
+    def hand_id(self) -> str:
+        return self.header[0]
+
+    @property
+    def tournament_id(self) -> str:
+        return self.header[1]
+
+    @property
+    def tournament_name(self) -> str:
+        return self.header[2]
+
+    @property
+    def hand_date(self) -> datetime:
+        hand_date = self.header[3]
+        return None if hand_date == NO_DATE else EPOCH + timedelta(microseconds=hand_date)
+
+    @property
+    def level(self) -> Level:
+        return Level(value=self.header[4], bb=self.header[5], sb=self.header[6], ante=self.header[7])
+
+    @property
+    def max_players(self) -> int:
+        return self.header[8]
+
+    @property
+    def bb_seat(self) -> int:
+        return self.header[9]
+
+    @property
+    def street(self):
+        code = self.header[10]
+        return None if code == NO_CODE else STREETS[code]
+
+    @property
+    def total_buy_in(self) -> float:
+        return self.header[11]
+
+    @property
+    def pot_value(self) -> float:
+        return self.header[12]
+
+    @property
+    def hero_combo(self) -> Combo:
+        combo = self.header[13].rstrip(b"\0")
+        return Combo(combo.decode()) if combo else None
+
+    @property
+    def board(self) -> list:
+        cards = self.header[14].rstrip(b"\0").decode()
+        return [cards[index:index + 2] for index in range(0, len(cards), 2)]
+
+    def _decode_players(self):
+        buffer = self.buffer
+        nb_players, nb_rewards, offset = self.header[15], self.header[16], self.header[17]
+        players = []
+        for _ in range(nb_players):
+            player = ArchivedPlayer()
+            (player.seat, position, flags, player.init_stack, player.stack, player.bounty, player.hand_reward, combo,
+             player.stats_row, nb_actions) = PLAYER.unpack_from(buffer, offset)
+            player.name, offset = unpack_string(buffer, offset + PLAYER.size)
+            player.position = None if position == NO_CODE else POSITIONS[position]
+            player.folded = bool(flags & FOLDED)
+            player.is_hero = bool(flags & IS_HERO)
+            player.entered_hand = bool(flags & ENTERED_HAND)
+            player.went_to_showdown = bool(flags & WENT_TO_SHOWDOWN)
+            combo = combo.rstrip(b"\0")
+            player.combo = Combo(combo.decode()) if combo else None
+            streets = buffer[offset:offset + nb_actions]
+            moves = buffer[offset + nb_actions:offset + 2 * nb_actions]
+            amounts = buffer[offset + 2 * nb_actions:offset + 10 * nb_actions].cast("d")
+            player.actions = [(STREETS[street], MOVES[move], amount) for street, move, amount in
+                              zip(streets, moves, amounts)]
+            offset += 10 * nb_actions
+            players.append(player)
+        rewards = []
+        for _ in range(nb_rewards):
+            rewards.append(REWARD.unpack_from(buffer, offset))
+            offset += REWARD.size
+        self._players = players
+        self._rewards = rewards
+
+    @property
+    def players(self) -> list:
+        if self._players is None:
+            self._decode_players()
+        return self._players
+
+    @property
+    def rewards(self) -> list:
+        """
+        Returns the (seat, reward) of the rewards of the hand, in order of distribution
+        """
+        if self._rewards is None:
+            self._decode_players()
+        return self._rewards
+
+    def to_table(self) -> Table:
+        """
+        Rehydrates the hand into a Table, with its players, their actions histories and their stats. Postings are not
+        archived, and the deck is left full. The archived values were validated when the hand was converted, so the
+        table is built in trusted mode.
+
+        Returns:
+            table (Table): The rehydrated table
+        """
+        with trusted_mode():
+            return self._build_table()
+
+    def _build_table(self) -> Table:
+        table = Table()
+        table.hand_id = self.hand_id
+        table.hand_date = self.hand_date
+        table.level = self.level
+        table.max_players = self.max_players
+        if self.tournament_id:
+            table.tournament = Tournament(name=self.tournament_name, id=self.tournament_id, level=table.level)
+            table.is_mtt = True
+        table.total_buy_in = self.total_buy_in
+        table.board = Board.from_cards(self.board)
+        for archived_player in self.players:
+            player = TablePlayer(name=archived_player.name, seat=archived_player.seat,
+                                 init_stack=archived_player.init_stack, bounty=archived_player.bounty,
+                                 entered_hand=archived_player.entered_hand)
+            player.sit(table)
+            player.stack = archived_player.stack
+            player.position = archived_player.position
+            player.folded = archived_player.folded
+            player.is_hero = archived_player.is_hero
+            player.went_to_showdown = archived_player.went_to_showdown
+            player.hand_reward = archived_player.hand_reward
+            player.combo = archived_player.combo
+            for street, move, amount in archived_player.actions:
+                player.actions_history.add(Action(player, move, amount), street)
+            if self.segment is not None:
+                self.segment.layout.decode(self.segment.stats[archived_player.stats_row], player.hand_stats,
+                                           player.actions_history)
+        table.players.bb_seat = self.bb_seat
+        table.hero_combo = self.hero_combo
+        table.street = self.street
+        table.pot.value = self.pot_value
+        for seat, reward in self.rewards:
+            table.rewards_table.append({"player": table.players[seat], "reward": reward})
+        return table
@@ -0,0 +1,460 @@
+"""This module stores converted hands in segment files and reads them back with random access by hand_id"""
+import json
+import mmap
+import os
+
+import numpy as np
+import pandas as pd
+
+from pkrcomponents.analytics.flag_query import FlagQuery
+from pkrcomponents.components.players.player_hand_stats import STREET_NAMES
+from pkrcomponents.components.tables.table import Table
+from pkrcomponents.converters.archive.record import ArchivedHand, LENGTH, RECORD_VERSION, encode_hand
+from pkrcomponents.converters.archive.stats_layout import STATS_LAYOUT, StatsLayout
+from pkrcomponents.converters.utils.exceptions import ArchiveFormatError
+
+INDEX_BATCH_SIZE = 1000
+
+
+def get_segment_paths(directory: str, segment_id: int) -> dict:
+    """
+    Returns the paths of the files of a segment
+
+    Args:
+        directory (str): The directory of the archive
+        segment_id (int): The id of the segment
+
+    Returns:
+        paths (dict): The paths of the hands, stats and index files
+    """
+    prefix = os.path.join(directory, f"segment_{segment_id:05d}")
+    return {"hands": f"{prefix}.hands", "stats": f"{prefix}.stats", "index": f"{prefix}.index"}
+
+
+def get_index_header(layout: StatsLayout) -> dict:
+    return {"version": RECORD_VERSION, "stats_dtype": [list(item) for item in layout.dtype.descr]}
+
+
+def read_index(index_path: str, layout: StatsLayout) -> tuple:
+    """
+    Reads the complete lines of the index of a segment and checks that it was written with the same layout
+
+    Args:
+        index_path (str): The path of the index file
+        layout (StatsLayout): The layout of the stats rows
+
+    Returns:
+        header (dict): The header of the index
+        entries (list): The entries of the archived hands
+        sizes (list): The size in bytes of the index up to the header, then up to each entry
+    """
+    with open(index_path, "rb") as file:
+        lines = file.read().split(b"\n")
+    header = json.loads(lines[0])
+    if header != get_index_header(layout):
+        raise ArchiveFormatError(f"Segment {index_path} was written with another layout")
+    complete_lines = lines[1:-1]
+    entries = [json.loads(line) for line in complete_lines]
+    sizes = [len(lines[0]) + 1]
+    for line in complete_lines:
+        sizes.append(sizes[-1] + len(line) + 1)
+    return header, entries, sizes
+
+
+class SegmentWriter:
+    """
+    Appends converted hands to a segment: the records go to the hands file, the stats rows of the players to the stats
+    file, and one JSON line per hand to the index file. A hand is only visible to readers once its index line is
+    written, and the index lines are held back until the records and the stats rows they point to are synced to disk,
+    by batches of index_batch_size hands. Reopening the segment drops the index entries whose record or stats rows
+    are missing, and truncates what was written after the last valid entry, so a crash never exposes a partial hand.
+
+    Methods:
+        append(table): Appends a converted hand to the segment
+        flush_buffers(): Flushes the buffered records and stats rows, without syncing them to disk
+        flush(): Flushes the files of the segment
+        close(): Closes the files of the segment
+    """
+
+    def __init__(self, directory: str, segment_id: int = 0, layout: StatsLayout = STATS_LAYOUT,
+                 index_batch_size: int = INDEX_BATCH_SIZE):
+        os.makedirs(directory, exist_ok=True)
+        self.segment_id = segment_id
+        self.paths = get_segment_paths(directory, segment_id)
+        self.layout = layout
+        self.index_batch_size = index_batch_size
+        self.pending_entries = []
+        index_exists = os.path.exists(self.paths["index"])
+        self.nb_hands, self.offset, self.nb_stats_rows = self.recover() if index_exists else (0, 0, 0)
+        self.hands_file = open(self.paths["hands"], "ab")
+        self.stats_file = open(self.paths["stats"], "ab")
+        self.index_file = open(self.paths["index"], "a", encoding="utf-8", newline="\n")
+        if not index_exists:
+            self.index_file.write(json.dumps(get_index_header(layout)) + "\n")
+            self.index_file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def recover(self) -> tuple:
+        """
+        Checks that an existing segment was written with the same layout, drops the last index entries whose record or
+        stats rows are not entirely in their files, and truncates the files after the last valid entry
+
+        Returns:
+            nb_hands (int): The number of hands of the segment
+            offset (int): The end of the last record in the hands file
+            nb_stats_rows (int): The number of stats rows of the segment
+        """
+        header, entries, sizes = read_index(self.paths["index"], self.layout)
+        hands_size, stats_size = (os.path.getsize(self.paths[name]) if os.path.exists(self.paths[name]) else 0
+                                  for name in ("hands", "stats"))
+        row_size = self.layout.dtype.itemsize
+        while entries and (entries[-1]["offset"] + entries[-1]["length"] > hands_size
+                           or (entries[-1]["stats_row"] + entries[-1]["nb_players"]) * row_size > stats_size):
+            entries.pop()
+        last_entry = entries[-1] if entries else {"offset": 0, "length": 0, "stats_row": 0, "nb_players": 0}
+        offset = last_entry["offset"] + last_entry["length"]
+        nb_stats_rows = last_entry["stats_row"] + last_entry["nb_players"]
+        os.truncate(self.paths["index"], sizes[len(entries)])
+        for name, size, file_size in (("hands", offset, hands_size), ("stats", nb_stats_rows * row_size, stats_size)):
+            if file_size > size:
+                os.truncate(self.paths[name], size)
+        return len(entries), offset, nb_stats_rows
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the size of the hands file in bytes
+        """
+        return self.offset
+
+    def append(self, table: Table):
+        """
+        Appends a converted hand to the segment. Its index line is written with the next batch.
+
+        Args:
+            table (Table): The converted hand
+        """
+        record = encode_hand(table, self.nb_hands, self.nb_stats_rows)
+        rows = [self.layout.encode(player.hand_stats, self.nb_hands, player.seat) for player in table.players]
+        stats = np.array(rows, dtype=self.layout.dtype)
+        self.hands_file.write(record)
+        self.stats_file.write(stats.tobytes())
+        entry = {
+            "hand_id": table.hand_id,
+            "tournament_id": table.tournament.id if table.tournament else None,
+            "offset": self.offset,
+            "length": len(record),
+            "stats_row": self.nb_stats_rows,
+            "nb_players": len(rows),
+        }
+        self.pending_entries.append(entry)
+        self.offset += len(record)
+        self.nb_stats_rows += len(rows)
+        self.nb_hands += 1
+        if len(self.pending_entries) >= self.index_batch_size:
+            self.flush()
+
+    def flush_buffers(self):
+        """
+        Flushes the buffered records and stats rows to the files, so that a reader of the segment can map those of the
+        pending hands. Their index lines are not written, since the records are not synced to disk.
+        """
+        self.hands_file.flush()
+        self.stats_file.flush()
+
+    def flush(self):
+        """
+        Syncs the records and the stats rows of the pending hands to disk, then writes and syncs their index lines
+        """
+        for file in (self.hands_file, self.stats_file):
+            file.flush()
+            os.fsync(file.fileno())
+        if self.pending_entries:
+            self.index_file.write("".join(json.dumps(entry) + "\n" for entry in self.pending_entries))
+            self.pending_entries = []
+        self.index_file.flush()
+        os.fsync(self.index_file.fileno())
+
+    def close(self):
+        self.flush()
+        self.hands_file.close()
+        self.stats_file.close()
+        self.index_file.close()
+
+
+class SegmentReader:
+    """
+    Reads a segment. The hands file is memory-mapped and records are decoded lazily; the stats file is memory-mapped as
+    a numpy structured array, so stats columns are read without copying. The segment of a writer can be read with the
+    entries of its pending hands, once its buffers are flushed.
+
+    Attributes:
+        offsets (dict): The offset and length of the record of each hand_id
+        tournaments (dict): The hand_ids of each tournament_id
+        stats (np.memmap): The stats rows of the players of the segment
+
+    Methods:
+        get(hand_id): Returns an archived hand
+        tournament_hands(tournament_id): Returns the archived hands of a tournament
+        stats_column(column): Returns a stats column
+        stats_dataframe(columns): Returns stats columns as a DataFrame
+        close(): Closes the memory maps
+    """
+
+    def __init__(self, directory: str, segment_id: int = 0, layout: StatsLayout = STATS_LAYOUT,
+                 pending_entries: list = ()):
+        self.paths = get_segment_paths(directory, segment_id)
+        self.layout = layout
+        self.offsets = {}
+        self.tournaments = {}
+        _, entries, _ = read_index(self.paths["index"], layout)
+        entries.extend(pending_entries)
+        for entry in entries:
+            self.offsets[entry["hand_id"]] = (entry["offset"], entry["length"])
+            self.tournaments.setdefault(entry["tournament_id"], []).append(entry["hand_id"])
+        self.hands_file = open(self.paths["hands"], "rb")
+        hands_size = os.fstat(self.hands_file.fileno()).st_size
+        self.hands = mmap.mmap(self.hands_file.fileno(), 0, access=mmap.ACCESS_READ) if hands_size else b""
+        nb_rows = entries[-1]["stats_row"] + entries[-1]["nb_players"] if entries else 0
+        self.stats = np.memmap(self.paths["stats"], dtype=layout.dtype, mode="r", shape=(nb_rows,)) if nb_rows \
+            else np.zeros(0, dtype=layout.dtype)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __contains__(self, hand_id: str) -> bool:
+        return hand_id in self.offsets
+
+    @property
+    def hand_ids(self) -> list:
+        return list(self.offsets)
+
+    def get(self, hand_id: str) -> ArchivedHand:
+        """
+        Returns an archived hand
+
+        Args:
+            hand_id (str): The id of the hand
+
+        Returns:
+            hand (ArchivedHand): The archived hand
+        """
+        offset, length = self.offsets[hand_id]
+        buffer = memoryview(self.hands)[offset + LENGTH.size:offset + length]
+        return ArchivedHand(buffer, segment=self)
+
+    def tournament_hands(self, tournament_id: str) -> list:
+        """
+        Returns the archived hands of a tournament, in order of archiving
+
+        Args:
+            tournament_id (str): The id of the tournament
+
+        Returns:
+            hands (list): The archived hands
+        """
+        return [self.get(hand_id) for hand_id in self.tournaments.get(tournament_id, [])]
+
+    def stats_column(self, column: str) -> np.ndarray:
+        """
+        Returns a stats column of all the players of the segment
+
+        Args:
+            column (str): The name of the column, like "preflop_flag_vpip"
+
+        Returns:
+            values (np.ndarray): The values of the column
+        """
+        return self.layout.column(self.stats, column)
+
+    def stats_dataframe(self, columns: list = None) -> pd.DataFrame:
+        """
+        Returns stats columns of all the players of the segment as a DataFrame
+
+        Args:
+            columns (list): The names of the columns, all of them by default
+
+        Returns:
+            df (pd.DataFrame): The stats, with the hand_index and seat columns
+        """
+        columns = self.layout.columns if columns is None else columns
+        data = {"hand_index": self.stats["hand_index"], "seat": self.stats["seat"]}
+        data.update({column: self.stats_column(column) for column in columns})
+        return pd.DataFrame(data)
+
+    def close(self):
+        """
+        Closes the memory maps. If archived hands of the segment are still referenced, the hands map is released when
+        they are garbage collected instead.
+        """
+        self.stats = np.zeros(0, dtype=self.layout.dtype)
+        if isinstance(self.hands, mmap.mmap):
+            try:
+                self.hands.close()
+            except BufferError:
+                pass
+        self.hands_file.close()
+
+
+class HandArchive:
+    """
+    An archive of converted hands, made of segments of bounded size in a directory. The readers of the segments are
+    kept open between reads, and only the reader of the segment written since the last read is reopened, with the
+    pending hands of the writer, so that appends and reads can alternate without syncing the writer.
+
+    Methods:
+        append(table): Appends a converted hand to the current segment
+        get(hand_id): Returns an archived hand from any segment
+        tournament_hands(tournament_id): Returns the archived hands of a tournament from all segments
+        stats_column(column): Returns a stats column over all segments
+        close(): Closes the writer and the readers
+    """
+
+    def __init__(self, directory: str, max_segment_size: int = 64 * 1024 * 1024, layout: StatsLayout = STATS_LAYOUT):
+        self.directory = directory
+        self.max_segment_size = max_segment_size
+        self.layout = layout
+        self.writer = None
+        self._readers = None
+        self._stale_segment_ids = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def segment_ids(self) -> list:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(int(filename[8:13]) for filename in os.listdir(self.directory)
+                      if filename.startswith("segment_") and filename.endswith(".index"))
+
+    def append(self, table: Table):
+        """
+        Appends a converted hand to the current segment, starting a new segment when it is full
+
+        Args:
+            table (Table): The converted hand
+        """
+        if self.writer is None:
+            segment_ids = self.segment_ids
+            self.writer = SegmentWriter(self.directory, segment_ids[-1] if segment_ids else 0, self.layout)
+        if self.writer.size >= self.max_segment_size:
+            segment_id = self.segment_ids[-1] + 1
+            self.writer.close()
+            self._stale_segment_ids.add(self.writer.segment_id)
+            self.writer = SegmentWriter(self.directory, segment_id, self.layout)
+        self.writer.append(table)
+        self._stale_segment_ids.add(self.writer.segment_id)
+
+    @property
+    def readers(self) -> list:
+        if self._readers is None:
+            self._readers = {}
+            self._stale_segment_ids.update(self.segment_ids)
+        for segment_id in self._stale_segment_ids:
+            if segment_id in self._readers:
+                self._readers.pop(segment_id).close()
+            self._readers[segment_id] = self.open_reader(segment_id)
+        self._stale_segment_ids.clear()
+        return [self._readers[segment_id] for segment_id in sorted(self._readers)]
+
+    def open_reader(self, segment_id: int) -> SegmentReader:
+        """
+        Opens the reader of a segment, with the pending hands of the writer if it is the segment being written
+
+        Args:
+            segment_id (int): The id of the segment
+
+        Returns:
+            reader (SegmentReader): The reader of the segment
+        """
+        if self.writer is not None and self.writer.segment_id == segment_id:
+            self.writer.flush_buffers()
+            return SegmentReader(self.directory, segment_id, self.layout, list(self.writer.pending_entries))
+        return SegmentReader(self.directory, segment_id, self.layout)
+
+    def __len__(self) -> int:
+        return sum(len(reader) for reader in self.readers)
+
+    def __contains__(self, hand_id: str) -> bool:
+        return any(hand_id in reader for reader in self.readers)
+
+    def get(self, hand_id: str) -> ArchivedHand:
+        """
+        Returns an archived hand
+
+        Args:
+            hand_id (str): The id of the hand
+
+        Returns:
+            hand (ArchivedHand): The archived hand
+        """
+        for reader in self.readers:
+            if hand_id in reader:
+                return reader.get(hand_id)
+        raise KeyError(hand_id)
+
+    def tournament_hands(self, tournament_id: str) -> list:
+        """
+        Returns the archived hands of a tournament from all segments
+
+        Args:
+            tournament_id (str): The id of the tournament
+
+        Returns:
+            hands (list): The archived hands
+        """
+        return [hand for reader in self.readers for hand in reader.tournament_hands(tournament_id)]
+
+    def stats_column(self, column: str) -> np.ndarray:
+        """
+        Returns a stats column over all segments. It is a view of the stats file when there is a single segment.
+
+        Args:
+            column (str): The name of the column, like "preflop_flag_vpip"
+
+        Returns:
+            values (np.ndarray): The values of the column
+        """
+        columns = [reader.stats_column(column) for reader in self.readers]
+        if len(columns) == 1:
+            return columns[0]
+        return np.concatenate(columns) if columns else np.zeros(0)
+
+    def flag_query(self) -> FlagQuery:
+        """
+        Returns a query over the packed flags of all the archived players, to compute stats like fold to cbet with
+        bitwise operations instead of decoding the hands
+
+        Returns:
+            query (FlagQuery): The query over the flags columns of all segments
+        """
+        return FlagQuery({f"{street_name}_flags": self.stats_column(f"{street_name}_flags")
+                          for street_name in STREET_NAMES})
+
+    def close_readers(self):
+        if self._readers is not None:
+            for reader in self._readers.values():
+                reader.close()
+            self._readers = None
+            self._stale_segment_ids.clear()
+
+    def close(self):
+        self.close_readers()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
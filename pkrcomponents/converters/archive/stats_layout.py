@@ -0,0 +1,185 @@
+"""This module derives the fixed-width layout of the archived player stats from the attrs metadata of the stats"""
+import attrs
+import numpy as np
+
+from pkrcomponents.components.actions.action_log import MOVE_CODES, MOVE_SYMBOLS
+from pkrcomponents.components.actions.action_move import ActionMove
+from pkrcomponents.components.actions.street import Street
+from pkrcomponents.components.cards.combo import Combo
+from pkrcomponents.components.players.player_hand_stats import FLAGS_SCHEMAS, STREET_NAMES, PlayerHandStats
+from pkrcomponents.components.players.position import Position
+
+ENUM_TYPES = {"ActionMove": ActionMove, "Street": Street, "Position": Position}
+NUMBER_FORMATS = {"decimal_15_2": "<f8", "decimal_10_5": "<f8", "float": "<f8", "tiny_int+": "<i2"}
+NO_LINE = np.iinfo(np.uint64).max
+LINE_BITS = 4
+MAX_LINE_LENGTH = 64 // LINE_BITS
+
+
+def pack_line(sequence) -> int:
+    """
+    Packs an actions sequence into an integer, LINE_BITS bits per move, so that it can be stored in a uint64 column
+
+    Args:
+        sequence (ActionsSequence): The sequence to pack, or None
+
+    Returns:
+        packed_line (int): The packed line, NO_LINE for None
+    """
+    if sequence is None:
+        return int(NO_LINE)
+    actions = sequence.actions
+    if len(actions) > MAX_LINE_LENGTH:
+        raise ValueError(f"Cannot pack a line of more than {MAX_LINE_LENGTH} moves")
+    packed_line = 0
+    for index, action in enumerate(actions):
+        packed_line |= (MOVE_CODES[action.move] + 1) << (LINE_BITS * index)
+    return packed_line
+
+
+def unpack_line(packed_line: int) -> str:
+    """
+    Returns the symbols of a packed line
+
+    Args:
+        packed_line (int): The packed line
+
+    Returns:
+        symbol (str): The symbols of the moves of the line, None for NO_LINE
+    """
+    packed_line = int(packed_line)
+    if packed_line == NO_LINE:
+        return None
+    symbols = []
+    while packed_line:
+        symbols.append(MOVE_SYMBOLS[(packed_line & 0xF) - 1])
+        packed_line >>= LINE_BITS
+    return "".join(symbols)
+
+
+class StatsLayout:
+    """
+    The fixed-width row layout of the stats of a player in a hand. Boolean stats are packed as bits of one uint64
+    flags column per street, following the flags schema of the street stats class, enums are stored as int8 codes
+    (-1 for None), combos as their 4 characters and actions sequences as packed lines.
+
+    Attributes:
+        dtype (np.dtype): The numpy structured dtype of a row
+        fields (list): The (street, attribute name, column, kind) of each stat
+        flag_bits (dict): The (flags column, bit) of each boolean stat column
+
+    Methods:
+        encode(hand_stats, hand_index, seat): Returns the row of the stats of a player
+        decode(row, hand_stats, actions_history): Sets the stats of a player from a row
+    """
+
+    def __init__(self):
+        self.fields = []
+        self.flag_bits = {}
+        formats = [("hand_index", "<u4"), ("seat", "u1")]
+        for street_name in STREET_NAMES:
+            schema = FLAGS_SCHEMAS[street_name]
+            flags_column = f"{street_name}_flags"
+            for attribute in attrs.fields(schema.stats_class):
+                kind = attribute.metadata.get("type")
+                column = f"{street_name}_{attribute.name}"
+                if kind == "bool":
+                    self.flag_bits[column] = (flags_column, schema.bits[attribute.name])
+                elif kind in NUMBER_FORMATS:
+                    formats.append((column, NUMBER_FORMATS[kind]))
+                elif kind in ENUM_TYPES:
+                    formats.append((column, "i1"))
+                elif kind == "Combo":
+                    formats.append((column, "S4"))
+                elif kind == "ActionsSequence":
+                    formats.append((column, "<u8"))
+                else:
+                    raise TypeError(f"Cannot archive the stat {column} of type {kind}")
+                self.fields.append((street_name, attribute.name, column, kind))
+            formats.append((flags_column, "<u8"))
+        self.dtype = np.dtype(formats)
+        self.enum_codes = {kind: {member: code for code, member in enumerate(enum)}
+                           for kind, enum in ENUM_TYPES.items()}
+        self.enum_members = {kind: tuple(enum) for kind, enum in ENUM_TYPES.items()}
+
+    def encode(self, hand_stats: PlayerHandStats, hand_index: int, seat: int) -> tuple:
+        """
+        Returns the row of the stats of a player
+
+        Args:
+            hand_stats (PlayerHandStats): The stats of the player
+            hand_index (int): The index of the hand in its segment
+            seat (int): The seat of the player
+
+        Returns:
+            row (tuple): The row, ordered as the dtype
+        """
+        values = hand_stats.pack_flags()
+        values.update(hand_index=hand_index, seat=seat)
+        for street_name, name, column, kind in self.fields:
+            if kind == "bool":
+                continue
+            value = getattr(getattr(hand_stats, street_name), name)
+            if kind in NUMBER_FORMATS:
+                values[column] = value
+            elif kind in ENUM_TYPES:
+                values[column] = -1 if value is None else self.enum_codes[kind][value]
+            elif kind == "Combo":
+                values[column] = b"" if value is None else str(value).encode()
+            else:
+                values[column] = pack_line(value)
+        return tuple(values[name] for name in self.dtype.names)
+
+    def decode(self, row, hand_stats: PlayerHandStats, actions_history):
+        """
+        Sets the stats of a player from a row. Actions sequences are linked to the sequences of the actions history,
+        as they are after a conversion.
+
+        Args:
+            row (np.void): The row of the stats
+            hand_stats (PlayerHandStats): The stats to set
+            actions_history (ActionsHistory): The rehydrated actions history of the player
+        """
+        hand_stats.unpack_flags(row)
+        for street_name, name, column, kind in self.fields:
+            if kind == "bool":
+                continue
+            if kind == "tiny_int+":
+                value = int(row[column])
+            elif kind in NUMBER_FORMATS:
+                value = float(row[column])
+            elif kind in ENUM_TYPES:
+                code = int(row[column])
+                value = None if code < 0 else self.enum_members[kind][code]
+            elif kind == "Combo":
+                value = Combo(row[column].decode()) if row[column] else None
+            else:
+                value = None if int(row[column]) == NO_LINE else getattr(actions_history, street_name)
+            setattr(getattr(hand_stats, street_name), name, value)
+
+    def column(self, rows: np.ndarray, column: str) -> np.ndarray:
+        """
+        Returns a stats column from rows. Stored columns are returned as views of the rows, boolean columns are unpacked
+        from their flags column.
+
+        Args:
+            rows (np.ndarray): The rows of the stats
+            column (str): The name of the column, like "preflop_flag_vpip"
+
+        Returns:
+            values (np.ndarray): The values of the column
+        """
+        if column in self.flag_bits:
+            street_name, name = column.split("_", 1)
+            return FLAGS_SCHEMAS[street_name].select(rows[f"{street_name}_flags"], name)
+        return rows[column]
+
+    @property
+    def columns(self) -> list:
+        """
+        Returns the names of the stats columns, boolean ones included
+        """
+        return [column for _, _, column, _ in self.fields]
+
+
+STATS_LAYOUT = StatsLayout()
@@ -0,0 +1,377 @@
+"""This module indexes the converted tournaments and their hands in a SQLite database"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import attrs
+
+from pkrcomponents.components.tournaments.buy_in import BuyIn
+from pkrcomponents.components.tournaments.level import Level
+from pkrcomponents.components.tournaments.levels_structure import LevelsStructure
+from pkrcomponents.components.tournaments.payout import Payout, Payouts
+from pkrcomponents.components.tournaments.speed import TourSpeed
+from pkrcomponents.components.tournaments.tournament import Tournament
+from pkrcomponents.components.tournaments.tournament_type import TournamentType
+from pkrcomponents.components.utils.constants import MoneyType
+from pkrcomponents.converters.utils.cache import LRUCache
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tournaments (
+    tournament_id TEXT PRIMARY KEY,
+    summary_key TEXT,
+    start_date TEXT,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS hands (
+    hand_id TEXT PRIMARY KEY,
+    tournament_id TEXT NOT NULL,
+    history_key TEXT,
+    segment_id INTEGER,
+    offset INTEGER,
+    length INTEGER,
+    hand_timestamp INTEGER
+);
+"""
+INDEXES = """
+DROP INDEX IF EXISTS hands_tournament_id;
+CREATE INDEX IF NOT EXISTS hands_tournament_order ON hands (tournament_id, hand_timestamp, hand_id);
+"""
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+TOURNAMENTS_CACHE_SIZE = 10_000
+
+
+def tournament_to_record(tournament: Tournament) -> dict:
+    """
+    Returns the fields of a converted tournament as a JSON serializable record
+
+    Args:
+        tournament (Tournament): The tournament
+
+    Returns:
+        record (dict): The record of the tournament
+    """
+    return {
+        "id": tournament.id,
+        "name": tournament.name,
+        "buy_in": tournament.buy_in.to_json(),
+        "is_ko": tournament.is_ko,
+        "money_type": tournament.money_type.name,
+        "payouts": [payout.to_json() for payout in tournament.payouts],
+        "total_players": tournament.total_players,
+        "speed": None if tournament.speed is None else tournament.speed.name,
+        "start_date": tournament.start_date.strftime(DATE_FORMAT),
+        "starting_stack": tournament.starting_stack,
+        "amount_won": tournament.amount_won,
+        "bounty_won": tournament.bounty_won,
+        "nb_entries": tournament.nb_entries,
+        "final_position": tournament.final_position,
+        "prize_pool": tournament.prize_pool,
+        "tournament_type": tournament.tournament_type.name,
+        "levels_structure": tournament.levels_structure.to_json(),
+    }
+
+
+def tournament_from_record(record: dict) -> Tournament:
+    """
+    Returns the tournament of a record, without current level
+
+    Args:
+        record (dict): The record, as returned by tournament_to_record
+
+    Returns:
+        tournament (Tournament): The tournament
+    """
+    levels_structure = LevelsStructure()
+    for level_dict in record["levels_structure"]:
+        duration = level_dict.pop("duration")
+        levels_structure.add_level(Level(**level_dict), duration=duration)
+    return Tournament(
+        id=record["id"],
+        name=record["name"],
+        buy_in=BuyIn(**record["buy_in"]),
+        is_ko=record["is_ko"],
+        money_type=MoneyType[record["money_type"]],
+        level=None,
+        payouts=Payouts(Payout(**payout) for payout in record["payouts"]),
+        total_players=record["total_players"],
+        speed=None if record["speed"] is None else TourSpeed[record["speed"]],
+        start_date=datetime.fromisoformat(record["start_date"]),
+        starting_stack=record["starting_stack"],
+        amount_won=record["amount_won"],
+        bounty_won=record["bounty_won"],
+        nb_entries=record["nb_entries"],
+        final_position=record["final_position"],
+        prize_pool=record["prize_pool"],
+        tournament_type=TournamentType[record["tournament_type"]],
+        levels_structure=levels_structure,
+    )
+
+
+def split_history_key(history_key: str) -> tuple:
+    """
+    Returns the tournament id and the hand id of a parsed history, from its key
+    .../YYYY/MM/DD/<tournament_id>/<hand_id>.json
+
+    Args:
+        history_key (str): The key of the parsed history
+
+    Returns:
+        tournament_id (str): The id of the tournament
+        hand_id (str): The id of the hand
+    """
+    parts = history_key.replace("\\", "/").split("/")
+    return parts[-2], os.path.splitext(parts[-1])[0]
+
+
+def get_hand_timestamp(hand_id: str) -> int:
+    """
+    Returns the unix timestamp of a hand, ending its id <number>-<table>-<timestamp>
+
+    Args:
+        hand_id (str): The id of the hand
+
+    Returns:
+        hand_timestamp (int): The timestamp of the hand, None if the id does not end with one
+    """
+    timestamp = hand_id.rsplit("-", 1)[-1]
+    return int(timestamp) if timestamp.isdigit() else None
+
+
+class TournamentIndex:
+    """
+    A persistent index of the converted tournaments and of their hands. Each tournament is stored with the record of
+    its summary, and each hand with the key of its parsed history and, once archived, its place in the hand archive.
+    The most recently used tournaments read from the index are cached in memory, so that attaching the tournament of
+    a hand usually costs a dictionary lookup. The levels added to the structure of a cached tournament are saved to
+    its record with save_levels_structure, so that they survive its eviction. The connection is shared by the threads of
+    a conversion run, each access holding a lock.
+
+    Attributes:
+        path (str): The path of the SQLite database
+        connection (sqlite3.Connection): The connection to the database
+        cache_size (int): The maximum number of tournaments cached
+
+    Methods:
+        add_tournament(tournament, summary_key): Indexes a converted tournament
+        add_hand(hand_id, tournament_id, history_key): Indexes a hand
+        add_history_keys(history_keys): Indexes the hands of parsed histories from their keys
+        add_archive(archive): Indexes the places of the hands of an archive
+        get_tournament(tournament_id, level): Returns an indexed tournament
+        get_levels_structure(tournament_id): Returns the levels structure of an indexed tournament
+        save_levels_structure(tournament_id, levels_structure): Saves the levels structure of an indexed tournament
+        tournament_hands(tournament_id): Returns the indexed hands of a tournament
+        close(): Commits and closes the database
+    """
+
+    def __init__(self, path: str, cache_size: int = TOURNAMENTS_CACHE_SIZE):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.cache_size = cache_size
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self._add_hand_timestamps()
+        self.connection.executescript(INDEXES)
+        self._tournaments = LRUCache(cache_size)
+        self._lock = threading.RLock()
+
+    def _add_hand_timestamps(self):
+        """Adds the timestamps of the hands to an index created before they were stored"""
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(hands)")]
+        if "hand_timestamp" in columns:
+            return
+        self.connection.execute("ALTER TABLE hands ADD COLUMN hand_timestamp INTEGER")
+        hand_ids = [row[0] for row in self.connection.execute("SELECT hand_id FROM hands")]
+        self.connection.executemany("UPDATE hands SET hand_timestamp = ? WHERE hand_id = ?",
+                                    [(get_hand_timestamp(hand_id), hand_id) for hand_id in hand_ids])
+        self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __contains__(self, tournament_id: str) -> bool:
+        return self.get_tournament(tournament_id) is not None
+
+    @property
+    def nb_tournaments(self) -> int:
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM tournaments").fetchone()[0]
+
+    @property
+    def nb_hands(self) -> int:
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM hands").fetchone()[0]
+
+    def add_tournament(self, tournament: Tournament, summary_key: str = None):
+        """
+        Indexes a converted tournament, replacing a previous record of the same tournament
+
+        Args:
+            tournament (Tournament): The converted tournament
+            summary_key (str): The key of its parsed summary
+        """
+        record = tournament_to_record(tournament)
+        with self._lock:
+            self.connection.execute("INSERT OR REPLACE INTO tournaments VALUES (?, ?, ?, ?)",
+                                    (tournament.id, summary_key, record["start_date"], json.dumps(record)))
+            self._tournaments.pop(tournament.id)
+
+    def add_hand(self, hand_id: str, tournament_id: str, history_key: str = None):
+        """
+        Indexes a hand, keeping its place in the archive if it was already archived
+
+        Args:
+            hand_id (str): The id of the hand
+            tournament_id (str): The id of its tournament
+            history_key (str): The key of its parsed history
+        """
+        self._add_history_rows([(hand_id, tournament_id, history_key, get_hand_timestamp(hand_id))])
+
+    def _add_history_rows(self, rows: list):
+        with self._lock:
+            self.connection.executemany(
+                "INSERT INTO hands (hand_id, tournament_id, history_key, hand_timestamp) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (hand_id) DO UPDATE SET tournament_id = excluded.tournament_id, "
+                "history_key = excluded.history_key", rows)
+
+    def add_history_keys(self, history_keys: list):
+        """
+        Indexes the hands of parsed histories, reading the tournament and hand ids from their keys
+
+        Args:
+            history_keys (list): The keys of the parsed histories, like .../<tournament_id>/<hand_id>.json
+        """
+        rows = []
+        for history_key in history_keys:
+            tournament_id, hand_id = split_history_key(history_key)
+            rows.append((hand_id, tournament_id, history_key, get_hand_timestamp(hand_id)))
+        self._add_history_rows(rows)
+
+    def add_archive(self, archive):
+        """
+        Indexes the segment, offset and length of the record of each hand of an archive
+
+        Args:
+            archive (HandArchive): The archive
+        """
+        rows = []
+        for segment_id, reader in zip(archive.segment_ids, archive.readers):
+            for tournament_id, hand_ids in reader.tournaments.items():
+                for hand_id in hand_ids:
+                    offset, length = reader.offsets[hand_id]
+                    rows.append((hand_id, tournament_id, segment_id, offset, length, get_hand_timestamp(hand_id)))
+        with self._lock:
+            self.connection.executemany(
+                "INSERT INTO hands (hand_id, tournament_id, segment_id, offset, length, hand_timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (hand_id) DO UPDATE SET segment_id = excluded.segment_id, offset = excluded.offset, "
+                "length = excluded.length", rows)
+
+    def get_tournament(self, tournament_id: str, level: Level = None) -> Tournament:
+        """
+        Returns an indexed tournament. The tournament read from the database is cached, and a shallow copy of it is
+        returned with the given level, so that hands of different levels do not share their current level.
+
+        Args:
+            tournament_id (str): The id of the tournament
+            level (Level): The current level of the copy
+
+        Returns:
+            tournament (Tournament): The tournament, None if it is not indexed
+        """
+        tournament = self.load_tournament(tournament_id)
+        return None if tournament is None else attrs.evolve(tournament, level=level)
+
+    def load_tournament(self, tournament_id: str) -> Tournament:
+        """
+        Returns the cached tournament of the index, read from the database when it is not cached
+
+        Args:
+            tournament_id (str): The id of the tournament
+
+        Returns:
+            tournament (Tournament): The cached tournament, None if it is not indexed
+        """
+        tournament = self._tournaments.get(tournament_id)
+        if tournament is not None:
+            return tournament
+        with self._lock:
+            tournament = self._tournaments.get(tournament_id)
+            if tournament is None:
+                row = self.connection.execute("SELECT record FROM tournaments WHERE tournament_id = ?",
+                                              (tournament_id,)).fetchone()
+                if row is None:
+                    return None
+                tournament = tournament_from_record(json.loads(row[0]))
+                self._tournaments.put(tournament_id, tournament)
+            return tournament
+
+    def get_levels_structure(self, tournament_id: str) -> LevelsStructure:
+        """
+        Returns the levels structure of an indexed tournament, shared by the copies returned by get_tournament, so
+        that the levels met in the hands of the tournament are added to it. The added levels are kept in memory until
+        they are saved with save_levels_structure.
+
+        Args:
+            tournament_id (str): The id of the tournament
+
+        Returns:
+            levels_structure (LevelsStructure): The levels structure, None if the tournament is not indexed
+        """
+        tournament = self.load_tournament(tournament_id)
+        return None if tournament is None else tournament.levels_structure
+
+    def save_levels_structure(self, tournament_id: str, levels_structure: LevelsStructure):
+        """
+        Saves the levels structure of an indexed tournament to its record, so that the levels added to the cached
+        structure are kept when the tournament is evicted from the cache. Does nothing if the tournament is not indexed.
+
+        Args:
+            tournament_id (str): The id of the tournament
+            levels_structure (LevelsStructure): Its levels structure
+        """
+        with self._lock:
+            self.connection.execute(
+                "UPDATE tournaments SET record = json_set(record, '$.levels_structure', json(?)) "
+                "WHERE tournament_id = ?", (json.dumps(levels_structure.to_json()), tournament_id))
+
+    def get_summary_key(self, tournament_id: str) -> str:
+        with self._lock:
+            row = self.connection.execute("SELECT summary_key FROM tournaments WHERE tournament_id = ?",
+                                          (tournament_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def tournament_hands(self, tournament_id: str) -> list:
+        """
+        Returns the indexed hands of a tournament, ordered by the timestamps of their ids, to replay the tournament
+
+        Args:
+            tournament_id (str): The id of the tournament
+
+        Returns:
+            hands (list): The (hand_id, history_key, segment_id, offset, length) of each hand
+        """
+        with self._lock:
+            return self.connection.execute(
+                "SELECT hand_id, history_key, segment_id, offset, length FROM hands WHERE tournament_id = ? "
+                "ORDER BY hand_timestamp, hand_id", (tournament_id,)).fetchall()
+
+    def get_hand_tournament_id(self, hand_id: str) -> str:
+        with self._lock:
+            row = self.connection.execute("SELECT tournament_id FROM hands WHERE hand_id = ?", (hand_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def commit(self):
+        with self._lock:
+            self.connection.commit()
+
+    def close(self):
+        with self._lock:
+            self.connection.commit()
+            self.connection.close()
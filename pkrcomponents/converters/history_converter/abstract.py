@@ -1,10 +1,14 @@
+import copy
+import itertools
 import json
+import threading
 
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from tqdm import tqdm
 
+from pkrcomponents.analytics.hud import HudAggregator
 from pkrcomponents.components.actions.action import BetAction, CallAction, CheckAction, FoldAction, RaiseAction
 from pkrcomponents.components.actions.action_move import ActionMove
 from pkrcomponents.components.actions.blind_type import BlindType
@@ -13,18 +17,84 @@ from pkrcomponents.components.actions.street import Street
 from pkrcomponents.components.cards.combo import Combo
 from pkrcomponents.components.players.table_player import TablePlayer
 from pkrcomponents.components.tables.table import Table
+from pkrcomponents.components.tables.table_pool import TablePool
 from pkrcomponents.components.tournaments.level import Level
+from pkrcomponents.components.tournaments.levels_structure import LevelsStructure
 from pkrcomponents.components.tournaments.tournament import Tournament
 from pkrcomponents.components.utils.exceptions import NotSufficientBetError, NotSufficientRaiseError, \
     ShowdownNotReachedError, CannotParseWinnersError, SeatTakenError, PlayerAlreadyFoldedError, \
     PlayerNotOnTableError
-from pkrcomponents.converters.utils.exceptions import HandConversionError
+from pkrcomponents.components.utils.trusted import trusted_mode
+from pkrcomponents.converters.archive.manifest import ConversionManifest, get_content_hash
+from pkrcomponents.converters.archive.segment import HandArchive
+from pkrcomponents.converters.archive.tournament_index import TournamentIndex
+from pkrcomponents.converters.history_converter.dedup import HandDeduplicator, get_key_hand_id
+from pkrcomponents.converters.history_converter.plan import ACTION_FACTORIES, HandPlan, get_move, get_posting_class
+from pkrcomponents.converters.utils.cache import LRUCache
+from pkrcomponents.converters.utils.dates import parse_history_date
+from pkrcomponents.converters.utils.exceptions import DuplicateHandError, HandConversionError
+from pkrcomponents.converters.utils.memory import MemoryTracker
+from pkrcomponents.converters.utils.metrics import ConversionMetrics
+from pkrcomponents.converters.utils.schema import validate_history
+from pkrcomponents.converters.utils.profiling import CONVERTER_THREAD_PREFIX, HandProfiler
+from pkrcomponents.converters.utils.timing import PhaseTimer
+
+LEVELS_STRUCTURES_CACHE_SIZE = 10_000
+LEVELS_LOCK = threading.Lock()
 
 
 class AbstractHandHistoryConverter(ABC):
 
     data: dict
     table: Table
+    pool: TablePool
+    trusted: bool
+    compiled: bool
+    timer: PhaseTimer
+    hand_profiler: HandProfiler
+    memory_tracker: MemoryTracker
+    metrics: ConversionMetrics
+    levels_structures: LRUCache = None
+    tournament_index: TournamentIndex
+    manifest: ConversionManifest
+    deduplicator: HandDeduplicator
+    data_version: str = None
+    data_hash: str = None
+
+    def __init__(self, pooled: bool = False, trusted: bool = False, compiled: bool = False,
+                 tournament_index: TournamentIndex = None, manifest: ConversionManifest = None,
+                 deduplicator: HandDeduplicator = None, timed: bool = False, memory_tracked: bool = False,
+                 timer: PhaseTimer = None, hand_profiler: HandProfiler = None, memory_tracker: MemoryTracker = None,
+                 metrics: ConversionMetrics = None):
+        """
+        Sets the options of the conversion, shared by the concrete converters. Each converter has its own instruments,
+        disabled unless they are given or enabled by their flag, and shares them with its clones.
+
+        Args:
+            pooled (bool): Whether the tables and players are recycled by a table pool
+            trusted (bool): Whether the histories are validated once against the schema instead of by the validators
+            compiled (bool): Whether the histories are compiled into conversion plans
+            tournament_index (TournamentIndex): The index of the converted tournaments
+            manifest (ConversionManifest): The manifest of the converted histories
+            deduplicator (HandDeduplicator): The deduplicator of the converted hands
+            timed (bool): Whether the phases are timed, when no timer is given
+            memory_tracked (bool): Whether the memory is tracked, when no memory tracker is given
+            timer (PhaseTimer): The timer of the phases
+            hand_profiler (HandProfiler): The profiler of the hands
+            memory_tracker (MemoryTracker): The tracker of the memory
+            metrics (ConversionMetrics): The metrics of the conversion
+        """
+        self.pool = TablePool() if pooled else None
+        self.table = self.pool.table if pooled else Table()
+        self.trusted = trusted
+        self.compiled = compiled
+        self.tournament_index = tournament_index
+        self.manifest = manifest
+        self.deduplicator = deduplicator
+        self.timer = PhaseTimer(enabled=timed) if timer is None else timer
+        self.hand_profiler = HandProfiler() if hand_profiler is None else hand_profiler
+        self.memory_tracker = MemoryTracker(enabled=memory_tracked) if memory_tracker is None else memory_tracker
+        self.metrics = ConversionMetrics(enabled=False) if metrics is None else metrics
 
     @abstractmethod
     def list_parsed_histories_keys(self) -> list:
@@ -35,6 +105,61 @@ class AbstractHandHistoryConverter(ABC):
         """
         pass
 
+    def iter_parsed_histories_keys(self):
+        """
+        Yields the keys of the parsed histories. Converters which can list their keys lazily override it, so that a
+        run starts converting before the whole key space is listed.
+        Returns:
+            keys (Iterator[str]): The keys of the parsed histories
+        """
+        yield from self.list_parsed_histories_keys()
+
+    def iter_parsed_histories_versions(self):
+        """
+        Yields the keys of the parsed histories with their versions. Converters whose listing gives the versions
+        override it, so that the versions cost no request per key.
+        Returns:
+            versions (Iterator[tuple]): The (parsed_key, version) of the parsed histories
+        """
+        for parsed_key in self.iter_parsed_histories_keys():
+            yield parsed_key, self.get_key_version(parsed_key)
+
+    def iter_versioned_keys_to_convert(self):
+        """
+        Yields the keys of the parsed histories whose current version is not recorded in the manifest, with the
+        version given by the listing. Without a manifest, all the keys are yielded with a None version.
+        Returns:
+            versions (Iterator[tuple]): The (parsed_key, version) of the parsed histories to convert
+        """
+        if self.manifest is None:
+            for parsed_key in self.iter_parsed_histories_keys():
+                yield parsed_key, None
+            return
+        for parsed_key, version in self.iter_parsed_histories_versions():
+            if not self.manifest.is_converted(parsed_key, version):
+                yield parsed_key, version
+
+    def iter_keys_to_convert(self):
+        """
+        Yields the keys of the parsed histories whose current version is not recorded in the manifest, all of them
+        without a manifest
+        Returns:
+            keys (Iterator[str]): The keys of the parsed histories to convert
+        """
+        for parsed_key, _ in self.iter_versioned_keys_to_convert():
+            yield parsed_key
+
+    @abstractmethod
+    def get_key_version(self, parsed_key: str) -> str:
+        """
+        Returns the version of a parsed history, which changes when the history is written again
+        Args:
+            parsed_key (str): The key of the parsed history
+        Returns:
+            version (str): The version of the parsed history
+        """
+        pass
+
     @abstractmethod
     def read_data_text(self, parsed_key: str) -> str:
         """
@@ -46,14 +171,22 @@ class AbstractHandHistoryConverter(ABC):
         """
         pass
 
-    def get_parsed_data(self, parsed_key: str):
+    def get_parsed_data(self, parsed_key: str, version: str = None):
         """
-        Gets the data of a parsed history and stores it in the data attribute
+        Gets the data of a parsed history and stores it in the data attribute. In trusted and compiled modes, the data
+        is validated against the history schema here, once, instead of by the validators of the components.
         Args:
             parsed_key (str): The key of the parsed history
+            version (str): The version of the parsed history given by its listing, asked for with a manifest if None
         """
+        if self.manifest is not None:
+            self.data_version = self.get_key_version(parsed_key) if version is None else version
         data_text = self.read_data_text(parsed_key)
-        self.data = json.loads(data_text)
+        self.metrics.add_bytes_read(len(data_text))
+        if self.manifest is not None:
+            self.data_hash = get_content_hash(data_text)
+        data = json.loads(data_text)
+        self.data = validate_history(data) if self.trusted or self.compiled else data
 
     @staticmethod
     def get_split_key(file_key: str) -> str:
@@ -75,6 +208,7 @@ class AbstractHandHistoryConverter(ABC):
         Moves the parsed history file and the associated split file to the corrections directory
         """
         split_key = self.get_split_key(parsed_key)
+        self.metrics.count_correction()
         self.send_to_corrections(parsed_key)
         self.send_to_corrections(split_key)
 
@@ -93,12 +227,62 @@ class AbstractHandHistoryConverter(ABC):
         buy_in = self.data.get("buy_in")
         self.table.set_total_buy_in(buy_in)
 
+    def get_levels_structure(self, tournament_id: str) -> LevelsStructure:
+        """
+        Get the levels structure of a tournament, gathering the levels met in its hands. The levels structure of a
+        tournament of the tournament index is the one of the indexed tournament, the others are kept in a cache of the
+        most recently met tournaments.
+
+        Args:
+            tournament_id (str): The id of the tournament
+
+        Returns:
+            levels_structure (LevelsStructure): The levels structure of the tournament
+        """
+        if self.tournament_index is not None:
+            levels_structure = self.tournament_index.get_levels_structure(tournament_id)
+            if levels_structure is not None:
+                return levels_structure
+        if self.levels_structures is None:
+            self.levels_structures = LRUCache(LEVELS_STRUCTURES_CACHE_SIZE)
+        return self.levels_structures.get_or_create(tournament_id, LevelsStructure)
+
+    def get_tournament_level(self, tournament_id: str, value: int, bb: float, ante: float) -> Level:
+        """
+        Get a level of a tournament from its levels structure, added to it if unknown. The levels structures are shared
+        by the clones of the converter and by the tournament index: a known level is read without a lock, and a missing
+        one is looked up again and added under LEVELS_LOCK, with a fresh lookup index. A level added to the structure of
+        an indexed tournament is saved to the index.
+
+        Args:
+            tournament_id (str): The id of the tournament
+            value (int): The value of the level
+            bb (float): The big blind of the level
+            ante (float): The ante of the level
+
+        Returns:
+            level (Level): The level
+        """
+        levels_structure = self.get_levels_structure(tournament_id)
+        level = levels_structure.get_known_level(value=value, bb=bb, ante=ante)
+        if level is not None:
+            return level
+        with LEVELS_LOCK:
+            levels_structure.refresh_index()
+            nb_levels = len(levels_structure)
+            level = levels_structure.get_or_add_level(value=value, bb=bb, ante=ante)
+            if self.tournament_index is not None and len(levels_structure) > nb_levels:
+                self.tournament_index.save_levels_structure(tournament_id, levels_structure)
+            return level
+
     def get_level(self):
         """
-        Get the level  and blinds from the data and set it to set the tournament object
+        Get the level  and blinds from the data and set it to set the tournament object. Hands of the same level of a
+        tournament share the Level object of its levels structure.
         """
         level_data = self.data.get("level")
-        level = Level(value=level_data.get("value"), bb=level_data.get("bb"), ante=level_data.get("ante"))
+        level = self.get_tournament_level(self.get_tournament_id(), value=level_data.get("value"),
+                                          bb=level_data.get("bb"), ante=level_data.get("ante"))
         self.table.set_level(level)
 
     def get_tournament_name(self) -> str:
@@ -133,12 +317,16 @@ class AbstractHandHistoryConverter(ABC):
 
     def get_pregame_info(self):
         """
-        Get the pregame info from the data and set it to the set table object
+        Get the pregame info from the data and set it to the set table object. The tournament of the hand is read
+        from the tournament index when it was indexed from its summary.
         """
         self.get_level()
-        tournament_name = self.get_tournament_name()
         tournament_id = self.get_tournament_id()
-        tournament = Tournament(name=tournament_name, id=tournament_id, level=self.table.level)
+        tournament = None
+        if self.tournament_index is not None:
+            tournament = self.tournament_index.get_tournament(tournament_id, level=self.table.level)
+        if tournament is None:
+            tournament = Tournament(name=self.get_tournament_name(), id=tournament_id, level=self.table.level)
         self.table.add_tournament(tournament)
         self.get_table_number()
         self.get_max_players()
@@ -155,8 +343,7 @@ class AbstractHandHistoryConverter(ABC):
         Get the datetime from the data and set it to the table object
         """
         hand_date_str = self.data.get("datetime")
-        date_format = "%d-%m-%Y %H:%M:%S"
-        hand_datetime = datetime.strptime(hand_date_str, date_format)
+        hand_datetime = parse_history_date(hand_date_str)
         self.table.hand_date = hand_datetime
 
     def get_game_type(self) -> str:
@@ -203,13 +390,33 @@ class AbstractHandHistoryConverter(ABC):
         init_stack = player_dict.get("init_stack")
         bounty = player_dict.get("bounty")
         entered_hand = player_dict.get("entered_hand")
-        player = TablePlayer(name=name, seat=seat, init_stack=init_stack, bounty=bounty, entered_hand=entered_hand)
+        player = self.create_player(name=name, seat=seat, init_stack=init_stack, bounty=bounty,
+                                    entered_hand=entered_hand)
         try:
             if entered_hand:
                 player.sit(self.table)
         except SeatTakenError:
             player.replace(self.table)
 
+    def create_player(self, name: str, seat: int, init_stack: float, bounty: float, entered_hand: bool) -> TablePlayer:
+        """
+        Create a player, or take a recycled one from the pool in pooled mode
+
+        Args:
+            name (str): The name of the player
+            seat (int): The seat number of the player
+            init_stack (float): The initial stack of the player
+            bounty (float): The bounty of the player
+            entered_hand (bool): Whether the player entered the hand
+
+        Returns:
+            player (TablePlayer): The player
+        """
+        if self.pool is not None:
+            return self.pool.acquire_player(name=name, seat=seat, init_stack=init_stack, bounty=bounty,
+                                            entered_hand=entered_hand)
+        return TablePlayer(name=name, seat=seat, init_stack=init_stack, bounty=bounty, entered_hand=entered_hand)
+
     def get_hero(self):
         """Get the hero from the data and set it to the table object"""
         name = self.data.get("hero_hand").get("hero")
@@ -257,7 +464,8 @@ class AbstractHandHistoryConverter(ABC):
         actions_dict = self.data.get("actions")
         for street, actions in actions_dict.items():
             if not self.table.hand_ended:
-                self.get_street_actions(street)
+                with self.timer.phase("actions", street):
+                    self.get_street_actions(street)
 
     def get_street_actions(self, street: Street):
         """
@@ -367,61 +575,439 @@ class AbstractHandHistoryConverter(ABC):
         self.get_hand_id()
         self.get_datetime()
 
+    def apply_pregame(self, plan: HandPlan):
+        """
+        Sets the table info and the pregame info of a conversion plan to the table object, as get_table_info and
+        get_pregame_info
+
+        Args:
+            plan (HandPlan): The conversion plan
+        """
+        table = self.table
+        table.hand_id = plan.hand_id
+        table.hand_date = plan.hand_date
+        value, bb, ante = plan.level
+        table.set_level(self.get_tournament_level(plan.tournament_id, value=value, bb=bb, ante=ante))
+        tournament = None
+        if self.tournament_index is not None:
+            tournament = self.tournament_index.get_tournament(plan.tournament_id, level=table.level)
+        if tournament is None:
+            tournament = Tournament(name=plan.tournament_name, id=plan.tournament_id, level=table.level)
+        table.add_tournament(tournament)
+        table.set_max_players(plan.max_players)
+        table.set_total_buy_in(plan.buy_in)
+
+    def apply_players(self, plan: HandPlan):
+        """
+        Seats the players and distributes the hero cards of a conversion plan, as get_players and get_hero
+
+        Args:
+            plan (HandPlan): The conversion plan
+        """
+        table = self.table
+        for name, seat, init_stack, bounty, entered_hand in plan.players:
+            player = self.create_player(name=name, seat=seat, init_stack=init_stack, bounty=bounty,
+                                        entered_hand=entered_hand)
+            try:
+                if entered_hand:
+                    player.sit(table)
+            except SeatTakenError:
+                player.replace(table)
+        table.set_bb_seat(table.players.get_bb_seat_from_button(plan.button_seat))
+        table.players.distribute_positions()
+        name, first_card, second_card = plan.hero
+        if first_card and second_card:
+            table.distribute_hero_cards(name, first_card, second_card)
+
+    def apply_postings(self, plan: HandPlan):
+        """
+        Adapts the positions to the postings of a conversion plan and executes them, as get_postings
+
+        Args:
+            plan (HandPlan): The conversion plan
+        """
+        table = self.table
+        get_player = table.players.__getitem__
+        for name, amount, blind_type in plan.postings:
+            player = get_player(name)
+            if blind_type == "big blind":
+                table.players.bb_seat = player.seat
+        table.players.distribute_positions()
+        table.set_starting_status()
+        for name, amount, blind_type in plan.postings:
+            player = get_player(name)
+            get_posting_class(blind_type)(player_name=player.name, value=amount).execute(player)
+
+    def apply_actions(self, plan: HandPlan):
+        """
+        Plays the actions of each street of a conversion plan and draws the board, as get_actions
+
+        Args:
+            plan (HandPlan): The conversion plan
+        """
+        table = self.table
+        for street, actions in plan.streets:
+            if not table.hand_ended:
+                with self.timer.phase("actions", street):
+                    self.apply_street_actions(plan, actions)
+
+    def apply_street_actions(self, plan: HandPlan, actions: tuple):
+        """
+        Plays the actions of a street of a conversion plan and draws the next street, as get_street_actions
+
+        Args:
+            plan (HandPlan): The conversion plan
+            actions (tuple): The actions of the street
+        """
+        table = self.table
+        get_player = table.players.__getitem__
+        for name, action, amount, is_all_in in actions:
+            player = get_player(name)
+            if player.folded:
+                raise PlayerAlreadyFoldedError
+            move = get_move(action)
+            factory = ACTION_FACTORIES.get(move)
+            if factory is None:
+                raise ValueError(f"Invalid action: {move}")
+            factory(player, amount, is_all_in).play()
+        if table.next_street_ready:
+            match table.street:
+                case Street.PREFLOP:
+                    table.execute_flop(*plan.flop)
+                case Street.FLOP:
+                    table.execute_turn(plan.turn)
+                case Street.TURN:
+                    table.execute_river(plan.river)
+                case Street.RIVER:
+                    table.advance_to_showdown()
+
+    def apply_showdown(self, plan: HandPlan):
+        """
+        Shows the hands of a conversion plan, as get_showdown
+
+        Args:
+            plan (HandPlan): The conversion plan
+        """
+        get_player = self.table.players.__getitem__
+        for name, first_card, second_card in plan.showdown:
+            get_player(name).shows(Combo.from_cards(first_card, second_card))
+
+    def convert_plan(self, plan: HandPlan):
+        """
+        Drives the table through a conversion plan
+
+        Args:
+            plan (HandPlan): The conversion plan
+        """
+        self.run_phase("pregame", self.apply_pregame, plan)
+        self.run_phase("players", self.apply_players, plan)
+        self.run_phase("postings", self.apply_postings, plan)
+        self.apply_actions(plan)
+        self.run_phase("showdown", self.apply_showdown, plan)
+        self.run_phase("winners", self.get_winners)
+
+    def run_phase(self, name: str, step, *args):
+        """
+        Runs a step of the conversion, timed as a phase when the timer is enabled
+
+        Args:
+            name (str): The name of the phase
+            step (function): The step
+            *args: The arguments of the step
+        """
+        with self.timer.phase(name):
+            step(*args)
+
+    def clone(self) -> "AbstractHandHistoryConverter":
+        """
+        Returns a converter sharing the settings, the caches and the instruments of this one, with its own table and
+        table pool, so that several threads can convert hands at the same time. Levels are only added to the shared levels
+        structures under LEVELS_LOCK, and the measures of all the clones are gathered by the instruments of this one.
+
+        Returns:
+            converter (AbstractHandHistoryConverter): The clone
+        """
+        if self.levels_structures is None:
+            self.levels_structures = LRUCache(LEVELS_STRUCTURES_CACHE_SIZE)
+        converter = copy.copy(self)
+        converter.timer, converter.hand_profiler = self.timer, self.hand_profiler
+        converter.memory_tracker, converter.metrics = self.memory_tracker, self.metrics
+        converter.pool = None if self.pool is None else TablePool(self.pool.check_leaks_on_release)
+        converter.table = Table() if converter.pool is None else converter.pool.table
+        return converter
+
+    def claim_hand(self, file_key: str, hand_id: str, check_history: bool = True) -> str:
+        """
+        Claims a hand for the current conversion
+
+        Args:
+            file_key (str): Path to the hand history file
+            hand_id (str): The id of the hand
+            check_history (bool): Whether the hands converted by the previous runs are skipped
+
+        Returns:
+            hand_id (str): The id of the hand claimed
+
+        Raises:
+            DuplicateHandError: If the hand was already converted
+        """
+        if not self.deduplicator.claim(hand_id, check_history):
+            raise DuplicateHandError(file_key, hand_id)
+        return hand_id
+
     def reset_table(self):
         """
-        Reset the table object
+        Reset the table object. In pooled mode, the table and its players are recycled in place, so the table returned
+        by a previous conversion must not be used anymore.
         """
+        if self.pool is not None:
+            self.table = self.pool.acquire_table()
+            return
         del self.table
         table = Table()
         self.table = table
 
-    def convert_history(self, file_key: str, verbose=0) -> Table:
+    def convert_history(self, file_key: str, verbose=0, version: str = None) -> Table:
         """
-        Convert a hand history file into a table object
+        Convert a hand history file into a table object. In compiled mode, the validated history is compiled into a
+        conversion plan that drives the table in trusted mode. With a manifest, the version and the content hash of the
+        file are kept in data_version and data_hash, to be recorded with record_history once the table is persisted.
+        With a deduplicator, a hand already converted raises a DuplicateHandError, before its file is read when the key
+        of the file encodes the hand id. A file whose previous version is recorded in the manifest is converted again,
+        its hand only checked against the hands of the run.
 
         Args:
             file_key (str): Path to the hand history file
             verbose (int): Verbosity level
+            version (str): The version of the file given by its listing, asked for with a manifest if None
 
         Returns:
             (Table): Table object
         """
         if verbose:
             print(f"Converting file {file_key}")
-        self.reset_table()
+        self.run_phase("reset", self.reset_table)
+        with self.hand_profiler.hand():
+            self.run_conversion(file_key, version)
+        return self.table
+
+    def record_history(self, file_key: str, version: str, content_hash: str):
+        """
+        Records a converted hand history file in the manifest, if any. The drivers of the runs call it once the consumer
+        of the table has persisted it, so that a crash never records a history whose hand is lost.
+
+        Args:
+            file_key (str): Path to the hand history file
+            version (str): The version of the file converted
+            content_hash (str): The hash of its content
+        """
+        if self.manifest is not None:
+            self.manifest.record(file_key, version, content_hash)
+
+    def run_conversion(self, file_key: str, version: str = None):
+        """
+        Converts the parsed history into the table, translating the errors of the conversion into HandConversionError.
+        With a deduplicator, the hand is claimed before the conversion is timed and counted, so that a duplicate is only
+        counted as skipped. A history whose key does not encode the hand id is read before its claim. The version of a
+        skipped history is kept in data_version, to be recorded in the manifest like a converted one.
+
+        Args:
+            file_key (str): Path to the hand history file
+            version (str): The version of the file given by its listing
+        """
+        claimed_hand_id, converted, skipped, data_read = None, False, False, False
         try:
-            self.get_parsed_data(file_key)
-            self.get_table_info()
-            self.get_pregame_info()
-            self.get_players()
-            self.get_hero()
-            self.get_postings()
-            self.get_actions()
-            self.get_showdown()
-            self.get_winners()
-            return self.table
+            if self.deduplicator is not None:
+                check_history = self.manifest is None or not self.manifest.is_known(file_key)
+                hand_id = get_key_hand_id(file_key)
+                if hand_id is None:
+                    self.run_phase("read", self.get_parsed_data, file_key, version)
+                    hand_id, data_read = self.data["hand_id"], True
+                claimed_hand_id = self.claim_hand(file_key, hand_id, check_history)
+            with self.timer.phase("total"), self.metrics.hand():
+                if not data_read:
+                    self.run_phase("read", self.get_parsed_data, file_key, version)
+                if self.compiled:
+                    with trusted_mode():
+                        with self.timer.phase("plan"):
+                            plan = HandPlan.from_history(self.data)
+                        self.convert_plan(plan)
+                else:
+                    with trusted_mode() if self.trusted else nullcontext():
+                        self.run_phase("table_info", self.get_table_info)
+                        self.run_phase("pregame", self.get_pregame_info)
+                        self.run_phase("players", self.get_players)
+                        self.run_phase("hero", self.get_hero)
+                        self.run_phase("postings", self.get_postings)
+                        self.get_actions()
+                        self.run_phase("showdown", self.get_showdown)
+                        self.run_phase("winners", self.get_winners)
+            converted = True
+        except DuplicateHandError:
+            skipped = True
+            self.metrics.count_skipped()
+            if self.manifest is not None and not data_read:
+                self.data_version = self.get_key_version(file_key) if version is None else version
+                self.data_hash = ""
+            raise
         except (HandConversionError, NotSufficientBetError, NotSufficientRaiseError, PlayerNotOnTableError, ValueError,
                 KeyError, ShowdownNotReachedError, CannotParseWinnersError, AttributeError) as e:
             raise HandConversionError(file_key, e)
+        finally:
+            if claimed_hand_id is not None and not converted:
+                self.deduplicator.release(claimed_hand_id)
+            if skipped:
+                self.timer.discard_hand()
+            else:
+                self.timer.end_hand(self.table.hand_id or file_key)
+                self.memory_tracker.end_hand(self.table.hand_id or file_key)
 
     def slow_convert_histories(self):
-        parsed_keys = self.list_parsed_histories_keys()
+        parsed_keys = self.iter_versioned_keys_to_convert()
+        for parsed_key, version in tqdm(parsed_keys):
+            try:
+                self.convert_history(parsed_key, version=version)
+            except DuplicateHandError:
+                self.record_history(parsed_key, self.data_version, self.data_hash)
+                continue
+            except HandConversionError:
+                self.move_to_correction_dir(parsed_key)
+                continue
+            self.record_history(parsed_key, self.data_version, self.data_hash)
+        if self.manifest is not None:
+            self.manifest.commit()
+        self.report_timings()
+        self.report_memory()
+
+    def report_timings(self):
+        """
+        Prints the timings of the phases of the converted hands, when the timer is enabled
+        """
+        if self.timer.enabled:
+            print(self.timer.report())
+
+    def report_memory(self):
+        """
+        Prints the memory of the converted hands, the last partial batch included, when the memory is tracked
+        """
+        if self.memory_tracker.enabled:
+            self.memory_tracker.end_batch()
+            print(self.memory_tracker.report())
+
+    def archive_histories(self, archive: HandArchive):
+        """
+        Converts the parsed histories one by one and appends the converted hands to an archive, so that they can be
+        analysed again without converting them from JSON
+
+        Args:
+            archive (HandArchive): The archive to append the hands to
+        """
+        parsed_keys = self.iter_parsed_histories_keys()
         for parsed_key in tqdm(parsed_keys):
             try:
-                self.convert_history(parsed_key)
+                table = self.convert_history(parsed_key)
+            except DuplicateHandError:
+                self.record_history(parsed_key, self.data_version, self.data_hash)
+                continue
             except HandConversionError:
                 self.move_to_correction_dir(parsed_key)
+                continue
+            archive.append(table)
+            self.record_history(parsed_key, self.data_version, self.data_hash)
 
+    def aggregate_histories(self, aggregator: HudAggregator):
+        """
+        Converts the parsed histories one by one and adds the stats of each converted hand to a HUD aggregator
 
+        Args:
+            aggregator (HudAggregator): The aggregator to update
+        """
+        parsed_keys = self.iter_parsed_histories_keys()
+        for parsed_key in tqdm(parsed_keys):
+            try:
+                table = self.convert_history(parsed_key)
+            except DuplicateHandError:
+                self.record_history(parsed_key, self.data_version, self.data_hash)
+                continue
+            except HandConversionError:
+                self.move_to_correction_dir(parsed_key)
+                continue
+            aggregator.update(table)
+            self.record_history(parsed_key, self.data_version, self.data_hash)
 
-    def convert_histories(self):
-        parsed_keys = self.list_parsed_histories_keys()
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            futures = {executor.submit(self.convert_history, parsed_key): parsed_key for parsed_key in parsed_keys}
-            for future in as_completed(futures):
-                parsed_key = futures[future]
+    def convert_stream(self, parsed_keys=None, max_workers: int = 10, max_in_flight: int = None):
+        """
+        Converts parsed histories concurrently and yields the results as they complete. The keys are consumed lazily and
+        at most max_in_flight conversions are queued or running at a time, so that the memory of a run does not depend
+        on the number of keys. Each worker thread converts with its own clone of the converter. In pooled mode, each
+        hand in flight is converted with a table pool of its own, given back once the consumer asks for the next
+        result, so that a yielded table stays valid until then. A converted or skipped history is recorded in the
+        manifest at the same time, once the consumer is done with its result. When the keys to convert are listed here, their versions
+        come with the listing, so that a manifest costs no request per key.
+
+        Args:
+            parsed_keys (Iterable[str]): The keys of the parsed histories, those to convert if None
+            max_workers (int): The number of worker threads
+            max_in_flight (int): The maximum number of conversions in flight, twice the number of workers if None
+
+        Returns:
+            results (Iterator[tuple]): The (parsed_key, table, error) of each conversion in completion order, the table
+            None and the HandConversionError or the DuplicateHandError as error if the hand was not converted
+        """
+        if parsed_keys is None:
+            versioned_keys = self.iter_versioned_keys_to_convert()
+        else:
+            versioned_keys = ((parsed_key, None) for parsed_key in parsed_keys)
+        max_in_flight = max_in_flight or 2 * max_workers
+        workers = threading.local()
+        free_pools = []
+
+        def convert(parsed_key: str, version: str) -> tuple:
+            converter = getattr(workers, "converter", None)
+            if converter is None:
+                converter = workers.converter = self.clone()
+            if self.pool is not None:
                 try:
-                    future.result()
-                except HandConversionError as e:
-                    print(f"Error processing history {parsed_key}: {e}")
-                    self.move_to_correction_dir(parsed_key)
+                    converter.pool = free_pools.pop()
+                except IndexError:
+                    converter.pool = TablePool(self.pool.check_leaks_on_release)
+            try:
+                table = converter.convert_history(parsed_key, version=version)
+                return table, None, converter.pool, (converter.data_version, converter.data_hash)
+            except DuplicateHandError as e:
+                return None, e, converter.pool, (converter.data_version, converter.data_hash)
+            except HandConversionError as e:
+                return None, e, converter.pool, None
+
+        self.metrics.set_workers(max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=CONVERTER_THREAD_PREFIX) as executor:
+            in_flight = {executor.submit(convert, parsed_key, version): parsed_key
+                         for parsed_key, version in itertools.islice(versioned_keys, max_in_flight)}
+            try:
+                while in_flight:
+                    self.metrics.set_queue_depth(len(in_flight))
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    results = [(in_flight.pop(future), future) for future in done]
+                    for parsed_key, version in itertools.islice(versioned_keys, len(done)):
+                        in_flight[executor.submit(convert, parsed_key, version)] = parsed_key
+                    for parsed_key, future in results:
+                        table, error, pool, conversion = future.result()
+                        yield parsed_key, table, error
+                        if conversion is not None:
+                            self.record_history(parsed_key, *conversion)
+                        if pool is not None:
+                            free_pools.append(pool)
+            finally:
+                for future in in_flight:
+                    future.cancel()
+            self.metrics.set_queue_depth(0)
+
+    def convert_histories(self):
+        for parsed_key, table, error in self.convert_stream():
+            if isinstance(error, HandConversionError):
+                print(f"Error processing history {parsed_key}: {error}")
+                self.move_to_correction_dir(parsed_key)
+        if self.manifest is not None:
+            self.manifest.commit()
+        self.report_timings()
+        self.report_memory()
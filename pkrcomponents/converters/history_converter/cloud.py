@@ -1,6 +1,5 @@
 import boto3
 
-from pkrcomponents.components.tables.table import Table
 from pkrcomponents.converters.history_converter.abstract import AbstractHandHistoryConverter
 
 
@@ -8,18 +7,48 @@ class CloudHandHistoryConverter(AbstractHandHistoryConverter):  # pragma: no cov
     """
     A class that converts hand histories from a bucket to a table
     """
-    def __init__(self, bucket_name: str):
+    def __init__(self, bucket_name: str, **options):
+        super().__init__(**options)
         self.s3 = boto3.client("s3")
         self.bucket_name = bucket_name
         self.parsed_prefix = "data/histories/parsed"
-        self.table = Table()
         
     def list_parsed_histories_keys(self) -> list:
+        return list(self.iter_parsed_histories_keys())
+
+    def iter_parsed_histories_keys(self):
+        """
+        Yields the keys of the parsed histories page by page, while the bucket is listed
+        Returns:
+            keys (Iterator[str]): The keys of the parsed histories
+        """
+        for obj in self.iter_parsed_histories_objects():
+            yield obj["Key"]
+
+    def iter_parsed_histories_versions(self):
+        """
+        Yields the keys of the parsed histories with their ETags, taken from the listing pages instead of one
+        head_object request per key
+        Returns:
+            versions (Iterator[tuple]): The (key, version) of the parsed histories
+        """
+        for obj in self.iter_parsed_histories_objects():
+            yield obj["Key"], obj["ETag"].strip('"')
+
+    def iter_parsed_histories_objects(self):
+        """
+        Yields the objects of the parsed histories page by page, while the bucket is listed
+        Returns:
+            objects (Iterator[dict]): The listed objects of the parsed histories
+        """
         paginator = self.s3.get_paginator("list_objects_v2")
-        pages = paginator.paginate(Bucket=self.bucket_name, Prefix=self.parsed_prefix)
-        keys = [obj["Key"] for page in pages for obj in page.get("Contents", [])]
-        return keys
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=self.parsed_prefix):
+            yield from page.get("Contents", [])
     
+    def get_key_version(self, parsed_key: str) -> str:
+        response = self.s3.head_object(Bucket=self.bucket_name, Key=parsed_key)
+        return response["ETag"].strip('"')
+
     def read_data_text(self, parsed_key: str) -> str:
         response = self.s3.get_object(Bucket=self.bucket_name, Key=parsed_key)
         content = response["Body"].read().decode("utf-8")
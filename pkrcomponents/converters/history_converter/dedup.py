@@ -0,0 +1,115 @@
+"""This module detects the hands converted more than once, like the copies of a hand exported from several seats"""
+import os
+import re
+import threading
+import warnings
+
+from pkrcomponents.converters.archive.tournament_index import split_history_key
+from pkrcomponents.converters.utils.bloom import BloomFilter
+from pkrcomponents.converters.utils.exceptions import BloomFilterSaturationWarning
+
+HAND_ID_PATTERN = re.compile(r"\d+-\d+-\d+")
+
+
+def get_key_hand_id(history_key: str) -> str:
+    """
+    Returns the hand id encoded in the key of a parsed history, .../<tournament_id>/<hand_id>.json
+
+    Args:
+        history_key (str): The key of the parsed history
+
+    Returns:
+        hand_id (str): The id of the hand, None if the name of the file is not a hand id
+    """
+    hand_id = split_history_key(history_key)[1]
+    return hand_id if HAND_ID_PATTERN.fullmatch(hand_id) else None
+
+
+class HandDeduplicator:
+    """
+    Claims the hand ids of a conversion run, so that each hand is converted once. The hand ids of the run are kept in an
+    exact set, and those of the previous runs in a Bloom filter saved on close, so that a hand already converted is
+    skipped with the false positive probability of the filter. A BloomFilterSaturationWarning is issued when the filter
+    holds more hands than its capacity, since its false positives then skip never converted hands more often.
+
+    Attributes:
+        path (str): The path of the saved filter, None to only detect the duplicates of the run
+        claimed (set): The hand ids claimed in the run
+        history (BloomFilter): The filter of the hand ids of the previous runs
+        nb_duplicates (int): The number of hands of the run already claimed
+        nb_history_duplicates (int): The number of hands found in the filter of the previous runs
+
+    Methods:
+        claim(hand_id, check_history): Claims a hand id, unless it was already claimed
+        release(hand_id): Releases a hand id whose conversion failed
+        close(): Adds the claimed hand ids to the filter and saves it
+    """
+
+    def __init__(self, path: str = None, capacity: int = 10_000_000, false_positive_rate: float = 1e-6):
+        self.path = path
+        self.claimed = set()
+        if path is not None and os.path.exists(path):
+            self.history = BloomFilter.load(path)
+        else:
+            self.history = BloomFilter(capacity=capacity, false_positive_rate=false_positive_rate)
+        self.nb_duplicates = 0
+        self.nb_history_duplicates = 0
+        self._lock = threading.Lock()
+        self.check_saturation()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def claim(self, hand_id: str, check_history: bool = True) -> bool:
+        """
+        Claims a hand id for the current conversion, unless it was claimed in the run or converted by a previous run
+
+        Args:
+            hand_id (str): The id of the hand
+            check_history (bool): Whether the hands of the previous runs are skipped, False to convert a history again
+
+        Returns:
+            claimed (bool): Whether the hand should be converted
+        """
+        with self._lock:
+            if hand_id in self.claimed:
+                self.nb_duplicates += 1
+                return False
+            if check_history and hand_id in self.history:
+                self.nb_history_duplicates += 1
+                return False
+            self.claimed.add(hand_id)
+            return True
+
+    def release(self, hand_id: str):
+        """
+        Releases a hand id whose conversion failed, so that another copy of the hand can be converted
+
+        Args:
+            hand_id (str): The id of the hand
+        """
+        with self._lock:
+            self.claimed.discard(hand_id)
+
+    def close(self):
+        """
+        Adds the hand ids claimed in the run to the filter of the previous runs, and saves it
+        """
+        with self._lock:
+            for hand_id in self.claimed:
+                self.history.add(hand_id)
+            self.claimed = set()
+            if self.path is not None:
+                self.history.save(self.path)
+        self.check_saturation()
+
+    def check_saturation(self):
+        """
+        Warns when the filter of the previous runs holds more hands than its capacity
+        """
+        if self.history.count > self.history.capacity:
+            warnings.warn(BloomFilterSaturationWarning(self.history.count, self.history.capacity,
+                                                       self.history.false_positive_probability), stacklevel=3)
@@ -1,16 +1,15 @@
 import os
 
 from tqdm import tqdm
-from pkrcomponents.components.tables.table import Table
 from pkrcomponents.converters.history_converter.abstract import AbstractHandHistoryConverter
 
 
 class LocalHandHistoryConverter(AbstractHandHistoryConverter):
     
-    def __init__(self, data_dir: str):
+    def __init__(self, data_dir: str, **options):
+        super().__init__(**options)
         data_dir = self.correct_data_dir(data_dir)
         self.parsed_dir = os.path.join(data_dir, "histories", "parsed")
-        self.table = Table()
         
     @staticmethod
     def correct_data_dir(data_dir: str) -> str:
@@ -19,12 +18,47 @@ class LocalHandHistoryConverter(AbstractHandHistoryConverter):
         return data_dir
     
     def list_parsed_histories_keys(self) -> list:
-        parsed_keys = [
-            os.path.join(root, filename)
-            for root, _, filenames in os.walk(self.parsed_dir)
-            for filename in filenames if filename.endswith('.json')
-        ]
-        return parsed_keys
+        return list(self.iter_parsed_histories_keys())
+
+    def iter_parsed_histories_keys(self):
+        """
+        Yields the paths of the parsed histories while the directories are scanned
+        Returns:
+            keys (Iterator[str]): The paths of the parsed histories
+        """
+        for entry in self.iter_parsed_histories_entries():
+            yield entry.path
+
+    def iter_parsed_histories_versions(self):
+        """
+        Yields the paths of the parsed histories with their versions, taken from the entries of the directory scan
+        Returns:
+            versions (Iterator[tuple]): The (path, version) of the parsed histories
+        """
+        for entry in self.iter_parsed_histories_entries():
+            yield entry.path, self.get_stat_version(entry.stat())
+
+    def iter_parsed_histories_entries(self):
+        """
+        Yields the directory entries of the parsed histories while the directories are scanned, depth first, so that at
+        most one directory listing is held at a time
+        Returns:
+            entries (Iterator[os.DirEntry]): The directory entries of the parsed histories
+        """
+        directories = [self.parsed_dir]
+        while directories:
+            try:
+                entries = os.scandir(directories.pop())
+            except OSError:
+                continue
+            subdirectories = []
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                    elif entry.name.endswith('.json'):
+                        yield entry
+            directories.extend(reversed(subdirectories))
 
     def list_parsed_history_keys_to_correct(self) -> list:
         correction_dir = self.parsed_dir.replace("data", "corrections")
@@ -40,6 +74,13 @@ class LocalHandHistoryConverter(AbstractHandHistoryConverter):
         for parsed_key in tqdm(parsed_keys):
             self.convert_history(parsed_key)
     
+    def get_key_version(self, parsed_key: str) -> str:
+        return self.get_stat_version(os.stat(parsed_key))
+
+    @staticmethod
+    def get_stat_version(stat: os.stat_result) -> str:
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
     def read_data_text(self, parsed_key: str) -> str:
         with open(parsed_key, 'r', encoding='utf-8') as file:
             content = file.read()
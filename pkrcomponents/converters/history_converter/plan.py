@@ -0,0 +1,134 @@
+"""This module compiles a validated parsed history into a conversion plan, whose values are resolved once"""
+from datetime import datetime
+from functools import lru_cache
+
+from attrs import define
+
+from pkrcomponents.components.actions.action import BetAction, CallAction, CheckAction, FoldAction, RaiseAction
+from pkrcomponents.components.actions.action_move import ActionMove
+from pkrcomponents.components.actions.blind_type import BlindType
+from pkrcomponents.components.actions.posting import AntePosting, BBPosting, SBPosting
+from pkrcomponents.converters.utils.dates import parse_history_date
+
+ACTION_FACTORIES = {
+    ActionMove.FOLD: lambda player, amount, is_all_in: FoldAction(player),
+    ActionMove.CHECK: lambda player, amount, is_all_in: CheckAction(player),
+    ActionMove.CALL: lambda player, amount, is_all_in: CallAction(player, is_all_in=is_all_in),
+    ActionMove.BET: lambda player, amount, is_all_in: BetAction(player, amount, is_all_in=is_all_in),
+    ActionMove.RAISE: lambda player, amount, is_all_in: RaiseAction(player, amount, is_all_in=is_all_in),
+}
+POSTING_CLASSES = {
+    BlindType.ANTE: AntePosting,
+    BlindType.SMALL_BLIND: SBPosting,
+    BlindType.BIG_BLIND: BBPosting,
+}
+
+
+@lru_cache(maxsize=None)
+def get_move(action: str) -> ActionMove:
+    """
+    Returns the move of an action of a parsed history, resolved once per spelling
+
+    Args:
+        action (str): The action, like "folds"
+
+    Returns:
+        move (ActionMove): The move
+    """
+    return ActionMove(action)
+
+
+@lru_cache(maxsize=None)
+def get_posting_class(blind_type: str) -> type:
+    """
+    Returns the posting class of a blind type of a parsed history, resolved once per spelling
+
+    Args:
+        blind_type (str): The blind type, like "big blind"
+
+    Returns:
+        posting_class (type): The Posting subclass
+    """
+    return POSTING_CLASSES[BlindType(blind_type)]
+
+
+@define(frozen=True)
+class HandPlan:
+    """
+    The conversion plan of a parsed history: the values read by each step of the conversion, extracted in a single
+    pass over the validated history, so that the converter drives the table without walking the parsed dictionaries.
+    Moves and blind types are resolved when the plan is played, through caches shared by all the hands.
+
+    Attributes:
+        hand_id (str): The id of the hand
+        hand_date (datetime): The date of the hand
+        tournament_id (str): The id of the tournament
+        tournament_name (str): The name of the tournament
+        table_number (str): The number of the table
+        level (tuple): The value, big blind and ante of the level
+        max_players (int): The maximum number of players of the table
+        buy_in (float): The total buy-in of the tournament
+        button_seat (int): The seat of the button
+        players (tuple): The (name, seat, init_stack, bounty, entered_hand) of each player
+        hero (tuple): The name and the two cards of the hero
+        postings (tuple): The (name, amount, blind_type) of each posting
+        streets (tuple): The (street, actions) of each street, the actions as (player, action, amount, is_all_in)
+        flop (tuple): The three cards of the flop
+        turn (str): The turn card
+        river (str): The river card
+        showdown (tuple): The (name, first_card, second_card) of each player showing their hand
+    """
+    hand_id: str
+    hand_date: datetime
+    tournament_id: str
+    tournament_name: str
+    table_number: str
+    level: tuple
+    max_players: int
+    buy_in: float
+    button_seat: int
+    players: tuple
+    hero: tuple
+    postings: tuple
+    streets: tuple
+    flop: tuple
+    turn: str
+    river: str
+    showdown: tuple
+
+    @classmethod
+    def from_history(cls, data: dict) -> "HandPlan":
+        """
+        Compiles the conversion plan of a parsed history validated by validate_history
+
+        Args:
+            data (dict): The validated parsed history
+
+        Returns:
+            plan (HandPlan): The conversion plan
+        """
+        tournament_info, level, hero_hand = data["tournament_info"], data["level"], data["hero_hand"]
+        flop = data["flop"]
+        return cls(
+            hand_id=data["hand_id"],
+            hand_date=parse_history_date(data["datetime"]),
+            tournament_id=tournament_info["tournament_id"],
+            tournament_name=tournament_info["tournament_name"],
+            table_number=tournament_info["table_number"],
+            level=(level["value"], level["bb"], level["ante"]),
+            max_players=data["max_players"],
+            buy_in=data["buy_in"],
+            button_seat=data["button_seat"],
+            players=tuple((player["name"], player["seat"], player["init_stack"], player["bounty"],
+                           player["entered_hand"]) for player in data["players"].values()),
+            hero=(hero_hand["hero"], hero_hand["first_card"], hero_hand["second_card"]),
+            postings=tuple((posting["name"], posting["amount"], posting["blind_type"])
+                           for posting in data["postings"]),
+            streets=tuple((street, tuple((action["player"], action["action"], action["amount"], action["is_all_in"])
+                                         for action in actions)) for street, actions in data["actions"].items()),
+            flop=(flop["flop_card_1"], flop["flop_card_2"], flop["flop_card_3"]),
+            turn=data["turn"]["turn_card"],
+            river=data["river"]["river_card"],
+            showdown=tuple((name, cards["first_card"], cards["second_card"])
+                           for name, cards in data["showdown"].items()),
+        )
@@ -0,0 +1,16 @@
+"""This script converts hand histories from the local directory and saves the HUD stats of the players."""
+import os
+
+from pkrcomponents.analytics.hud import HudAggregator
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+from pkrcomponents.converters.utils.metrics import export_metrics
+from pkrcomponents.converters.utils.profiling import profile_run
+
+
+if __name__ == "__main__":  # pragma: no cover
+    aggregator = HudAggregator()
+    converter = LocalHandHistoryConverter(data_dir=DATA_DIR, pooled=True, trusted=True)
+    with profile_run("aggregate_histories", converter), export_metrics(converter):
+        converter.aggregate_histories(aggregator)
+    aggregator.snapshot(os.path.join(DATA_DIR, "histories", "hud.npz"))
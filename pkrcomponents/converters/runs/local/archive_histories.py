@@ -0,0 +1,15 @@
+"""This script converts hand histories from the local directory and stores them in a binary archive."""
+import os
+
+from pkrcomponents.converters.archive.segment import HandArchive
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+from pkrcomponents.converters.utils.metrics import export_metrics
+from pkrcomponents.converters.utils.profiling import profile_run
+
+
+if __name__ == "__main__":  # pragma: no cover
+    converter = LocalHandHistoryConverter(data_dir=DATA_DIR, pooled=True, trusted=True)
+    with profile_run("archive_histories", converter), export_metrics(converter):
+        with HandArchive(os.path.join(DATA_DIR, "histories", "archive")) as archive:
+            converter.archive_histories(archive)
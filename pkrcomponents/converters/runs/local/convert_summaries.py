@@ -1,8 +1,13 @@
 """This script converts the summaries of the local runs to the format used by the PKR components."""
+import os
+
 from pkrcomponents.converters.summary_converter.local import LocalSummaryConverter
 from pkrcomponents.converters.settings import DATA_DIR
+from pkrcomponents.converters.utils.profiling import profile_run
 
 
 if __name__ == "__main__":  # pragma: no cover
     converter = LocalSummaryConverter(data_dir=DATA_DIR)
-    converter.convert_summaries()
+    with profile_run("convert_summaries"):
+        results = converter.convert_summaries()
+    results.to_dataframe().to_csv(os.path.join(DATA_DIR, "summaries", "tournaments.csv"), index=False)
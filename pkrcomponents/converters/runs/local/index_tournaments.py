@@ -0,0 +1,14 @@
+"""This script indexes the summaries and the histories of the local directory, to attach the tournaments to the hands."""
+import os
+
+from pkrcomponents.converters.archive.tournament_index import TournamentIndex
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.summary_converter.local import LocalSummaryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+
+
+if __name__ == "__main__":  # pragma: no cover
+    with TournamentIndex(os.path.join(DATA_DIR, "tournaments.db")) as tournament_index:
+        LocalSummaryConverter(data_dir=DATA_DIR).index_summaries(tournament_index)
+        history_converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        tournament_index.add_history_keys(history_converter.list_parsed_histories_keys())
@@ -1,7 +1,16 @@
+import os
+
+from pkrcomponents.converters.archive.manifest import ConversionManifest
+from pkrcomponents.converters.history_converter.dedup import HandDeduplicator
 from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
 from pkrcomponents.converters.settings import DATA_DIR
+from pkrcomponents.converters.utils.metrics import export_metrics
+from pkrcomponents.converters.utils.profiling import profile_run
 
 
 if __name__ == "__main__":  # pragma: no cover
-    converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
-    converter.slow_convert_histories()
+    with ConversionManifest(os.path.join(DATA_DIR, "histories", "converted.manifest")) as manifest, \
+            HandDeduplicator(os.path.join(DATA_DIR, "histories", "converted_hands.bloom")) as deduplicator:
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR, manifest=manifest, deduplicator=deduplicator)
+        with profile_run("slow_convert_histories", converter), export_metrics(converter):
+            converter.slow_convert_histories()
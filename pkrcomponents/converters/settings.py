@@ -2,4 +2,10 @@ import os
 
 BUCKET_NAME = os.getenv("POKER_AWS_BUCKET_NAME")
 DATA_DIR = os.environ.get("POKER_DATA_DIR")
-TEST_DATA_DIR = os.getenv("POKER_TEST_DATA_DIR")
\ No newline at end of file
+TEST_DATA_DIR = os.getenv("POKER_TEST_DATA_DIR")
+PROFILE_INTERVAL = os.getenv("POKER_PROFILE_INTERVAL")
+PROFILE_EVERY = os.getenv("POKER_PROFILE_EVERY")
+PROFILE_DIR = os.getenv("POKER_PROFILE_DIR")
+METRICS_PATH = os.getenv("POKER_METRICS_PATH")
+METRICS_PORT = os.getenv("POKER_METRICS_PORT")
+METRICS_INTERVAL = os.getenv("POKER_METRICS_INTERVAL")
\ No newline at end of file
@@ -1,15 +1,44 @@
 import json
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
-
+from concurrent.futures import ProcessPoolExecutor
 
 from pkrcomponents.components.tournaments.buy_in import BuyIn
+from pkrcomponents.components.tournaments.levels_structure import LevelsStructure
 from pkrcomponents.components.tournaments.speed import TourSpeed
 from pkrcomponents.components.tournaments.tournament import Tournament
 from pkrcomponents.components.tournaments.tournament_type import TournamentType
+from pkrcomponents.converters.summary_converter.tournament_results import TournamentResults
+from pkrcomponents.converters.utils.dates import parse_summary_date
 from pkrcomponents.converters.utils.exceptions import SummaryConversionError
 
+CHUNK_SIZE = 256
+_worker_converter = None
+
+
+def init_worker(converter: "AbstractSummaryConverter"):
+    """
+    Stores the copy of the converter received by a worker process, so that each worker has its own data and tournament
+
+    Args:
+        converter (AbstractSummaryConverter): The converter copied to the worker
+    """
+    global _worker_converter
+    _worker_converter = converter
+
+
+def convert_chunk(parsed_keys: list) -> tuple:
+    """
+    Converts summaries in a worker process
+
+    Args:
+        parsed_keys (list): The keys of the parsed summaries
+
+    Returns:
+        rows (list): The results of the converted tournaments
+        failed_keys (list): The keys of the summaries that could not be converted
+    """
+    return _worker_converter.convert_chunk(parsed_keys)
+
 
 class AbstractSummaryConverter(ABC):
     """
@@ -47,6 +76,15 @@ class AbstractSummaryConverter(ABC):
         """
         pass
 
+    def send_batch_to_corrections(self, file_keys: list):
+        """
+        Sends many files to the corrections directory
+        Args:
+            file_keys (list): The keys of the files to send to the corrections directory
+        """
+        for file_key in file_keys:
+            self.send_to_corrections(file_key)
+
     def get_parsed_data(self, parsed_key: str):
         """
         Gets the data of a parsed history and stores it in the data attribute
@@ -120,8 +158,7 @@ class AbstractSummaryConverter(ABC):
             start_date (str): Tournament start date
         """
         start_date_string = self.data.get("start_date")
-        date_format = "%Y/%m/%d %H:%M:%S %Z"
-        start_date = datetime.strptime(start_date_string, date_format)
+        start_date = parse_summary_date(start_date_string)
         self.tournament.start_date = start_date
 
     def get_final_position(self):
@@ -168,8 +205,11 @@ class AbstractSummaryConverter(ABC):
         self.tournament.nb_entries = nb_entries
 
     def get_levels_structure(self):
-        # TODO: Implement this method taking a list of dictionaries and converting it to a LevelsStructure object
-        pass
+        """
+        Get the levels structure from the data and set it to the set tournament object
+        """
+        levels_structure = LevelsStructure.from_dicts(self.data.get("levels_structure"))
+        self.tournament.levels_structure = levels_structure
 
     def get_tournament(self):
         """
@@ -201,22 +241,86 @@ class AbstractSummaryConverter(ABC):
 
     def convert_summary(self, parsed_key: str) -> Tournament:
         """
-        Convert a summary to a tournament object
+        Convert a summary to a new tournament object
         Args:
             parsed_key: The key of the parsed summary
         Returns:
             tournament (Tournament): The tournament object
         """
-        self.get_parsed_data(parsed_key)
-        self.get_tournament()
+        self.reset_tournament()
+        try:
+            self.get_parsed_data(parsed_key)
+            self.get_tournament()
+        except SummaryConversionError:
+            raise
+        except (ValueError, KeyError, AttributeError, TypeError) as e:
+            raise SummaryConversionError(e)
         return self.tournament
 
-    def convert_summaries(self):
+    def index_summaries(self, tournament_index):
+        """
+        Converts the summaries one by one and indexes the converted tournaments, so that the history converters can
+        attach them to the hands
+        Args:
+            tournament_index (TournamentIndex): The index to complete
+        """
+        failed_keys = []
+        for parsed_key in self.list_parsed_summaries_keys():
+            try:
+                tournament_index.add_tournament(self.convert_summary(parsed_key), summary_key=parsed_key)
+            except SummaryConversionError:
+                failed_keys.append(parsed_key)
+        tournament_index.commit()
+        if failed_keys:
+            self.send_batch_to_corrections(failed_keys)
+
+    def convert_chunk(self, parsed_keys: list) -> tuple:
+        """
+        Converts summaries one by one
+        Args:
+            parsed_keys (list): The keys of the parsed summaries
+        Returns:
+            rows (list): The results of the converted tournaments, as TournamentResults rows
+            failed_keys (list): The keys of the summaries that could not be converted
+        """
+        rows, failed_keys = [], []
+        for parsed_key in parsed_keys:
+            try:
+                rows.append(TournamentResults.get_row(self.convert_summary(parsed_key)))
+            except SummaryConversionError:
+                failed_keys.append(parsed_key)
+        return rows, failed_keys
+
+    def convert_summaries(self, max_workers: int = None, chunk_size: int = CHUNK_SIZE) -> TournamentResults:
         """
-        Convert all the summaries to tournament objects
+        Convert all the summaries in worker processes, each with its own copy of the converter, and send the
+        summaries that could not be converted to corrections, chunk by chunk
+        Args:
+            max_workers (int): The number of worker processes, the number of CPUs if None, 0 to convert in this process
+            chunk_size (int): The number of summaries converted by a worker at once
+        Returns:
+            results (TournamentResults): The results of the converted tournaments
         """
         parsed_keys = self.list_parsed_summaries_keys()
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            futures = [executor.submit(self.convert_summary, parsed_key) for parsed_key in parsed_keys]
-            for future in as_completed(futures):
-                future.result()
+        chunks = [parsed_keys[start:start + chunk_size] for start in range(0, len(parsed_keys), chunk_size)]
+        results = TournamentResults()
+        if max_workers == 0:
+            self.handle_chunks_results(map(self.convert_chunk, chunks), results)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker, initargs=(self,)) as executor:
+                self.handle_chunks_results(executor.map(convert_chunk, chunks), results)
+        return results
+
+    def handle_chunks_results(self, chunks_results, results: TournamentResults):
+        """
+        Gathers the results of converted chunks and sends their failed summaries to corrections
+        Args:
+            chunks_results: The rows and failed keys of each chunk
+            results (TournamentResults): The results to complete
+        """
+        for rows, failed_keys in chunks_results:
+            for row in rows:
+                results.append_row(row)
+            if failed_keys:
+                print(f"Error converting {len(failed_keys)} summaries")
+                self.send_batch_to_corrections(failed_keys)
@@ -1,4 +1,5 @@
 import boto3
+from botocore.exceptions import ClientError
 
 from pkrcomponents.components.tournaments.tournament import Tournament
 from pkrcomponents.converters.summary_converter.abstract import AbstractSummaryConverter
@@ -14,6 +15,15 @@ class CloudSummaryConverter(AbstractSummaryConverter):  # pragma: no cover
         self.parsed_prefix = 'data/summaries/parsed'
         self.tournament = Tournament()
 
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["s3"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.s3 = boto3.client('s3')
+
     def list_parsed_summaries_keys(self) -> list:
         paginator = self.s3.get_paginator('list_objects_v2')
         pages = paginator.paginate(Bucket=self.bucket_name, Prefix=self.parsed_prefix)
@@ -32,3 +42,22 @@ class CloudSummaryConverter(AbstractSummaryConverter):  # pragma: no cover
                             Key=correction_key)
         self.s3.delete_object(Bucket=self.bucket_name, Key=file_key)
         print('Corrupt summary files have been moved to corrections directory')
+
+    def send_batch_to_corrections(self, file_keys: list):
+        copied_keys = []
+        for file_key in file_keys:
+            try:
+                self.s3.copy_object(Bucket=self.bucket_name, CopySource=f'{self.bucket_name}/{file_key}',
+                                    Key=file_key.replace('data', 'corrections'))
+            except ClientError as error:
+                print(f'Could not copy {file_key} to corrections directory: {error}')
+                continue
+            copied_keys.append(file_key)
+        nb_moved = len(copied_keys)
+        for start in range(0, len(copied_keys), 1000):
+            objects = [{'Key': file_key} for file_key in copied_keys[start:start + 1000]]
+            response = self.s3.delete_objects(Bucket=self.bucket_name, Delete={'Objects': objects, 'Quiet': True})
+            for error in response.get('Errors', []):
+                print(f"Could not delete {error['Key']} after copying it to corrections directory: {error['Message']}")
+                nb_moved -= 1
+        print(f'{nb_moved} of {len(file_keys)} corrupt summary files have been moved to corrections directory')
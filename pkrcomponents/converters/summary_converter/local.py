@@ -44,4 +44,4 @@ class LocalSummaryConverter(AbstractSummaryConverter):
         os.makedirs(os.path.dirname(correction_key), exist_ok=True)
         print(f"Moving {file_key} to {correction_key}")
         os.replace(file_key, correction_key)
-        print("Corrupt summary files have been moved to corrections directory")
\ No newline at end of file
+        print("Corrupt summary files have been moved to corrections directory")
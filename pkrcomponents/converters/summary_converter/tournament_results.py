@@ -0,0 +1,111 @@
+"""This module gathers the converted tournaments into columns, one value per tournament"""
+import numpy as np
+import pandas as pd
+
+from pkrcomponents.components.tournaments.tournament import Tournament
+
+COLUMNS_DTYPES = {
+    "id": str,
+    "name": str,
+    "buy_in_prize_pool": float,
+    "buy_in_bounty": float,
+    "buy_in_rake": float,
+    "speed": str,
+    "tournament_type": str,
+    "start_date": "datetime64[s]",
+    "total_players": np.int64,
+    "nb_entries": np.int64,
+    "prize_pool": float,
+    "final_position": float,
+    "amount_won": float,
+    "bounty_won": float,
+}
+
+
+class TournamentResults:
+    """
+    The results of many tournaments stored as columns, so that they can be sent between processes as plain tuples
+    and analysed without Tournament objects
+
+    Attributes:
+        columns (dict): The values of each column, one per tournament
+
+    Methods:
+        append(tournament): Adds the results of a tournament
+        append_row(row): Adds a row returned by get_row
+        merge(other): Adds the results of other tournament results
+        to_arrays(): Returns the columns as numpy arrays
+        to_dataframe(): Returns the columns as a DataFrame
+    """
+
+    def __init__(self):
+        self.columns = {column: [] for column in COLUMNS_DTYPES}
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    @staticmethod
+    def get_row(tournament: Tournament) -> tuple:
+        """
+        Returns the results of a tournament as a row
+
+        Args:
+            tournament (Tournament): The converted tournament
+
+        Returns:
+            row (tuple): The values of the columns, NaN as final position if unknown
+        """
+        buy_in = tournament.buy_in
+        final_position = np.nan if tournament.final_position is None else tournament.final_position
+        return (tournament.id, tournament.name, buy_in.prize_pool, buy_in.bounty, buy_in.rake,
+                None if tournament.speed is None else tournament.speed.name, tournament.tournament_type.name,
+                tournament.start_date, tournament.total_players, tournament.nb_entries, tournament.prize_pool,
+                final_position, tournament.amount_won, tournament.bounty_won)
+
+    def append(self, tournament: Tournament):
+        """
+        Adds the results of a tournament
+
+        Args:
+            tournament (Tournament): The converted tournament
+        """
+        self.append_row(self.get_row(tournament))
+
+    def append_row(self, row: tuple):
+        """
+        Adds the results of a tournament given as a row
+
+        Args:
+            row (tuple): The row, as returned by get_row
+        """
+        for values, value in zip(self.columns.values(), row):
+            values.append(value)
+
+    def merge(self, other: "TournamentResults"):
+        """
+        Adds the results of other tournament results
+
+        Args:
+            other (TournamentResults): The other results
+        """
+        for column, values in self.columns.items():
+            values.extend(other.columns[column])
+
+    def to_arrays(self) -> dict:
+        """
+        Returns the columns as numpy arrays
+
+        Returns:
+            arrays (dict): The array of each column
+        """
+        return {column: np.array(values, dtype=COLUMNS_DTYPES[column]).reshape(len(values))
+                for column, values in self.columns.items()}
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Returns the columns as a DataFrame
+
+        Returns:
+            df (pd.DataFrame): One row per tournament
+        """
+        return pd.DataFrame(self.to_arrays())
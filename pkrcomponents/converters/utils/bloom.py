@@ -0,0 +1,127 @@
+"""This module implements a Bloom filter, a compact probabilistic set of strings which can be saved to disk"""
+import hashlib
+import math
+import os
+
+import numpy as np
+
+
+def get_filter_size(capacity: int, false_positive_rate: float) -> tuple:
+    """
+    Returns the optimal number of bits and of hash functions of a Bloom filter
+
+    Args:
+        capacity (int): The number of items the filter is sized for
+        false_positive_rate (float): The probability of a false positive once the filter holds capacity items
+
+    Returns:
+        nb_bits (int): The number of bits, rounded up to a multiple of 8
+        nb_hashes (int): The number of hash functions
+    """
+    nb_bits = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+    nb_bits = max(8, (nb_bits + 7) // 8 * 8)
+    nb_hashes = max(1, round(nb_bits / capacity * math.log(2)))
+    return nb_bits, nb_hashes
+
+
+class BloomFilter:
+    """
+    A Bloom filter of strings: an item is set in nb_hashes bits, derived by double hashing from a single blake2b digest.
+    Membership tests have no false negatives, and false positives with a probability growing with the number of items.
+
+    Attributes:
+        capacity (int): The number of items the filter is sized for
+        nb_bits (int): The number of bits of the filter
+        nb_hashes (int): The number of bits set per item
+        count (int): The number of items added
+        bits (bytearray): The bits of the filter
+
+    Methods:
+        add(item): Adds an item to the filter
+        save(path): Saves the filter
+        load(path): Loads a saved filter
+    """
+
+    def __init__(self, capacity: int = 10_000_000, false_positive_rate: float = 1e-6):
+        self.capacity = capacity
+        self.nb_bits, self.nb_hashes = get_filter_size(capacity, false_positive_rate)
+        self.count = 0
+        self.bits = bytearray(self.nb_bits // 8)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        for position in self.get_positions(item):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get_positions(self, item: str) -> list:
+        """
+        Returns the positions of the bits of an item
+
+        Args:
+            item (str): The item
+
+        Returns:
+            positions (list): The positions of its nb_hashes bits
+        """
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first_hash, second_hash = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(first_hash + i * second_hash) % self.nb_bits for i in range(self.nb_hashes)]
+
+    def add(self, item: str):
+        """
+        Adds an item to the filter
+
+        Args:
+            item (str): The item
+        """
+        bits = self.bits
+        for position in self.get_positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    @property
+    def false_positive_probability(self) -> float:
+        """
+        Returns the estimated probability of a false positive, given the number of items added
+        """
+        return (1 - math.exp(-self.nb_hashes * self.count / self.nb_bits)) ** self.nb_hashes
+
+    def save(self, path: str):
+        """
+        Saves the filter through a temporary file, so that a crash never leaves a partial filter
+
+        Args:
+            path (str): The path of the file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{path}.tmp.npz"
+        np.savez(temporary_path, bits=np.frombuffer(self.bits, dtype=np.uint8), nb_hashes=np.int64(self.nb_hashes),
+                 capacity=np.int64(self.capacity), count=np.int64(self.count))
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        """
+        Loads a saved filter
+
+        Args:
+            path (str): The path of the file
+
+        Returns:
+            bloom_filter (BloomFilter): The filter
+        """
+        with np.load(path) as saved:
+            bloom_filter = cls.__new__(cls)
+            bloom_filter.bits = bytearray(saved["bits"].tobytes())
+            bloom_filter.nb_bits = len(bloom_filter.bits) * 8
+            bloom_filter.nb_hashes = int(saved["nb_hashes"])
+            bloom_filter.capacity = int(saved["capacity"])
+            bloom_filter.count = int(saved["count"])
+        return bloom_filter
@@ -0,0 +1,101 @@
+"""This module implements a bounded cache evicting the least recently used entries, shared by the conversion threads"""
+import threading
+from collections import OrderedDict
+
+DEFAULT_CAPACITY = 10_000
+
+
+class LRUCache:
+    """
+    A cache of at most capacity entries, which evicts the least recently used entry when a new one is added, so that
+    the memory of a long conversion run does not grow with the number of tournaments met. Its operations hold a lock,
+    so that the clones of a converter can share it across threads.
+
+    Attributes:
+        capacity (int): The maximum number of entries
+        entries (OrderedDict): The entries, from the least to the most recently used
+
+    Methods:
+        get(key): Returns the value of a key
+        put(key, value): Adds or replaces the value of a key
+        get_or_create(key, factory): Returns the value of a key, created by the factory if it is not cached
+        pop(key): Removes a key
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self.entries
+
+    def get(self, key, default=None):
+        """
+        Returns the value of a key, marked as the most recently used
+
+        Args:
+            key: The key
+            default: The value returned when the key is not cached
+
+        Returns:
+            value: The cached value, default if the key is not cached
+        """
+        with self._lock:
+            value = self.entries.get(key, default)
+            if key in self.entries:
+                self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """
+        Adds or replaces the value of a key, evicting the least recently used entry if the cache is full
+
+        Args:
+            key: The key
+            value: The value
+        """
+        with self._lock:
+            self._put(key, value)
+
+    def _put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def get_or_create(self, key, factory):
+        """
+        Returns the value of a key, created by the factory and added to the cache if it is not cached
+
+        Args:
+            key: The key
+            factory (function): The function called without arguments to create the value
+
+        Returns:
+            value: The cached or created value
+        """
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            value = factory()
+            self._put(key, value)
+            return value
+
+    def pop(self, key, default=None):
+        """
+        Removes a key from the cache
+
+        Args:
+            key: The key
+            default: The value returned when the key is not cached
+
+        Returns:
+            value: The removed value, default if the key was not cached
+        """
+        with self._lock:
+            return self.entries.pop(key, default)
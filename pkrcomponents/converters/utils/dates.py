@@ -0,0 +1,133 @@
+"""This module parses the fixed-format dates of the parsed histories and summaries without strptime"""
+import re
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+HISTORY_DATE_FORMAT = "%d-%m-%Y %H:%M:%S"
+SUMMARY_DATE_FORMAT = "%Y/%m/%d %H:%M:%S %Z"
+HISTORY_DATE_PATTERN = re.compile(r"(\d\d)-(\d\d)-(\d{4}) (\d\d):(\d\d):(\d\d)")
+SUMMARY_DATE_PATTERN = re.compile(r"(\d{4})/(\d\d)/(\d\d) (\d\d):(\d\d):(\d\d) (?:UTC|GMT)")
+# Positions of the characters of "YYYY-MM-DDTHH:MM:SS" in each layout, and the separators of the layout by position
+HISTORY_ISO_ORDER = np.array([6, 7, 8, 9, 2, 3, 4, 5, 0, 1, 10, 11, 12, 13, 14, 15, 16, 17, 18])
+HISTORY_SEPARATORS = {2: "-", 5: "-", 10: " ", 13: ":", 16: ":"}
+SUMMARY_ISO_ORDER = np.arange(19)
+SUMMARY_SEPARATORS = {4: "/", 7: "/", 10: " ", 13: ":", 16: ":"}
+SUMMARY_SUFFIXES = (b" UTC", b" GMT")
+ISO_SEPARATORS = {4: "-", 7: "-", 10: "T", 13: ":", 16: ":"}
+ISO_LENGTH = 19
+
+
+@lru_cache(maxsize=4096)
+def get_day(year: str, month: str, day: str) -> tuple:
+    """
+    Returns the validated year, month and day of a date prefix. Hands of a session share their day, so the
+    conversion and the validation of the calendar date are cached.
+
+    Args:
+        year (str): The year digits
+        month (str): The month digits
+        day (str): The day digits
+
+    Returns:
+        day (tuple): The year, month and day as integers
+    """
+    date = datetime(int(year), int(month), int(day))
+    return date.year, date.month, date.day
+
+
+def parse_history_date(date_string: str) -> datetime:
+    """
+    Returns the date of a parsed history, formatted as "%d-%m-%Y %H:%M:%S"
+
+    Args:
+        date_string (str): The date, like "04-01-2023 17:36:27"
+
+    Returns:
+        date (datetime): The date, as datetime.strptime(date_string, HISTORY_DATE_FORMAT)
+    """
+    match = HISTORY_DATE_PATTERN.fullmatch(date_string)
+    if match is None:
+        return datetime.strptime(date_string, HISTORY_DATE_FORMAT)
+    day, month, year, hour, minute, second = match.groups()
+    return datetime(*get_day(year, month, day), int(hour), int(minute), int(second))
+
+
+def parse_summary_date(date_string: str) -> datetime:
+    """
+    Returns the start date of a parsed summary, formatted as "%Y/%m/%d %H:%M:%S %Z"
+
+    Args:
+        date_string (str): The date, like "2023/01/04 17:30:01 UTC"
+
+    Returns:
+        date (datetime): The naive date, as datetime.strptime(date_string, SUMMARY_DATE_FORMAT)
+    """
+    match = SUMMARY_DATE_PATTERN.fullmatch(date_string)
+    if match is None:
+        return datetime.strptime(date_string, SUMMARY_DATE_FORMAT)
+    year, month, day, hour, minute, second = match.groups()
+    return datetime(*get_day(year, month, day), int(hour), int(minute), int(second))
+
+
+def to_datetime64(date_strings, iso_order: np.ndarray, separators: dict, length: int = None,
+                  suffixes: tuple = ()) -> np.ndarray:
+    """
+    Returns a column of fixed-format dates as datetime64, by reordering the characters of every date into the ISO
+    layout at once
+
+    Args:
+        date_strings: The dates, as a sequence or an array of strings
+        iso_order (np.ndarray): The position in the layout of each character of the ISO layout
+        separators (dict): The separator expected at each position of the layout
+        length (int): The length of the dates, None to ignore the characters after the ISO ones
+        suffixes (tuple): The suffixes allowed after the ISO characters, as bytes, empty to ignore them
+
+    Returns:
+        dates (np.ndarray): The dates as datetime64[s]
+    """
+    encoded = np.asarray(date_strings, dtype=bytes)
+    shape = encoded.shape
+    encoded = encoded.reshape(-1).astype(f"S{max(encoded.itemsize, ISO_LENGTH, length or 0)}")
+    characters = encoded.view(np.uint8).reshape(len(encoded), encoded.itemsize)
+    positions = list(separators)
+    invalid = (characters[:, positions] != np.frombuffer("".join(separators.values()).encode(), np.uint8)).any()
+    if length is not None:
+        invalid |= (characters[:, :length] == 0).any() or characters[:, length:].any()
+    if suffixes and len(encoded):
+        lengths = np.char.str_len(encoded)
+        invalid |= not np.logical_or.reduce(
+            [np.char.endswith(encoded, suffix) & (lengths == ISO_LENGTH + len(suffix)) for suffix in suffixes]).all()
+    if invalid:
+        raise ValueError("The dates do not match the fixed layout")
+    iso = characters[:, iso_order]
+    iso[:, list(ISO_SEPARATORS)] = np.frombuffer("".join(ISO_SEPARATORS.values()).encode(), np.uint8)
+    return np.ascontiguousarray(iso).view(f"S{ISO_LENGTH}").reshape(shape).astype("datetime64[s]")
+
+
+def parse_history_dates(date_strings) -> np.ndarray:
+    """
+    Returns a column of history dates, formatted as "%d-%m-%Y %H:%M:%S", as datetime64
+
+    Args:
+        date_strings: The dates, as a sequence or an array of strings
+
+    Returns:
+        dates (np.ndarray): The dates as datetime64[s]
+    """
+    return to_datetime64(date_strings, HISTORY_ISO_ORDER, HISTORY_SEPARATORS, length=ISO_LENGTH)
+
+
+def parse_summary_dates(date_strings) -> np.ndarray:
+    """
+    Returns a column of summary start dates, formatted as "%Y/%m/%d %H:%M:%S %Z", as naive datetime64. As with
+    parse_summary_date, only the UTC and GMT time zones are accepted.
+
+    Args:
+        date_strings: The dates, as a sequence or an array of strings
+
+    Returns:
+        dates (np.ndarray): The dates as datetime64[s]
+    """
+    return to_datetime64(date_strings, SUMMARY_ISO_ORDER, SUMMARY_SEPARATORS, suffixes=SUMMARY_SUFFIXES)
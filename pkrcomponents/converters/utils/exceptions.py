@@ -18,4 +18,45 @@ class SummaryConversionError(Exception):
                             f"Original error: {str(original_exception)}")
         else:
             self.message = "Error converting summary"
-        super().__init__(self.message)
\ No newline at end of file
+        super().__init__(self.message)
+
+
+class HistorySchemaError(ValueError):
+    def __init__(self, path: str, reason: str):
+        self.path = path
+        self.reason = reason
+        self.message = f"Invalid parsed history at {path}: {reason}"
+        super().__init__(self.message)
+
+
+class ArchiveFormatError(Exception):
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(self.message)
+
+
+class MemoryGrowthWarning(UserWarning):
+    def __init__(self, batch: int, retained_per_hand: float):
+        self.batch = batch
+        self.retained_per_hand = retained_per_hand
+        self.message = (f"Memory retained per hand grew by {retained_per_hand:.0f} bytes in batch {batch}, "
+                        f"a reset path may keep references to previous hands")
+        super().__init__(self.message)
+
+
+class BloomFilterSaturationWarning(UserWarning):
+    def __init__(self, count: int, capacity: int, false_positive_probability: float):
+        self.count = count
+        self.capacity = capacity
+        self.false_positive_probability = false_positive_probability
+        self.message = (f"The filter of the converted hands holds {count} hands for a capacity of {capacity}, "
+                        f"{false_positive_probability:.2e} of the new hands are skipped as false duplicates")
+        super().__init__(self.message)
+
+
+class DuplicateHandError(Exception):
+    def __init__(self, file_key: str, hand_id: str):
+        self.file_key = file_key
+        self.hand_id = hand_id
+        self.message = f"Hand {hand_id} of file {file_key} was already converted"
+        super().__init__(self.message)
@@ -0,0 +1,191 @@
+"""This module accounts for the memory allocated and retained by the conversion of the hands, with tracemalloc"""
+import gc
+import sys
+import threading
+import tracemalloc
+import warnings
+
+import pandas as pd
+
+from pkrcomponents.converters.utils.exceptions import MemoryGrowthWarning
+from pkrcomponents.converters.utils.timing import PhaseHistogram
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+DEFAULT_BATCH_SIZE = 1000
+NB_SITES = 10
+GROWTH_THRESHOLD = 1024
+IGNORED_FILES = (tracemalloc.__file__, __file__, "<frozen importlib._bootstrap>",
+                 "<frozen importlib._bootstrap_external>", "<unknown>")
+
+
+def get_peak_rss() -> int:
+    """
+    Returns the peak resident set size of the process
+
+    Returns:
+        peak_rss (int): The peak resident set size, in bytes, None where the resource module is not available
+    """
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+class MemoryTracker:
+    """
+    Opt-in accounting of the memory of the converted hands, with tracemalloc. The memory is measured at the end of each
+    hand, so that a hand is charged with everything done since the end of the previous one, the reset of the table
+    included. Every batch_size hands, the cyclic garbage is collected, the traces are diffed with those of the previous
+    batch to find the top allocation sites, and a MemoryGrowthWarning is raised when a batch after the first retains
+    more than growth_threshold bytes per hand. As tracemalloc traces the whole process, hands converted concurrently
+    share their measures.
+
+    Attributes:
+        enabled (bool): Whether the memory is measured
+        batch_size (int): The number of hands of a batch
+        nb_sites (int): The number of allocation sites kept per batch
+        growth_threshold (int): The bytes retained per hand above which a batch raises a warning
+        allocated (PhaseHistogram): The bytes allocated at the peak of each hand, and the largest hands
+        batches (list): The measures of each batch
+        sites (list): The (site, size_diff, count_diff) of the top allocation sites of the last batch
+
+    Methods:
+        end_hand(hand_id): Records the memory of a hand
+        end_batch(): Records the memory of the current batch
+        stop(): Stops tracing the memory
+        summary(): Returns the measures of each batch as a DataFrame
+        report(): Returns the measures as text
+    """
+
+    def __init__(self, enabled: bool = True, batch_size: int = DEFAULT_BATCH_SIZE, nb_sites: int = NB_SITES,
+                 growth_threshold: int = GROWTH_THRESHOLD):
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.nb_sites = nb_sites
+        self.growth_threshold = growth_threshold
+        self.allocated = PhaseHistogram()
+        self.batches = []
+        self.sites = []
+        self._lock = threading.RLock()
+        self._started = False
+        self._snapshot = None
+        if enabled:
+            self.start()
+
+    def start(self):
+        """
+        Starts tracing the memory, unless it is already traced, and takes the reference snapshot of the first batch
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+        self._snapshot = self.take_snapshot()
+        self._start_batch()
+
+    def stop(self):
+        """
+        Stops tracing the memory, if the tracker started it
+        """
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+        self._snapshot = None
+
+    @staticmethod
+    def take_snapshot() -> tracemalloc.Snapshot:
+        """
+        Returns a snapshot of the traces, without the allocations of tracemalloc, of the tracker and of the imports
+        """
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, filename)
+                                                          for filename in IGNORED_FILES])
+
+    def _start_batch(self):
+        gc.collect()
+        self._current = self._batch_current = tracemalloc.get_traced_memory()[0]
+        self._batch_blocks = sys.getallocatedblocks()
+        self._batch_hands = 0
+        self._batch_allocated = 0
+        tracemalloc.reset_peak()
+
+    def end_hand(self, hand_id: str):
+        """
+        Records the memory of the hand which just ended, and of its batch if it is the last hand of the batch
+
+        Args:
+            hand_id (str): The id of the hand, or the key of its file if it could not be read
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            current, peak = tracemalloc.get_traced_memory()
+            allocated = max(peak - self._current, 0)
+            self.allocated.add(allocated, hand_id)
+            self._current = current
+            self._batch_hands += 1
+            self._batch_allocated += allocated
+            tracemalloc.reset_peak()
+            if self._batch_hands >= self.batch_size:
+                self.end_batch()
+
+    def end_batch(self):
+        """
+        Records the memory of the current batch: the bytes allocated and retained per hand, the memory blocks retained
+        per hand, the peak resident set size and the top allocation sites since the previous batch
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if not self._batch_hands:
+                return
+            gc.collect()
+            current = tracemalloc.get_traced_memory()[0]
+            retained_per_hand = (current - self._batch_current) / self._batch_hands
+            self.batches.append({
+                "batch": len(self.batches),
+                "hands": self._batch_hands,
+                "allocated_per_hand": self._batch_allocated / self._batch_hands,
+                "retained_per_hand": retained_per_hand,
+                "blocks_per_hand": (sys.getallocatedblocks() - self._batch_blocks) / self._batch_hands,
+                "traced_bytes": current,
+                "peak_rss": get_peak_rss(),
+            })
+            snapshot = self.take_snapshot()
+            self.sites = [(str(statistic.traceback), statistic.size_diff, statistic.count_diff)
+                          for statistic in snapshot.compare_to(self._snapshot, "lineno")[:self.nb_sites]]
+            self._snapshot = snapshot
+            if len(self.batches) > 1 and retained_per_hand > self.growth_threshold:
+                warnings.warn(MemoryGrowthWarning(len(self.batches) - 1, retained_per_hand), stacklevel=2)
+            self._start_batch()
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Returns the measures of each batch
+
+        Returns:
+            df (pd.DataFrame): One row per batch, with the number of hands, the bytes allocated and retained per hand,
+            the memory blocks retained per hand, the traced bytes and the peak resident set size
+        """
+        columns = ["batch", "hands", "allocated_per_hand", "retained_per_hand", "blocks_per_hand", "traced_bytes",
+                   "peak_rss"]
+        return pd.DataFrame(self.batches, columns=columns)
+
+    def report(self) -> str:
+        """
+        Returns the measures of the batches, the largest hands and the top allocation sites of the last batch as text
+
+        Returns:
+            report (str): The report
+        """
+        if not self.allocated.count:
+            return "No memory measured"
+        lines = [
+            self.summary().to_string(index=False, float_format="{:.1f}".format),
+            f"Allocated per hand: p50 {self.allocated.percentile(50)} B, p99 {self.allocated.percentile(99)} B, "
+            f"max {self.allocated.max} B, largest hands {self.allocated.slowest_hands}",
+        ]
+        lines.extend(f"{site}: {size_diff:+d} B, {count_diff:+d} blocks" for site, size_diff, count_diff in self.sites)
+        return "\n".join(lines)
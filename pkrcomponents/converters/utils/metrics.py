@@ -0,0 +1,290 @@
+"""This module exports the throughput and the errors of the conversion runs in the Prometheus text format"""
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pkrcomponents.converters.settings import METRICS_INTERVAL, METRICS_PATH, METRICS_PORT
+
+DEFAULT_INTERVAL = 10.0
+NO_METRICS = nullcontext()
+
+
+class ConversionMetrics:
+    """
+    Opt-in counters and gauges of a conversion run, updated under a lock once per hand so that their overhead is
+    negligible. When disabled, hand() returns a shared no-op context manager. Each process keeps its own metrics and
+    labels them with its pid, so that the files or the endpoints of several processes can be scraped together.
+
+    Attributes:
+        enabled (bool): Whether the metrics are updated
+        hands_converted (int): The number of hands converted
+        errors (Counter): The number of hands which failed, by exception type
+        hands_skipped (int): The number of hands skipped as duplicates, not counted as converted nor failed
+        bytes_read (int): The number of characters of parsed histories read, their bytes for ASCII histories
+        corrections (int): The number of parsed histories moved to the corrections
+        queue_depth (int): The number of hands submitted and not converted yet
+        hands_in_progress (int): The number of hands being converted
+        workers (int): The number of workers converting the hands
+        busy_seconds (float): The time spent converting hands, summed over the workers
+
+    Methods:
+        hand(): Returns a context manager counting the conversion of a hand
+        add_bytes_read(nb_bytes): Counts the bytes of a parsed history
+        count_correction(): Counts a parsed history moved to the corrections
+        count_skipped(): Counts a hand skipped as a duplicate
+        set_queue_depth(queue_depth): Sets the number of hands waiting
+        set_workers(workers): Sets the number of workers
+        render(): Returns the metrics in the Prometheus text format
+        write(path): Writes the metrics to a file, atomically
+        start(path, port, interval): Exports the metrics periodically to a file, or on an HTTP endpoint
+        stop(): Stops exporting the metrics, after a last write
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started_at = time.monotonic()
+        self.hands_converted = 0
+        self.errors = Counter()
+        self.hands_skipped = 0
+        self.bytes_read = 0
+        self.corrections = 0
+        self.queue_depth = 0
+        self.hands_in_progress = 0
+        self.workers = 1
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._writer = None
+        self._server = None
+        self._path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def hand(self):
+        """
+        Returns a context manager counting the conversion of a hand, and its error by type if it fails, a no-op one
+        when the metrics are disabled
+        """
+        if not self.enabled:
+            return NO_METRICS
+        return self._count_hand()
+
+    @contextmanager
+    def _count_hand(self):
+        with self._lock:
+            self.hands_in_progress += 1
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self.hands_in_progress -= 1
+                self.busy_seconds += duration
+                if error is None:
+                    self.hands_converted += 1
+                else:
+                    self.errors[error] += 1
+
+    def add_bytes_read(self, nb_bytes: int):
+        """
+        Counts the bytes of a parsed history read
+
+        Args:
+            nb_bytes (int): The number of bytes
+        """
+        if self.enabled:
+            with self._lock:
+                self.bytes_read += nb_bytes
+
+    def count_correction(self):
+        """
+        Counts a parsed history moved to the corrections
+        """
+        if self.enabled:
+            with self._lock:
+                self.corrections += 1
+
+    def count_skipped(self):
+        """
+        Counts a hand skipped as a duplicate
+        """
+        if self.enabled:
+            with self._lock:
+                self.hands_skipped += 1
+
+    def set_queue_depth(self, queue_depth: int):
+        """
+        Sets the number of hands submitted and not converted yet
+
+        Args:
+            queue_depth (int): The number of hands
+        """
+        self.queue_depth = queue_depth
+
+    def set_workers(self, workers: int):
+        """
+        Sets the number of workers converting the hands
+
+        Args:
+            workers (int): The number of workers
+        """
+        self.workers = workers
+
+    def render(self) -> str:
+        """
+        Returns the metrics in the Prometheus text exposition format, labelled with the pid of the process
+
+        Returns:
+            text (str): The metrics
+        """
+        with self._lock:
+            uptime = max(time.monotonic() - self.started_at, 1e-9)
+            errors = sorted(self.errors.items())
+            metrics = [
+                ("hands_converted_total", "counter", "Hands converted", self.hands_converted),
+                ("hands_skipped_total", "counter", "Hands skipped as duplicates", self.hands_skipped),
+                ("bytes_read_total", "counter", "Bytes of parsed histories read", self.bytes_read),
+                ("corrections_total", "counter", "Parsed histories moved to the corrections", self.corrections),
+                ("worker_busy_seconds_total", "counter", "Time spent converting hands", self.busy_seconds),
+                ("hands_per_second", "gauge", "Hands converted per second since the start",
+                 self.hands_converted / uptime),
+                ("bytes_read_per_second", "gauge", "Bytes read per second since the start", self.bytes_read / uptime),
+                ("queue_depth", "gauge", "Hands submitted and not converted yet", self.queue_depth),
+                ("hands_in_progress", "gauge", "Hands being converted", self.hands_in_progress),
+                ("workers", "gauge", "Workers converting the hands", self.workers),
+                ("worker_utilization", "gauge", "Share of the time of the workers spent converting hands",
+                 self.busy_seconds / (uptime * self.workers)),
+                ("uptime_seconds", "gauge", "Time since the start of the run", uptime),
+            ]
+        pid = f'pid="{os.getpid()}"'
+        lines = []
+        for name, metric_type, description, value in metrics:
+            lines.extend([f"# HELP pkr_{name} {description}", f"# TYPE pkr_{name} {metric_type}",
+                          f"pkr_{name}{{{pid}}} {value}"])
+        lines.extend(["# HELP pkr_hands_failed_total Hands which failed, by exception type",
+                      "# TYPE pkr_hands_failed_total counter"])
+        lines.extend(f'pkr_hands_failed_total{{{pid},error="{error}"}} {count}' for error, count in errors)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """
+        Writes the metrics to a file through a temporary file, so that readers never see a partial file. A "{pid}" in
+        the path is replaced by the pid of the process, so that processes do not overwrite each other.
+
+        Args:
+            path (str): The path of the file, like "metrics/convert_histories_{pid}.prom"
+        """
+        path = path.format(pid=os.getpid())
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write(self.render())
+        os.replace(temporary_path, path)
+
+    def start(self, path: str = None, port: int = None, interval: float = DEFAULT_INTERVAL):
+        """
+        Exports the metrics periodically to a file, and on demand on a local HTTP endpoint
+
+        Args:
+            path (str): The path of the file, None to write no file
+            port (int): The port of the HTTP endpoint, None to serve no endpoint, 0 for any free port
+            interval (float): The time between two writes of the file, in seconds
+        """
+        self._stopped.clear()
+        if path is not None:
+            self._path = path
+            self._writer = threading.Thread(target=self._write_periodically, args=(path, interval),
+                                            name="MetricsWriter", daemon=True)
+            self._writer.start()
+        if port is not None:
+            self._server = ThreadingHTTPServer(("127.0.0.1", port), self._get_handler())
+            threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True).start()
+
+    @property
+    def port(self) -> int:
+        """
+        Returns the port of the HTTP endpoint, None if the metrics are not served
+        """
+        return None if self._server is None else self._server.server_address[1]
+
+    def _write_periodically(self, path: str, interval: float):
+        while not self._stopped.wait(interval):
+            self.write(path)
+
+    def _get_handler(self) -> type:
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return MetricsHandler
+
+    def stop(self):
+        """
+        Stops exporting the metrics, after a last write of the file
+        """
+        self._stopped.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+            self.write(self._path)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+@contextmanager
+def export_metrics(converter, path: str = None, port: int = None, interval: float = None):
+    """
+    Exports the metrics of a conversion run as configured by the POKER_METRICS_PATH, POKER_METRICS_PORT and
+    POKER_METRICS_INTERVAL environment variables, or by the arguments. Without a path nor a port, the metrics of the
+    converter stay disabled.
+
+    Args:
+        converter (AbstractHandHistoryConverter): The converter whose metrics are exported
+        path (str): The path of the metrics file, with an optional "{pid}" placeholder
+        port (int): The port of the local HTTP endpoint
+        interval (float): The time between two writes of the file, in seconds
+
+    Returns:
+        metrics (ConversionMetrics): The exported metrics, None if they are not exported
+    """
+    path = path or METRICS_PATH
+    port = port if port is not None else int(METRICS_PORT) if METRICS_PORT else None
+    interval = interval or float(METRICS_INTERVAL or DEFAULT_INTERVAL)
+    if path is None and port is None:
+        yield None
+        return
+    converter.metrics = ConversionMetrics()
+    converter.metrics.start(path=path, port=port, interval=interval)
+    try:
+        yield converter.metrics
+    finally:
+        converter.metrics.stop()
@@ -0,0 +1,342 @@
+"""This module profiles long conversion runs by sampling, cheaply enough to be left on in production"""
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
+
+from pkrcomponents.converters.settings import PROFILE_DIR, PROFILE_EVERY, PROFILE_INTERVAL
+
+DEFAULT_INTERVAL = 0.01
+MAX_DEPTH = 128
+CONVERTER_THREAD_PREFIX = "HandConverter"
+# Leaf frames of the threads blocked waiting: on an event, a condition or a join, or a pool worker waiting for work
+IDLE_FUNCTIONS = frozenset({"threading:wait", "threading:_wait_for_tstate_lock", "thread:_worker"})
+NO_PROFILE = nullcontext()
+PROCESS_WIDE_PROFILER = sys.version_info >= (3, 12)
+_profiler_lock = threading.Lock()
+
+
+def get_frame_label(code) -> str:
+    """
+    Returns the label of a function in the collapsed stacks, like "pkrcomponents.components.tables.table:execute_flop"
+
+    Args:
+        code (CodeType): The code object of the function
+
+    Returns:
+        label (str): The module and the name of the function
+    """
+    module = os.path.splitext(code.co_filename)[0].replace("\\", "/")
+    if "/pkrcomponents/" in module:
+        module = "pkrcomponents." + module.rsplit("/pkrcomponents/", 1)[1].replace("/", ".")
+    else:
+        module = os.path.basename(module)
+    return f"{module}:{code.co_name}"
+
+
+class StackSampler:
+    """
+    A sampling profiler: a daemon thread reads the stacks of the profiled threads at a fixed interval and counts each
+    distinct stack, so that the profiled code runs at full speed between samples. The stacks of the threads blocked
+    waiting, whose leaf frame is one of IDLE_FUNCTIONS, are not counted. The counts are aggregated by function and
+    written as collapsed stacks, the input of flamegraph tools.
+
+    Attributes:
+        interval (float): The time between two samples, in seconds
+        all_threads (bool): Whether all the threads are sampled, or only the thread which started the sampler
+        thread_prefix (str): The prefix of the names of the threads sampled with the thread which started the sampler
+        stacks (Counter): The number of samples of each stack, as tuples of labels from the root to the leaf
+        nb_samples (int): The number of samples taken
+        nb_idle_samples (int): The number of stacks not counted because their thread was waiting
+
+    Methods:
+        start(): Starts sampling
+        stop(): Stops sampling
+        summary(top): Returns the samples aggregated by function
+        collapsed(): Returns the stacks in the collapsed format
+        write_collapsed(path): Writes the stacks in the collapsed format
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, all_threads: bool = False, thread_prefix: str = None):
+        self.interval = interval
+        self.all_threads = all_threads
+        self.thread_prefix = thread_prefix
+        self.stacks = Counter()
+        self.nb_samples = 0
+        self.nb_idle_samples = 0
+        self._labels = {}
+        self._thread = None
+        self._target_id = None
+        self._stopped = threading.Event()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """
+        Starts sampling the current thread and the threads named with the prefix, or all the threads
+        """
+        self._target_id = threading.get_ident()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="StackSampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops sampling and waits for the sampling thread
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        sampler_id = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            frames = sys._current_frames()
+            if self.all_threads:
+                self.sample(frame for thread_id, frame in frames.items() if thread_id != sampler_id)
+            elif self.thread_prefix is not None:
+                thread_ids = {thread.ident for thread in threading.enumerate()
+                              if thread.name.startswith(self.thread_prefix)}
+                thread_ids.add(self._target_id)
+                self.sample(frame for thread_id, frame in frames.items() if thread_id in thread_ids)
+            elif self._target_id in frames:
+                self.sample([frames[self._target_id]])
+
+    def sample(self, frames):
+        """
+        Counts the stacks of frames, except those of the waiting threads
+
+        Args:
+            frames: The current frames of the sampled threads
+        """
+        labels = self._labels
+        for frame in frames:
+            label = labels.get(frame.f_code)
+            if label is None:
+                label = labels[frame.f_code] = get_frame_label(frame.f_code)
+            if label in IDLE_FUNCTIONS:
+                self.nb_idle_samples += 1
+                continue
+            stack = []
+            while frame is not None and len(stack) < MAX_DEPTH:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = get_frame_label(code)
+                stack.append(label)
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+        self.nb_samples += 1
+
+    def summary(self, top: int = None) -> pd.DataFrame:
+        """
+        Returns the samples aggregated by function: the self samples, in which the function was running, and the
+        total samples, in which it was on the stack
+
+        Args:
+            top (int): The number of functions to keep, the most sampled first, all if None
+
+        Returns:
+            df (pd.DataFrame): One row per function, with its self and total samples and their shares
+        """
+        self_samples, total_samples = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            self_samples[stack[-1]] += count
+            for label in set(stack):
+                total_samples[label] += count
+        nb_stacks = max(sum(self.stacks.values()), 1)
+        df = pd.DataFrame({
+            "function": list(total_samples),
+            "self_samples": [self_samples[label] for label in total_samples],
+            "total_samples": list(total_samples.values()),
+        }, columns=["function", "self_samples", "total_samples"])
+        df["self_share"] = df["self_samples"] / nb_stacks
+        df["total_share"] = df["total_samples"] / nb_stacks
+        df = df.sort_values(["self_samples", "total_samples"], ascending=False, ignore_index=True)
+        return df if top is None else df.head(top)
+
+    def collapsed(self) -> str:
+        """
+        Returns the stacks in the collapsed format: one line per stack, its frames from the root separated by
+        semicolons, followed by its number of samples
+
+        Returns:
+            collapsed (str): The collapsed stacks
+        """
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def write_collapsed(self, path: str):
+        """
+        Writes the stacks in the collapsed format, to render them with flamegraph.pl or speedscope
+
+        Args:
+            path (str): The path of the output file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.collapsed())
+
+
+class HandProfiler:
+    """
+    A deterministic profiler of one hand in every N, so that a run is profiled at 1 / N of the cost of profiling all
+    its hands. The statistics of the profiled hands are merged across the run. A single hand of the process is
+    profiled at a time: when the Nth hand cannot be profiled, because another hand is profiled or another profiling
+    tool is active, the next hand is profiled instead. From Python 3.12, a profiler records all the threads, so a hand
+    is only profiled when no other hand is being converted, and runs with many workers profile fewer hands.
+
+    Attributes:
+        every (int): The period of the profiled hands, 0 to profile no hand
+        process_wide (bool): Whether an enabled profiler records all the threads
+        nb_hands (int): The number of hands seen
+        nb_profiled_hands (int): The number of hands profiled
+        stats (pstats.Stats): The merged statistics, None before the first profiled hand
+
+    Methods:
+        hand(): Returns a context manager profiling the hand if it is the Nth one
+        summary(top): Returns the statistics by function
+        write_stats(path): Writes the statistics, readable with pstats or snakeviz
+    """
+
+    def __init__(self, every: int = 0, process_wide: bool = PROCESS_WIDE_PROFILER):
+        self.every = every
+        self.process_wide = process_wide
+        self.nb_hands = 0
+        self.nb_profiled_hands = 0
+        self.stats = None
+        self._lock = threading.Lock()
+        self._nb_hands_in_flight = 0
+        self._pending = False
+
+    def hand(self):
+        """
+        Returns a context manager profiling the current hand if it is the Nth one, or if the previous Nth hand could not
+        be profiled, a no-op one when the profiler is disabled
+        """
+        if not self.every:
+            return NO_PROFILE
+        return self._profile_hand()
+
+    def _start_profile(self) -> cProfile.Profile:
+        with self._lock:
+            self.nb_hands += 1
+            self._nb_hands_in_flight += 1
+            if self.nb_hands % self.every == 0:
+                self._pending = True
+            if not self._pending or (self.process_wide and self._nb_hands_in_flight > 1):
+                return None
+            if not _profiler_lock.acquire(blocking=False):
+                return None
+            self._pending = False
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            _profiler_lock.release()
+            with self._lock:
+                self._pending = True
+            return None
+        return profile
+
+    @contextmanager
+    def _profile_hand(self):
+        profile = self._start_profile()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                _profiler_lock.release()
+            with self._lock:
+                self._nb_hands_in_flight -= 1
+                if profile is not None:
+                    self.nb_profiled_hands += 1
+                    if self.stats is None:
+                        self.stats = pstats.Stats(profile)
+                    else:
+                        self.stats.add(profile)
+
+    def summary(self, top: int = None) -> pd.DataFrame:
+        """
+        Returns the statistics of the profiled hands by function, the longest own time first
+
+        Args:
+            top (int): The number of functions to keep, all if None
+
+        Returns:
+            df (pd.DataFrame): One row per function, with its number of calls, own time and cumulative time per hand
+        """
+        rows = []
+        if self.stats is not None:
+            for (filename, line, name), (_, nb_calls, own_time, cumulative_time, _) in self.stats.stats.items():
+                rows.append({
+                    "function": f"{os.path.basename(filename)}:{line}({name})",
+                    "calls_per_hand": nb_calls / self.nb_profiled_hands,
+                    "own_ms_per_hand": own_time * 1e3 / self.nb_profiled_hands,
+                    "cumulative_ms_per_hand": cumulative_time * 1e3 / self.nb_profiled_hands,
+                })
+        df = pd.DataFrame(rows, columns=["function", "calls_per_hand", "own_ms_per_hand", "cumulative_ms_per_hand"])
+        df = df.sort_values("own_ms_per_hand", ascending=False, ignore_index=True)
+        return df if top is None else df.head(top)
+
+    def write_stats(self, path: str):
+        """
+        Writes the merged statistics
+
+        Args:
+            path (str): The path of the output file
+        """
+        if self.stats is not None:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.stats.dump_stats(path)
+
+
+@contextmanager
+def profile_run(name: str, converter=None, interval: float = None, every: int = None, output_dir: str = None):
+    """
+    Profiles a run as configured by the POKER_PROFILE_INTERVAL, POKER_PROFILE_EVERY and POKER_PROFILE_DIR environment
+    variables, or by the arguments. Without any of them, the run is not profiled. The stacks are sampled in the thread
+    of the run and in the converter worker threads, not in the other threads like the progress bar monitor. The results
+    are written in the output directory as <name>.collapsed and <name>.prof, and the most sampled functions are printed.
+
+    Args:
+        name (str): The name of the run
+        converter (AbstractHandHistoryConverter): The converter whose hands are profiled one in every N
+        interval (float): The time between two stack samples, in seconds
+        every (int): The period of the profiled hands
+        output_dir (str): The directory of the results, the current directory if None
+
+    Returns:
+        sampler (StackSampler): The stack sampler of the run, None if the stacks are not sampled
+    """
+    interval = interval if interval is not None else float(PROFILE_INTERVAL) if PROFILE_INTERVAL else None
+    every = every if every is not None else int(PROFILE_EVERY) if PROFILE_EVERY else 0
+    output_dir = output_dir or PROFILE_DIR or os.getcwd()
+    sampler = StackSampler(interval=interval, thread_prefix=CONVERTER_THREAD_PREFIX) if interval else None
+    if every and converter is not None:
+        converter.hand_profiler = HandProfiler(every=every)
+    try:
+        with sampler if sampler is not None else nullcontext():
+            yield sampler
+    finally:
+        if sampler is not None:
+            sampler.write_collapsed(os.path.join(output_dir, f"{name}.collapsed"))
+            print(sampler.summary(top=20).to_string(index=False))
+        if every and converter is not None:
+            converter.hand_profiler.write_stats(os.path.join(output_dir, f"{name}.prof"))
+            print(converter.hand_profiler.summary(top=20).to_string(index=False))
@@ -0,0 +1,255 @@
+"""This module declares the schema of the parsed hand histories and validates them in a single pass"""
+from attrs import define, field
+
+from pkrcomponents.converters.utils.exceptions import HistorySchemaError
+
+
+@define(frozen=True)
+class Value:
+    """
+    A scalar value of the schema
+
+    Attributes:
+        kind (type): The expected type. Integers are accepted and cast for float values
+        optional (bool): Whether the value can be null
+        min_value (float): The minimum accepted value
+        max_value (float): The maximum accepted value
+        min_len (int): The minimum accepted length
+        max_len (int): The maximum accepted length
+    """
+    kind = field()
+    optional = field(default=False)
+    min_value = field(default=None)
+    max_value = field(default=None)
+    min_len = field(default=None)
+    max_len = field(default=None)
+
+
+@define(frozen=True)
+class Record:
+    """
+    A dictionary with known keys, all of them required
+
+    Attributes:
+        fields (dict): The schema of each key
+    """
+    fields = field()
+
+
+@define(frozen=True)
+class MappingOf:
+    """
+    A dictionary with free keys and values sharing the same schema
+
+    Attributes:
+        values (object): The schema of the values
+    """
+    values = field()
+
+
+@define(frozen=True)
+class ListOf:
+    """
+    A list of items sharing the same schema
+
+    Attributes:
+        items (object): The schema of the items
+    """
+    items = field()
+
+
+AMOUNT = Value(float, min_value=0)
+CARD = Value(str, optional=True)
+SEAT = Value(int, min_value=0, max_value=10)
+
+HISTORY_SCHEMA = Record({
+    "tournament_info": Record({
+        "tournament_name": Value(str),
+        "tournament_id": Value(str),
+        "table_number": Value(str),
+    }),
+    "buy_in": AMOUNT,
+    "hand_id": Value(str),
+    "datetime": Value(str),
+    "game_type": Value(str),
+    "level": Record({
+        "value": Value(int, min_value=0),
+        "ante": AMOUNT,
+        "sb": AMOUNT,
+        "bb": AMOUNT,
+    }),
+    "max_players": Value(int, min_value=2, max_value=10),
+    "button_seat": SEAT,
+    "players": MappingOf(Record({
+        "seat": SEAT,
+        "name": Value(str, min_len=3, max_len=12),
+        "init_stack": AMOUNT,
+        "bounty": AMOUNT,
+        "entered_hand": Value(bool),
+    })),
+    "hero_hand": Record({
+        "hero": Value(str),
+        "first_card": CARD,
+        "second_card": CARD,
+    }),
+    "postings": ListOf(Record({
+        "name": Value(str),
+        "amount": AMOUNT,
+        "blind_type": Value(str),
+    })),
+    "actions": MappingOf(ListOf(Record({
+        "player": Value(str),
+        "action": Value(str),
+        "amount": AMOUNT,
+        "is_all_in": Value(bool, optional=True),
+    }))),
+    "flop": Record({
+        "flop_card_1": CARD,
+        "flop_card_2": CARD,
+        "flop_card_3": CARD,
+    }),
+    "turn": Record({"turn_card": CARD}),
+    "river": Record({"river_card": CARD}),
+    "showdown": MappingOf(Record({
+        "first_card": Value(str),
+        "second_card": Value(str),
+    })),
+})
+
+
+class SchemaMismatch(Exception):
+    """
+    Raised by the compiled checkers. The keys of the nodes are collected while the exception goes up, so that the
+    path of the invalid value is only built when the history is invalid.
+    """
+    def __init__(self, reason: str):
+        self.reason = reason
+        self.keys = []
+        super().__init__(reason)
+
+    @property
+    def path(self) -> str:
+        path = ""
+        for key in reversed(self.keys):
+            if isinstance(key, int):
+                path = f"{path}[{key}]"
+            else:
+                path = f"{path}.{key}" if path else key
+        return path
+
+
+def compile_value(schema: Value):
+    """
+    Compiles a scalar value of the schema into a checker function, with its bounds bound as constants
+
+    Args:
+        schema (Value): The schema of the value
+
+    Returns:
+        checker (function): A function checking a value and returning it normalized
+    """
+    kind, optional, casts_int = schema.kind, schema.optional, schema.kind is float
+    min_value, max_value, min_len, max_len = schema.min_value, schema.max_value, schema.min_len, schema.max_len
+    has_bounds = min_value is not None or max_value is not None
+    has_length = min_len is not None or max_len is not None
+
+    def check_value(value):
+        if value is None:
+            if optional:
+                return None
+            raise SchemaMismatch("missing value")
+        if casts_int and type(value) is int:
+            value = float(value)
+        elif type(value) is not kind:
+            raise SchemaMismatch(f"expected {kind.__name__}, got {type(value).__name__}")
+        if has_bounds:
+            if min_value is not None and value < min_value:
+                raise SchemaMismatch(f"{value} is lower than {min_value}")
+            if max_value is not None and value > max_value:
+                raise SchemaMismatch(f"{value} is greater than {max_value}")
+        if has_length:
+            if min_len is not None and len(value) < min_len:
+                raise SchemaMismatch(f"length must be at least {min_len}")
+            if max_len is not None and len(value) > max_len:
+                raise SchemaMismatch(f"length must be at most {max_len}")
+        return value
+    return check_value
+
+
+def compile_schema(schema):
+    """
+    Compiles a node of the schema into a checker function, once, so that a history is checked without dispatching on
+    the kind of each node. The checkers normalize the nodes in place and raise SchemaMismatch on invalid data.
+
+    Args:
+        schema (Value, Record, MappingOf, ListOf): The schema of the node
+
+    Returns:
+        checker (function): A function checking a node and returning it normalized
+    """
+    if isinstance(schema, Value):
+        return compile_value(schema)
+    if isinstance(schema, ListOf):
+        check_item = compile_schema(schema.items)
+
+        def check_list(data):
+            if not isinstance(data, list):
+                raise SchemaMismatch("expected a list")
+            index = 0
+            try:
+                for index, item in enumerate(data):
+                    data[index] = check_item(item)
+            except SchemaMismatch as mismatch:
+                mismatch.keys.append(index)
+                raise
+            return data
+        return check_list
+    if isinstance(schema, MappingOf):
+        check_item = compile_schema(schema.values)
+
+        def check_mapping(data):
+            if not isinstance(data, dict):
+                raise SchemaMismatch("expected a dictionary")
+            key = None
+            try:
+                for key, item in data.items():
+                    data[key] = check_item(item)
+            except SchemaMismatch as mismatch:
+                mismatch.keys.append(key)
+                raise
+            return data
+        return check_mapping
+    fields = tuple((key, compile_schema(item_schema)) for key, item_schema in schema.fields.items())
+
+    def check_record(data):
+        if not isinstance(data, dict):
+            raise SchemaMismatch("expected a dictionary")
+        key = None
+        try:
+            for key, check_item in fields:
+                data[key] = check_item(data.get(key))
+        except SchemaMismatch as mismatch:
+            mismatch.keys.append(key)
+            raise
+        return data
+    return check_record
+
+
+HISTORY_CHECKER = compile_schema(HISTORY_SCHEMA)
+
+
+def validate_history(data: dict) -> dict:
+    """
+    Validates a parsed hand history against the history schema. Integers are cast to float where floats are expected,
+    so that the objects built from the history get the same types as with the attrs converters.
+
+    Args:
+        data (dict): The parsed hand history
+
+    Returns:
+        data (dict): The validated and normalized hand history
+    """
+    try:
+        return HISTORY_CHECKER(data)
+    except SchemaMismatch as mismatch:
+        raise HistorySchemaError(mismatch.path, mismatch.reason) from None
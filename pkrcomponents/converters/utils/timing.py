@@ -0,0 +1,237 @@
+"""This module times the phases of the conversion of the hands, with per-phase histograms and the slowest hands"""
+import heapq
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
+
+SUB_BUCKETS = 4
+NB_BUCKETS = 64 * SUB_BUCKETS
+NB_OUTLIERS = 5
+NO_PHASE = nullcontext()
+
+
+def get_bucket(duration: int) -> int:
+    """
+    Returns the histogram bucket of a duration. The buckets are log-linear: each power of two of nanoseconds is split
+    into SUB_BUCKETS buckets, so that the relative error of the percentiles stays below 1 / SUB_BUCKETS.
+
+    Args:
+        duration (int): The duration, in nanoseconds
+
+    Returns:
+        bucket (int): The index of the bucket
+    """
+    bit_length = duration.bit_length()
+    if bit_length <= 2:
+        return duration
+    return (bit_length - 2) * SUB_BUCKETS + ((duration >> (bit_length - 3)) & (SUB_BUCKETS - 1))
+
+
+def get_bucket_bound(bucket: int) -> int:
+    """
+    Returns the upper bound of a histogram bucket
+
+    Args:
+        bucket (int): The index of the bucket
+
+    Returns:
+        bound (int): The largest duration of the bucket, in nanoseconds
+    """
+    if bucket < SUB_BUCKETS:
+        return bucket
+    power, sub_bucket = divmod(bucket, SUB_BUCKETS)
+    return ((SUB_BUCKETS + sub_bucket + 1) << (power - 1)) - 1
+
+
+class PhaseHistogram:
+    """
+    The durations of a phase across the converted hands
+
+    Attributes:
+        count (int): The number of durations recorded
+        total (int): The sum of the durations, in nanoseconds
+        max (int): The longest duration, in nanoseconds
+        buckets (list): The number of durations in each bucket
+        outliers (list): A min-heap of the NB_OUTLIERS longest (duration, hand_id)
+
+    Methods:
+        add(duration, hand_id): Records a duration
+        percentile(q): Returns an upper bound of a percentile of the durations
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = [0] * NB_BUCKETS
+        self.outliers = []
+
+    def add(self, duration: int, hand_id: str):
+        """
+        Records the duration of a phase of a hand
+
+        Args:
+            duration (int): The duration, in nanoseconds
+            hand_id (str): The id of the hand
+        """
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.buckets[get_bucket(duration)] += 1
+        if len(self.outliers) < NB_OUTLIERS:
+            heapq.heappush(self.outliers, (duration, hand_id))
+        elif duration > self.outliers[0][0]:
+            heapq.heapreplace(self.outliers, (duration, hand_id))
+
+    def percentile(self, q: float) -> int:
+        """
+        Returns an upper bound of a percentile of the durations, within the resolution of the buckets
+
+        Args:
+            q (float): The percentile, between 0 and 100
+
+        Returns:
+            duration (int): The duration, in nanoseconds
+        """
+        rank = q / 100 * self.count
+        cumulated = 0
+        for bucket, count in enumerate(self.buckets):
+            cumulated += count
+            if count and cumulated >= rank:
+                return min(get_bucket_bound(bucket), self.max)
+        return self.max
+
+    @property
+    def slowest_hands(self) -> list:
+        """
+        Returns the ids of the hands with the longest durations, the slowest first
+        """
+        return [hand_id for duration, hand_id in sorted(self.outliers, reverse=True)]
+
+
+class PhaseTimer:
+    """
+    Opt-in timer of the phases of the conversion of the hands, on the monotonic clock. When disabled, phase() returns a
+    shared no-op context manager. When enabled, the durations of a hand are kept until end_hand(), so that they are
+    attributed to the hand id even for the phases timed before it was read.
+
+    Attributes:
+        enabled (bool): Whether the phases are timed
+        histograms (dict): The histogram of each phase
+
+    Methods:
+        phase(name, detail): Returns a context manager timing a phase
+        end_hand(hand_id): Records the durations of the phases of a hand
+        discard_hand(): Forgets the durations of the phases of a hand
+        summary(): Returns the statistics of each phase as a DataFrame
+        report(): Returns the summary as text
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.histograms = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def pending(self) -> list:
+        """
+        Returns the (phase, duration) timed for the hand converted by the current thread
+        """
+        pending = getattr(self._local, "pending", None)
+        if pending is None:
+            pending = self._local.pending = []
+        return pending
+
+    def phase(self, name: str, detail: str = None):
+        """
+        Returns a context manager timing a phase, a no-op one when the timer is disabled
+
+        Args:
+            name (str): The name of the phase
+            detail (str): A detail of the phase, like the street of the actions, appended to the name
+
+        Returns:
+            context (contextmanager): The context manager
+        """
+        if not self.enabled:
+            return NO_PHASE
+        return self._time_phase(name if detail is None else f"{name}.{detail}")
+
+    @contextmanager
+    def _time_phase(self, name: str):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.pending.append((name, time.perf_counter_ns() - start))
+
+    def end_hand(self, hand_id: str):
+        """
+        Records the durations of the phases of the hand converted by the current thread
+
+        Args:
+            hand_id (str): The id of the hand, or the key of its file if it could not be read
+        """
+        if not self.enabled:
+            return
+        pending = self.pending
+        with self._lock:
+            for name, duration in pending:
+                histogram = self.histograms.get(name)
+                if histogram is None:
+                    histogram = self.histograms[name] = PhaseHistogram()
+                histogram.add(duration, hand_id)
+        pending.clear()
+
+    def discard_hand(self):
+        """
+        Forgets the durations of the phases of the hand of the current thread, like a skipped duplicate
+        """
+        if self.enabled:
+            self.pending.clear()
+
+    def reset(self):
+        """
+        Forgets the recorded durations
+        """
+        with self._lock:
+            self.histograms = {}
+        self.pending.clear()
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Returns the statistics of each phase, in milliseconds
+
+        Returns:
+            df (pd.DataFrame): One row per phase, with the count, total, mean, p50, p90, p99, max and slowest hands
+        """
+        rows = []
+        for name, histogram in self.histograms.items():
+            rows.append({
+                "phase": name,
+                "count": histogram.count,
+                "total_ms": histogram.total / 1e6,
+                "mean_ms": histogram.total / histogram.count / 1e6,
+                "p50_ms": histogram.percentile(50) / 1e6,
+                "p90_ms": histogram.percentile(90) / 1e6,
+                "p99_ms": histogram.percentile(99) / 1e6,
+                "max_ms": histogram.max / 1e6,
+                "slowest_hands": histogram.slowest_hands,
+            })
+        columns = ["phase", "count", "total_ms", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms", "slowest_hands"]
+        return pd.DataFrame(rows, columns=columns)
+
+    def report(self) -> str:
+        """
+        Returns the summary as text, the most expensive phases first
+
+        Returns:
+            report (str): The report
+        """
+        df = self.summary()
+        if df.empty:
+            return "No phase timed"
+        return df.sort_values("total_ms", ascending=False).to_string(index=False, float_format="{:.3f}".format)
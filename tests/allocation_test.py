@@ -0,0 +1,80 @@
+"""This module compares the allocations needed to convert parsed files with and without the table pool."""
+
+import gc
+import os
+import time
+import tracemalloc
+from pkrcomponents.components.actions import Action
+from pkrcomponents.components.cards import Deck
+from pkrcomponents.components.players import Players, TablePlayer
+from pkrcomponents.components.players.player_hand_stats import PlayerHandStats
+from pkrcomponents.components.tables import Board, Pot, Table
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+FILES_DIR = os.path.join(TEST_DIR, "history_converter", "json_files")
+ALLOCATION_RESULTS_PATH = os.path.join(TEST_DIR, "allocation_results.txt")
+COUNTED_CLASSES = [Table, Deck, Board, Pot, Players, TablePlayer, PlayerHandStats, Action]
+NB_ROUNDS = 20
+
+
+def count_constructions(classes: list) -> dict:
+    """Wraps the __init__ of each class to count how many objects are constructed"""
+    counts = {cls.__name__: 0 for cls in classes}
+    for cls in classes:
+        original_init = cls.__init__
+
+        def counting_init(self, *args, __original_init=original_init, __name=cls.__name__, **kwargs):
+            counts[__name] += 1
+            __original_init(self, *args, **kwargs)
+
+        cls.__init__ = counting_init
+    return counts
+
+
+def measure(converter, files_list: list, counts: dict) -> dict:
+    for key in counts:
+        counts[key] = 0
+    collections = []
+    gc.callbacks.append(lambda phase, info: collections.append(info["generation"]) if phase == "start" else None)
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(NB_ROUNDS):
+        for file_key in files_list:
+            converter.convert_history(file_key)
+    total_time = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.callbacks.pop()
+    nb_hands = NB_ROUNDS * len(files_list)
+    return {
+        "constructions": {name: count / nb_hands for name, count in counts.items()},
+        "gen0_collections": collections.count(0) / nb_hands,
+        "peak_memory_kb": peak / 1024,
+        "time_ms": total_time / nb_hands * 1000,
+    }
+
+
+def format_results(name: str, results: dict) -> str:
+    constructions = ", ".join(f"{name}: {count:.2f}" for name, count in results["constructions"].items())
+    return (f"{name}\n"
+            f"  Objects constructed per hand: {constructions}\n"
+            f"  Gen0 garbage collections per hand: {results['gen0_collections']:.3f}\n"
+            f"  Peak traced memory: {results['peak_memory_kb']:.1f} KB\n"
+            f"  Average time (with tracemalloc): {results['time_ms']:.2f} ms per hand\n")
+
+
+def allocation_test(files_list: list, results_path: str):
+    counts = count_constructions(COUNTED_CLASSES)
+    regular_results = measure(LocalHandHistoryConverter(TEST_DIR), files_list, counts)
+    pooled_results = measure(LocalHandHistoryConverter(TEST_DIR, pooled=True), files_list, counts)
+    text = format_results("Regular conversion", regular_results) + format_results("Pooled conversion", pooled_results)
+    print(text)
+    print(f"Writing results to {results_path}")
+    with open(results_path, "w") as file:
+        file.write(text)
+
+
+if __name__ == "__main__":
+    history_files = [os.path.join(FILES_DIR, filename) for filename in sorted(os.listdir(FILES_DIR))]
+    allocation_test(history_files, ALLOCATION_RESULTS_PATH)
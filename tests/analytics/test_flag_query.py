@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from pkrcomponents.converters.archive import HandArchive
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+from pkrcomponents.analytics.flag_query import FlagQuery
+from pkrcomponents.analytics.hud import HudAggregator
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "history_converter",
+                         "json_files")
+
+
+class TestFlagQuery(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.archive = HandArchive(cls.directory.name)
+        cls.aggregator = HudAggregator()
+        frames, packed_frames = [], []
+        for filename in sorted(os.listdir(FILES_DIR)):
+            table = converter.convert_history(os.path.join(FILES_DIR, filename))
+            cls.archive.append(table)
+            cls.aggregator.update(table)
+            for player in table.players:
+                frames.append(player.hand_stats.to_dataframe())
+                packed_frames.append(player.hand_stats.to_dataframe(packed_flags=True))
+        cls.df = pd.concat(frames, ignore_index=True)
+        cls.packed_df = pd.concat(packed_frames, ignore_index=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.archive.close()
+        cls.directory.cleanup()
+
+    def test_select_matches_boolean_columns(self):
+        query = FlagQuery(self.packed_df)
+        self.assertEqual(len(query), len(self.df))
+        for flags in (("preflop_flag_vpip",), ("flop_flag_face_cbet", "flop_flag_fold"),
+                      ("preflop_flag_raise", "flop_flag_cbet_opportunity", "flop_flag_cbet")):
+            expected = np.logical_and.reduce([self.df[flag].astype(bool).to_numpy() for flag in flags])
+            np.testing.assert_array_equal(query.select(*flags), expected)
+        self.assertEqual(query.count(), len(self.df))
+
+    def test_ratio(self):
+        query = FlagQuery(self.packed_df)
+        face_cbet = self.df["flop_flag_face_cbet"].astype(bool)
+        expected = self.df.loc[face_cbet, "flop_flag_fold"].astype(bool).mean() if face_cbet.any() else float("nan")
+        np.testing.assert_equal(query.ratio("flop_flag_fold", "flop_flag_face_cbet"), expected)
+        self.assertTrue(np.isnan(FlagQuery(self.packed_df, where=np.zeros(len(self.df), dtype=bool)).ratio(
+            "preflop_flag_vpip")))
+
+    def test_ratios_match_hud_aggregator(self):
+        totals = np.array(list(self.aggregator.counters.values())).sum(axis=0)
+        ratios = FlagQuery(self.packed_df).ratios()
+        for index, stat in enumerate(self.aggregator.stats):
+            opportunities, successes = totals[1 + 2 * index], totals[2 + 2 * index]
+            expected = successes / opportunities if opportunities else float("nan")
+            np.testing.assert_almost_equal(ratios[stat.name], expected)
+
+    def test_where(self):
+        seats = self.df["general_seat"].to_numpy()
+        query = FlagQuery(self.packed_df, where=seats == 1)
+        self.assertEqual(len(query), int((seats == 1).sum()))
+        self.assertEqual(query.count("preflop_flag_vpip"),
+                         int(self.df.loc[seats == 1, "preflop_flag_vpip"].astype(bool).sum()))
+
+    def test_archive_flag_query(self):
+        query = self.archive.flag_query()
+        np.testing.assert_array_equal(query.columns["flop_flags"], self.packed_df["flop_flags"].to_numpy())
+        np.testing.assert_equal(query.ratios(), FlagQuery(self.packed_df).ratios())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from pkrcomponents.analytics.hud import HudAggregator, HudStat
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "history_converter",
+                         "json_files")
+
+
+class TestHudAggregator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        cls.tables = []
+        cls.stats = []
+        for filename in sorted(os.listdir(FILES_DIR)):
+            table = converter.convert_history(os.path.join(FILES_DIR, filename))
+            cls.stats.append({player.name: (player.position, player.hand_stats.to_dataframe().iloc[0].to_dict())
+                              for player in table.players})
+            cls.tables.append(table)
+
+    def aggregate(self, tables, **kwargs) -> HudAggregator:
+        aggregator = HudAggregator(**kwargs)
+        for table in tables:
+            aggregator.update(table)
+        return aggregator
+
+    def test_counters_match_hand_stats(self):
+        aggregator = self.aggregate(self.tables)
+        df = aggregator.to_dataframe().set_index("name")
+        for name in df.index:
+            hands = [stats[name][1] for stats in self.stats if name in stats]
+            self.assertEqual(df.loc[name, "hands"], len(hands))
+            self.assertEqual(df.loc[name, "vpip_successes"], sum(bool(stats["preflop_flag_vpip"]) for stats in hands))
+            three_bets = [stats for stats in hands if stats["preflop_flag_3bet_opportunity"]]
+            self.assertEqual(df.loc[name, "three_bet_opportunities"], len(three_bets))
+            self.assertEqual(df.loc[name, "three_bet_successes"],
+                             sum(bool(stats["preflop_flag_3bet"]) for stats in three_bets))
+            fold_to_cbet = [stats for stats in hands if stats["flop_flag_face_cbet"]]
+            self.assertEqual(df.loc[name, "flop_fold_to_cbet_successes"],
+                             sum(bool(stats["flop_flag_fold"]) for stats in fold_to_cbet))
+
+    def test_ratios(self):
+        df = self.aggregate(self.tables).to_dataframe()
+        self.assertTrue(((df["vpip"] >= 0) & (df["vpip"] <= 1)).all())
+        no_opportunity = df["three_bet_opportunities"] == 0
+        self.assertTrue(df.loc[no_opportunity, "three_bet"].isna().all())
+
+    def test_merge_equals_sequential_update(self):
+        half = len(self.tables) // 2
+        merged = self.aggregate(self.tables[:half])
+        merged.merge(self.aggregate(self.tables[half:]))
+        self.assertEqual(merged.counters, self.aggregate(self.tables).counters)
+
+    def test_merge_rejects_other_configuration(self):
+        with self.assertRaises(ValueError):
+            HudAggregator().merge(HudAggregator(by_position=True))
+        with self.assertRaises(ValueError):
+            HudAggregator().merge(HudAggregator(stats=[HudStat("vpip", "preflop_flag_vpip")]))
+
+    def test_keys_by_position_and_stack_bucket(self):
+        aggregator = self.aggregate(self.tables, by_position=True, stack_buckets=[20, 40])
+        total = self.aggregate(self.tables)
+        self.assertGreaterEqual(len(aggregator), len(total))
+        for name, position, bucket in aggregator.counters:
+            self.assertIn(bucket, (0, 1, 2))
+        self.assertEqual(sum(row[0] for row in aggregator.counters.values()),
+                         sum(row[0] for row in total.counters.values()))
+        df = aggregator.to_dataframe()
+        self.assertEqual(list(df.columns[:4]), ["name", "position", "stack_bucket", "hands"])
+        self.assertTrue(set(df["stack_bucket"]) <= {"0-20", "20-40", "40+"})
+
+    def test_snapshot_restore(self):
+        aggregator = self.aggregate(self.tables, by_position=True, stack_buckets=[25])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hud.npz")
+            aggregator.snapshot(path)
+            aggregator.snapshot(path)
+            self.assertEqual(os.listdir(directory), ["hud.npz"])
+            restored = HudAggregator.restore(path)
+        self.assertEqual(restored.config, aggregator.config)
+        self.assertEqual(restored.counters, aggregator.counters)
+        restored.merge(aggregator)
+
+    def test_pickle(self):
+        aggregator = self.aggregate(self.tables[:3])
+        unpickled = pickle.loads(pickle.dumps(aggregator))
+        self.assertEqual(unpickled.counters, aggregator.counters)
+        unpickled.update(self.tables[3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from pkrcomponents.analytics.tournament_stats import TournamentStats
+from pkrcomponents.converters.summary_converter.local import LocalSummaryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+from pkrcomponents.converters.summary_converter.tournament_results import TournamentResults
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "summary_converter",
+                         "json_files")
+
+
+class TestTournamentStats(unittest.TestCase):
+    def setUp(self):
+        self.columns = {
+            "buy_in_prize_pool": [4.5, 4.5, 9.0, 9.0, 45.0],
+            "buy_in_bounty": [0.0, 0.0, 0.0, 0.0, 0.0],
+            "buy_in_rake": [0.5, 0.5, 1.0, 1.0, 5.0],
+            "amount_won": [0.0, 30.0, 0.0, 0.0, 120.0],
+            "bounty_won": [2.0, 0.0, 0.0, 5.0, 30.0],
+            "nb_entries": [1, 1, 2, 1, 1],
+            "final_position": [100, 3, 250, np.nan, 1],
+            "speed": ["TURBO", "TURBO", "REGULAR", "REGULAR", "TURBO"],
+            "tournament_type": ["KO", "KO", "KO", "KO", "KO"],
+            "start_date": np.array(["2023-01-04T17:30", "2023-01-20T20:00", "2023-02-01T18:00", "2023-02-03T21:00",
+                                    "2023-02-10T21:00"], dtype="datetime64[s]"),
+        }
+        self.stats = TournamentStats(self.columns, buy_in_buckets=[10, 20])
+
+    def test_overall_metrics(self):
+        row = self.stats.summary(nb_bootstraps=0).iloc[0]
+        self.assertEqual(row["tournaments"], 5)
+        self.assertAlmostEqual(row["cost"], 5 + 5 + 20 + 10 + 50)
+        self.assertAlmostEqual(row["profit"], 187 - 90)
+        self.assertAlmostEqual(row["roi"], 97 / 90)
+        self.assertAlmostEqual(row["itm"], 2 / 5)
+        self.assertAlmostEqual(row["average_finish"], (100 + 3 + 250 + 1) / 4)
+        self.assertAlmostEqual(row["bounty_share"], 37 / 187)
+        self.assertNotIn("roi_low", row)
+
+    def test_grouped_metrics_match_pandas(self):
+        df = self.stats.summary(["speed", "month"], nb_bootstraps=0)
+        frame = pd.DataFrame(self.columns)
+        frame["month"] = frame["start_date"].dt.strftime("%Y-%m")
+        frame["cost"] = (frame["buy_in_prize_pool"] + frame["buy_in_rake"]) * frame["nb_entries"]
+        expected = frame.groupby(["speed", "month"])["cost"].agg(["sum", "count"])
+        self.assertEqual(len(df), len(expected))
+        for _, row in df.iterrows():
+            self.assertAlmostEqual(row["cost"], expected.loc[(row["speed"], row["month"]), "sum"])
+            self.assertEqual(row["tournaments"], expected.loc[(row["speed"], row["month"]), "count"])
+
+    def test_buy_in_buckets(self):
+        df = self.stats.summary(["buy_in_bucket"], nb_bootstraps=0).set_index("buy_in_bucket")
+        self.assertEqual(df["tournaments"].to_dict(), {"0-10": 2, "10-20": 2, "20+": 1})
+        with self.assertRaises(ValueError):
+            self.stats.summary(["hero"])
+
+    def test_bootstrap_intervals(self):
+        rng = np.random.default_rng(0)
+        nb_tournaments = 2000
+        columns = {
+            "buy_in_prize_pool": np.full(nb_tournaments, 9.0),
+            "buy_in_bounty": np.zeros(nb_tournaments),
+            "buy_in_rake": np.full(nb_tournaments, 1.0),
+            "amount_won": np.where(rng.random(nb_tournaments) < 0.2, 40.0, 0.0),
+            "bounty_won": np.zeros(nb_tournaments),
+            "nb_entries": np.ones(nb_tournaments, dtype=int),
+            "final_position": rng.integers(1, 100, nb_tournaments).astype(float),
+            "speed": np.full(nb_tournaments, "TURBO"),
+            "tournament_type": np.full(nb_tournaments, "KO"),
+            "start_date": np.full(nb_tournaments, np.datetime64("2023-01-01T00:00:00")),
+        }
+        stats = TournamentStats(columns)
+        row = stats.summary(nb_bootstraps=500, seed=1).iloc[0]
+        self.assertLess(row["itm_low"], row["itm"])
+        self.assertGreater(row["itm_high"], row["itm"])
+        standard_error = np.sqrt(row["itm"] * (1 - row["itm"]) / nb_tournaments)
+        self.assertAlmostEqual(row["itm_high"] - row["itm_low"], 2 * 1.96 * standard_error, delta=0.3 * standard_error)
+        self.assertAlmostEqual(row["roi"], 4 * row["itm"] - 1)
+        again = stats.summary(nb_bootstraps=500, seed=1).iloc[0]
+        self.assertEqual(row["roi_low"], again["roi_low"])
+
+    def test_from_converted_summaries(self):
+        converter = LocalSummaryConverter(data_dir=DATA_DIR)
+        results = TournamentResults()
+        for filename in sorted(os.listdir(FILES_DIR)):
+            results.append(converter.convert_summary(os.path.join(FILES_DIR, filename)))
+        df = TournamentStats(results).summary(["tournament_type"], nb_bootstraps=100, seed=0)
+        self.assertEqual(df["tournaments"].sum(), len(results))
+        self.assertTrue({"roi", "roi_low", "roi_high", "itm", "bounty_share"} <= set(df.columns))
+
+
+if __name__ == '__main__':
+    unittest.main()
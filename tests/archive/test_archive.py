@@ -0,0 +1,166 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pkrcomponents.converters.archive import HandArchive, SegmentReader, SegmentWriter
+from pkrcomponents.converters.archive.stats_layout import NO_LINE, pack_line, unpack_line
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "history_converter",
+                         "json_files")
+
+
+class TestHandArchive(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.history_paths = [os.path.join(FILES_DIR, filename) for filename in sorted(os.listdir(FILES_DIR))]
+        cls.converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.archive = HandArchive(cls.directory.name)
+        cls.expected = {}
+        for history_path in cls.history_paths:
+            table = cls.converter.convert_history(history_path)
+            cls.archive.append(table)
+            cls.expected[table.hand_id] = {
+                player.name: {
+                    "stack": player.stack,
+                    "position": player.position,
+                    "combo": player.combo,
+                    "line": player.actions_history.view().symbol,
+                    "stats": player.hand_stats.to_dataframe().to_dict(),
+                } for player in table.players}
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.archive.close()
+        cls.directory.cleanup()
+
+    def test_random_access_by_hand_id(self):
+        self.assertEqual(len(self.archive), len(self.history_paths))
+        for hand_id, players in self.expected.items():
+            hand = self.archive.get(hand_id)
+            self.assertEqual(hand.hand_id, hand_id)
+            self.assertEqual({player.name for player in hand.players}, set(players))
+        with self.assertRaises(KeyError):
+            self.archive.get("unknown")
+
+    def test_rehydrated_tables_match_converted_tables(self):
+        for hand_id, players in self.expected.items():
+            table = self.archive.get(hand_id).to_table()
+            self.assertEqual(table.hand_id, hand_id)
+            for player in table.players:
+                expected = players[player.name]
+                self.assertEqual(player.stack, expected["stack"])
+                self.assertEqual(player.position, expected["position"])
+                self.assertEqual(player.combo, expected["combo"])
+                self.assertEqual(player.actions_history.view().symbol, expected["line"])
+                self.assertEqual(player.hand_stats.to_dataframe().to_dict(), expected["stats"])
+
+    def test_tournament_hands(self):
+        hand = self.archive.get(next(iter(self.expected)))
+        hands = self.archive.tournament_hands(hand.tournament_id)
+        self.assertIn(hand.hand_id, [tournament_hand.hand_id for tournament_hand in hands])
+        self.assertTrue(all(tournament_hand.tournament_id == hand.tournament_id for tournament_hand in hands))
+
+    def test_stats_columns(self):
+        nb_players = sum(len(players) for players in self.expected.values())
+        vpip = self.archive.stats_column("preflop_flag_vpip")
+        amount_won = self.archive.stats_column("general_amount_won")
+        self.assertEqual(len(vpip), nb_players)
+        expected_vpip = [stats["stats"]["preflop_flag_vpip"][0] for players in self.expected.values()
+                         for stats in players.values()]
+        self.assertEqual(vpip.tolist(), expected_vpip)
+        self.assertEqual(amount_won.sum(), sum(stats["stats"]["general_amount_won"][0]
+                                               for players in self.expected.values() for stats in players.values()))
+
+    def test_segments_roll_over(self):
+        directory = os.path.join(self.directory.name, "small")
+        with HandArchive(directory, max_segment_size=2000) as archive:
+            for history_path in self.history_paths:
+                archive.append(self.converter.convert_history(history_path))
+            self.assertGreater(len(archive.segment_ids), 1)
+            self.assertEqual(len(archive), len(self.history_paths))
+            for hand_id in self.expected:
+                self.assertEqual(archive.get(hand_id).hand_id, hand_id)
+
+    def test_appends_and_reads_alternate_without_syncing(self):
+        directory = os.path.join(self.directory.name, "alternate")
+        first_reader = None
+        with HandArchive(directory, max_segment_size=2000) as archive:
+            for history_path in self.history_paths:
+                table = self.converter.convert_history(history_path)
+                archive.append(table)
+                with patch("os.fsync") as fsync:
+                    self.assertEqual(archive.get(table.hand_id).hand_id, table.hand_id)
+                fsync.assert_not_called()
+                if first_reader is None and len(archive.segment_ids) > 2:
+                    first_reader = archive.readers[0]
+            self.assertIs(archive.readers[0], first_reader)
+            self.assertEqual(len(archive), len(self.history_paths))
+        with HandArchive(directory) as archive:
+            self.assertEqual(len(archive), len(self.history_paths))
+
+    def test_incomplete_record_is_truncated_on_reopening(self):
+        directory = os.path.join(self.directory.name, "crash")
+        writer = SegmentWriter(directory)
+        writer.append(self.converter.convert_history(self.history_paths[0]))
+        writer.flush()
+        writer.hands_file.write(b"partial record")
+        writer.index_file.write('{"hand_id": "partial')
+        writer.close()
+        with SegmentReader(directory) as reader:
+            self.assertEqual(len(reader), 1)
+        writer = SegmentWriter(directory)
+        writer.append(self.converter.convert_history(self.history_paths[1]))
+        writer.close()
+        with SegmentReader(directory) as reader:
+            self.assertEqual(len(reader), 2)
+            for hand_id in reader.hand_ids:
+                self.assertEqual(reader.get(hand_id).hand_id, hand_id)
+            self.assertEqual(len(reader.stats), len(reader.get(reader.hand_ids[0]).players)
+                             + len(reader.get(reader.hand_ids[1]).players))
+
+    def test_index_entries_without_records_are_dropped_on_reopening(self):
+        directory = os.path.join(self.directory.name, "lost_records")
+        with SegmentWriter(directory) as writer:
+            writer.append(self.converter.convert_history(self.history_paths[0]))
+            writer.append(self.converter.convert_history(self.history_paths[1]))
+            first_hand_size = writer.pending_entries[1]["offset"]
+            first_stats_size = writer.pending_entries[1]["stats_row"] * writer.layout.dtype.itemsize
+        os.truncate(os.path.join(directory, "segment_00000.hands"), first_hand_size + 10)
+        writer = SegmentWriter(directory)
+        self.assertEqual((writer.nb_hands, writer.offset), (1, first_hand_size))
+        self.assertEqual(os.path.getsize(os.path.join(directory, "segment_00000.stats")), first_stats_size)
+        writer.append(self.converter.convert_history(self.history_paths[2]))
+        writer.close()
+        with SegmentReader(directory) as reader:
+            self.assertEqual(len(reader), 2)
+            for hand_id in reader.hand_ids:
+                self.assertEqual(reader.get(hand_id).hand_id, hand_id)
+
+    def test_index_lines_are_written_after_their_records(self):
+        directory = os.path.join(self.directory.name, "ordering")
+        with SegmentWriter(directory, index_batch_size=2) as writer:
+            writer.append(self.converter.convert_history(self.history_paths[0]))
+            with SegmentReader(directory) as reader:
+                self.assertEqual(len(reader), 0)
+            writer.append(self.converter.convert_history(self.history_paths[1]))
+            with SegmentReader(directory) as reader:
+                self.assertEqual(len(reader), 2)
+
+
+class TestPackedLines(unittest.TestCase):
+    def test_pack_line(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        table = converter.convert_history(os.path.join(FILES_DIR, "example01.json"))
+        for player in table.players:
+            sequence = player.actions_history.preflop
+            self.assertEqual(unpack_line(pack_line(sequence)), sequence.symbol)
+        self.assertEqual(pack_line(None), NO_LINE)
+        self.assertIsNone(unpack_line(NO_LINE))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from pkrcomponents.converters.archive.manifest import ConversionManifest, get_content_hash
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORIES_DIR = os.path.join(TESTS_DIR, "history_converter", "json_files")
+
+
+class TestConversionManifest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "histories", "converted.manifest")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_record(self):
+        with ConversionManifest(self.path, batch_size=2) as manifest:
+            manifest.record("a.json", "1-10", get_content_hash("a"))
+            self.assertFalse(manifest.is_converted("a.json", "1-10"))
+            manifest.record("b.json", "2-20", get_content_hash("b"))
+            self.assertTrue(manifest.is_converted("a.json", "1-10"))
+            self.assertFalse(manifest.is_converted("a.json", "3-10"))
+            manifest.record("c.json", "3-30", get_content_hash("c"))
+        self.assertTrue(os.path.exists(f"{self.path}.idx.npz"))
+        with ConversionManifest(self.path) as manifest:
+            self.assertEqual(len(manifest), 3)
+            for key, version in [("a.json", "1-10"), ("b.json", "2-20"), ("c.json", "3-30")]:
+                self.assertTrue(manifest.is_converted(key, version))
+            self.assertFalse(manifest.is_converted("d.json", "4-40"))
+
+    def test_known_keys(self):
+        with ConversionManifest(self.path, batch_size=1) as manifest:
+            manifest.record("a.json", "1-10", get_content_hash("a"))
+            self.assertTrue(manifest.is_known("a.json"))
+            self.assertFalse(manifest.is_known("b.json"))
+        with ConversionManifest(self.path) as manifest:
+            self.assertTrue(manifest.is_known("a.json"))
+            self.assertFalse(manifest.is_converted("a.json", "2-10"))
+        with np.load(f"{self.path}.idx.npz") as index:
+            np.savez(f"{self.path}.idx.npz", fingerprints=index["fingerprints"], manifest_size=index["manifest_size"])
+        with ConversionManifest(self.path) as manifest:
+            self.assertTrue(manifest.is_known("a.json"))
+
+    def test_entries_appended_after_the_index(self):
+        with ConversionManifest(self.path) as manifest:
+            manifest.record("a.json", "1-10", get_content_hash("a"))
+        with open(self.path, "a", encoding="utf-8", newline="\n") as file:
+            file.write(f"b.json\t2-20\t{get_content_hash('b')}\n")
+        with ConversionManifest(self.path) as manifest:
+            self.assertEqual(len(manifest), 2)
+            self.assertTrue(manifest.is_converted("b.json", "2-20"))
+
+    def test_lines_are_counted_across_reopenings(self):
+        with ConversionManifest(self.path) as manifest:
+            manifest.record("a.json", "1-10", get_content_hash("a"))
+            manifest.record("a.json", "1-10", get_content_hash("a"))
+            manifest.commit()
+            self.assertEqual(len(manifest), 2)
+        with ConversionManifest(self.path) as manifest:
+            self.assertEqual(len(manifest), 2)
+        os.remove(f"{self.path}.idx.npz")
+        with ConversionManifest(self.path) as manifest:
+            self.assertEqual(len(manifest), 2)
+
+    def test_index_of_a_rewritten_manifest_is_rebuilt(self):
+        with ConversionManifest(self.path) as manifest:
+            manifest.record("a.json", "1-10", get_content_hash("a"))
+        with open(self.path, "w", encoding="utf-8", newline="\n") as file:
+            file.write(f"b.json\t2-20\t{get_content_hash('b')}\nc.json\t3-30\t{get_content_hash('c')}\n")
+        with ConversionManifest(self.path) as manifest:
+            self.assertEqual(len(manifest), 2)
+            self.assertFalse(manifest.is_converted("a.json", "1-10"))
+            self.assertFalse(manifest.is_known("a.json"))
+            self.assertTrue(manifest.is_converted("b.json", "2-20"))
+
+    def test_crash_recovery(self):
+        manifest = ConversionManifest(self.path, batch_size=2)
+        for key in ["a.json", "b.json", "c.json"]:
+            manifest.record(key, "1-10", get_content_hash(key))
+        manifest.file.close()
+        with open(self.path, "a", encoding="utf-8", newline="\n") as file:
+            file.write("d.json\t1-")
+        with ConversionManifest(self.path) as manifest:
+            self.assertEqual(len(manifest), 2)
+            self.assertFalse(manifest.is_converted("c.json", "1-10"))
+            manifest.record("e.json", "1-10", get_content_hash("e"))
+        with open(self.path, "r", encoding="utf-8") as file:
+            self.assertEqual([line.split("\t")[0] for line in file], ["a.json", "b.json", "e.json"])
+
+
+class TestResumableConversion(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.directory.name, "data")
+        self.manifest_path = os.path.join(self.data_dir, "histories", "converted.manifest")
+        parsed_dir = os.path.join(self.data_dir, "histories", "parsed")
+        os.makedirs(parsed_dir)
+        for filename in sorted(os.listdir(HISTORIES_DIR))[:6]:
+            shutil.copy(os.path.join(HISTORIES_DIR, filename), parsed_dir)
+        self.parsed_keys = sorted(os.path.join(parsed_dir, filename) for filename in os.listdir(parsed_dir))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_reruns_skip_converted_histories(self):
+        for run in ("slow_convert_histories", "convert_histories"):
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            with ConversionManifest(self.manifest_path) as manifest:
+                converter = LocalHandHistoryConverter(data_dir=self.data_dir, manifest=manifest)
+                self.assertEqual(sorted(converter.iter_keys_to_convert()), self.parsed_keys)
+                getattr(converter, run)()
+                self.assertEqual(len(manifest), len(self.parsed_keys))
+            with ConversionManifest(self.manifest_path) as manifest:
+                converter = LocalHandHistoryConverter(data_dir=self.data_dir, manifest=manifest)
+                self.assertEqual(list(converter.iter_keys_to_convert()), [])
+                stat = os.stat(self.parsed_keys[0])
+                os.utime(self.parsed_keys[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+                self.assertEqual(list(converter.iter_keys_to_convert()), [self.parsed_keys[0]])
+            os.remove(self.manifest_path)
+            os.remove(f"{self.manifest_path}.idx.npz")
+
+    def test_versions_come_from_the_listing(self):
+        for run in ("slow_convert_histories", "convert_histories"):
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            with ConversionManifest(self.manifest_path) as manifest:
+                converter = LocalHandHistoryConverter(data_dir=self.data_dir, manifest=manifest)
+                versions = dict(converter.iter_parsed_histories_versions())
+                self.assertEqual(versions, {key: converter.get_key_version(key) for key in self.parsed_keys})
+                with patch.object(LocalHandHistoryConverter, "get_key_version", side_effect=AssertionError):
+                    getattr(converter, run)()
+                self.assertTrue(all(manifest.is_converted(key, versions[key]) for key in self.parsed_keys))
+            os.remove(self.manifest_path)
+            os.remove(f"{self.manifest_path}.idx.npz")
+
+    def test_histories_are_recorded_once_consumed(self):
+        with ConversionManifest(self.manifest_path, batch_size=1) as manifest:
+            converter = LocalHandHistoryConverter(data_dir=self.data_dir, manifest=manifest)
+            converter.convert_history(self.parsed_keys[0])
+            self.assertEqual(len(manifest), 0)
+            results = converter.convert_stream(self.parsed_keys, max_workers=2)
+            parsed_key, table, error = next(results)
+            self.assertIsNone(error)
+            self.assertFalse(manifest.is_known(parsed_key))
+            next(results)
+            self.assertTrue(manifest.is_known(parsed_key))
+
+    def test_recorded_content_hash(self):
+        with ConversionManifest(self.manifest_path) as manifest:
+            converter = LocalHandHistoryConverter(data_dir=self.data_dir, manifest=manifest)
+            converter.convert_history(self.parsed_keys[0])
+            converter.record_history(self.parsed_keys[0], converter.data_version, converter.data_hash)
+        with open(self.manifest_path, "r", encoding="utf-8") as file:
+            key, version, content_hash = file.read().rstrip("\n").split("\t")
+        self.assertEqual(key, self.parsed_keys[0])
+        self.assertEqual(version, converter.get_key_version(self.parsed_keys[0]))
+        self.assertEqual(content_hash, get_content_hash(converter.read_data_text(self.parsed_keys[0])))
+
+
+if __name__ == '__main__':
+    unittest.main()
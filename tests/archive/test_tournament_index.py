@@ -0,0 +1,163 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from pkrcomponents.converters.archive import HandArchive
+from pkrcomponents.converters.archive.tournament_index import TournamentIndex, get_hand_timestamp, split_history_key
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+from pkrcomponents.converters.summary_converter.local import LocalSummaryConverter
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORIES_DIR = os.path.join(TESTS_DIR, "history_converter", "json_files")
+SUMMARIES_DIR = os.path.join(TESTS_DIR, "summary_converter", "json_files")
+
+
+class TestTournamentIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "index", "tournaments.db")
+        self.index = TournamentIndex(self.path)
+        self.summary_key = os.path.join(SUMMARIES_DIR, "example01.json")
+        self.tournament = LocalSummaryConverter(data_dir=DATA_DIR).convert_summary(self.summary_key)
+        self.index.add_tournament(self.tournament, summary_key=self.summary_key)
+
+    def tearDown(self):
+        self.index.close()
+        self.directory.cleanup()
+
+    def test_split_history_key(self):
+        history_key = os.path.join("histories", "parsed", "2023", "01", "04", "608341002", "123-4-5.json")
+        self.assertEqual(split_history_key(history_key), ("608341002", "123-4-5"))
+
+    def test_get_hand_timestamp(self):
+        self.assertEqual(get_hand_timestamp("2612804708405870609-6-1672853787"), 1672853787)
+        self.assertIsNone(get_hand_timestamp("hand"))
+
+    def test_get_tournament(self):
+        tournament = self.index.get_tournament("608341002")
+        self.assertEqual(tournament.buy_in, self.tournament.buy_in)
+        self.assertEqual(tournament.total_players, 2525)
+        self.assertEqual(tournament.speed, self.tournament.speed)
+        self.assertEqual(tournament.tournament_type, self.tournament.tournament_type)
+        self.assertEqual(tournament.final_position, 886)
+        self.assertEqual(tournament.levels_structure.to_json(), self.tournament.levels_structure.to_json())
+        self.assertEqual(self.index.get_summary_key("608341002"), self.summary_key)
+        self.assertIsNone(self.index.get_tournament("unknown"))
+        self.assertIn("608341002", self.index)
+
+    def test_tournaments_are_copied_with_their_level(self):
+        level = self.tournament.levels_structure.get_level(2)
+        first = self.index.get_tournament("608341002", level=level)
+        second = self.index.get_tournament("608341002")
+        self.assertIs(first.level, level)
+        self.assertIsNone(second.level)
+        self.assertIs(first.buy_in, second.buy_in)
+
+    def test_index_is_persistent(self):
+        self.index.add_hand("123-4-5", "608341002", "histories/parsed/608341002/123-4-5.json")
+        self.index.close()
+        self.index = TournamentIndex(self.path)
+        self.assertEqual(self.index.nb_tournaments, 1)
+        self.assertEqual(self.index.nb_hands, 1)
+        self.assertEqual(self.index.get_tournament("608341002").total_players, 2525)
+        self.assertEqual(self.index.get_hand_tournament_id("123-4-5"), "608341002")
+
+    def test_history_converter_attaches_indexed_tournament(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR, tournament_index=self.index)
+        table = converter.convert_history(os.path.join(HISTORIES_DIR, "example01.json"))
+        self.assertEqual(table.tournament.id, "608341002")
+        self.assertEqual(table.tournament.total_players, 2525)
+        self.assertEqual(table.tournament.buy_in, self.tournament.buy_in)
+        self.assertIs(table.tournament.level, table.level)
+        plain_table = LocalHandHistoryConverter(data_dir=DATA_DIR).convert_history(
+            os.path.join(HISTORIES_DIR, "example01.json"))
+        self.assertEqual(table.level, plain_table.level)
+        self.assertEqual(table.total_buy_in, plain_table.total_buy_in)
+
+    def test_history_converter_uses_indexed_levels_structure(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR, tournament_index=self.index)
+        table = converter.convert_history(os.path.join(HISTORIES_DIR, "example01.json"))
+        levels_structure = self.index.get_levels_structure("608341002")
+        self.assertIs(converter.get_levels_structure("608341002"), levels_structure)
+        self.assertIs(table.tournament.levels_structure, levels_structure)
+        self.assertIn(table.level.value, [level.value for level in levels_structure])
+        self.assertIsNone(converter.levels_structures)
+
+    def test_index_is_shared_by_the_worker_threads(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR, tournament_index=self.index)
+        history_paths = [os.path.join(HISTORIES_DIR, filename) for filename in sorted(os.listdir(HISTORIES_DIR))]
+        results = list(converter.convert_stream(history_paths, max_workers=4))
+        self.assertEqual(len(results), len(history_paths))
+        self.assertTrue(all(error is None for _, _, error in results))
+        tournament_ids = {table.tournament.id for _, table, _ in results}
+        self.assertIn("608341002", tournament_ids)
+
+    def test_cached_tournaments_are_bounded(self):
+        index = TournamentIndex(os.path.join(self.directory.name, "bounded.db"), cache_size=2)
+        for tournament_id in ("1", "2", "3"):
+            tournament = LocalSummaryConverter(data_dir=DATA_DIR).convert_summary(self.summary_key)
+            tournament.id = tournament_id
+            index.add_tournament(tournament)
+            self.assertEqual(index.get_tournament(tournament_id).id, tournament_id)
+        self.assertEqual(len(index._tournaments), 2)
+        self.assertEqual(index.get_tournament("1").id, "1")
+        index.close()
+
+    def test_added_levels_survive_eviction(self):
+        self.index.commit()
+        index = TournamentIndex(self.path, cache_size=1)
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR, tournament_index=index)
+        levels_structure = index.get_levels_structure("608341002")
+        nb_levels = len(levels_structure)
+        level = converter.get_tournament_level("608341002", value=99, bb=4000, ante=500)
+        self.assertEqual(len(levels_structure), nb_levels + 1)
+        other = LocalSummaryConverter(data_dir=DATA_DIR).convert_summary(self.summary_key)
+        other.id = "other"
+        index.add_tournament(other)
+        self.assertEqual(index.get_tournament("other").id, "other")
+        self.assertIsNot(index.get_levels_structure("608341002"), levels_structure)
+        self.assertEqual(index.get_levels_structure("608341002").get_level(99).bb, level.bb)
+        index.close()
+
+    def test_tournament_hands_are_ordered_by_timestamp(self):
+        hand_ids = ["9-6-1672853787", "10-6-1672853790", "1-6-1672853799"]
+        self.index.add_history_keys(
+            [os.path.join("parsed", "2023", "01", "04", "608341002", f"{hand_id}.json") for hand_id in hand_ids])
+        self.assertEqual([hand[0] for hand in self.index.tournament_hands("608341002")], hand_ids)
+
+    def test_hand_timestamps_are_added_to_an_older_index(self):
+        path = os.path.join(self.directory.name, "older.db")
+        connection = sqlite3.connect(path)
+        connection.executescript(
+            "CREATE TABLE hands (hand_id TEXT PRIMARY KEY, tournament_id TEXT NOT NULL, history_key TEXT, "
+            "segment_id INTEGER, offset INTEGER, length INTEGER);"
+            "CREATE INDEX hands_tournament_id ON hands (tournament_id, hand_id);"
+            "INSERT INTO hands (hand_id, tournament_id) VALUES ('9-6-1672853787', '1'), ('10-6-1672853790', '1');")
+        connection.commit()
+        connection.close()
+        with TournamentIndex(path) as index:
+            self.assertEqual([hand[0] for hand in index.tournament_hands("1")], ["9-6-1672853787", "10-6-1672853790"])
+
+    def test_tournament_hands(self):
+        history_keys = [os.path.join("parsed", "2023", "01", "04", "608341002", f"{hand_id}.json")
+                        for hand_id in ("b-2", "a-1")]
+        self.index.add_history_keys(history_keys)
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        with HandArchive(os.path.join(self.directory.name, "archive")) as archive:
+            for filename in sorted(os.listdir(HISTORIES_DIR))[:3]:
+                archive.append(converter.convert_history(os.path.join(HISTORIES_DIR, filename)))
+            self.index.add_archive(archive)
+            reader = archive.readers[0]
+            hands = {hand[0]: hand for hand in self.index.tournament_hands("608341002")}
+            for hand_id, (offset, length) in reader.offsets.items():
+                if reader.get(hand_id).tournament_id == "608341002":
+                    self.assertEqual(hands[hand_id][2:], (0, offset, length))
+        self.assertEqual(hands["a-1"], ("a-1", history_keys[1], None, None, None))
+        self.assertEqual([hand[0] for hand in self.index.tournament_hands("608341002")],
+                         sorted(hands, key=lambda hand_id: (get_hand_timestamp(hand_id), hand_id)))
+
+
+if __name__ == '__main__':
+    unittest.main()
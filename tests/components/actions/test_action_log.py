@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from pkrcomponents.components.actions import ActionLog, ActionMove, Street
+
+
+class TestActionLog(unittest.TestCase):
+    def setUp(self):
+        self.log = ActionLog()
+        self.log.append(3, Street.PREFLOP, ActionMove.RAISE, 400)
+        self.log.append(3, Street.PREFLOP, ActionMove.CALL, 800)
+        self.log.append(3, Street.FLOP, ActionMove.BET, 600)
+        self.log.append(3, Street.RIVER, ActionMove.CHECK, 0)
+
+    def test_street_views(self):
+        self.assertEqual(len(self.log), 4)
+        self.assertEqual(self.log.view(Street.PREFLOP).symbol, "RC")
+        self.assertEqual(self.log.view(Street.FLOP).symbol, "B")
+        self.assertEqual(self.log.view(Street.TURN).symbol, "")
+        self.assertEqual(self.log.view(Street.RIVER).symbol, "X")
+        self.assertEqual(self.log.view().symbol, "RCBX")
+        self.assertEqual(self.log.view(Street.PREFLOP).total_amount, 1200)
+        self.assertEqual(list(self.log.view(Street.FLOP)), [(3, ActionMove.BET, 600.0)])
+
+    def test_views_do_not_copy(self):
+        amounts = np.frombuffer(self.log.view(Street.PREFLOP).amounts, dtype=np.float64)
+        self.log.amounts[0] = 500
+        self.assertEqual(amounts[0], 500)
+
+    def test_streets_must_be_appended_in_order(self):
+        with self.assertRaises(ValueError):
+            self.log.append(3, Street.FLOP, ActionMove.CALL, 100)
+
+    def test_growth_keeps_previous_views(self):
+        view = self.log.view(Street.PREFLOP)
+        for _ in range(40):
+            self.log.append(3, Street.RIVER, ActionMove.BET, 100)
+        self.assertEqual(len(self.log), 44)
+        self.assertEqual(view.symbol, "RC")
+        self.assertEqual(self.log.view(Street.PREFLOP).symbol, "RC")
+        self.assertEqual(len(self.log.view(Street.RIVER)), 41)
+
+    def test_reset(self):
+        self.log.reset()
+        self.assertEqual(len(self.log), 0)
+        self.assertEqual(self.log.view(Street.PREFLOP).symbol, "")
+        self.log.append(1, Street.PREFLOP, ActionMove.FOLD, 0)
+        self.assertEqual(self.log.view(Street.PREFLOP).symbol, "F")
+
+
+if __name__ == '__main__':
+    unittest.main()
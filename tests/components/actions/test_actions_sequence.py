@@ -1,6 +1,6 @@
 import unittest
 
-from pkrcomponents.components.actions import Action, ActionMove, ActionsSequence
+from pkrcomponents.components.actions import Action, ActionMove, ActionsSequence, LINES
 from pkrcomponents.components.players import TablePlayer
 
 
@@ -18,4 +18,20 @@ class TestActionsSequence(unittest.TestCase):
     def test_name(self):
         self.assertEqual(self.actions_sequence.name, "CHECK-CALL-FOLD")
 
+    def test_add(self):
+        actions_sequence = ActionsSequence()
+        actions_sequence.add(self.action1)
+        actions_sequence.add(self.action2)
+        self.assertEqual(actions_sequence.symbol, "CX")
+        self.assertEqual(ActionsSequence().actions, [])
+        actions_sequence.reset()
+        self.assertEqual(actions_sequence.symbol, "")
+
+    def test_line_id(self):
+        same_sequence = ActionsSequence([self.action2, self.action1, self.action3])
+        other_sequence = ActionsSequence([self.action1])
+        self.assertEqual(self.actions_sequence.line_id, same_sequence.line_id)
+        self.assertNotEqual(self.actions_sequence.line_id, other_sequence.line_id)
+        self.assertEqual(LINES.symbol(self.actions_sequence.line_id), "XCF")
+
 
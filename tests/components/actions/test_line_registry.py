@@ -0,0 +1,26 @@
+import unittest
+
+from pkrcomponents.components.actions import LineRegistry
+
+
+class TestLineRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = LineRegistry()
+
+    def test_intern(self):
+        self.assertEqual(self.registry.intern(""), 0)
+        rc_id = self.registry.intern("RC")
+        rrc_id = self.registry.intern("RRC")
+        self.assertNotEqual(rc_id, rrc_id)
+        self.assertEqual(self.registry.intern("RC"), rc_id)
+        self.assertEqual(self.registry.symbol(rrc_id), "RRC")
+        self.assertEqual(len(self.registry), 3)
+
+    def test_encode_decode(self):
+        line_ids = self.registry.encode(["RC", "F", "RC", ""])
+        self.assertEqual(line_ids.tolist(), [1, 2, 1, 0])
+        self.assertEqual(self.registry.decode(line_ids), ["RC", "F", "RC", ""])
+
+
+if __name__ == '__main__':
+    unittest.main()
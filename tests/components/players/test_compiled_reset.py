@@ -0,0 +1,59 @@
+import unittest
+
+import attrs
+
+from pkrcomponents.components.actions.action_move import ActionMove
+from pkrcomponents.components.actions.actions_sequence import ActionsSequence
+from pkrcomponents.components.players.player_hand_stats import PlayerHandStats
+from pkrcomponents.components.players.street_hand_stats.compiled_reset import get_compiled_reset
+from pkrcomponents.components.players.street_hand_stats.general import GeneralPlayerHandStats
+from pkrcomponents.components.players.street_hand_stats.postflop import PostflopPlayerHandStats
+from pkrcomponents.components.players.street_hand_stats.preflop import PreflopPlayerHandStats
+
+STATS_CLASSES = [GeneralPlayerHandStats, PreflopPlayerHandStats, PostflopPlayerHandStats]
+
+
+def get_values(stats) -> dict:
+    return {attribute.name: getattr(stats, attribute.name) for attribute in attrs.fields(type(stats))}
+
+
+class MyCompiledResetTestCase(unittest.TestCase):
+    def test_create_matches_attrs_defaults(self):
+        for stats_class in STATS_CLASSES:
+            expected = get_values(stats_class())
+            values = get_values(stats_class.create())
+            for name, value in values.items():
+                if name != "actions_sequence":
+                    self.assertEqual(value, expected[name], msg=f"{stats_class.__name__}.{name}")
+                    self.assertIs(type(value), type(expected[name]), msg=f"{stats_class.__name__}.{name}")
+
+    def test_reset_restores_defaults(self):
+        stats = PreflopPlayerHandStats()
+        stats.flag_vpip = True
+        stats.total_bet_amount = 1200
+        stats.move_facing_2bet = ActionMove.CALL
+        stats.reset()
+        self.assertEqual(get_values(stats), get_values(PreflopPlayerHandStats.create()))
+        self.assertIsInstance(stats.total_bet_amount, float)
+        self.assertIs(get_compiled_reset(PreflopPlayerHandStats), get_compiled_reset(PreflopPlayerHandStats))
+
+    def test_actions_sequence(self):
+        self.assertIsInstance(PreflopPlayerHandStats().actions_sequence, ActionsSequence)
+        self.assertIsInstance(PostflopPlayerHandStats().actions_sequence, ActionsSequence)
+        hand_stats = PlayerHandStats()
+        for street_name in ("preflop", "flop", "turn", "river"):
+            self.assertIsNone(getattr(hand_stats, street_name).actions_sequence)
+        hand_stats.flop.actions_sequence = ActionsSequence()
+        hand_stats.reset()
+        self.assertIsNone(hand_stats.flop.actions_sequence)
+
+    def test_player_hand_stats_streets_are_distinct(self):
+        hand_stats = PlayerHandStats()
+        self.assertIsNot(hand_stats.flop, hand_stats.turn)
+        hand_stats.flop.flag_saw = True
+        self.assertFalse(hand_stats.turn.flag_saw)
+        self.assertTrue(PlayerHandStats().to_dataframe().equals(PlayerHandStats().to_dataframe()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from pkrcomponents.components.actions.action_move import ActionMove
+from pkrcomponents.components.players.player_hand_stats import FLAGS_SCHEMAS, PlayerHandStats
+from pkrcomponents.components.players.street_hand_stats.flags import get_flags_schema
+from pkrcomponents.components.players.street_hand_stats.postflop import PostflopPlayerHandStats
+
+
+class MyFlagsSchemaTestCase(unittest.TestCase):
+    def setUp(self):
+        self.hand_stats = PlayerHandStats()
+        self.hand_stats.preflop.flag_vpip = True
+        self.hand_stats.preflop.flag_3bet = True
+        self.hand_stats.flop.flag_face_cbet = True
+        self.hand_stats.flop.flag_fold = True
+        self.hand_stats.flop.move_facing_1bet = ActionMove.BET
+
+    def test_schema_from_metadata(self):
+        schema = get_flags_schema(PostflopPlayerHandStats)
+        self.assertIs(schema, FLAGS_SCHEMAS["flop"])
+        self.assertIs(schema, FLAGS_SCHEMAS["river"])
+        self.assertIn("flag_cbet", schema)
+        self.assertNotIn("move_facing_1bet", schema)
+        self.assertEqual(list(schema.bits.values()), list(range(len(schema))))
+        self.assertEqual(schema.mask("flag_saw"), 1 << schema.bits["flag_saw"])
+
+    def test_pack_unpack(self):
+        flags = self.hand_stats.pack_flags()
+        self.assertEqual(set(flags), {"general_flags", "preflop_flags", "flop_flags", "turn_flags", "river_flags"})
+        self.assertEqual(flags["flop_flags"], FLAGS_SCHEMAS["flop"].mask("flag_face_cbet", "flag_fold"))
+        self.assertEqual(flags["turn_flags"], 0)
+        unpacked = PlayerHandStats()
+        unpacked.unpack_flags(flags)
+        self.assertTrue(unpacked.preflop.flag_vpip)
+        self.assertTrue(unpacked.flop.flag_fold)
+        self.assertFalse(unpacked.flop.flag_cbet)
+        self.assertEqual(unpacked.pack_flags(), flags)
+
+    def test_to_dataframe_packed_flags(self):
+        df = self.hand_stats.to_dataframe()
+        packed_df = self.hand_stats.to_dataframe(packed_flags=True)
+        self.assertNotIn("preflop_flag_vpip", packed_df.columns)
+        self.assertEqual(packed_df["preflop_flags"].dtype, np.uint64)
+        self.assertEqual(len(packed_df.columns), len(df.columns) - sum(map(len, FLAGS_SCHEMAS.values())) + 5)
+        self.assertEqual(packed_df["flop_move_facing_1bet"][0], ActionMove.BET)
+        schema = FLAGS_SCHEMAS["preflop"]
+        self.assertTrue(schema.select(packed_df["preflop_flags"].to_numpy(), "flag_vpip", "flag_3bet")[0])
+        self.assertFalse(schema.select(packed_df["preflop_flags"].to_numpy(), "flag_vpip", "flag_4bet")[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
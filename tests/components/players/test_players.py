@@ -61,6 +61,32 @@ class PlayersTest(unittest.TestCase):
         self.assertEqual(tab.players[5].position, Position.HJ)
         self.assertRaises(ValueError, lambda: tab.players[0.5])
 
+    def test_seat_order_is_recomputed_when_seats_or_bb_change(self):
+        tab = Table()
+        for player in self.list:
+            player.sit(tab)
+        tab.players.bb_seat = 2
+        seat_order = tab.players.seat_order
+        self.assertIs(tab.players.seat_order, seat_order)
+        self.assertEqual(seat_order.preflop, (4, 6, 1, 2))
+        self.assertEqual(seat_order.seats["BTN"], 6)
+        tab.players.preflop_ordered_seats.append(5)
+        self.assertEqual(tab.players.preflop_ordered_seats, [4, 6, 1, 2])
+        tab.players.bb_seat = 4
+        self.assertEqual(tab.players.preflop_ordered_seats, [6, 1, 2, 4])
+        self.p5.sit(tab)
+        self.assertEqual(tab.players.preflop_ordered_seats, [5, 6, 1, 2, 4])
+        tab.players.remove_player(self.p3)
+        self.assertEqual(tab.players.occupied_seats, [1, 2, 4, 5])
+        self.assertEqual(tab.players.preflop_ordered_seats, [5, 1, 2, 4])
+        self.assertEqual(tab.players.seats_mapper, {"CO": 5, "BTN": 1, "SB": 2, "BB": 4})
+        tab.players.clear()
+        self.assertEqual(tab.players.occupied_seats, [])
+        self.p1.sit(tab)
+        self.p2.sit(tab)
+        tab.players.bb_seat = 1
+        self.assertEqual(tab.players.seats_mapper, {"SB": 2, "BB": 1})
+
     def test_advance_bb_seat(self):
         table = Table()
         for pl in self.list:
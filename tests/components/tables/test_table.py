@@ -1,12 +1,13 @@
 import unittest
 import numpy as np
-from pkrcomponents.components.actions import BetAction, CallAction, CheckAction, FoldAction, RaiseAction, Street
+from pkrcomponents.components.actions import ActionMove, BetAction, CallAction, CheckAction, FoldAction, RaiseAction, Street
 from pkrcomponents.components.cards import Card, Deck, Flop
 from pkrcomponents.components.players import Players, TablePlayer
-from pkrcomponents.components.tournaments import BuyIn, Level, Tournament
+from pkrcomponents.components.tournaments import BuyIn, Level, Payout, Payouts, Tournament
 from pkrcomponents.components.tables import Board, Pot, Table
 from pkrcomponents.components.utils.exceptions import (NotSufficientRaiseError, ShowdownNotReachedError,
-                                                       NotSufficientBetError, CannotParseWinnersError)
+                                                       NotSufficientBetError, CannotParseWinnersError,
+                                                       NotFinalTableError)
 
 
 class TableTest(unittest.TestCase):
@@ -238,6 +239,27 @@ class TableTest(unittest.TestCase):
             pl.sit(table)
         self.assertEqual(table.estimated_players_remaining, 149)
 
+    def test_icm_equities(self):
+        table = Table()
+        tournament = Tournament(level=Level(1, 100), payouts=Payouts([Payout(1, 70.0), Payout(2, 30.0)]))
+        table.add_tournament(tournament)
+        for pl in [self.p1, self.p2]:
+            pl.sit(table)
+        equities = table.icm_equities()
+        self.assertEqual(set(equities), {"Toto", "Tata"})
+        self.assertAlmostEqual(equities["Toto"], 70 * 2000 / 4500 + 30 * 2500 / 4500)
+        self.assertAlmostEqual(sum(equities.values()), 100.0)
+
+    def test_icm_equities_need_the_final_table(self):
+        table = Table()
+        tournament = Tournament(level=Level(1, 100), payouts=Payouts([Payout(1, 70.0), Payout(2, 30.0)]),
+                                total_players=10, players_remaining=5)
+        table.add_tournament(tournament)
+        for pl in [self.p1, self.p2]:
+            pl.sit(table)
+        with self.assertRaises(NotFinalTableError):
+            table.icm_equities()
+
     def test_action_fold(self):
         table = Table()
         table.add_tournament(self.tournament)
@@ -388,6 +410,83 @@ class TableTest(unittest.TestCase):
         self.assertEqual(table.pot.highest_bet, 400)
         self.assertFalse(table.players[2].is_current_player)
 
+    def test_street_facts(self):
+        table = Table()
+        table.add_tournament(Tournament(level=Level(value=1, bb=200)))
+        for name, seat in [("Alpha", 1), ("Bravo", 2), ("Charlie", 3), ("Delta", 4)]:
+            table.add_player(TablePlayer(name=name, seat=seat, init_stack=20000))
+        table.set_bb_seat(2)
+        table.start_hand()
+        self.assertIsNone(table.street_first_to_talk_seat)
+        self.assertIsNone(table.initiative_seat)
+        FoldAction(table.current_player).play()
+        self.assertEqual(table.street_first_to_talk_seat, 3)
+        RaiseAction(table.current_player, 400).play()
+        self.assertTrue(table.steal_attempted)
+        self.assertFalse(table.squeeze_made)
+        self.assertEqual(table.initiative_seat, 4)
+        self.assertEqual(table.street_first_to_talk_seat, 4)
+        self.assertTrue(table.players[1].is_facing_steal)
+        FoldAction(table.current_player).play()
+        CallAction(table.current_player).play()
+        table.execute_flop("7h", "2d", "5c")
+        self.assertIsNone(table.street_first_to_talk_seat)
+        self.assertTrue(table.current_player.can_donk_bet)
+        CheckAction(table.current_player).play()
+        self.assertEqual(table.street_first_to_talk_seat, 2)
+        self.assertFalse(table.street_cbet_made)
+        BetAction(table.current_player, 300).play()
+        self.assertTrue(table.street_cbet_made)
+        self.assertTrue(table.players[2].is_facing_cbet)
+        FoldAction(table.current_player).play()
+        self.assertEqual(table.initiative_seat, 4)
+        table.hand_reset()
+        self.assertFalse(table.steal_attempted)
+        self.assertFalse(table.street_cbet_made)
+        self.assertIsNone(table.street_first_to_talk_seat)
+
+    def test_street_all_in_fact(self):
+        table = Table()
+        table.add_tournament(Tournament(level=Level(value=1, bb=200)))
+        for name, seat, stack in [("Alpha", 1, 20000), ("Bravo", 2, 20000), ("Charlie", 3, 5000)]:
+            table.add_player(TablePlayer(name=name, seat=seat, init_stack=stack))
+        table.set_bb_seat(2)
+        table.start_hand()
+        self.assertFalse(table.street_all_in_made)
+        shover = table.current_player
+        self.assertEqual(shover.name, "Charlie")
+        RaiseAction(shover, shover.stack, is_all_in=True).play()
+        self.assertTrue(table.street_all_in_made)
+        self.assertTrue(shover.flag_street_went_all_in)
+        self.assertIsNone(shover.hand_stats.general.face_all_in_street)
+        caller = table.current_player
+        self.assertTrue(caller.is_facing_all_in)
+        CallAction(caller).play()
+        self.assertEqual(caller.hand_stats.general.face_all_in_street, Street.PREFLOP)
+        self.assertEqual(caller.hand_stats.general.facing_all_in_move, ActionMove.CALL)
+        FoldAction(table.current_player).play()
+        table.execute_flop("7h", "2d", "5c")
+        self.assertFalse(table.street_all_in_made)
+        self.assertFalse(table.current_player.is_facing_all_in)
+
+    def test_short_all_in_call_is_not_faced(self):
+        table = Table()
+        table.add_tournament(Tournament(level=Level(value=1, bb=200)))
+        for name, seat, stack in [("Alpha", 1, 20000), ("Bravo", 2, 20000), ("Charlie", 3, 150)]:
+            table.add_player(TablePlayer(name=name, seat=seat, init_stack=stack))
+        table.set_bb_seat(2)
+        table.start_hand()
+        short_stack = table.current_player
+        CallAction(short_stack, is_all_in=True).play()
+        self.assertTrue(short_stack.flag_street_went_all_in)
+        self.assertFalse(table.street_all_in_made)
+        CallAction(table.current_player).play()
+        big_blind = table.current_player
+        self.assertEqual(big_blind.name, "Bravo")
+        self.assertFalse(big_blind.is_facing_all_in)
+        CheckAction(big_blind).play()
+        self.assertIsNone(big_blind.hand_stats.general.facing_all_in_move)
+
     def test_hand_example(self):
         hand_id = "2612804708405870609-6-1672853787"
         datetime = "04-01-2023 17:36:27"
@@ -0,0 +1,76 @@
+import unittest
+from pkrcomponents.components.actions import BetAction, FoldAction
+from pkrcomponents.components.players import TablePlayer
+from pkrcomponents.components.tables import Table
+from pkrcomponents.components.tables.table_pool import TablePool
+from pkrcomponents.components.utils.exceptions import PoolLeakError
+
+
+class TablePoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = TablePool(check_leaks_on_release=True)
+
+    def play_hand(self):
+        table = self.pool.acquire_table()
+        p1 = self.pool.acquire_player(name="Toto", seat=1, init_stack=2000, bounty=5)
+        p2 = self.pool.acquire_player(name="Tata", seat=2, init_stack=2500)
+        p3 = self.pool.acquire_player(name="Titi", seat=3, init_stack=3000, entered_hand=False)
+        for player in (p1, p2):
+            table.add_player(player)
+        table.start_hand()
+        p1.distribute("AcKc")
+        BetAction(table.current_player, 1000).play()
+        FoldAction(table.current_player).play()
+        return table, p1, p2, p3
+
+    def test_acquire_table_returns_recycled_table(self):
+        table, _, _, _ = self.play_hand()
+        self.assertIs(self.pool.acquire_table(), table)
+        self.assertIsInstance(table, Table)
+        self.assertEqual(table.players.len, 0)
+        self.assertEqual(table.pot.value, 0)
+        self.assertEqual(table.postings, [])
+        self.assertEqual(table.deck.len, 52)
+        self.assertEqual(table.board.len, 0)
+        self.assertIsNone(table.street)
+        self.assertFalse(table.hand_has_started)
+
+    def test_players_are_recycled(self):
+        _, p1, p2, p3 = self.play_hand()
+        self.assertEqual(self.pool.cnt_created_players, 3)
+        self.play_hand()
+        self.assertEqual(self.pool.cnt_created_players, 3)
+        self.assertEqual(len(self.pool.players_in_use), 3)
+        self.assertCountEqual([id(p) for p in self.pool.players_in_use], [id(p1), id(p2), id(p3)])
+
+    def test_acquired_player_is_reset(self):
+        self.play_hand()
+        self.pool.release()
+        player = self.pool.acquire_player(name="Tutu", seat=4, init_stack=1200, bounty=3)
+        fresh = TablePlayer(name="Tutu", seat=4, init_stack=1200, bounty=3)
+        self.assertEqual(player.name, "Tutu")
+        self.assertEqual(player.stack, 1200)
+        self.assertIsNone(player.table)
+        self.assertIsNone(player.combo)
+        self.assertFalse(player.folded)
+        self.assertFalse(player.is_hero)
+        self.assertFalse(player.has_initiative)
+        self.assertEqual(player.current_bet, 0)
+        self.assertEqual(player.actions_history.preflop.actions, [])
+        self.assertEqual(player.hand_stats.to_dataframe().to_dict(), fresh.hand_stats.to_dataframe().to_dict())
+
+    def test_check_leaks_detects_lost_player(self):
+        self.play_hand()
+        self.pool.release()
+        self.pool.free_players.pop()
+        with self.assertRaises(PoolLeakError):
+            self.pool.check_leaks()
+
+    def test_check_leaks_detects_dirty_table(self):
+        self.play_hand()
+        self.pool.check_leaks_on_release = False
+        self.pool.release()
+        self.pool.table.postings.append("posting")
+        with self.assertRaises(PoolLeakError):
+            self.pool.check_leaks()
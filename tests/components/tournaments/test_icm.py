@@ -0,0 +1,86 @@
+import itertools
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from pkrcomponents.components.actions import Action
+from pkrcomponents.components.tournaments import Payout, Payouts, Tournament
+from pkrcomponents.components.tournaments.icm import icm_equities, get_rewards
+
+
+def harville_equities(stacks: list, rewards: list) -> np.ndarray:
+    equities = np.zeros(len(stacks))
+    for order in itertools.permutations(range(len(stacks))):
+        probability, remaining = 1.0, sum(stacks)
+        for seat in order:
+            probability *= stacks[seat] / remaining
+            remaining -= stacks[seat]
+        for rank, seat in enumerate(order[:len(rewards)]):
+            equities[seat] += probability * rewards[rank]
+    return equities
+
+
+class ICMTest(unittest.TestCase):
+
+    def setUp(self):
+        self.stacks = [5000, 3000, 2000, 1500, 700, 300]
+        self.rewards = [50.0, 30.0, 20.0]
+        self.payouts = Payouts([Payout(1, 50.0), Payout(2, 30.0), Payout(3, 20.0)])
+
+    def test_get_rewards(self):
+        self.assertEqual(get_rewards(self.payouts, 4).tolist(), [50.0, 30.0, 20.0, 0.0])
+        self.assertEqual(get_rewards(self.rewards, 2).tolist(), [50.0, 30.0])
+        self.assertEqual(get_rewards(Payouts([Payout(1, 50.0), Payout(3, 10.0)]), 3).tolist(), [50.0, 10.0, 10.0])
+
+    def test_exact_matches_harville(self):
+        expected = harville_equities(self.stacks, self.rewards)
+        np.testing.assert_allclose(icm_equities(self.stacks, self.rewards, method="exact"), expected)
+        np.testing.assert_allclose(icm_equities(self.stacks, self.payouts), expected)
+        rewards = [40.0, 25.0, 15.0, 10.0, 6.0, 4.0]
+        np.testing.assert_allclose(icm_equities(self.stacks, rewards), harville_equities(self.stacks, rewards))
+
+    def test_equities_sum_to_prize_pool(self):
+        stacks = np.random.default_rng(0).uniform(1000, 20000, 9)
+        equities = icm_equities(stacks, [30.0, 20.0, 15.0, 10.0, 8.0, 6.0, 5.0, 4.0, 2.0])
+        self.assertAlmostEqual(equities.sum(), 100.0)
+        self.assertEqual(list(np.argsort(equities)), list(np.argsort(stacks)))
+
+    def test_batch_of_stacks(self):
+        batch = np.array([self.stacks, self.stacks[::-1]])
+        equities = icm_equities(batch, self.rewards)
+        self.assertEqual(equities.shape, (2, 6))
+        np.testing.assert_allclose(equities[1], equities[0][::-1])
+
+    def test_monte_carlo_is_close_to_exact(self):
+        exact = icm_equities(self.stacks, self.rewards, method="exact")
+        estimated = icm_equities(self.stacks, self.rewards, method="monte_carlo", nb_samples=100000, seed=1)
+        np.testing.assert_allclose(estimated, exact, atol=0.5)
+        self.assertAlmostEqual(estimated.sum(), 100.0)
+
+    def test_monte_carlo_batch_of_stacks(self):
+        batch = np.array([self.stacks, self.stacks[::-1], [2000] * 6])
+        exact = icm_equities(batch, self.rewards, method="exact")
+        with patch("pkrcomponents.components.tournaments.icm.MONTE_CARLO_MAX_DRAWS", 2 * 50000 * 6):
+            estimated = icm_equities(batch, self.rewards, method="monte_carlo", nb_samples=50000, seed=1)
+        self.assertEqual(estimated.shape, (3, 6))
+        np.testing.assert_allclose(estimated, exact, atol=0.6)
+        np.testing.assert_allclose(estimated.sum(axis=1), 100.0)
+
+    def test_heads_up_and_unpaid(self):
+        np.testing.assert_allclose(icm_equities([3000, 1000], [60.0, 40.0]), [55.0, 45.0])
+        np.testing.assert_allclose(icm_equities([3000, 1000], []), [0.0, 0.0])
+
+    def test_invalid_inputs_raise_error(self):
+        with self.assertRaises(ValueError):
+            icm_equities([1000, 0], self.rewards)
+        with self.assertRaises(ValueError):
+            icm_equities(self.stacks, self.rewards, method="chip_ev")
+
+    def test_tournament_icm_equities(self):
+        tournament = Tournament(payouts=self.payouts)
+        np.testing.assert_allclose(tournament.icm_equities(self.stacks), harville_equities(self.stacks, self.rewards))
+
+
+if __name__ == '__main__':
+    unittest.main()
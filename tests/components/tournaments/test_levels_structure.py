@@ -0,0 +1,76 @@
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from pkrcomponents.components.actions import Action
+from pkrcomponents.components.tournaments import Level, LevelsStructure
+
+
+class LevelsStructureTest(unittest.TestCase):
+
+    def setUp(self):
+        self.levels_dicts = [
+            {"value": 1, "bb": 200.0, "sb": 100.0, "ante": 25.0},
+            {"value": 2, "bb": 250.0, "sb": 125.0, "ante": 30.0},
+            {"value": 3, "bb": 300.0, "sb": 150.0, "ante": 35.0, "duration": 5},
+        ]
+        self.structure = LevelsStructure.from_dicts(self.levels_dicts, level_duration=10)
+
+    def test_from_dicts(self):
+        self.assertEqual(len(self.structure), 3)
+        self.assertIsInstance(self.structure, list)
+        self.assertEqual(self.structure.get_level(2), Level(value=2, bb=250.0, sb=125.0, ante=30.0))
+        self.assertIsNone(self.structure.get_level(4))
+        self.assertEqual(self.structure.get_duration(3), 5)
+        self.assertEqual(self.structure.to_json()[0], {"value": 1, "bb": 200.0, "sb": 100.0, "ante": 25.0,
+                                                       "duration": 10})
+
+    def test_level_at(self):
+        self.assertEqual(self.structure.starts.tolist(), [0.0, 10.0, 20.0])
+        self.assertEqual(self.structure.ends.tolist(), [10.0, 20.0, 25.0])
+        self.assertEqual(self.structure.level_at(0).value, 1)
+        self.assertEqual(self.structure.level_at(9.99).value, 1)
+        self.assertEqual(self.structure.level_at(10).value, 2)
+        self.assertEqual(self.structure.level_at(60).value, 3)
+        start_date = datetime(2023, 1, 4, 17, 30)
+        self.assertEqual(self.structure.level_at_date(start_date + timedelta(minutes=21), start_date).value, 3)
+        indexes = self.structure.level_indexes_at([0, 9.99, 10, 24, 100])
+        self.assertEqual(indexes.tolist(), [0, 0, 1, 2, 2])
+
+    def test_level_at_without_durations_raises_error(self):
+        structure = LevelsStructure.from_dicts(self.levels_dicts[:2])
+        with self.assertRaises(ValueError):
+            structure.level_at(5)
+        with self.assertRaises(ValueError):
+            structure.level_indexes_at([5])
+
+    def test_cost_per_round(self):
+        np.testing.assert_allclose(self.structure.cost_per_round(6), [300 + 150, 375 + 180, 450 + 210])
+
+    def test_get_or_add_level(self):
+        structure = LevelsStructure()
+        level = structure.get_or_add_level(value=1, bb=200, ante=25)
+        self.assertEqual(level, Level(value=1, bb=200, ante=25))
+        self.assertIs(structure.get_or_add_level(value=1, bb=200, ante=25), level)
+        other_level = structure.get_or_add_level(value=1, bb=400, ante=50)
+        self.assertEqual(other_level.bb, 400)
+        self.assertIs(structure.get_level(1), level)
+        self.assertEqual(len(structure), 1)
+        self.assertIs(structure.get_known_level(value=1, bb=200, ante=25), level)
+        self.assertIsNone(structure.get_known_level(value=1, bb=400, ante=50))
+        self.assertIsNone(structure.get_known_level(value=2, bb=400, ante=50))
+
+    def test_index_is_rebuilt_after_modification(self):
+        self.assertEqual(self.structure.level_at(22).value, 3)
+        self.structure.add_level(Level(value=4, bb=400, ante=50), duration=10)
+        self.assertEqual(self.structure.level_at(30).value, 4)
+        self.structure.pop(0)
+        self.assertEqual(self.structure.level_at(0).value, 2)
+        self.structure.durations[2] = 1
+        self.structure.refresh_index()
+        self.assertEqual(self.structure.level_at(2).value, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from pkrcomponents.components.tournaments import Payout, Payouts
 
 
@@ -81,3 +82,35 @@ class PayoutsTest(unittest.TestCase):
     def test_rewards_property_returns_correct_rewards(self):
         rewards = self.payouts.rewards
         self.assertEqual(rewards, [300.0, 200.0, 100.0])
+
+    def test_lookups_with_tiers_gaps(self):
+        payouts = Payouts([Payout(1, 1000.0), Payout(2, 500.0), Payout(5, 100.0), Payout(10, 50.0)])
+        self.assertEqual(payouts.get_reward(4), 100.0)
+        self.assertEqual(payouts.get_payout(6), Payout(10, 50.0))
+        self.assertEqual(payouts.get_payout(11), Payout(0, 0.0))
+        self.assertEqual(payouts.closest_payout(7).tier, 5)
+        self.assertEqual(payouts.get_prize_pool(), 1000.0 + 500.0 + 3 * 100.0 + 5 * 50.0)
+        ranks = np.arange(1, 13)
+        self.assertEqual(payouts.get_rewards(ranks).tolist(), [payouts.get_reward(rank) for rank in ranks])
+
+    def test_index_is_rebuilt_after_modification(self):
+        self.assertEqual(self.payouts.get_prize_pool(), 600.0)
+        self.payouts.add_payout(Payout(5, 50.0))
+        self.assertEqual(self.payouts.get_prize_pool(), 700.0)
+        self.payouts.remove_payout(1)
+        self.assertEqual(self.payouts.get_reward(1), 200.0)
+        self.payouts[0] = Payout(2, 250.0)
+        self.assertEqual(self.payouts.get_reward(1), 250.0)
+        self.payouts[0].reward = 260.0
+        self.payouts.refresh_index()
+        self.assertEqual(self.payouts.get_reward(1), 260.0)
+        self.payouts.clear()
+        self.assertEqual(self.payouts.get_reward(1), 0.0)
+        with self.assertRaises(ValueError):
+            self.payouts.get_prize_pool()
+
+    def test_unsorted_payouts_are_looked_up_by_tier(self):
+        payouts = Payouts([Payout(3, 100.0), Payout(1, 300.0), Payout(2, 200.0)])
+        self.assertEqual(payouts.get_reward(1), 300.0)
+        self.assertEqual(payouts.closest_payout(3).tier, 2)
+        self.assertEqual(payouts.tiers, [3, 1, 2])
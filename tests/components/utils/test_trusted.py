@@ -0,0 +1,90 @@
+import threading
+import unittest
+
+import attrs
+from attrs.validators import get_disabled
+
+from pkrcomponents.components.players.table_player import TablePlayer
+from pkrcomponents.components.tables.table import Table
+from pkrcomponents.components.utils.trusted import compile_init, get_hot_classes, is_trusted, trusted_mode
+
+
+class TestTrustedMode(unittest.TestCase):
+    def setUp(self):
+        self.player = TablePlayer(name="Hero", seat=1, init_stack=1000)
+
+    def test_validators_are_skipped_in_trusted_mode(self):
+        with trusted_mode():
+            self.assertTrue(is_trusted())
+            self.assertFalse(get_disabled())
+            self.player.stack = -1.0
+            player = TablePlayer(name="Ab", seat=1, init_stack=1000)
+        self.assertEqual(self.player.stack, -1.0)
+        self.assertEqual(player.name, "Ab")
+
+    def test_attrs_init_reads_the_validators_config(self):
+        validated_classes = [cls for cls in get_hot_classes()
+                             if any(attribute.validator is not None for attribute in attrs.fields(cls))]
+        self.assertIn(TablePlayer, validated_classes)
+        for cls in validated_classes:
+            with self.subTest(cls=cls.__name__):
+                self.assertIn("_config", cls.__init__.__code__.co_names,
+                              "the __init__ generated by attrs does not read _config, the trusted mode cannot skip its "
+                              "validators")
+                self.assertIsNotNone(compile_init(cls))
+
+    def test_converters_still_apply_in_trusted_mode(self):
+        table = Table()
+        with trusted_mode():
+            self.player.stack = 500
+            table.street = "Flop"
+        self.assertIsInstance(self.player.stack, float)
+        self.assertEqual(table.street.name, "FLOP")
+
+    def test_trusted_mode_is_reentrant(self):
+        with trusted_mode():
+            with trusted_mode():
+                self.assertTrue(is_trusted())
+            self.assertTrue(is_trusted())
+            self.player.stack = -1.0
+        self.assertFalse(is_trusted())
+        self.assertFalse(get_disabled())
+        with self.assertRaises(ValueError):
+            self.player.stack = -1.0
+
+    def test_other_threads_keep_validating(self):
+        entered, done = threading.Event(), threading.Event()
+        errors = []
+
+        def run_trusted():
+            with trusted_mode():
+                entered.set()
+                done.wait(5)
+
+        thread = threading.Thread(target=run_trusted)
+        thread.start()
+        entered.wait(5)
+        try:
+            self.assertFalse(is_trusted())
+            try:
+                self.player.stack = -1.0
+            except ValueError as error:
+                errors.append(error)
+            with self.assertRaises(ValueError):
+                TablePlayer(name="Ab", seat=-3, init_stack=1000)
+        finally:
+            done.set()
+            thread.join()
+        self.assertEqual(len(errors), 1)
+
+    def test_trusted_mode_is_exited_on_error(self):
+        with self.assertRaises(KeyError):
+            with trusted_mode():
+                raise KeyError
+        self.assertFalse(is_trusted())
+        with self.assertRaises(ValueError):
+            self.player.stack = -1.0
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import unittest
+
+from pkrcomponents.components.tournaments.levels_structure import LevelsStructure
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+from pkrcomponents.converters.utils.cache import LRUCache
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "json_files")
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LRUCache(capacity=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIsNone(cache.get("b"))
+
+    def test_get_or_create(self):
+        cache = LRUCache(capacity=2)
+        created = cache.get_or_create("a", list)
+        self.assertIs(cache.get_or_create("a", list), created)
+        self.assertEqual(cache.pop("a"), [])
+        self.assertEqual(len(cache), 0)
+
+
+class TestLevelsStructuresCache(unittest.TestCase):
+    def test_levels_structures_are_bounded(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        converter.levels_structures = LRUCache(capacity=2)
+        structures = [converter.get_levels_structure(tournament_id) for tournament_id in ("1", "2", "3")]
+        self.assertTrue(all(isinstance(structure, LevelsStructure) for structure in structures))
+        self.assertEqual(len(converter.levels_structures), 2)
+        self.assertNotIn("1", converter.levels_structures)
+        self.assertIs(converter.get_levels_structure("3"), structures[2])
+
+    def test_hands_of_a_tournament_share_their_levels(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        first = converter.convert_history(os.path.join(FILES_DIR, "example01.json")).level
+        second = converter.convert_history(os.path.join(FILES_DIR, "example01.json")).level
+        self.assertIs(first, second)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import json
 import os
 import pandas as pd
 import unittest
@@ -14,7 +15,10 @@ from pkrcomponents.components.players.position import Position
 from pkrcomponents.components.tables.table import Table
 from pkrcomponents.components.tournaments.level import Level
 from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.history_converter.plan import HandPlan
 from pkrcomponents.converters.settings import DATA_DIR, TEST_DATA_DIR
+from pkrcomponents.converters.utils.exceptions import HandConversionError, HistorySchemaError
+from pkrcomponents.converters.utils.schema import validate_history
 
 FILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "json_files")
 
@@ -55,6 +59,11 @@ class TestLocalHandHistoryConverter01(unittest.TestCase):
         self.assertEqual(self.converter.table.level.bb, 200)
         self.assertEqual(self.converter.table.level.sb, 100)
         self.assertEqual(self.converter.table.level.ante, 25)
+        level = self.converter.table.level
+        self.converter.get_level()
+        self.assertIs(self.converter.table.level, level)
+        levels_structure = self.converter.get_levels_structure(self.converter.get_tournament_id())
+        self.assertIs(levels_structure.get_level(1), level)
 
     def test_get_tournament_name(self):
         tournament_name = self.converter.get_tournament_name()
@@ -985,3 +994,142 @@ class TestLocalHandHistoryConverter25(unittest.TestCase):
 
     def test_convert_history(self):
         self.converter.convert_history(self.history_path)
+
+
+class TestPooledHandHistoryConverter(unittest.TestCase):
+    def setUp(self):
+        self.history_paths = [os.path.join(FILES_DIR, filename) for filename in sorted(os.listdir(FILES_DIR))]
+        self.converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        self.pooled_converter = LocalHandHistoryConverter(data_dir=DATA_DIR, pooled=True)
+        self.pooled_converter.pool.check_leaks_on_release = True
+
+    def test_pooled_conversion_matches_regular_conversion(self):
+        for history_path in self.history_paths:
+            table = self.converter.convert_history(history_path)
+            pooled_table = self.pooled_converter.convert_history(history_path)
+            self.assertIs(pooled_table, self.pooled_converter.pool.table)
+            self.assertEqual(pooled_table.hand_id, table.hand_id)
+            self.assertEqual([pl.name for pl in pooled_table.players], [pl.name for pl in table.players])
+            for player in table.players:
+                pooled_player = pooled_table.players[player.name]
+                self.assertEqual(pooled_player.stack, player.stack)
+                self.assertEqual(pooled_player.hand_stats.to_dataframe().to_dict(),
+                                 player.hand_stats.to_dataframe().to_dict())
+
+    def test_pooled_conversion_recycles_players(self):
+        for history_path in self.history_paths:
+            self.pooled_converter.convert_history(history_path)
+        pool = self.pooled_converter.pool
+        self.assertLessEqual(pool.cnt_created_players, 10)
+        pool.release()
+        pool.check_leaks()
+
+
+class TestTrustedHandHistoryConverter(unittest.TestCase):
+    def setUp(self):
+        self.history_paths = [os.path.join(FILES_DIR, filename) for filename in sorted(os.listdir(FILES_DIR))]
+        self.converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        self.trusted_converter = LocalHandHistoryConverter(data_dir=DATA_DIR, trusted=True)
+
+    def test_trusted_conversion_matches_regular_conversion(self):
+        for history_path in self.history_paths:
+            table = self.converter.convert_history(history_path)
+            trusted_table = self.trusted_converter.convert_history(history_path)
+            self.assertEqual(trusted_table.hand_id, table.hand_id)
+            self.assertEqual(trusted_table.pot.value, table.pot.value)
+            for player in table.players:
+                trusted_player = trusted_table.players[player.name]
+                self.assertEqual(trusted_player.stack, player.stack)
+                self.assertEqual(trusted_player.hand_stats.to_dataframe().to_dict(),
+                                 player.hand_stats.to_dataframe().to_dict())
+
+    def test_validators_are_restored_after_trusted_conversion(self):
+        table = self.trusted_converter.convert_history(self.history_paths[0])
+        with self.assertRaises(ValueError):
+            table.players.pl_list[0].stack = -1
+        with self.assertRaises(TypeError):
+            table.hand_id = 1
+
+    def test_validate_history_normalizes_numbers(self):
+        with open(self.history_paths[0], "r", encoding="utf-8") as file:
+            data = json.load(file)
+        data["buy_in"] = 5
+        data["postings"][0]["amount"] = 25
+        data = validate_history(data)
+        self.assertIsInstance(data["buy_in"], float)
+        self.assertIsInstance(data["postings"][0]["amount"], float)
+
+    def test_validate_history_rejects_invalid_data(self):
+        with open(self.history_paths[0], "r", encoding="utf-8") as file:
+            data = json.load(file)
+        data["players"]["1"]["init_stack"] = -10.0
+        with self.assertRaises(HistorySchemaError) as context:
+            validate_history(data)
+        self.assertEqual(context.exception.path, "players.1.init_stack")
+        del data["hand_id"]
+        with self.assertRaises(HistorySchemaError):
+            validate_history(data)
+
+class TestCompiledHandHistoryConverter(unittest.TestCase):
+    def setUp(self):
+        self.history_paths = [os.path.join(FILES_DIR, filename) for filename in sorted(os.listdir(FILES_DIR))]
+        self.converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        self.compiled_converter = LocalHandHistoryConverter(data_dir=DATA_DIR, compiled=True)
+
+    def test_compiled_conversion_matches_regular_conversion(self):
+        for history_path in self.history_paths:
+            table = self.converter.convert_history(history_path)
+            compiled_table = self.compiled_converter.convert_history(history_path)
+            self.assertEqual(compiled_table.hand_id, table.hand_id)
+            self.assertEqual(compiled_table.hand_date, table.hand_date)
+            self.assertEqual(compiled_table.level, table.level)
+            self.assertEqual(compiled_table.pot.value, table.pot.value)
+            self.assertEqual(compiled_table.board, table.board)
+            for player in table.players:
+                compiled_player = compiled_table.players[player.name]
+                self.assertEqual(compiled_player.stack, player.stack)
+                self.assertEqual(compiled_player.position, player.position)
+                self.assertEqual(compiled_player.hand_stats.to_dataframe().to_dict(),
+                                 player.hand_stats.to_dataframe().to_dict())
+
+    def test_hand_plan(self):
+        with open(self.history_paths[0], "r", encoding="utf-8") as file:
+            data = validate_history(json.load(file))
+        plan = HandPlan.from_history(data)
+        self.assertEqual(plan.hand_id, data["hand_id"])
+        self.assertEqual(plan.hand_date, datetime.strptime(data["datetime"], "%d-%m-%Y %H:%M:%S"))
+        self.assertEqual(plan.level, (data["level"]["value"], data["level"]["bb"], data["level"]["ante"]))
+        self.assertEqual(len(plan.players), len(data["players"]))
+        self.assertEqual([(street, len(actions)) for street, actions in plan.streets],
+                         [(street, len(actions)) for street, actions in data["actions"].items()])
+        self.assertEqual(plan.postings[0], (data["postings"][0]["name"], data["postings"][0]["amount"],
+                                            data["postings"][0]["blind_type"]))
+
+    def test_compiled_conversion_rejects_invalid_data(self):
+        with open(self.history_paths[0], "r", encoding="utf-8") as file:
+            data = json.load(file)
+        data["postings"][1]["amount"] = "25"
+        self.compiled_converter.read_data_text = lambda parsed_key: json.dumps(data)
+        with self.assertRaises(HandConversionError) as context:
+            self.compiled_converter.convert_history(self.history_paths[0])
+        self.assertIsInstance(context.exception.original_exception, HistorySchemaError)
+        self.assertEqual(context.exception.original_exception.path, "postings[1].amount")
+
+
+class TestActionLogConversion(unittest.TestCase):
+    def setUp(self):
+        self.history_paths = [os.path.join(FILES_DIR, filename) for filename in sorted(os.listdir(FILES_DIR))]
+        self.converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+
+    def test_action_log_matches_actions_sequences(self):
+        for history_path in self.history_paths:
+            table = self.converter.convert_history(history_path)
+            for player in table.players:
+                history = player.actions_history
+                for street, sequence in zip([Street.PREFLOP, Street.FLOP, Street.TURN, Street.RIVER],
+                                            [history.preflop, history.flop, history.turn, history.river]):
+                    view = history.view(street)
+                    self.assertEqual(view.symbol, sequence.symbol)
+                    self.assertEqual(view.line_id, sequence.line_id)
+                    self.assertEqual(view.total_amount, sum(action.value for action in sequence.actions))
+                    self.assertTrue(all(seat == player.seat for seat in view.seats))
@@ -0,0 +1,51 @@
+import unittest
+from datetime import datetime
+
+import numpy as np
+
+from pkrcomponents.converters.utils.dates import HISTORY_DATE_FORMAT, SUMMARY_DATE_FORMAT, parse_history_date, \
+    parse_history_dates, parse_summary_date, parse_summary_dates
+
+
+class TestDates(unittest.TestCase):
+    def setUp(self):
+        self.history_dates = ["04-01-2023 17:36:27", "05-09-2015 20:29:05", "29-02-2024 00:00:00"]
+        self.summary_dates = ["2023/01/04 17:30:01 UTC", "2021/10/17 18:30:07 UTC", "2024/09/01 20:00:01 GMT"]
+
+    def test_parse_history_date(self):
+        for date_string in self.history_dates + ["4-1-2023 7:36:27"]:
+            self.assertEqual(parse_history_date(date_string), datetime.strptime(date_string, HISTORY_DATE_FORMAT))
+        for date_string in ["29-02-2023 00:00:00", "04-01-2023 24:00:00", "2023-01-04 17:36:27"]:
+            with self.assertRaises(ValueError):
+                parse_history_date(date_string)
+
+    def test_parse_summary_date(self):
+        for date_string in self.summary_dates:
+            self.assertEqual(parse_summary_date(date_string), datetime.strptime(date_string, SUMMARY_DATE_FORMAT))
+        with self.assertRaises(ValueError):
+            parse_summary_date("2023/13/04 17:30:01 UTC")
+
+    def test_parse_history_dates(self):
+        dates = parse_history_dates(self.history_dates)
+        self.assertEqual(dates.dtype, np.dtype("datetime64[s]"))
+        self.assertEqual(dates.tolist(), [datetime.strptime(date_string, HISTORY_DATE_FORMAT)
+                                          for date_string in self.history_dates])
+        for date_strings in (["4-1-2023 7:36:27"], ["04-01-2023 17:36:27 UTC"], ["32-01-2023 17:36:27"]):
+            with self.assertRaises(ValueError):
+                parse_history_dates(date_strings)
+
+    def test_parse_summary_dates(self):
+        dates = parse_summary_dates(np.array(self.summary_dates))
+        self.assertEqual(dates.tolist(), [parse_summary_date(date_string) for date_string in self.summary_dates])
+        self.assertEqual(len(parse_summary_dates([])), 0)
+
+    def test_non_utc_summary_dates_are_rejected(self):
+        for date_string in ("2024/01/01 12:00:00 CET", "2024/01/01 12:00:00", "2024/01/01 12:00:00 UTC+1"):
+            with self.assertRaises(ValueError):
+                parse_summary_date(date_string)
+            with self.assertRaises(ValueError):
+                parse_summary_dates(self.summary_dates + [date_string])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from pkrcomponents.converters.archive.manifest import ConversionManifest
+from pkrcomponents.converters.history_converter.dedup import HandDeduplicator, get_key_hand_id
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+from pkrcomponents.converters.utils.bloom import BloomFilter, get_filter_size
+from pkrcomponents.converters.utils.exceptions import BloomFilterSaturationWarning, DuplicateHandError, HandConversionError
+from pkrcomponents.converters.utils.metrics import ConversionMetrics
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "json_files")
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_filter_size(self):
+        nb_bits, nb_hashes = get_filter_size(1000, 0.01)
+        self.assertEqual(nb_bits % 8, 0)
+        self.assertAlmostEqual(nb_bits / 1000, 9.6, delta=0.1)
+        self.assertEqual(nb_hashes, 7)
+
+    def test_membership(self):
+        bloom_filter = BloomFilter(capacity=10000, false_positive_rate=0.001)
+        for i in range(10000):
+            bloom_filter.add(f"hand_{i}")
+        self.assertEqual(len(bloom_filter), 10000)
+        self.assertTrue(all(f"hand_{i}" in bloom_filter for i in range(10000)))
+        nb_false_positives = sum(f"other_{i}" in bloom_filter for i in range(100000))
+        self.assertLess(nb_false_positives, 300)
+        self.assertAlmostEqual(bloom_filter.false_positive_probability, 0.001, delta=0.0005)
+
+    def test_save_and_load(self):
+        bloom_filter = BloomFilter(capacity=100)
+        for i in range(50):
+            bloom_filter.add(f"hand_{i}")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "filters", "hands.bloom")
+            bloom_filter.save(path)
+            self.assertEqual(os.listdir(os.path.dirname(path)), ["hands.bloom"])
+            loaded_filter = BloomFilter.load(path)
+        self.assertEqual(loaded_filter.bits, bloom_filter.bits)
+        self.assertEqual((loaded_filter.nb_hashes, loaded_filter.capacity, len(loaded_filter)),
+                         (bloom_filter.nb_hashes, 100, 50))
+        self.assertIn("hand_49", loaded_filter)
+
+
+class TestHandDeduplicator(unittest.TestCase):
+    def test_key_hand_id(self):
+        hand_id = "2612804708405870609-6-1672853787"
+        self.assertEqual(get_key_hand_id(f"data/histories/parsed/2023/01/04/608341002/{hand_id}.json"), hand_id)
+        self.assertEqual(get_key_hand_id(f"C:\\data\\608341002\\{hand_id}.json"), hand_id)
+        self.assertIsNone(get_key_hand_id(os.path.join(FILES_DIR, "example01.json")))
+
+    def test_claims(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hands.bloom")
+            with HandDeduplicator(path) as deduplicator:
+                self.assertTrue(deduplicator.claim("hand_1"))
+                self.assertFalse(deduplicator.claim("hand_1"))
+                self.assertTrue(deduplicator.claim("hand_2"))
+                deduplicator.release("hand_2")
+                self.assertTrue(deduplicator.claim("hand_2"))
+                self.assertEqual(deduplicator.nb_duplicates, 1)
+            with HandDeduplicator(path) as deduplicator:
+                self.assertFalse(deduplicator.claim("hand_1"))
+                self.assertTrue(deduplicator.claim("hand_3"))
+                self.assertEqual(deduplicator.nb_history_duplicates, 1)
+        with HandDeduplicator() as deduplicator:
+            self.assertTrue(deduplicator.claim("hand_1"))
+
+    def test_history_check_can_be_bypassed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hands.bloom")
+            with HandDeduplicator(path) as deduplicator:
+                self.assertTrue(deduplicator.claim("hand_1"))
+            with HandDeduplicator(path) as deduplicator:
+                self.assertTrue(deduplicator.claim("hand_1", check_history=False))
+                self.assertFalse(deduplicator.claim("hand_1", check_history=False))
+                self.assertEqual(deduplicator.nb_history_duplicates, 0)
+
+    def test_saturation_warning(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hands.bloom")
+            deduplicator = HandDeduplicator(path, capacity=2)
+            for i in range(3):
+                deduplicator.claim(f"hand_{i}")
+            with self.assertWarns(BloomFilterSaturationWarning) as context:
+                deduplicator.close()
+            self.assertEqual((context.warning.count, context.warning.capacity), (3, 2))
+            with self.assertWarns(BloomFilterSaturationWarning):
+                HandDeduplicator(path)
+
+
+class TestDeduplicatedConversion(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.parsed_dir = os.path.join(self.directory.name, "data", "histories", "parsed")
+        self.history_paths = [os.path.join(FILES_DIR, filename) for filename in sorted(os.listdir(FILES_DIR))[:4]]
+        self.keys = {}
+        for tournament_id in ("100", "200"):
+            for history_path in self.history_paths:
+                with open(history_path, "r", encoding="utf-8") as file:
+                    hand_id = json.load(file)["hand_id"]
+                key = os.path.join(self.parsed_dir, tournament_id, f"{hand_id}.json")
+                os.makedirs(os.path.dirname(key), exist_ok=True)
+                shutil.copy(history_path, key)
+                self.keys.setdefault(hand_id, []).append(key)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_duplicates_are_not_read(self):
+        hand_id, (first_key, second_key) = next(iter(self.keys.items()))
+        with open(second_key, "w", encoding="utf-8") as file:
+            file.write("{")
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR, deduplicator=HandDeduplicator())
+        self.assertEqual(converter.convert_history(first_key).hand_id, hand_id)
+        with self.assertRaises(DuplicateHandError) as context:
+            converter.convert_history(second_key)
+        self.assertEqual(context.exception.hand_id, hand_id)
+
+    def test_failed_hands_are_released(self):
+        hand_id, (first_key, second_key) = next(iter(self.keys.items()))
+        with open(first_key, "w", encoding="utf-8") as file:
+            file.write("{")
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR, deduplicator=HandDeduplicator())
+        with self.assertRaises(HandConversionError):
+            converter.convert_history(first_key)
+        self.assertEqual(converter.convert_history(second_key).hand_id, hand_id)
+
+    def test_duplicates_are_only_counted_as_skipped(self):
+        hand_id, (first_key, second_key) = next(iter(self.keys.items()))
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR, deduplicator=HandDeduplicator(), timed=True,
+                                              metrics=ConversionMetrics())
+        for history_key in (first_key, second_key, self.history_paths[1], self.history_paths[1]):
+            try:
+                converter.convert_history(history_key)
+            except DuplicateHandError:
+                pass
+        self.assertEqual(converter.metrics.hands_converted, 2)
+        self.assertEqual(converter.metrics.hands_skipped, 2)
+        self.assertEqual(converter.metrics.errors, {})
+        self.assertEqual(converter.timer.histograms["total"].count, 2)
+
+    def test_keys_without_hand_id(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR, deduplicator=HandDeduplicator())
+        converter.convert_history(self.history_paths[0])
+        with self.assertRaises(DuplicateHandError):
+            converter.convert_history(self.history_paths[0])
+
+    def test_rewritten_histories_are_converted_again(self):
+        manifest_path = os.path.join(self.directory.name, "converted.manifest")
+        bloom_path = os.path.join(self.directory.name, "converted_hands.bloom")
+        data_dir = os.path.join(self.directory.name, "data")
+        with ConversionManifest(manifest_path) as manifest, HandDeduplicator(bloom_path) as deduplicator:
+            LocalHandHistoryConverter(data_dir=data_dir, manifest=manifest, deduplicator=deduplicator).convert_histories()
+            self.assertEqual(len(manifest), 2 * len(self.keys))
+        hand_id, (first_key, second_key) = next(iter(self.keys.items()))
+        stat = os.stat(first_key)
+        os.utime(first_key, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        with ConversionManifest(manifest_path) as manifest, HandDeduplicator(bloom_path) as deduplicator:
+            converter = LocalHandHistoryConverter(data_dir=data_dir, manifest=manifest, deduplicator=deduplicator)
+            self.assertEqual(list(converter.iter_keys_to_convert()), [first_key])
+            converter.convert_histories()
+            self.assertTrue(manifest.is_converted(first_key, converter.get_key_version(first_key)))
+            self.assertEqual(deduplicator.claimed, {hand_id})
+            self.assertEqual(deduplicator.nb_duplicates + deduplicator.nb_history_duplicates, 0)
+
+    def test_runs(self):
+        for run in ("slow_convert_histories", "convert_histories"):
+            deduplicator = HandDeduplicator()
+            converter = LocalHandHistoryConverter(data_dir=os.path.join(self.directory.name, "data"),
+                                                  deduplicator=deduplicator)
+            getattr(converter, run)()
+            self.assertEqual(deduplicator.claimed, set(self.keys))
+            self.assertEqual(deduplicator.nb_duplicates, len(self.keys))
+            self.assertFalse(os.path.exists(os.path.join(self.directory.name, "corrections")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import unittest
+
+from pkrcomponents.components.actions.action_move import ActionMove
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "json_files")
+
+# The street and the move of each player facing an all-in bet or raise in the fixture hands, the other players never
+# face an all-in: a short all-in call, like the one of dom97230 in example04, does not put the next players all-in.
+EXPECTED_FACING_ALL_IN = {
+    "example07.json": {"NAS11.43": ("F", "C"), "THESEE": ("F", "C")},
+    "example10.json": {"Alberto Vida": ("PF", "F"), "Blob72": ("PF", "F"), "mica2110": ("PF", "C")},
+    "example14.json": {"chachnaq": ("T", "C")},
+    "example15.json": {"NASTAKASS": ("T", "F")},
+    "example17.json": {"TiAree": ("PF", "C")},
+    "example19.json": {"manggy94": ("PF", "F"), "st michel 81": ("PF", "R")},
+    "example20.json": {"jahden 974": ("PF", "F"), "manggy94": ("PF", "C")},
+    "example21.json": {"SuperPrezzy": ("PF", "F"), "manggy94": ("PF", "F"), "stefou59": ("PF", "F"),
+                       "xxxThug13xxx": ("PF", "F")},
+    "example22.json": {"Elfurio72": ("PF", "F"), "Gilbert 70": ("PF", "C"), "jeanclaude88": ("PF", "F")},
+    "example23.json": {"La punaise p": ("T", "F"), "Nicoluz": ("T", "F")},
+    "example24.json": {"jonhfour777": ("T", "C")},
+    "example25.json": {"L.Openda": ("PF", "C")},
+}
+
+
+class TestFacingAllIn(unittest.TestCase):
+    """The face_all_in_street and facing_all_in_move stats of the fixture hands must match their expected values"""
+
+    def check_facing_all_in(self, converter: LocalHandHistoryConverter):
+        for filename in sorted(os.listdir(FILES_DIR)):
+            table = converter.convert_history(os.path.join(FILES_DIR, filename))
+            expected = EXPECTED_FACING_ALL_IN.get(filename, {})
+            for player in table.players:
+                general_stats = player.hand_stats.general
+                street, move = general_stats.face_all_in_street, general_stats.facing_all_in_move
+                with self.subTest(history=filename, player=player.name):
+                    if player.name in expected:
+                        self.assertEqual((street.symbol, move.symbol), expected[player.name])
+                        self.assertNotEqual(move, ActionMove.CHECK)
+                    else:
+                        self.assertIsNone(street)
+                        self.assertIsNone(move)
+
+    def test_facing_all_in(self):
+        self.check_facing_all_in(LocalHandHistoryConverter(data_dir=DATA_DIR))
+
+    def test_facing_all_in_compiled(self):
+        self.check_facing_all_in(LocalHandHistoryConverter(data_dir=DATA_DIR, pooled=True, compiled=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tracemalloc
+import unittest
+import warnings
+
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+from pkrcomponents.converters.utils.exceptions import MemoryGrowthWarning
+from pkrcomponents.converters.utils.memory import MemoryTracker
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "json_files")
+
+
+class LeakingHandHistoryConverter(LocalHandHistoryConverter):
+    leaked = []
+
+    def get_hero(self):
+        super().get_hero()
+        self.leaked.append(bytearray(10000))
+
+
+class TestMemoryTracker(unittest.TestCase):
+    def setUp(self):
+        self.history_paths = [os.path.join(FILES_DIR, filename) for filename in sorted(os.listdir(FILES_DIR))]
+
+    def test_disabled_tracker(self):
+        tracker = MemoryTracker(enabled=False)
+        tracker.end_hand("hand")
+        tracker.end_batch()
+        self.assertEqual(tracker.batches, [])
+        self.assertTrue(tracker.summary().empty)
+        self.assertEqual(tracker.report(), "No memory measured")
+
+    def test_tracked_conversion(self):
+        was_tracing = tracemalloc.is_tracing()
+        for pooled in (False, True):
+            converter = LocalHandHistoryConverter(data_dir=DATA_DIR, pooled=pooled, memory_tracked=True)
+            converter.memory_tracker.batch_size = len(self.history_paths)
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("error", MemoryGrowthWarning)
+                    for _ in range(3):
+                        hand_ids = {converter.convert_history(history_path).hand_id
+                                    for history_path in self.history_paths}
+                df = converter.memory_tracker.summary()
+                self.assertEqual(list(df["hands"]), [len(self.history_paths)] * 3)
+                self.assertTrue((df["allocated_per_hand"] > 0).all())
+                self.assertTrue(set(converter.memory_tracker.allocated.slowest_hands) <= hand_ids)
+                self.assertLessEqual(len(converter.memory_tracker.sites), converter.memory_tracker.nb_sites)
+                self.assertIn("Allocated per hand", converter.memory_tracker.report())
+            finally:
+                converter.memory_tracker.stop()
+            self.assertEqual(tracemalloc.is_tracing(), was_tracing)
+
+    def test_leak_warning(self):
+        converter = LeakingHandHistoryConverter(data_dir=DATA_DIR, memory_tracked=True)
+        converter.memory_tracker.batch_size = len(self.history_paths)
+        try:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                for _ in range(2):
+                    for history_path in self.history_paths:
+                        converter.convert_history(history_path)
+        finally:
+            converter.memory_tracker.stop()
+            LeakingHandHistoryConverter.leaked.clear()
+        growth_warnings = [warning.message for warning in caught if warning.category is MemoryGrowthWarning]
+        self.assertEqual(len(growth_warnings), 1)
+        self.assertEqual(growth_warnings[0].batch, 1)
+        self.assertGreater(growth_warnings[0].retained_per_hand, 10000)
+        self.assertIn("test_memory.py", converter.memory_tracker.sites[0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+from pkrcomponents.converters.utils.exceptions import HandConversionError
+from pkrcomponents.converters.utils.metrics import NO_METRICS, ConversionMetrics, export_metrics
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "json_files")
+ERRORS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "errors", "json_files")
+
+
+class TestConversionMetrics(unittest.TestCase):
+    def test_disabled_metrics(self):
+        metrics = ConversionMetrics(enabled=False)
+        self.assertIs(metrics.hand(), NO_METRICS)
+        metrics.add_bytes_read(100)
+        metrics.count_correction()
+        self.assertEqual((metrics.hands_converted, metrics.bytes_read, metrics.corrections), (0, 0, 0))
+
+    def test_hands_are_counted(self):
+        metrics = ConversionMetrics()
+        with metrics.hand():
+            pass
+        with self.assertRaises(KeyError):
+            with metrics.hand():
+                raise KeyError("seat")
+        self.assertEqual(metrics.hands_converted, 1)
+        self.assertEqual(metrics.errors, {"KeyError": 1})
+        self.assertEqual(metrics.hands_in_progress, 0)
+        self.assertGreaterEqual(metrics.busy_seconds, 0)
+
+    def test_thread_safety(self):
+        metrics = ConversionMetrics()
+
+        def convert_hands():
+            for _ in range(1000):
+                with metrics.hand():
+                    metrics.add_bytes_read(10)
+
+        threads = [threading.Thread(target=convert_hands) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(metrics.hands_converted, 8000)
+        self.assertEqual(metrics.bytes_read, 80000)
+
+    def test_render(self):
+        metrics = ConversionMetrics()
+        metrics.errors["NotSufficientRaiseError"] += 2
+        metrics.set_queue_depth(5)
+        metrics.count_skipped()
+        lines = metrics.render().splitlines()
+        pid = os.getpid()
+        self.assertIn("# TYPE pkr_hands_converted_total counter", lines)
+        self.assertIn(f'pkr_queue_depth{{pid="{pid}"}} 5', lines)
+        self.assertIn(f'pkr_hands_skipped_total{{pid="{pid}"}} 1', lines)
+        self.assertIn(f'pkr_hands_failed_total{{pid="{pid}",error="NotSufficientRaiseError"}} 2', lines)
+        for line in lines:
+            if not line.startswith("#"):
+                float(line.rsplit(" ", 1)[1])
+
+
+class TestExportedMetrics(unittest.TestCase):
+    def setUp(self):
+        self.history_paths = [os.path.join(FILES_DIR, filename) for filename in sorted(os.listdir(FILES_DIR))]
+
+    def test_converter_metrics(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        converter.metrics = ConversionMetrics()
+        for history_path in self.history_paths:
+            converter.convert_history(history_path)
+        with self.assertRaises(HandConversionError) as context:
+            converter.convert_history(os.path.join(ERRORS_DIR, "example02.json"))
+        error = type(context.exception.original_exception).__name__
+        self.assertEqual(converter.metrics.hands_converted, len(self.history_paths))
+        self.assertEqual(converter.metrics.errors, {error: 1})
+        self.assertEqual(converter.metrics.bytes_read,
+                         sum(len(converter.read_data_text(history_path)) for history_path in self.history_paths) +
+                         len(converter.read_data_text(os.path.join(ERRORS_DIR, "example02.json"))))
+
+    def test_export(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics", "convert_{pid}.prom")
+            with export_metrics(converter, path=path, port=0, interval=60) as metrics:
+                converter.convert_history(self.history_paths[0])
+                url = f"http://127.0.0.1:{metrics.port}"
+                with urllib.request.urlopen(f"{url}/metrics") as response:
+                    self.assertEqual(response.status, 200)
+                    self.assertIn(f'pkr_hands_converted_total{{pid="{os.getpid()}"}} 1', response.read().decode())
+                with self.assertRaises(urllib.error.HTTPError):
+                    urllib.request.urlopen(f"{url}/other")
+            self.assertEqual(os.listdir(os.path.join(directory, "metrics")), [f"convert_{os.getpid()}.prom"])
+            with open(path.format(pid=os.getpid()), "r", encoding="utf-8") as file:
+                self.assertIn("pkr_hands_converted_total", file.read())
+        self.assertIsNone(metrics.port)
+
+    def test_no_export(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        with export_metrics(converter) as metrics:
+            converter.convert_history(self.history_paths[0])
+        self.assertIsNone(metrics)
+        self.assertFalse(converter.metrics.enabled)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+import cProfile
+import os
+import pstats
+import tempfile
+import threading
+import time
+import unittest
+
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+from pkrcomponents.converters.utils import profiling
+from pkrcomponents.converters.utils.profiling import (NO_PROFILE, HandProfiler, StackSampler, get_frame_label,
+                                                      profile_run)
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "json_files")
+
+
+def busy_loop(duration: float):
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        pass
+
+
+class ActiveToolProfile(cProfile.Profile):
+    def enable(self, *args, **kwargs):
+        raise ValueError("Another profiling tool is already active")
+
+
+class TestStackSampler(unittest.TestCase):
+    def test_frame_label(self):
+        self.assertEqual(get_frame_label(LocalHandHistoryConverter.read_data_text.__code__),
+                         "pkrcomponents.converters.history_converter.local:read_data_text")
+        self.assertEqual(get_frame_label(busy_loop.__code__), "test_profiling:busy_loop")
+
+    def test_sampler(self):
+        with StackSampler(interval=0.001) as sampler:
+            busy_loop(0.2)
+        self.assertGreater(sampler.nb_samples, 0)
+        self.assertEqual(sum(sampler.stacks.values()) + sampler.nb_idle_samples, sampler.nb_samples)
+        for line in sampler.collapsed().splitlines():
+            stack, count = line.rsplit(" ", 1)
+            self.assertGreater(int(count), 0)
+            self.assertNotIn(" ", stack.split(";")[-1])
+        df = sampler.summary(top=5)
+        self.assertEqual(list(df.columns), ["function", "self_samples", "total_samples", "self_share", "total_share"])
+        self.assertLessEqual(len(df), 5)
+        self.assertIn("test_profiling:busy_loop", set(sampler.summary()["function"]))
+        self.assertTrue((df["self_samples"] <= df["total_samples"]).all())
+
+    def test_sampler_skips_waiting_and_unnamed_threads(self):
+        event = threading.Event()
+        threads = [threading.Thread(target=event.wait, name="Worker-waiting"),
+                   threading.Thread(target=busy_loop, args=(0.2,), name="Worker-busy"),
+                   threading.Thread(target=busy_loop, args=(0.2,), name="Other")]
+        with StackSampler(interval=0.001, thread_prefix="Worker") as sampler:
+            for thread in threads:
+                thread.start()
+            threads[1].join()
+            event.set()
+        for thread in threads:
+            thread.join()
+        self.assertGreater(sampler.nb_idle_samples, 0)
+        leaves = {stack[-1] for stack in sampler.stacks}
+        self.assertIn("test_profiling:busy_loop", leaves)
+        self.assertFalse(leaves & profiling.IDLE_FUNCTIONS)
+        self.assertLessEqual(sum(count for stack, count in sampler.stacks.items()
+                                 if stack[-1] == "test_profiling:busy_loop"), sampler.nb_samples)
+
+    def test_stopped_sampler(self):
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        sampler.stop()
+        nb_samples = sampler.nb_samples
+        busy_loop(0.02)
+        self.assertEqual(sampler.nb_samples, nb_samples)
+
+
+class TestHandProfiler(unittest.TestCase):
+    def setUp(self):
+        self.history_paths = [os.path.join(FILES_DIR, filename) for filename in sorted(os.listdir(FILES_DIR))]
+
+    def test_disabled_profiler(self):
+        profiler = HandProfiler()
+        self.assertIs(profiler.hand(), NO_PROFILE)
+        self.assertEqual(profiler.nb_hands, 0)
+        self.assertTrue(profiler.summary().empty)
+
+    def test_profiled_conversion(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        converter.hand_profiler = HandProfiler(every=2)
+        for history_path in self.history_paths:
+            converter.convert_history(history_path)
+        self.assertEqual(converter.hand_profiler.nb_hands, len(self.history_paths))
+        self.assertEqual(converter.hand_profiler.nb_profiled_hands, len(self.history_paths) // 2)
+        df = converter.hand_profiler.summary(top=10)
+        self.assertEqual(len(df), 10)
+        self.assertTrue(df["own_ms_per_hand"].is_monotonic_decreasing)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stats", "run.prof")
+            converter.hand_profiler.write_stats(path)
+            self.assertGreater(pstats.Stats(path).total_calls, 0)
+
+    def test_one_hand_is_profiled_at_a_time(self):
+        profiler = HandProfiler(every=1, process_wide=False)
+        other_profiler = HandProfiler(every=1, process_wide=False)
+        with profiler.hand():
+            with other_profiler.hand():
+                busy_loop(0.001)
+        self.assertEqual((profiler.nb_profiled_hands, other_profiler.nb_profiled_hands), (1, 0))
+        with other_profiler.hand():
+            busy_loop(0.001)
+        self.assertEqual(other_profiler.nb_profiled_hands, 1)
+
+    def test_process_wide_profiler_skips_concurrent_hands(self):
+        profiler = HandProfiler(every=1, process_wide=True)
+        with profiler.hand():
+            with profiler.hand():
+                busy_loop(0.001)
+        self.assertEqual(profiler.nb_profiled_hands, 1)
+        with profiler.hand():
+            busy_loop(0.001)
+        self.assertEqual((profiler.nb_hands, profiler.nb_profiled_hands), (3, 2))
+
+    def test_active_profiling_tool_does_not_fail_the_conversion(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        converter.hand_profiler = HandProfiler(every=1)
+        profile_class = profiling.cProfile.Profile
+        profiling.cProfile.Profile = ActiveToolProfile
+        try:
+            table = converter.convert_history(self.history_paths[0])
+        finally:
+            profiling.cProfile.Profile = profile_class
+        self.assertIsNotNone(table.hand_id)
+        self.assertEqual(converter.hand_profiler.nb_profiled_hands, 0)
+        converter.convert_history(self.history_paths[0])
+        self.assertEqual(converter.hand_profiler.nb_profiled_hands, 1)
+
+    def test_profile_run(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        with tempfile.TemporaryDirectory() as directory:
+            with profile_run("run", converter, interval=0.001, every=3, output_dir=directory) as sampler:
+                for history_path in self.history_paths:
+                    converter.convert_history(history_path)
+            self.assertIsInstance(sampler, StackSampler)
+            self.assertEqual(sorted(os.listdir(directory)), ["run.collapsed", "run.prof"])
+        self.assertEqual(converter.hand_profiler.nb_profiled_hands, len(self.history_paths) // 3)
+
+    def test_unprofiled_run(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        with tempfile.TemporaryDirectory() as directory:
+            with profile_run("run", converter, interval=0, every=0, output_dir=directory) as sampler:
+                converter.convert_history(self.history_paths[0])
+            self.assertIsNone(sampler)
+            self.assertEqual(os.listdir(directory), [])
+        self.assertEqual(converter.hand_profiler.nb_hands, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
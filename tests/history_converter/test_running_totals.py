@@ -0,0 +1,41 @@
+import os
+import unittest
+
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "json_files")
+STREET_NAMES = ["preflop", "flop", "turn", "river"]
+
+
+class TestRunningTotals(unittest.TestCase):
+    """The running bet totals must stay identical to the totals recomputed from the actions of each street"""
+
+    def setUp(self):
+        self.history_paths = [os.path.join(FILES_DIR, filename) for filename in sorted(os.listdir(FILES_DIR))]
+
+    def check_totals(self, converter: LocalHandHistoryConverter):
+        for history_path in self.history_paths:
+            table = converter.convert_history(history_path)
+            for player in table.players:
+                hand_stats = player.hand_stats
+                street_totals = []
+                for street_name in STREET_NAMES:
+                    actions = getattr(player.actions_history, street_name).actions
+                    expected = sum([action.value for action in actions])
+                    total = getattr(hand_stats, street_name).total_bet_amount
+                    with self.subTest(history=os.path.basename(history_path), player=player.name, street=street_name):
+                        self.assertEqual(total, expected)
+                    street_totals.append(total)
+                with self.subTest(history=os.path.basename(history_path), player=player.name, street="general"):
+                    self.assertEqual(hand_stats.general.total_bet_amount, sum(street_totals))
+
+    def test_running_totals(self):
+        self.check_totals(LocalHandHistoryConverter(data_dir=DATA_DIR))
+
+    def test_running_totals_pooled_trusted(self):
+        self.check_totals(LocalHandHistoryConverter(data_dir=DATA_DIR, pooled=True, trusted=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
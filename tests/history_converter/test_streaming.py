@@ -0,0 +1,138 @@
+import inspect
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+from pkrcomponents.converters.utils.exceptions import HandConversionError
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "json_files")
+ERRORS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "errors", "json_files")
+
+
+class TestLazyKeys(unittest.TestCase):
+    def test_iter_parsed_histories_keys(self):
+        with tempfile.TemporaryDirectory() as directory:
+            converter = LocalHandHistoryConverter(data_dir=directory)
+            for relative_path in ["a.json", "b.txt", "t1/c.json", "t1/t2/d.json", "t3/e.json", "t3/f.json.bak"]:
+                path = os.path.join(converter.parsed_dir, relative_path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                open(path, "w").close()
+            os.makedirs(os.path.join(converter.parsed_dir, "empty"))
+            keys = converter.iter_parsed_histories_keys()
+            self.assertTrue(inspect.isgenerator(keys))
+            expected_keys = {os.path.join(root, filename) for root, _, filenames in os.walk(converter.parsed_dir)
+                             for filename in filenames if filename.endswith(".json")}
+            self.assertEqual(set(keys), expected_keys)
+            self.assertEqual(sorted(converter.list_parsed_histories_keys()), sorted(expected_keys))
+
+    def test_missing_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            converter = LocalHandHistoryConverter(data_dir=directory)
+            self.assertEqual(converter.list_parsed_histories_keys(), [])
+
+
+class TestConvertStream(unittest.TestCase):
+    def setUp(self):
+        self.history_paths = [os.path.join(FILES_DIR, filename) for filename in sorted(os.listdir(FILES_DIR))]
+        self.error_path = os.path.join(ERRORS_DIR, "example02.json")
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        self.hand_ids = {history_path: converter.convert_history(history_path).hand_id
+                         for history_path in self.history_paths}
+
+    def test_results(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        results = {}
+        for parsed_key, table, error in converter.convert_stream(self.history_paths + [self.error_path], max_workers=4):
+            self.assertNotIn(parsed_key, results)
+            results[parsed_key] = table.hand_id if error is None else error
+        self.assertIsInstance(results.pop(self.error_path), HandConversionError)
+        self.assertEqual(results, self.hand_ids)
+
+    def test_pooled_results(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR, pooled=True)
+        history_paths = self.history_paths * 3
+        results = []
+        for parsed_key, table, error in converter.convert_stream(history_paths, max_workers=4, max_in_flight=6):
+            self.assertIsNone(error)
+            self.assertEqual(table.hand_id, self.hand_ids[parsed_key])
+            results.append(parsed_key)
+        self.assertEqual(sorted(results), sorted(history_paths))
+
+    def test_clones_share_levels_structures(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        clones = [converter.clone() for _ in range(8)]
+
+        def add_levels(clone):
+            return [clone.get_tournament_level("1", value=value, bb=100.0 * value, ante=10.0 * value)
+                    for value in range(1, 200)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            levels = list(executor.map(add_levels, clones))
+        levels_structure = converter.get_levels_structure("1")
+        self.assertEqual(sorted(level.value for level in levels_structure), list(range(1, 200)))
+        for clone_levels in levels:
+            self.assertEqual([id(level) for level in clone_levels], [id(level) for level in levels[0]])
+
+    def test_instruments_are_shared_by_the_clones_only(self):
+        instruments = ("timer", "hand_profiler", "memory_tracker", "metrics")
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR, timed=True)
+        other = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        clone = converter.clone()
+        for name in instruments:
+            self.assertIs(getattr(clone, name), getattr(converter, name))
+            self.assertIsNot(getattr(other, name), getattr(converter, name))
+        self.assertTrue(converter.timer.enabled)
+        self.assertFalse(other.timer.enabled)
+
+    def test_known_levels_are_read_without_lock(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        history_path = self.history_paths[0]
+        converter.convert_history(history_path)
+        with patch("pkrcomponents.converters.history_converter.abstract.LEVELS_LOCK") as lock:
+            converter.clone().convert_history(history_path)
+        lock.__enter__.assert_not_called()
+
+    def test_bounded_window(self):
+        consumed = []
+
+        def parsed_keys():
+            for history_path in self.history_paths:
+                consumed.append(history_path)
+                yield history_path
+
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        stream = converter.convert_stream(parsed_keys(), max_workers=2, max_in_flight=3)
+        for nb_yielded, (parsed_key, table, error) in enumerate(stream, 1):
+            self.assertIsNone(error)
+            self.assertLess(len(consumed), nb_yielded + 2 * 3)
+        self.assertEqual(nb_yielded, len(self.history_paths))
+
+    def test_early_close(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        stream = converter.convert_stream(iter(self.history_paths), max_workers=2, max_in_flight=2)
+        parsed_key, table, error = next(stream)
+        stream.close()
+        self.assertIn(parsed_key, self.hand_ids)
+
+    def test_convert_histories(self):
+        with tempfile.TemporaryDirectory() as directory:
+            converter = LocalHandHistoryConverter(data_dir=os.path.join(directory, "data"))
+            split_dir = converter.parsed_dir.replace("parsed", "split")
+            os.makedirs(converter.parsed_dir)
+            os.makedirs(split_dir)
+            for history_path in self.history_paths[:5]:
+                shutil.copy(history_path, converter.parsed_dir)
+            shutil.copy(self.error_path, os.path.join(converter.parsed_dir, "error.json"))
+            open(os.path.join(split_dir, "error.txt"), "w").close()
+            converter.convert_histories()
+            self.assertEqual(len(converter.list_parsed_histories_keys()), 5)
+            self.assertTrue(os.path.exists(os.path.join(directory, "corrections", "histories", "parsed", "error.json")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import json
+import os
+import tempfile
+import unittest
+
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+from pkrcomponents.converters.settings import DATA_DIR
+from pkrcomponents.converters.utils.exceptions import HandConversionError
+from pkrcomponents.converters.utils.timing import NO_PHASE, PhaseHistogram, PhaseTimer, get_bucket, get_bucket_bound
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "json_files")
+ERRORS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "errors", "json_files")
+
+
+class TestPhaseTimer(unittest.TestCase):
+    def test_buckets(self):
+        for duration in [0, 1, 3, 4, 7, 8, 100, 1023, 1024, 10 ** 6, 10 ** 12]:
+            bucket = get_bucket(duration)
+            self.assertLessEqual(duration, get_bucket_bound(bucket))
+            if bucket:
+                self.assertGreater(duration, get_bucket_bound(bucket - 1))
+            self.assertLessEqual(get_bucket_bound(bucket) - duration, duration / 4 + 1)
+
+    def test_histogram(self):
+        histogram = PhaseHistogram()
+        for duration in range(1, 1001):
+            histogram.add(duration * 1000, f"hand_{duration}")
+        self.assertEqual(histogram.count, 1000)
+        self.assertEqual(histogram.max, 10 ** 6)
+        self.assertAlmostEqual(histogram.percentile(50), 500000, delta=500000 / 4)
+        self.assertAlmostEqual(histogram.percentile(99), 990000, delta=990000 / 4)
+        self.assertEqual(histogram.slowest_hands, ["hand_1000", "hand_999", "hand_998", "hand_997", "hand_996"])
+
+    def test_disabled_timer(self):
+        timer = PhaseTimer(enabled=False)
+        self.assertIs(timer.phase("read"), NO_PHASE)
+        with timer.phase("read"):
+            pass
+        timer.end_hand("hand")
+        self.assertEqual(timer.histograms, {})
+        self.assertTrue(timer.summary().empty)
+
+    def test_timer(self):
+        timer = PhaseTimer()
+        for hand_id in ["hand_1", "hand_2"]:
+            with timer.phase("read"):
+                pass
+            with timer.phase("actions", "preflop"):
+                pass
+            timer.end_hand(hand_id)
+        self.assertEqual(set(timer.histograms), {"read", "actions.preflop"})
+        df = timer.summary().set_index("phase")
+        self.assertEqual(df.loc["read", "count"], 2)
+        self.assertEqual(sorted(df.loc["read", "slowest_hands"]), ["hand_1", "hand_2"])
+        self.assertIn("actions.preflop", timer.report())
+        timer.reset()
+        self.assertEqual(timer.histograms, {})
+
+
+class TestTimedConversion(unittest.TestCase):
+    def setUp(self):
+        self.history_paths = [os.path.join(FILES_DIR, filename) for filename in sorted(os.listdir(FILES_DIR))]
+
+    def test_timed_conversion(self):
+        for compiled in (False, True):
+            converter = LocalHandHistoryConverter(data_dir=DATA_DIR, timed=True, compiled=compiled)
+            hand_ids = {converter.convert_history(history_path).hand_id for history_path in self.history_paths}
+            histograms = converter.timer.histograms
+            self.assertEqual(histograms["total"].count, len(self.history_paths))
+            self.assertEqual(histograms["actions.preflop"].count, len(self.history_paths))
+            self.assertTrue({"read", "players", "postings", "showdown", "winners"} <= set(histograms))
+            self.assertTrue(set(histograms["total"].slowest_hands) <= hand_ids)
+
+    def test_failed_hands_are_attributed(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR, timed=True)
+        error_path = os.path.join(ERRORS_DIR, "example02.json")
+        with self.assertRaises(HandConversionError):
+            converter.convert_history(error_path)
+        with open(error_path, "r", encoding="utf-8") as file:
+            hand_id = json.load(file)["hand_id"]
+        self.assertEqual(converter.timer.histograms["total"].slowest_hands, [hand_id])
+        with tempfile.TemporaryDirectory() as directory:
+            unreadable_path = os.path.join(directory, "unreadable.json")
+            with open(unreadable_path, "w", encoding="utf-8") as file:
+                file.write("{")
+            with self.assertRaises(HandConversionError):
+                converter.convert_history(unreadable_path)
+        self.assertIn(unreadable_path, converter.timer.histograms["read"].slowest_hands)
+
+    def test_untimed_conversion(self):
+        converter = LocalHandHistoryConverter(data_dir=DATA_DIR)
+        converter.convert_history(self.history_paths[0])
+        self.assertFalse(converter.timer.enabled)
+        self.assertEqual(converter.timer.histograms, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+"""This module measures the time needed to compute the ICM equities of final tables and of large fields."""
+
+import os
+import timeit
+import numpy as np
+from pkrcomponents.components.actions import Action
+from pkrcomponents.components.tournaments.icm import icm_equities
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+ICM_SPEED_RESULTS_PATH = os.path.join(TEST_DIR, "icm_speed_results.txt")
+NB_ROUNDS = 200
+FINAL_TABLE_REWARDS = [30.0, 20.0, 15.0, 10.0, 8.0, 6.0, 5.0, 4.0, 2.0]
+
+
+def get_average_time(function, number: int = NB_ROUNDS) -> float:
+    function()
+    return timeit.timeit(function, number=number) / number
+
+
+def icm_speed_test(results_path: str):
+    generator = np.random.default_rng(0)
+    final_table = generator.uniform(1000, 50000, 9)
+    final_tables = generator.uniform(1000, 50000, (1000, 9))
+    large_field = generator.uniform(1000, 50000, 200)
+    average_times = {
+        "9 players, exact": get_average_time(lambda: icm_equities(final_table, FINAL_TABLE_REWARDS)),
+        "1000 final tables of 9 players, exact": get_average_time(
+            lambda: icm_equities(final_tables, FINAL_TABLE_REWARDS), number=10),
+        "200 players, 30 paid, Monte Carlo": get_average_time(
+            lambda: icm_equities(large_field, np.arange(30.0, 0.0, -1.0), seed=0), number=10),
+    }
+    text = "".join(f"{name}: {average_time * 1e3:.3f} ms\n" for name, average_time in average_times.items())
+    print(text)
+    print(f"Writing results to {results_path}")
+    with open(results_path, "w", encoding="utf-8") as file:
+        file.write(text)
+
+
+if __name__ == "__main__":
+    icm_speed_test(ICM_SPEED_RESULTS_PATH)
@@ -0,0 +1,36 @@
+"""This module measures the time needed to build and reset the hand stats of a player, compared to a DataFrame row."""
+
+import os
+import timeit
+import pandas as pd
+from pkrcomponents.components.actions import Action
+from pkrcomponents.components.players.player_hand_stats import PlayerHandStats
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+STATS_RESET_SPEED_RESULTS_PATH = os.path.join(TEST_DIR, "stats_reset_speed_results.txt")
+NB_ROUNDS = 5000
+
+
+def get_average_time(function) -> float:
+    function()
+    return timeit.timeit(function, number=NB_ROUNDS) / NB_ROUNDS
+
+
+def stats_reset_speed_test(results_path: str):
+    hand_stats = PlayerHandStats()
+    columns = list(hand_stats.to_dataframe().columns)
+    values = [0] * len(columns)
+    average_times = {
+        "PlayerHandStats construction": get_average_time(PlayerHandStats),
+        "PlayerHandStats reset": get_average_time(hand_stats.reset),
+        "One DataFrame row": get_average_time(lambda: pd.DataFrame([values], columns=columns)),
+    }
+    text = "".join(f"{name}: {average_time * 1e6:.1f} µs\n" for name, average_time in average_times.items())
+    print(text)
+    print(f"Writing results to {results_path}")
+    with open(results_path, "w", encoding="utf-8") as file:
+        file.write(text)
+
+
+if __name__ == "__main__":
+    stats_reset_speed_test(STATS_RESET_SPEED_RESULTS_PATH)
@@ -1,11 +1,22 @@
 import unittest
 import os
+import json
+import shutil
+import tempfile
+import io
+from contextlib import redirect_stdout
 from datetime import datetime
+from unittest.mock import Mock
+
+from botocore.exceptions import ClientError
+
 from pkrcomponents.components.tournaments.buy_in import BuyIn
 from pkrcomponents.components.tournaments.level import Level
 from pkrcomponents.components.tournaments.speed import TourSpeed
 from pkrcomponents.converters.settings import BUCKET_NAME, DATA_DIR, TEST_DATA_DIR
+from pkrcomponents.converters.summary_converter.cloud import CloudSummaryConverter
 from pkrcomponents.converters.summary_converter.local import LocalSummaryConverter
+from pkrcomponents.converters.summary_converter.tournament_results import TournamentResults
 
 FILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "json_files")
 
@@ -68,6 +79,12 @@ class TestLocalSummaryConverter(unittest.TestCase):
         nb_entries = self.converter.tournament.nb_entries
         self.assertEqual(nb_entries, 1)
 
+    def test_get_levels_structure(self):
+        self.converter.get_levels_structure()
+        levels_structure = self.converter.tournament.levels_structure
+        self.assertEqual(len(levels_structure), len(self.converter.data.get("levels_structure")))
+        self.assertEqual(levels_structure.get_level(2), Level(value=2, bb=250, sb=125, ante=30))
+
 
 class TestLocalSummaryConverter2(unittest.TestCase):
     def setUp(self):
@@ -118,3 +135,68 @@ class TestLocalSummaryConverter2(unittest.TestCase):
         self.converter.get_nb_entries()
         nb_entries = self.converter.tournament.nb_entries
         self.assertEqual(nb_entries, 2)
+
+
+class TestConvertSummaries(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_dir = os.path.join(self.temp_dir, "data")
+        self.parsed_dir = os.path.join(self.data_dir, "summaries", "parsed")
+        os.makedirs(self.parsed_dir)
+        for filename in ("example01.json", "example02.json", "example03.json"):
+            shutil.copy(os.path.join(FILES_DIR, filename), self.parsed_dir)
+        with open(os.path.join(FILES_DIR, "example01.json"), encoding="utf-8") as file:
+            corrupt_data = json.load(file)
+        corrupt_data["registered_players"] = None
+        with open(os.path.join(self.parsed_dir, "corrupt.json"), "w", encoding="utf-8") as file:
+            json.dump(corrupt_data, file)
+        self.converter = LocalSummaryConverter(data_dir=self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def check_results(self, results: TournamentResults):
+        self.assertEqual(len(results), 3)
+        df = results.to_dataframe()
+        self.assertEqual(len(set(df["id"])), 3)
+        row = df.set_index("id").loc["608341002"]
+        self.assertEqual(row["buy_in_bounty"], 2.25)
+        self.assertEqual(row["final_position"], 886)
+        self.assertEqual(row["total_players"], 2525)
+        corrections_dir = os.path.join(self.temp_dir, "corrections", "summaries", "parsed")
+        self.assertEqual(os.listdir(corrections_dir), ["corrupt.json"])
+        self.assertNotIn("corrupt.json", os.listdir(self.parsed_dir))
+
+    def test_convert_summary_resets_tournament(self):
+        keys = sorted(self.converter.list_parsed_summaries_keys())
+        first = self.converter.convert_summary(keys[1])
+        second = self.converter.convert_summary(keys[2])
+        self.assertIsNot(first, second)
+        self.assertNotEqual(first.id, second.id)
+
+    def test_convert_summaries_in_process(self):
+        self.check_results(self.converter.convert_summaries(max_workers=0, chunk_size=2))
+
+    def test_convert_summaries_in_workers(self):
+        self.check_results(self.converter.convert_summaries(max_workers=2, chunk_size=1))
+
+
+class TestCloudSummaryCorrections(unittest.TestCase):
+    def test_only_copied_keys_are_deleted(self):
+        converter = CloudSummaryConverter.__new__(CloudSummaryConverter)
+        converter.bucket_name = BUCKET_NAME
+        converter.s3 = Mock()
+        keys = [f"data/summaries/parsed/{name}.json" for name in ("a", "b", "c")]
+
+        def copy_object(Bucket, CopySource, Key):
+            if CopySource.endswith("b.json"):
+                raise ClientError({"Error": {"Code": "NoSuchKey", "Message": "Not found"}}, "CopyObject")
+
+        converter.s3.copy_object.side_effect = copy_object
+        converter.s3.delete_objects.return_value = {"Errors": [{"Key": keys[2], "Message": "Access denied"}]}
+        with redirect_stdout(io.StringIO()) as output:
+            converter.send_batch_to_corrections(keys)
+        deleted = converter.s3.delete_objects.call_args.kwargs["Delete"]["Objects"]
+        self.assertEqual([obj["Key"] for obj in deleted], [keys[0], keys[2]])
+        self.assertIn(f"Could not delete {keys[2]}", output.getvalue())
+        self.assertIn("1 of 3 corrupt summary files", output.getvalue())
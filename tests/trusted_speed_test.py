@@ -0,0 +1,46 @@
+"""This module compares the time needed to convert parsed files with and without the trusted and compiled modes."""
+
+import os
+import time
+from pkrcomponents.components.actions import Action
+from pkrcomponents.converters.history_converter.local import LocalHandHistoryConverter
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+FILES_DIR = os.path.join(TEST_DIR, "history_converter", "json_files")
+TRUSTED_SPEED_RESULTS_PATH = os.path.join(TEST_DIR, "trusted_speed_results.txt")
+NB_ROUNDS = 40
+
+
+def get_average_time(converter, files_list: list) -> float:
+    for file_key in files_list:
+        converter.convert_history(file_key)
+    start = time.perf_counter()
+    for _ in range(NB_ROUNDS):
+        for file_key in files_list:
+            converter.convert_history(file_key)
+    total_time = time.perf_counter() - start
+    return total_time / (NB_ROUNDS * len(files_list))
+
+
+def trusted_speed_test(files_list: list, results_path: str):
+    converters = {
+        "Regular conversion": LocalHandHistoryConverter(TEST_DIR),
+        "Trusted conversion": LocalHandHistoryConverter(TEST_DIR, trusted=True),
+        "Pooled conversion": LocalHandHistoryConverter(TEST_DIR, pooled=True),
+        "Pooled and trusted conversion": LocalHandHistoryConverter(TEST_DIR, pooled=True, trusted=True),
+        "Compiled conversion": LocalHandHistoryConverter(TEST_DIR, compiled=True),
+        "Pooled and compiled conversion": LocalHandHistoryConverter(TEST_DIR, pooled=True, compiled=True),
+    }
+    average_times = {name: get_average_time(converter, files_list) for name, converter in converters.items()}
+    regular_time = average_times["Regular conversion"]
+    text = "".join(f"{name}: {average_time * 1000:.2f} ms per hand, speedup x{regular_time / average_time:.2f}\n"
+                   for name, average_time in average_times.items())
+    print(text)
+    print(f"Writing results to {results_path}")
+    with open(results_path, "w") as file:
+        file.write(text)
+
+
+if __name__ == "__main__":
+    history_files = [os.path.join(FILES_DIR, filename) for filename in sorted(os.listdir(FILES_DIR))]
+    trusted_speed_test(history_files, TRUSTED_SPEED_RESULTS_PATH)